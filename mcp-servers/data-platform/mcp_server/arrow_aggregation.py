@@ -0,0 +1,278 @@
+"""
+Incremental Arrow aggregation.
+
+Folds record batches into per-group partial aggregates so a group-by can
+run over a dataset far larger than memory: only one batch plus the partial
+state (one row per group) is resident at a time.
+"""
+import logging
+from typing import Dict, List, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .arrow_expressions import ExpressionNotSupported
+
+logger = logging.getLogger(__name__)
+
+# pandas aggregation -> partial state it needs
+_PARTIAL_STATES = {
+    'sum': ('sum',),
+    'count': ('count',),
+    'min': ('min',),
+    'max': ('max',),
+    'mean': ('sum', 'count'),
+    'std': ('sum', 'count', 'm2'),
+    'var': ('sum', 'count', 'm2'),
+    'nunique': (),
+}
+
+# How each partial state is merged across batches
+_MERGE = {
+    'sum': 'sum',
+    'count': 'sum',
+    'min': 'min',
+    'max': 'max',
+    'm2': 'sum',
+}
+
+
+class IncrementalGroupBy:
+    """
+    Streaming group-by over record batches, matching pandas output.
+
+    Each batch is reduced to per-group partial states (sum, count, min,
+    max, and M2 for variance). Partials are merged whenever they pile up,
+    using Chan's parallel variance formula so std/var stay numerically
+    stable. nunique keeps the distinct (keys, value) pairs instead.
+
+    Output follows PandasTools._arrow_groupby: keys sorted, null keys
+    dropped, and `column_func` names once any column has a list of funcs.
+    """
+
+    def __init__(
+        self,
+        by: Union[str, List[str]],
+        agg: Dict[str, Union[str, List[str]]],
+        compact_rows: int = 500_000
+    ):
+        """
+        Args:
+            by: Column(s) to group by
+            agg: Aggregation dict (e.g., {"sales": "sum", "qty": ["mean", "max"]})
+            compact_rows: Merge buffered partials once they exceed this many rows
+
+        Raises:
+            ExpressionNotSupported: For aggregations with no incremental form
+        """
+        self.keys = [by] if isinstance(by, str) else list(by)
+        self.flatten = any(not isinstance(funcs, str) for funcs in agg.values())
+        self.compact_rows = compact_rows
+
+        self.outputs = []
+        self.states = {}
+        self.distinct_columns = []
+        for column, funcs in agg.items():
+            for func in ([funcs] if isinstance(funcs, str) else funcs):
+                if func not in _PARTIAL_STATES:
+                    raise ExpressionNotSupported(
+                        f"Unsupported out-of-core aggregation: {func}"
+                    )
+                self.outputs.append((column, func))
+                if func == 'nunique':
+                    if column not in self.distinct_columns:
+                        self.distinct_columns.append(column)
+                for state in _PARTIAL_STATES[func]:
+                    self.states.setdefault(column, set()).add(state)
+
+        self.columns = list(dict.fromkeys(
+            self.keys + list(self.states) + self.distinct_columns
+        ))
+        self._partials: List[pa.Table] = []
+        self._partial_rows = 0
+        self._distinct: Dict[str, List[pa.Table]] = {c: [] for c in self.distinct_columns}
+        self._distinct_rows = 0
+        self._groups = 0
+
+    @property
+    def num_groups(self) -> int:
+        """Lower bound on the number of groups seen so far"""
+        return self._groups
+
+    def update(self, batch: Union[pa.RecordBatch, pa.Table]):
+        """Fold one batch into the partial state"""
+        table = batch if isinstance(batch, pa.Table) else pa.Table.from_batches([batch])
+        for key in self.keys:
+            table = table.filter(pc.is_valid(table[key]))
+        if table.num_rows == 0:
+            return
+
+        if self.states:
+            partial = self._reduce_batch(table)
+            self._partials.append(partial)
+            self._partial_rows += partial.num_rows
+            self._groups = max(self._groups, partial.num_rows)
+
+        for column in self.distinct_columns:
+            pairs = table.group_by(self.keys + [column]).aggregate([])
+            if not self.states:
+                batch_groups = pairs.group_by(self.keys).aggregate([]).num_rows
+                self._groups = max(self._groups, batch_groups)
+            self._distinct[column].append(pairs)
+            self._distinct_rows += pairs.num_rows
+
+        if (self._partial_rows > self.compact_rows
+                or self._distinct_rows > self.compact_rows):
+            self._compact()
+
+    def result(self) -> pa.Table:
+        """Finalize partial states into the aggregated table"""
+        self._compact()
+
+        groups = None
+        if self._partials:
+            groups = self._partials[0]
+        for column in self.distinct_columns:
+            pairs = self._distinct[column][0] if self._distinct[column] else None
+            if pairs is None:
+                continue
+            counts = pairs.group_by(self.keys).aggregate([(column, 'count')])
+            counts = counts.rename_columns(self.keys + [f"{column}__nunique"])
+            groups = counts if groups is None else groups.join(
+                counts, self.keys, join_type='full outer'
+            )
+
+        if groups is None:
+            return pa.table({name: [] for name in self._output_names()})
+
+        columns = [groups[key] for key in self.keys]
+        for column, func in self.outputs:
+            columns.append(self._finalize(groups, column, func))
+        result = pa.table(columns, names=self._output_names())
+        return result.sort_by([(key, 'ascending') for key in self.keys])
+
+    def _output_names(self) -> List[str]:
+        return self.keys + [
+            f"{column}_{func}" if self.flatten else column
+            for column, func in self.outputs
+        ]
+
+    def _finalize(self, groups: pa.Table, column: str, func: str) -> pa.ChunkedArray:
+        """Turn merged partial states into one output column"""
+        if func == 'nunique':
+            return pc.coalesce(groups[f"{column}__nunique"], 0)
+        if func in ('sum', 'min', 'max', 'count'):
+            return groups[f"{column}__{func}"]
+
+        count = groups[f"{column}__count"].cast(pa.float64())
+        total = groups[f"{column}__sum"].cast(pa.float64())
+        if func == 'mean':
+            return pc.divide(total, pc.if_else(pc.equal(count, 0), None, count))
+
+        # ddof=1 like pandas; a single observation has no variance
+        denominator = pc.if_else(pc.less_equal(count, 1), None, pc.subtract(count, 1))
+        variance = pc.divide(groups[f"{column}__m2"], denominator)
+        return pc.sqrt(variance) if func == 'std' else variance
+
+    def _reduce_batch(self, table: pa.Table) -> pa.Table:
+        """Aggregate one batch into partial states"""
+        aggregations = []
+        names = []
+        for column, states in self.states.items():
+            for state in ('sum', 'count', 'min', 'max'):
+                if state in states:
+                    aggregations.append((column, state))
+                    names.append(f"{column}__{state}")
+            if 'm2' in states:
+                aggregations.append((column, 'variance', pc.VarianceOptions(ddof=0)))
+                names.append(f"{column}__variance")
+
+        partial = table.group_by(self.keys).aggregate(aggregations)
+        arrow_names = [f"{agg[0]}_{agg[1]}" for agg in aggregations]
+        partial = partial.select(self.keys + arrow_names).rename_columns(self.keys + names)
+
+        # M2 = population variance * n, so partials merge with Chan's formula
+        for column, states in self.states.items():
+            if 'm2' in states:
+                variance = partial[f"{column}__variance"]
+                count = partial[f"{column}__count"].cast(pa.float64())
+                m2 = pc.coalesce(pc.multiply(variance, count), 0.0)
+                index = partial.column_names.index(f"{column}__variance")
+                partial = partial.set_column(index, f"{column}__m2", m2)
+        return partial
+
+    def _compact(self):
+        """Merge buffered partials into a single table"""
+        if len(self._partials) > 1:
+            self._partials = [self._merge(pa.concat_tables(self._partials))]
+            self._partial_rows = self._partials[0].num_rows
+        for column in self.distinct_columns:
+            if len(self._distinct[column]) > 1:
+                pairs = pa.concat_tables(self._distinct[column])
+                self._distinct[column] = [
+                    pairs.group_by(self.keys + [column]).aggregate([])
+                ]
+        if self.distinct_columns:
+            self._distinct_rows = sum(
+                tables[0].num_rows for tables in self._distinct.values() if tables
+            )
+
+        if self._partials:
+            self._groups = self._partials[0].num_rows
+        elif self.distinct_columns and self._distinct[self.distinct_columns[0]]:
+            pairs = self._distinct[self.distinct_columns[0]][0]
+            self._groups = pairs.group_by(self.keys).aggregate([]).num_rows
+
+    def _merge(self, partials: pa.Table) -> pa.Table:
+        """Combine partial states that share group keys"""
+        aggregations = []
+        for name in partials.column_names[len(self.keys):]:
+            state = name.rsplit('__', 1)[1]
+            if state != 'm2':
+                aggregations.append((name, _MERGE[state]))
+
+        merged = partials.group_by(self.keys).aggregate(aggregations)
+        merged = merged.rename_columns(
+            self.keys + [name for name, _ in aggregations]
+        )
+
+        m2_columns = [c for c, states in self.states.items() if 'm2' in states]
+        if not m2_columns:
+            return merged.cast(partials.schema)
+
+        # Chan et al.: M2 = sum(M2_i) + sum(n_i * (mean_i - mean)^2)
+        totals = merged.select(
+            self.keys
+            + [f"{c}__sum" for c in m2_columns]
+            + [f"{c}__count" for c in m2_columns]
+        ).rename_columns(
+            self.keys
+            + [f"{c}__total_sum" for c in m2_columns]
+            + [f"{c}__total_count" for c in m2_columns]
+        )
+        joined = partials.join(totals, self.keys, join_type='inner')
+        spreads = []
+        for column in m2_columns:
+            count = joined[f"{column}__count"].cast(pa.float64())
+            mean = pc.divide(
+                joined[f"{column}__sum"].cast(pa.float64()),
+                pc.if_else(pc.equal(count, 0), None, count)
+            )
+            total_count = joined[f"{column}__total_count"].cast(pa.float64())
+            grand_mean = pc.divide(
+                joined[f"{column}__total_sum"].cast(pa.float64()),
+                pc.if_else(pc.equal(total_count, 0), None, total_count)
+            )
+            spread = pc.multiply(count, pc.power(pc.subtract(mean, grand_mean), 2))
+            spreads.append(
+                pc.add(joined[f"{column}__m2"], pc.coalesce(spread, 0.0))
+            )
+        spread_table = pa.table(
+            [joined[key] for key in self.keys] + spreads,
+            names=self.keys + [f"{c}__m2" for c in m2_columns]
+        )
+        m2 = spread_table.group_by(self.keys).aggregate(
+            [(f"{c}__m2", 'sum') for c in m2_columns]
+        ).rename_columns(self.keys + [f"{c}__m2" for c in m2_columns])
+        merged = merged.join(m2, self.keys, join_type='inner')
+        return merged.select(partials.column_names).cast(partials.schema)
@@ -0,0 +1,175 @@
+"""
+Arrow compute helpers.
+
+Translates pandas-style query strings into pyarrow.compute expressions so
+filters can run directly on Arrow tables (and be pushed down into datasets)
+without a pandas round-trip.
+"""
+import ast
+import logging
+from typing import Any, Set
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+logger = logging.getLogger(__name__)
+
+
+class ExpressionNotSupported(ValueError):
+    """Raised when a query string cannot be expressed in pyarrow.compute"""
+
+
+# Errors that mean "run this on the pandas engine instead"
+ARROW_FALLBACK_ERRORS = (ExpressionNotSupported, pa.ArrowException)
+
+_COMPARISONS = {
+    ast.Eq: lambda l, r: l == r,
+    ast.NotEq: lambda l, r: l != r,
+    ast.Lt: lambda l, r: l < r,
+    ast.LtE: lambda l, r: l <= r,
+    ast.Gt: lambda l, r: l > r,
+    ast.GtE: lambda l, r: l >= r,
+}
+
+_ARITHMETIC = {
+    ast.Add: pc.add,
+    ast.Sub: pc.subtract,
+    ast.Mult: pc.multiply,
+}
+
+
+def parse_condition(condition: str) -> pc.Expression:
+    """
+    Translate a pandas query string into a boolean Arrow expression.
+
+    Supports comparisons (==, !=, <, <=, >, >=, chained), `in` / `not in`
+    against literal lists, `and` / `or` / `not` (and `&` / `|` / `~`), and
+    +, -, *, / arithmetic between columns and literals. Null handling
+    mirrors pandas: comparisons against nulls are False, except `!=`
+    which is True.
+
+    Args:
+        condition: pandas query string (e.g., "age > 30 and city == 'NYC'")
+
+    Returns:
+        pyarrow.compute Expression
+
+    Raises:
+        ExpressionNotSupported: If the condition uses syntax with no Arrow
+            equivalent (backticks, @variables, method calls, ...)
+    """
+    try:
+        tree = ast.parse(condition.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ExpressionNotSupported(f"Cannot parse condition: {e}") from e
+    return _to_predicate(tree.body)
+
+
+def condition_columns(condition: str) -> Set[str]:
+    """
+    List the column names referenced by a query string.
+
+    Used to widen a column projection so a pushed-down predicate can be
+    evaluated before the projection is applied.
+
+    Args:
+        condition: pandas query string
+
+    Returns:
+        Set of referenced column names
+
+    Raises:
+        ExpressionNotSupported: If the condition cannot be parsed
+    """
+    try:
+        tree = ast.parse(condition.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ExpressionNotSupported(f"Cannot parse condition: {e}") from e
+    return {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+
+
+def _to_predicate(node: ast.AST) -> pc.Expression:
+    """Convert an AST node that must evaluate to a boolean"""
+    if isinstance(node, ast.BoolOp):
+        combine = pc.and_kleene if isinstance(node.op, ast.And) else pc.or_kleene
+        result = _to_predicate(node.values[0])
+        for value in node.values[1:]:
+            result = combine(result, _to_predicate(value))
+        return result
+
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+        combine = pc.and_kleene if isinstance(node.op, ast.BitAnd) else pc.or_kleene
+        return combine(_to_predicate(node.left), _to_predicate(node.right))
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+        return pc.invert(_to_predicate(node.operand))
+
+    if isinstance(node, ast.Compare):
+        result = None
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            term = _compare(op, left, right)
+            result = term if result is None else pc.and_kleene(result, term)
+            left = right
+        return result
+
+    if isinstance(node, ast.Name):
+        # Bare boolean column
+        return pc.coalesce(pc.field(node.id), pa.scalar(False))
+
+    raise ExpressionNotSupported(f"Unsupported condition: {ast.dump(node)}")
+
+
+def _compare(op: ast.cmpop, left: ast.AST, right: ast.AST) -> pc.Expression:
+    """Build a single null-safe comparison"""
+    if isinstance(op, (ast.In, ast.NotIn)):
+        values = _literal_list(right)
+        result = pc.is_in(_to_value(left), value_set=pa.array(values))
+        return pc.invert(result) if isinstance(op, ast.NotIn) else result
+
+    build = _COMPARISONS.get(type(op))
+    if build is None:
+        raise ExpressionNotSupported(f"Unsupported comparison: {type(op).__name__}")
+
+    result = build(_to_value(left), _to_value(right))
+    # pandas treats NaN/None as unequal to everything
+    return pc.coalesce(result, pa.scalar(isinstance(op, ast.NotEq)))
+
+
+def _to_value(node: ast.AST) -> Any:
+    """Convert an AST node that evaluates to a column, literal, or arithmetic"""
+    if isinstance(node, ast.Name):
+        return pc.field(node.id)
+
+    if isinstance(node, ast.Constant):
+        if node.value is None or isinstance(node.value, (bytes, complex)):
+            raise ExpressionNotSupported(f"Unsupported literal: {node.value!r}")
+        return pc.scalar(node.value)
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        if isinstance(node.operand, ast.Constant) and isinstance(node.operand.value, (int, float)):
+            return pc.scalar(-node.operand.value)
+        return pc.negate(_to_value(node.operand))
+
+    if isinstance(node, ast.BinOp):
+        left, right = _to_value(node.left), _to_value(node.right)
+        if isinstance(node.op, ast.Div):
+            # pandas "/" is true division, even for integer columns
+            return pc.divide(left.cast(pa.float64()), right.cast(pa.float64()))
+        arithmetic = _ARITHMETIC.get(type(node.op))
+        if arithmetic is not None:
+            return arithmetic(left, right)
+
+    raise ExpressionNotSupported(f"Unsupported value: {ast.dump(node)}")
+
+
+def _literal_list(node: ast.AST) -> list:
+    """Extract a list of literals for `in` / `not in`"""
+    if not isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        raise ExpressionNotSupported("'in' requires a literal list")
+    values = []
+    for element in node.elts:
+        if not isinstance(element, ast.Constant):
+            raise ExpressionNotSupported("'in' requires a literal list")
+        values.append(element.value)
+    return values
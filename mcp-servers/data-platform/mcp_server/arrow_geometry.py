@@ -0,0 +1,646 @@
+"""
+Arrow-native geometry.
+
+PostGIS geometries are kept as (E)WKB in Arrow binary columns tagged with
+the `geoarrow.wkb` extension name, or converted to GeoArrow-style nested
+coordinate arrays. WKB is parsed once into flat NumPy coordinate buffers
+(coords / ring offsets / geometry offsets) so bounding boxes, centroids and
+areas are computed with vectorized reductions instead of per-geometry
+objects.
+"""
+import json
+import logging
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL type names decoded as geometry
+GEOMETRY_TYPES = ('geometry', 'geography')
+
+GEOMETRY_TYPES_QUERY = """
+    SELECT t.typname, n.nspname
+    FROM pg_type t
+    JOIN pg_namespace n ON n.oid = t.typnamespace
+    WHERE t.typname = ANY($1::text[])
+"""
+
+EXTENSION_NAME = b'ARROW:extension:name'
+EXTENSION_METADATA = b'ARROW:extension:metadata'
+
+# WKB base type codes
+POINT, LINESTRING, POLYGON = 1, 2, 3
+MULTIPOINT, MULTILINESTRING, MULTIPOLYGON, GEOMETRYCOLLECTION = 4, 5, 6, 7
+
+TYPE_NAMES = {
+    POINT: 'Point',
+    LINESTRING: 'LineString',
+    POLYGON: 'Polygon',
+    MULTIPOINT: 'MultiPoint',
+    MULTILINESTRING: 'MultiLineString',
+    MULTIPOLYGON: 'MultiPolygon',
+    GEOMETRYCOLLECTION: 'GeometryCollection',
+}
+
+# Kind of each coordinate sequence ("ring") in the flat layout
+RING_POINT, RING_LINE, RING_EXTERIOR, RING_INTERIOR = 0, 1, 2, 3
+
+_EWKB_Z = 0x80000000
+_EWKB_M = 0x40000000
+_EWKB_SRID = 0x20000000
+
+# Fixed-size 2D point WKB, without / with an EWKB SRID
+_POINT_SIZES = (21, 25)
+
+
+class WKB(bytes):
+    """
+    EWKB bytes decoded from a PostGIS column.
+
+    A distinct type lets result columns be recognized as geometry after
+    asyncpg decoding, where the column type is no longer known.
+    """
+
+
+def decode_geometry(value: str) -> WKB:
+    """asyncpg text decoder: PostGIS text output is hex EWKB"""
+    return WKB(bytes.fromhex(value))
+
+
+def encode_geometry(value: Union[bytes, str]) -> str:
+    """asyncpg text encoder: WKB bytes become hex; WKT/EWKT strings pass through"""
+    return value.hex() if isinstance(value, (bytes, bytearray, memoryview)) else value
+
+
+async def register_geometry_codecs(conn: Any) -> List[str]:
+    """
+    Decode PostGIS geometry/geography values as WKB on this connection.
+
+    Uses the text protocol (hex EWKB), so WKT/EWKT string parameters keep
+    working. Databases without PostGIS are left unchanged.
+
+    Args:
+        conn: asyncpg connection
+
+    Returns:
+        Registered type names
+    """
+    registered = []
+    try:
+        rows = await conn.fetch(GEOMETRY_TYPES_QUERY, list(GEOMETRY_TYPES))
+        for r in rows:
+            await conn.set_type_codec(
+                r['typname'],
+                schema=r['nspname'],
+                encoder=encode_geometry,
+                decoder=decode_geometry,
+                format='text'
+            )
+            registered.append(r['typname'])
+    except Exception as e:
+        logger.debug(f"Geometry codecs not registered: {e}")
+    return registered
+
+
+@dataclass
+class Geometries:
+    """
+    Flat coordinate layout of a geometry column.
+
+    Geometry i owns rings geometry_offsets[i]:geometry_offsets[i + 1];
+    ring j owns coords ring_offsets[j]:ring_offsets[j + 1].
+    """
+    coords: np.ndarray            # (n, 2) float64 x/y
+    ring_offsets: np.ndarray      # int64, rings + 1
+    ring_kinds: np.ndarray        # int8, one RING_* per ring
+    geometry_offsets: np.ndarray  # int64, geometries + 1
+    types: np.ndarray             # int8 base type per geometry (0 = null/unsupported)
+    srids: np.ndarray             # int32 per geometry (0 = none)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+
+def geometry_field(name: str, srid: Optional[int] = None) -> pa.Field:
+    """Binary field tagged as GeoArrow WKB, with the CRS when the SRID is known"""
+    metadata = {EXTENSION_NAME: b'geoarrow.wkb'}
+    if srid:
+        metadata[EXTENSION_METADATA] = json.dumps({'crs': f'EPSG:{srid}'}).encode()
+    return pa.field(name, pa.binary(), metadata=metadata)
+
+
+def is_geometry_field(field: pa.Field) -> bool:
+    """Whether a field carries a GeoArrow extension name"""
+    name = (field.metadata or {}).get(EXTENSION_NAME, b'')
+    return name.startswith(b'geoarrow.')
+
+
+def geometry_columns(table: pa.Table) -> List[str]:
+    """Names of the table's GeoArrow-tagged columns"""
+    return [field.name for field in table.schema if is_geometry_field(field)]
+
+
+def tag_geometry(
+    table: pa.Table,
+    columns: List[str],
+    geometry_format: str = 'wkb'
+) -> pa.Table:
+    """
+    Mark WKB columns as geometry, optionally converting them to GeoArrow.
+
+    Args:
+        table: Table holding the columns as binary (or hex EWKB text)
+        columns: Geometry column names
+        geometry_format: 'wkb' (tagged binary) or 'geoarrow' (nested
+            coordinate arrays; needs one geometry type per column)
+
+    Raises:
+        ValueError: If a column cannot be converted to GeoArrow
+    """
+    for name in columns:
+        index = table.schema.get_field_index(name)
+        array = wkb_array(table.column(index))
+        srid = _first_srid(array)
+        if geometry_format == 'geoarrow':
+            array, field = to_geoarrow(parse_wkb(array), name, srid)
+        else:
+            field = geometry_field(name, srid)
+        table = table.set_column(index, field, array)
+    return table
+
+
+def wkb_array(column: Union[pa.Array, pa.ChunkedArray]) -> pa.Array:
+    """A geometry column as one binary array; hex EWKB text is decoded"""
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        column = pa.array(
+            [None if v is None else bytes.fromhex(v) for v in column.to_pylist()],
+            type=pa.binary()
+        )
+    if pa.types.is_large_binary(column.type):
+        column = column.cast(pa.binary())
+    if not pa.types.is_binary(column.type):
+        raise ValueError(f"Expected WKB binary or hex text, got {column.type}")
+    return column
+
+
+def parse_wkb(array: pa.Array) -> Geometries:
+    """
+    Parse a binary array of (E)WKB into flat coordinate buffers.
+
+    Columns of plain 2D points are decoded entirely with NumPy; other
+    geometries are walked once, with each coordinate sequence read by
+    np.frombuffer. Z/M ordinates are dropped. Nulls and unsupported
+    (curved) geometries get type 0 and no rings.
+    """
+    array = wkb_array(array)
+    points = _parse_points(array)
+    if points is not None:
+        return points
+
+    values = array.to_pylist()
+    coords: List[np.ndarray] = []
+    ring_kinds: List[int] = []
+    ring_sizes: List[int] = []
+    geometry_rings = np.zeros(len(values), dtype=np.int64)
+    types = np.zeros(len(values), dtype=np.int8)
+    srids = np.zeros(len(values), dtype=np.int32)
+
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        rings: List[Tuple[int, np.ndarray]] = []
+        try:
+            _, base_type, srid = _parse_geometry(value, 0, rings)
+        except (ValueError, struct.error):
+            continue
+        types[i] = base_type
+        srids[i] = srid or 0
+        geometry_rings[i] = len(rings)
+        for kind, ring in rings:
+            ring_kinds.append(kind)
+            ring_sizes.append(len(ring))
+            coords.append(ring)
+
+    ring_offsets = np.zeros(len(ring_sizes) + 1, dtype=np.int64)
+    np.cumsum(ring_sizes, out=ring_offsets[1:])
+    geometry_offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(geometry_rings, out=geometry_offsets[1:])
+    return Geometries(
+        coords=np.concatenate(coords) if coords else np.empty((0, 2)),
+        ring_offsets=ring_offsets,
+        ring_kinds=np.asarray(ring_kinds, dtype=np.int8),
+        geometry_offsets=geometry_offsets,
+        types=types,
+        srids=srids
+    )
+
+
+def read_geometries(column: Union[pa.Array, pa.ChunkedArray], field: pa.Field) -> Geometries:
+    """
+    Flat coordinates of a geometry column in any supported encoding.
+
+    Args:
+        column: WKB binary, hex EWKB text, or a GeoArrow native array
+        field: The column's field (its extension name selects the decoder)
+
+    Raises:
+        ValueError: If the column holds no recognizable geometry
+    """
+    extension = (field.metadata or {}).get(EXTENSION_NAME, b'').decode()
+    native = {f'geoarrow.{name.lower()}': code for code, name in TYPE_NAMES.items()}
+    if extension in native:
+        if isinstance(column, pa.ChunkedArray):
+            column = column.combine_chunks()
+        geoms = _read_native(column, native[extension])
+    else:
+        geoms = parse_wkb(column)
+
+    srid = field_srid(field)
+    if srid:
+        geoms.srids[(geoms.srids == 0) & (geoms.types > 0)] = srid
+    return geoms
+
+
+def field_srid(field: pa.Field) -> Optional[int]:
+    """SRID from a field's GeoArrow `EPSG:<code>` CRS metadata"""
+    metadata = (field.metadata or {}).get(EXTENSION_METADATA)
+    if not metadata:
+        return None
+    try:
+        crs = json.loads(metadata).get('crs', '')
+    except ValueError:
+        return None
+    if isinstance(crs, str) and crs.upper().startswith('EPSG:') and crs[5:].isdigit():
+        return int(crs[5:])
+    return None
+
+
+def _list_lengths(array: pa.Array) -> np.ndarray:
+    """Element count per list slot, 0 for nulls"""
+    return pc.list_value_length(array).fill_null(0).to_numpy(zero_copy_only=False).astype(np.int64)
+
+
+def _offsets(sizes: np.ndarray) -> np.ndarray:
+    offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    return offsets
+
+
+def _read_native(array: pa.Array, base_type: int) -> Geometries:
+    """Flat coordinates from GeoArrow nested lists of x/y structs"""
+    valid = array.is_valid().to_numpy(zero_copy_only=False)
+    types = np.where(valid, base_type, 0).astype(np.int8)
+    srids = np.zeros(len(array), dtype=np.int32)
+
+    if base_type == POINT:
+        points = array.filter(pa.array(valid))
+        coords = np.column_stack([
+            points.field('x').to_numpy(zero_copy_only=False),
+            points.field('y').to_numpy(zero_copy_only=False)
+        ]).astype(np.float64)
+        keep = ~np.isnan(coords).all(axis=1)  # empty points
+        has_coord = valid.copy()
+        has_coord[valid] = keep
+        return Geometries(
+            coords=coords[keep],
+            ring_offsets=np.arange(int(keep.sum()) + 1, dtype=np.int64),
+            ring_kinds=np.full(int(keep.sum()), RING_POINT, dtype=np.int8),
+            geometry_offsets=_offsets(has_coord.astype(np.int64)),
+            types=types,
+            srids=srids
+        )
+
+    if base_type in (LINESTRING, MULTIPOINT):
+        lengths = _list_lengths(array)
+        coords = array.flatten()
+        if base_type == LINESTRING:
+            ring_sizes = lengths[lengths > 0]
+            geometry_rings = (lengths > 0).astype(np.int64)
+            kinds = np.full(len(ring_sizes), RING_LINE, dtype=np.int8)
+        else:
+            ring_sizes = np.ones(int(lengths.sum()), dtype=np.int64)
+            geometry_rings = lengths
+            kinds = np.full(len(ring_sizes), RING_POINT, dtype=np.int8)
+    elif base_type in (POLYGON, MULTILINESTRING):
+        geometry_rings = _list_lengths(array)
+        rings = array.flatten()
+        ring_sizes = _list_lengths(rings)
+        coords = rings.flatten()
+        if base_type == POLYGON:
+            kinds = np.full(len(ring_sizes), RING_INTERIOR, dtype=np.int8)
+            starts = _offsets(geometry_rings)[:-1][geometry_rings > 0]
+            kinds[starts] = RING_EXTERIOR
+        else:
+            kinds = np.full(len(ring_sizes), RING_LINE, dtype=np.int8)
+    elif base_type == MULTIPOLYGON:
+        polygon_counts = _list_lengths(array)
+        polygons = array.flatten()
+        polygon_rings = _list_lengths(polygons)
+        ring_offsets_by_polygon = _offsets(polygon_rings)
+        geometry_rings = np.diff(ring_offsets_by_polygon[_offsets(polygon_counts)])
+        rings = polygons.flatten()
+        ring_sizes = _list_lengths(rings)
+        coords = rings.flatten()
+        kinds = np.full(len(ring_sizes), RING_INTERIOR, dtype=np.int8)
+        kinds[ring_offsets_by_polygon[:-1][polygon_rings > 0]] = RING_EXTERIOR
+    else:
+        raise ValueError(f"Unsupported GeoArrow type {TYPE_NAMES[base_type]}")
+
+    xy = np.column_stack([
+        coords.field('x').to_numpy(zero_copy_only=False),
+        coords.field('y').to_numpy(zero_copy_only=False)
+    ]).astype(np.float64) if len(coords) else np.empty((0, 2))
+    return Geometries(
+        coords=xy,
+        ring_offsets=_offsets(ring_sizes),
+        ring_kinds=kinds,
+        geometry_offsets=_offsets(geometry_rings),
+        types=types,
+        srids=srids
+    )
+
+
+def _parse_points(array: pa.Array) -> Optional[Geometries]:
+    """Vectorized path for columns holding only non-empty 2D points"""
+    valid = array.is_valid().to_numpy(zero_copy_only=False)
+    offsets = np.frombuffer(array.buffers()[1], dtype=np.int32)[array.offset:array.offset + len(array) + 1]
+    sizes = np.diff(offsets)[valid]
+    if len(sizes) == 0 or sizes[0] not in _POINT_SIZES or np.any(sizes != sizes[0]):
+        return None
+
+    size = int(sizes[0])
+    data = np.frombuffer(array.buffers()[2], dtype=np.uint8)
+    starts = offsets[:-1][valid]
+    rows = data[starts[:, None] + np.arange(size)]
+    if np.any(rows[:, 0] != 1):
+        return None  # big-endian WKB: take the general path
+    codes = rows[:, 1:5].copy().view('<u4').ravel()
+    expected = POINT | (_EWKB_SRID if size == 25 else 0)
+    if np.any(codes != expected):
+        return None
+    xy = rows[:, size - 16:].copy().view('<f8').reshape(-1, 2)
+    if np.isnan(xy).any():
+        return None  # empty points
+
+    count = len(array)
+    types = np.zeros(count, dtype=np.int8)
+    types[valid] = POINT
+    srids = np.zeros(count, dtype=np.int32)
+    if size == 25:
+        srids[valid] = rows[:, 5:9].copy().view('<i4').ravel()
+    geometry_offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(valid, out=geometry_offsets[1:])
+    return Geometries(
+        coords=xy,
+        ring_offsets=np.arange(len(xy) + 1, dtype=np.int64),
+        ring_kinds=np.full(len(xy), RING_POINT, dtype=np.int8),
+        geometry_offsets=geometry_offsets,
+        types=types,
+        srids=srids
+    )
+
+
+def _parse_geometry(
+    data: bytes,
+    position: int,
+    rings: List[Tuple[int, np.ndarray]]
+) -> Tuple[int, int, Optional[int]]:
+    """Parse one WKB geometry at `position`, appending its coordinate sequences"""
+    endian = '<' if data[position] == 1 else '>'
+    (code,) = struct.unpack_from(endian + 'I', data, position + 1)
+    position += 5
+
+    srid = None
+    if code & _EWKB_SRID:
+        (srid,) = struct.unpack_from(endian + 'I', data, position)
+        position += 4
+    has_z = bool(code & _EWKB_Z)
+    has_m = bool(code & _EWKB_M)
+    base_type = code & 0x0FFFFFFF
+    # ISO WKB encodes Z/M as +1000 / +2000 / +3000
+    iso, base_type = divmod(base_type, 1000)
+    has_z = has_z or iso in (1, 3)
+    has_m = has_m or iso in (2, 3)
+    dims = 2 + has_z + has_m
+    dtype = np.dtype(endian + 'f8')
+
+    def read_count() -> int:
+        nonlocal position
+        (count,) = struct.unpack_from(endian + 'I', data, position)
+        position += 4
+        return count
+
+    def read_coords(count: int, kind: int):
+        nonlocal position
+        values = np.frombuffer(data, dtype=dtype, count=count * dims, offset=position)
+        position += count * dims * 8
+        coords = values.reshape(count, dims)[:, :2].astype(np.float64)
+        if kind == RING_POINT and np.isnan(coords).all():
+            return  # POINT EMPTY
+        rings.append((kind, coords))
+
+    if base_type == POINT:
+        read_coords(1, RING_POINT)
+    elif base_type == LINESTRING:
+        read_coords(read_count(), RING_LINE)
+    elif base_type == POLYGON:
+        for ring_index in range(read_count()):
+            read_coords(read_count(), RING_EXTERIOR if ring_index == 0 else RING_INTERIOR)
+    elif base_type in (MULTIPOINT, MULTILINESTRING, MULTIPOLYGON, GEOMETRYCOLLECTION):
+        for _ in range(read_count()):
+            position, _, _ = _parse_geometry(data, position, rings)
+    else:
+        raise ValueError(f"Unsupported WKB geometry type {base_type}")
+    return position, base_type, srid
+
+
+def _first_srid(array: pa.Array) -> Optional[int]:
+    """SRID embedded in the first non-null EWKB value"""
+    for value in array.to_pylist():
+        if value is None or len(value) < 9:
+            continue
+        endian = '<' if value[0] == 1 else '>'
+        (code,) = struct.unpack_from(endian + 'I', value, 1)
+        if code & _EWKB_SRID:
+            return struct.unpack_from(endian + 'I', value, 5)[0] or None
+        return None
+    return None
+
+
+def _ring_ids(geoms: Geometries) -> np.ndarray:
+    """Ring index of every coordinate"""
+    return np.repeat(np.arange(len(geoms.ring_kinds)), np.diff(geoms.ring_offsets))
+
+
+def _geometry_ids(geoms: Geometries) -> np.ndarray:
+    """Geometry index of every ring"""
+    return np.repeat(np.arange(len(geoms)), np.diff(geoms.geometry_offsets))
+
+
+def _segments(geoms: Geometries) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Consecutive coordinate pairs within a ring: (ring id, start xy, end xy)"""
+    ring_ids = _ring_ids(geoms)
+    same_ring = ring_ids[:-1] == ring_ids[1:]
+    start = geoms.coords[:-1][same_ring]
+    end = geoms.coords[1:][same_ring]
+    return ring_ids[:-1][same_ring], start, end
+
+
+def bounds(geoms: Geometries) -> np.ndarray:
+    """Per-geometry (xmin, ymin, xmax, ymax); NaN for null or empty geometries"""
+    result = np.full((len(geoms), 4), np.nan)
+    coord_offsets = geoms.ring_offsets[geoms.geometry_offsets]
+    starts = coord_offsets[:-1]
+    nonempty = np.diff(coord_offsets) > 0
+    if not nonempty.any():
+        return result
+    x, y = geoms.coords[:, 0], geoms.coords[:, 1]
+    # Empty geometries have zero-length segments, so each reduceat segment
+    # ends where the next non-empty geometry begins
+    segment_starts = starts[nonempty]
+    result[nonempty, 0] = np.minimum.reduceat(x, segment_starts)
+    result[nonempty, 1] = np.minimum.reduceat(y, segment_starts)
+    result[nonempty, 2] = np.maximum.reduceat(x, segment_starts)
+    result[nonempty, 3] = np.maximum.reduceat(y, segment_starts)
+    return result
+
+
+def _ring_moments(geoms: Geometries) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Signed shoelace area and centroid numerators per ring"""
+    rings = len(geoms.ring_kinds)
+    ring_ids, start, end = _segments(geoms)
+    cross = start[:, 0] * end[:, 1] - end[:, 0] * start[:, 1]
+    area = 0.5 * np.bincount(ring_ids, weights=cross, minlength=rings)
+    cx = np.bincount(ring_ids, weights=(start[:, 0] + end[:, 0]) * cross, minlength=rings)
+    cy = np.bincount(ring_ids, weights=(start[:, 1] + end[:, 1]) * cross, minlength=rings)
+    return area, cx, cy
+
+
+def areas(geoms: Geometries) -> np.ndarray:
+    """
+    Planar area per geometry, in squared coordinate units.
+
+    Exterior rings add, holes subtract, whatever their winding order.
+    Points and lines have area 0; null geometries are NaN.
+    """
+    ring_area, _, _ = _ring_moments(geoms)
+    sign = np.where(geoms.ring_kinds == RING_EXTERIOR, 1.0,
+                    np.where(geoms.ring_kinds == RING_INTERIOR, -1.0, 0.0))
+    result = np.bincount(_geometry_ids(geoms), weights=sign * np.abs(ring_area), minlength=len(geoms))
+    result[geoms.types == 0] = np.nan
+    return result
+
+
+def centroids(geoms: Geometries) -> np.ndarray:
+    """
+    Per-geometry (x, y) centroid, like ST_Centroid.
+
+    Uses the highest-dimension parts: area-weighted over polygon rings,
+    else length-weighted over line segments, else the mean of the points.
+    """
+    count = len(geoms)
+    geometry_ids = _geometry_ids(geoms)
+    kinds = geoms.ring_kinds
+    polygonal = (kinds == RING_EXTERIOR) | (kinds == RING_INTERIOR)
+
+    # Polygons: sum(sign * |A_r| * C_r) / sum(sign * |A_r|), with C_r = m_r / (6 A_r)
+    ring_area, ring_cx, ring_cy = _ring_moments(geoms)
+    orientation = np.sign(ring_area) * np.where(kinds == RING_INTERIOR, -1.0, 1.0) * polygonal
+    poly_area = np.bincount(geometry_ids, weights=orientation * ring_area, minlength=count)
+    poly_x = np.bincount(geometry_ids, weights=orientation * ring_cx / 6.0, minlength=count)
+    poly_y = np.bincount(geometry_ids, weights=orientation * ring_cy / 6.0, minlength=count)
+
+    # Lines: segment midpoints weighted by length
+    ring_ids, start, end = _segments(geoms)
+    is_line = kinds[ring_ids] == RING_LINE
+    lengths = np.hypot(*(end - start).T) * is_line
+    segment_geometry = geometry_ids[ring_ids]
+    line_length = np.bincount(segment_geometry, weights=lengths, minlength=count)
+    line_x = np.bincount(segment_geometry, weights=lengths * (start[:, 0] + end[:, 0]) / 2, minlength=count)
+    line_y = np.bincount(segment_geometry, weights=lengths * (start[:, 1] + end[:, 1]) / 2, minlength=count)
+
+    # Points (and degenerate shapes): plain coordinate mean
+    coord_geometry = geometry_ids[_ring_ids(geoms)]
+    coord_count = np.bincount(coord_geometry, minlength=count)
+    mean_x = np.bincount(coord_geometry, weights=geoms.coords[:, 0], minlength=count)
+    mean_y = np.bincount(coord_geometry, weights=geoms.coords[:, 1], minlength=count)
+
+    result = np.full((count, 2), np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        use_points = coord_count > 0
+        result[use_points] = np.column_stack([mean_x, mean_y])[use_points] / coord_count[use_points, None]
+        use_lines = line_length > 0
+        result[use_lines] = np.column_stack([line_x, line_y])[use_lines] / line_length[use_lines, None]
+        use_polygons = np.abs(poly_area) > 0
+        result[use_polygons] = np.column_stack([poly_x, poly_y])[use_polygons] / poly_area[use_polygons, None]
+    return result
+
+
+def to_geoarrow(geoms: Geometries, name: str, srid: Optional[int] = None) -> Tuple[pa.Array, pa.Field]:
+    """
+    Build a GeoArrow native array (separated x/y struct coordinates).
+
+    Raises:
+        ValueError: If the column mixes geometry types or holds collections
+    """
+    present = set(np.unique(geoms.types[geoms.types > 0]).tolist())
+    if len(present) > 1 or GEOMETRYCOLLECTION in present:
+        found = ', '.join(sorted(TYPE_NAMES.get(t, str(t)) for t in present))
+        raise ValueError(f"GeoArrow needs a single non-collection geometry type; '{name}' has {found}")
+    base_type = present.pop() if present else POINT
+
+    mask = pa.array(geoms.types == 0)
+    points = pa.StructArray.from_arrays(
+        [pa.array(geoms.coords[:, 0]), pa.array(geoms.coords[:, 1])], names=['x', 'y']
+    )
+    ring_offsets = pa.array(geoms.ring_offsets.astype(np.int32))
+    geometry_offsets = geoms.geometry_offsets.astype(np.int32)
+    coord_offsets = pa.array(geoms.ring_offsets[geoms.geometry_offsets].astype(np.int32))
+
+    if base_type == POINT:
+        # One coordinate per non-empty geometry; null and empty points are NaN
+        has_coord = np.diff(geoms.geometry_offsets) > 0
+        x = np.full(len(geoms), np.nan)
+        y = np.full(len(geoms), np.nan)
+        x[has_coord] = geoms.coords[:, 0]
+        y[has_coord] = geoms.coords[:, 1]
+        array = pa.StructArray.from_arrays([pa.array(x), pa.array(y)], names=['x', 'y'], mask=mask)
+    elif base_type in (LINESTRING, MULTIPOINT):
+        array = pa.ListArray.from_arrays(coord_offsets, points, mask=mask)
+    elif base_type in (POLYGON, MULTILINESTRING):
+        rings = pa.ListArray.from_arrays(ring_offsets, points)
+        array = pa.ListArray.from_arrays(pa.array(geometry_offsets), rings, mask=mask)
+    else:
+        # MultiPolygon: each exterior ring starts a polygon
+        rings = pa.ListArray.from_arrays(ring_offsets, points)
+        exterior = np.flatnonzero(geoms.ring_kinds == RING_EXTERIOR)
+        polygon_offsets = np.append(exterior, len(geoms.ring_kinds)).astype(np.int32)
+        polygons = pa.ListArray.from_arrays(pa.array(polygon_offsets), rings)
+        # Geometry -> polygon offsets: number of exterior rings before each geometry
+        geometry_polygons = np.searchsorted(exterior, geoms.geometry_offsets).astype(np.int32)
+        array = pa.ListArray.from_arrays(pa.array(geometry_polygons), polygons, mask=mask)
+
+    metadata = {EXTENSION_NAME: f'geoarrow.{TYPE_NAMES[base_type].lower()}'.encode()}
+    if srid:
+        metadata[EXTENSION_METADATA] = json.dumps({'crs': f'EPSG:{srid}'}).encode()
+    return array, pa.field(name, array.type, metadata=metadata)
+
+
+def summarize(values: np.ndarray) -> Dict:
+    """min / max / mean / total of a measure, ignoring NaN"""
+    finite = values[~np.isnan(values)]
+    if len(finite) == 0:
+        return {'min': None, 'max': None, 'mean': None, 'total': None}
+    return {
+        'min': float(finite.min()),
+        'max': float(finite.max()),
+        'mean': float(finite.mean()),
+        'total': float(finite.sum())
+    }
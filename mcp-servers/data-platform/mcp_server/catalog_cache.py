@@ -0,0 +1,253 @@
+"""
+PostgreSQL catalog cache.
+
+Loads schemas, tables, columns and PostGIS geometry columns with one bulk
+query per catalog and serves the introspection tools from memory, so
+databases with thousands of tables are not re-scanned on every call.
+"""
+import difflib
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# `$1` limits a load to one schema (NULL = whole database)
+SCHEMAS_QUERY = """
+    SELECT schema_name
+    FROM information_schema.schemata
+    WHERE schema_name NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
+    ORDER BY schema_name
+"""
+
+TABLES_QUERY = """
+    SELECT table_schema, table_name, table_type
+    FROM information_schema.tables
+    WHERE ($1::text IS NULL OR table_schema = $1)
+    ORDER BY table_schema, table_name
+"""
+
+COLUMNS_QUERY = """
+    SELECT
+        table_schema,
+        table_name,
+        column_name,
+        data_type,
+        udt_name,
+        is_nullable,
+        column_default,
+        character_maximum_length,
+        numeric_precision
+    FROM information_schema.columns
+    WHERE ($1::text IS NULL OR table_schema = $1)
+    ORDER BY table_schema, table_name, ordinal_position
+"""
+
+GEOMETRY_QUERY = """
+    SELECT
+        f_table_schema as table_schema,
+        f_table_name as table_name,
+        f_geometry_column as geometry_column,
+        type as geometry_type,
+        srid,
+        coord_dimension
+    FROM geometry_columns
+    WHERE ($1::text IS NULL OR f_table_schema = $1)
+    ORDER BY f_table_schema, f_table_name
+"""
+
+# Search tiers: (score, label); fuzzy matches score below every tier
+_EXACT = (1.0, 'exact')
+_PREFIX = (0.9, 'prefix')
+_SUBSTRING = (0.8, 'substring')
+_SUBSEQUENCE = (0.7, 'subsequence')
+_FUZZY_WEIGHT = 0.6
+
+
+class CatalogSnapshot:
+    """
+    In-memory copy of the database catalog.
+
+    Built by `load`; lookups are dict reads. A snapshot scoped to one
+    schema (`schema` set) only answers for that schema.
+    """
+
+    def __init__(
+        self,
+        schemas: List[str],
+        tables: Dict[str, List[Dict]],
+        columns: Dict[Tuple[str, str], List[Dict]],
+        geometry: Optional[Dict[str, List[Dict]]],
+        geometry_error: Optional[str] = None,
+        schema: Optional[str] = None
+    ):
+        self.schemas = schemas
+        self.tables = tables
+        self.columns = columns
+        self.geometry = geometry
+        self.geometry_error = geometry_error
+        self.schema = schema
+        self.loaded_at = time.monotonic()
+
+        # Lowercased column name -> (schema, table, column) for search
+        self._by_column: Dict[str, List[Tuple[str, str, Dict]]] = {}
+        for (table_schema, table_name), table_columns in columns.items():
+            for column in table_columns:
+                self._by_column.setdefault(column['name'].lower(), []).append(
+                    (table_schema, table_name, column)
+                )
+
+    @classmethod
+    async def load(cls, conn: Any, schema: Optional[str] = None) -> 'CatalogSnapshot':
+        """
+        Read the catalog with one query per catalog view.
+
+        Args:
+            conn: asyncpg connection
+            schema: Limit the load to one schema (None = whole database)
+        """
+        schema_rows = await conn.fetch(SCHEMAS_QUERY)
+        table_rows = await conn.fetch(TABLES_QUERY, schema)
+        column_rows = await conn.fetch(COLUMNS_QUERY, schema)
+
+        columns: Dict[Tuple[str, str], List[Dict]] = {}
+        for r in column_rows:
+            columns.setdefault((r['table_schema'], r['table_name']), []).append({
+                'name': r['column_name'],
+                'type': r['data_type'],
+                'udt': r['udt_name'],
+                'nullable': r['is_nullable'] == 'YES',
+                'default': r['column_default'],
+                'max_length': r['character_maximum_length'],
+                'precision': r['numeric_precision']
+            })
+
+        tables: Dict[str, List[Dict]] = {}
+        for r in table_rows:
+            tables.setdefault(r['table_schema'], []).append({
+                'name': r['table_name'],
+                'type': r['table_type'],
+                'columns': len(columns.get((r['table_schema'], r['table_name']), []))
+            })
+
+        geometry = None
+        geometry_error = None
+        try:
+            geometry_rows = await conn.fetch(GEOMETRY_QUERY, schema)
+            geometry = {}
+            for r in geometry_rows:
+                geometry.setdefault(r['table_schema'], []).append({
+                    'table': r['table_name'],
+                    'geometry_column': r['geometry_column'],
+                    'geometry_type': r['geometry_type'],
+                    'srid': r['srid'],
+                    'dimensions': r['coord_dimension']
+                })
+        except Exception as e:
+            # No PostGIS; the relational catalog is still usable
+            geometry_error = str(e)
+
+        return cls(
+            schemas=[r['schema_name'] for r in schema_rows],
+            tables=tables,
+            columns=columns,
+            geometry=geometry,
+            geometry_error=geometry_error,
+            schema=schema
+        )
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+    def table_columns(self, schema: str, table: str) -> List[Dict]:
+        """Columns of one table in ordinal order (empty if unknown)"""
+        return self.columns.get((schema, table), [])
+
+    def stats(self) -> Dict:
+        """Snapshot size and age"""
+        return {
+            'schemas': len(self.schemas),
+            'tables': sum(len(t) for t in self.tables.values()),
+            'columns': sum(len(c) for c in self.columns.values()),
+            'geometry_columns': (
+                sum(len(g) for g in self.geometry.values())
+                if self.geometry is not None else None
+            ),
+            'age_seconds': round(self.age_seconds, 3)
+        }
+
+    def search_columns(
+        self,
+        query: str,
+        schema: Optional[str] = None,
+        limit: int = 25
+    ) -> List[Dict]:
+        """
+        Rank columns by how well their name matches `query`.
+
+        Exact, prefix, substring and subsequence matches ("cust_id" finds
+        customer_id) are checked against each distinct column name, then
+        difflib fills remaining slots with near-misses (typos). A dotted
+        query ("orders.cust") matches against "table.column".
+
+        Args:
+            query: Name or fragment to look for (case-insensitive)
+            schema: Restrict matches to one schema
+            limit: Maximum matches to return
+
+        Returns:
+            Matches, best first, each with schema, table, column, type,
+            score and match kind
+        """
+        needle = query.strip().lower()
+        if not needle:
+            return []
+
+        dotted = '.' in needle
+        if dotted or schema is not None:
+            candidates: Dict[str, List[Tuple[str, str, Dict]]] = {}
+            for name, entries in self._by_column.items():
+                for entry in entries:
+                    table_schema, table_name, _ = entry
+                    if schema is not None and table_schema != schema:
+                        continue
+                    key = f"{table_name.lower()}.{name}" if dotted else name
+                    candidates.setdefault(key, []).append(entry)
+        else:
+            candidates = self._by_column
+
+        subsequence = re.compile('.*?'.join(re.escape(c) for c in needle))
+        scored: Dict[str, Tuple[float, str]] = {}
+        for name in candidates:
+            if name == needle:
+                scored[name] = _EXACT
+            elif name.startswith(needle):
+                scored[name] = _PREFIX
+            elif needle in name:
+                scored[name] = _SUBSTRING
+            elif subsequence.search(name):
+                scored[name] = _SUBSEQUENCE
+
+        if len(scored) < limit:
+            remaining = [name for name in candidates if name not in scored]
+            for name in difflib.get_close_matches(needle, remaining, n=limit - len(scored), cutoff=0.6):
+                ratio = difflib.SequenceMatcher(None, needle, name).ratio()
+                scored[name] = (round(ratio * _FUZZY_WEIGHT, 3), 'fuzzy')
+
+        ranked = sorted(scored.items(), key=lambda item: (-item[1][0], len(item[0]), item[0]))
+        matches = []
+        for name, (score, kind) in ranked:
+            for table_schema, table_name, column in candidates[name]:
+                matches.append({
+                    'schema': table_schema,
+                    'table': table_name,
+                    'column': column['name'],
+                    'type': column['type'],
+                    'score': score,
+                    'match': kind
+                })
+                if len(matches) >= limit:
+                    return matches
+        return matches
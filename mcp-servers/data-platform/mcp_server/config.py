@@ -24,13 +24,37 @@ class DataPlatformConfig:
         self.dbt_project_dir: Optional[str] = None
         self.dbt_profiles_dir: Optional[str] = None
         self.max_rows: int = 100_000
+        self.max_memory_mb: int = 0
+        self.cache_dir: Optional[str] = None
+        self.storage_mode: str = 'memory'
+        self.pandas_cache_size: int = 8
+        self.pg_fetch_size: int = 10_000
+        self.pg_stream_max_mb: int = 0
+        self.pg_pool_min_size: int = 1
+        self.pg_pool_max_size: int = 5
+        self.pg_pool_max_inactive_seconds: float = 300.0
+        self.pg_statement_cache_size: int = 100
+        self.pg_search_path: Optional[str] = None
+        self.pg_statement_timeout_ms: int = 0
+        self.pg_pool_warmup: bool = False
+        self.pg_query_cache_ttl: float = 0.0
+        self.pg_query_cache_invalidate: bool = True
+        self.pg_catalog_ttl: float = 300.0
+        self.dbt_worker: bool = False
+        self.dbt_max_jobs: int = 2
+        self.dbt_state_dir: Optional[str] = None
 
     def load(self) -> Dict[str, Optional[str]]:
         """
         Load configuration from system and project levels.
 
         Returns:
-            Dict containing postgres_url, dbt_project_dir, dbt_profiles_dir, max_rows
+            Dict containing postgres_url, dbt_project_dir, dbt_profiles_dir, max_rows,
+            max_memory_mb, cache_dir, storage_mode, pandas_cache_size,
+            pg_fetch_size, pg_stream_max_mb, and the pg_pool_* / pg_statement_* /
+            pg_search_path connection pool settings, the pg_query_cache_*
+            result cache settings, pg_catalog_ttl, dbt_worker, dbt_max_jobs, and
+            dbt_state_dir
 
         Note:
             PostgreSQL credentials are optional - server can run in pandas-only mode.
@@ -61,6 +85,35 @@ class DataPlatformConfig:
         self.dbt_project_dir = os.getenv('DBT_PROJECT_DIR')
         self.dbt_profiles_dir = os.getenv('DBT_PROFILES_DIR')
         self.max_rows = int(os.getenv('DATA_PLATFORM_MAX_ROWS', '100000'))
+        self.max_memory_mb = int(os.getenv('DATA_PLATFORM_MAX_MEMORY_MB', '0'))
+        self.cache_dir = os.getenv('DATA_PLATFORM_CACHE_DIR') or str(
+            Path.home() / '.cache' / 'data-platform'
+        )
+        self.storage_mode = os.getenv('DATA_PLATFORM_STORAGE', 'memory').lower()
+        self.pandas_cache_size = int(os.getenv('DATA_PLATFORM_PANDAS_CACHE_SIZE', '8'))
+        self.pg_fetch_size = int(os.getenv('DATA_PLATFORM_PG_FETCH_SIZE', '10000'))
+        self.pg_stream_max_mb = int(os.getenv('DATA_PLATFORM_PG_STREAM_MAX_MB', '0'))
+        self.pg_pool_min_size = int(os.getenv('DATA_PLATFORM_PG_POOL_MIN_SIZE', '1'))
+        self.pg_pool_max_size = int(os.getenv('DATA_PLATFORM_PG_POOL_MAX_SIZE', '5'))
+        self.pg_pool_max_inactive_seconds = float(
+            os.getenv('DATA_PLATFORM_PG_POOL_MAX_INACTIVE_SECONDS', '300')
+        )
+        self.pg_statement_cache_size = int(os.getenv('DATA_PLATFORM_PG_STATEMENT_CACHE_SIZE', '100'))
+        self.pg_search_path = os.getenv('DATA_PLATFORM_PG_SEARCH_PATH') or None
+        self.pg_statement_timeout_ms = int(os.getenv('DATA_PLATFORM_PG_STATEMENT_TIMEOUT_MS', '0'))
+        self.pg_pool_warmup = os.getenv('DATA_PLATFORM_PG_POOL_WARMUP', 'false').lower() in (
+            '1', 'true', 'yes'
+        )
+        self.pg_query_cache_ttl = float(os.getenv('DATA_PLATFORM_PG_QUERY_CACHE_TTL', '0'))
+        self.pg_query_cache_invalidate = os.getenv(
+            'DATA_PLATFORM_PG_QUERY_CACHE_INVALIDATE', 'true'
+        ).lower() in ('1', 'true', 'yes')
+        self.pg_catalog_ttl = float(os.getenv('DATA_PLATFORM_PG_CATALOG_TTL', '300'))
+        self.dbt_worker = os.getenv('DATA_PLATFORM_DBT_WORKER', 'false').lower() in (
+            '1', 'true', 'yes'
+        )
+        self.dbt_max_jobs = int(os.getenv('DATA_PLATFORM_DBT_MAX_JOBS', '2'))
+        self.dbt_state_dir = os.getenv('DATA_PLATFORM_DBT_STATE_DIR')
 
         # Auto-detect dbt project if not specified
         if not self.dbt_project_dir and project_dir:
@@ -79,6 +132,25 @@ class DataPlatformConfig:
             'dbt_project_dir': self.dbt_project_dir,
             'dbt_profiles_dir': self.dbt_profiles_dir,
             'max_rows': self.max_rows,
+            'max_memory_mb': self.max_memory_mb,
+            'cache_dir': self.cache_dir,
+            'storage_mode': self.storage_mode,
+            'pandas_cache_size': self.pandas_cache_size,
+            'pg_fetch_size': self.pg_fetch_size,
+            'pg_stream_max_mb': self.pg_stream_max_mb,
+            'pg_pool_min_size': self.pg_pool_min_size,
+            'pg_pool_max_size': self.pg_pool_max_size,
+            'pg_pool_max_inactive_seconds': self.pg_pool_max_inactive_seconds,
+            'pg_statement_cache_size': self.pg_statement_cache_size,
+            'pg_search_path': self.pg_search_path,
+            'pg_statement_timeout_ms': self.pg_statement_timeout_ms,
+            'pg_pool_warmup': self.pg_pool_warmup,
+            'pg_query_cache_ttl': self.pg_query_cache_ttl,
+            'pg_query_cache_invalidate': self.pg_query_cache_invalidate,
+            'pg_catalog_ttl': self.pg_catalog_ttl,
+            'dbt_worker': self.dbt_worker,
+            'dbt_max_jobs': self.dbt_max_jobs,
+            'dbt_state_dir': self.dbt_state_dir,
             'postgres_available': self.postgres_url is not None,
             'dbt_available': self.dbt_project_dir is not None
         }
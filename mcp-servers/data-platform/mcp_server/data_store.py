@@ -5,15 +5,25 @@ Provides persistent storage for DataFrames across tool calls using Apache Arrow
 for efficient memory management and serialization.
 """
 import pyarrow as pa
+import pyarrow.ipc as ipc
 import pandas as pd
 import uuid
 import logging
-from typing import Dict, Optional, List, Union
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, List, Tuple, Union
 from dataclasses import dataclass
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Schema metadata keys written into IPC files so they can be re-indexed
+IPC_REF_KEY = b'data_platform.ref'
+IPC_SOURCE_KEY = b'data_platform.source'
+IPC_CREATED_KEY = b'data_platform.created_at'
+
+STORAGE_MODES = ('memory', 'ipc')
+
 
 @dataclass
 class DataFrameInfo:
@@ -26,6 +36,8 @@ class DataFrameInfo:
     memory_bytes: int
     created_at: datetime
     source: Optional[str] = None
+    ipc_path: Optional[str] = None
+    mapped: bool = False
 
 
 class DataStore:
@@ -34,17 +46,39 @@ class DataStore:
 
     Uses Arrow IPC format for efficient memory usage and supports
     data_ref based retrieval across multiple tool calls.
+
+    Storage modes:
+    - memory: tables live on the heap. When a memory budget is set, heap
+      tables are kept in LRU order (dict insertion order of _dataframes)
+      and the coldest ones are spilled to Arrow IPC files.
+    - ipc: store() writes each table once to an Arrow IPC file and keeps a
+      memory-mapped table, so data costs page cache instead of heap and
+      survives restarts (see reindex_ipc_dir).
+
+    Spilled tables are reloaded memory-mapped by get(); spill files from
+    earlier runs are removed by purge_spill_dir.
+
+    get_pandas() keeps a bounded LRU cache of pandas views. Views are
+    invalidated when their ref is dropped or overwritten, count toward the
+    memory budget, and are the first thing evicted when over budget.
     """
     _instance = None
     _dataframes: Dict[str, pa.Table] = {}
     _metadata: Dict[str, DataFrameInfo] = {}
     _max_rows: int = 100_000
+    _max_memory_bytes: int = 0
+    _cache_dir: str = str(Path(tempfile.gettempdir()) / 'data-platform')
+    _storage_mode: str = 'memory'
+    # ref -> (metadata the view was built from, view, estimated bytes)
+    _pandas_views: Dict[str, Tuple[DataFrameInfo, pd.DataFrame, int]] = {}
+    _pandas_cache_size: int = 8
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._dataframes = {}
             cls._metadata = {}
+            cls._pandas_views = {}
         return cls._instance
 
     @classmethod
@@ -59,6 +93,28 @@ class DataStore:
         """Set the maximum rows limit"""
         cls._max_rows = max_rows
 
+    @classmethod
+    def set_memory_budget(cls, max_memory_mb: int):
+        """Set the heap memory budget in MB (0 disables eviction)"""
+        cls._max_memory_bytes = max(0, int(max_memory_mb)) * 1024 * 1024
+
+    @classmethod
+    def set_cache_dir(cls, cache_dir: str):
+        """Set the directory used for spilled and IPC-backed files"""
+        cls._cache_dir = cache_dir
+
+    @classmethod
+    def set_pandas_cache_size(cls, size: int):
+        """Set the number of cached pandas views (0 disables the cache)"""
+        cls._pandas_cache_size = max(0, int(size))
+
+    @classmethod
+    def set_storage_mode(cls, mode: str):
+        """Set the storage mode ('memory' or 'ipc')"""
+        if mode not in STORAGE_MODES:
+            raise ValueError(f"Unknown storage mode: {mode} (expected one of {STORAGE_MODES})")
+        cls._storage_mode = mode
+
     def store(
         self,
         data: Union[pa.Table, pd.DataFrame],
@@ -86,54 +142,99 @@ class DataStore:
         data_ref = name or f"df_{uuid.uuid4().hex[:8]}"
 
         # Ensure unique reference
-        if data_ref in self._dataframes and name is None:
+        if data_ref in self._metadata and name is None:
             data_ref = f"{data_ref}_{uuid.uuid4().hex[:4]}"
 
-        # Store table
+        # Overwriting a ref invalidates any IPC copy and pandas view of the old table
+        self._pandas_views.pop(data_ref, None)
+        if data_ref in self._metadata:
+            self._remove_ipc_file(self._metadata[data_ref])
+
+        created_at = datetime.now()
+        ipc_path = None
+        if self._storage_mode == 'ipc':
+            ipc_path = self._write_ipc(table, data_ref, source, created_at)
+            if ipc_path:
+                table = self._read_ipc(ipc_path)
+
+        # Store table (re-insert so it becomes most recently used)
+        self._dataframes.pop(data_ref, None)
         self._dataframes[data_ref] = table
 
         # Store metadata
-        schema = table.schema
-        self._metadata[data_ref] = DataFrameInfo(
-            ref=data_ref,
-            rows=table.num_rows,
-            columns=table.num_columns,
-            column_names=[f.name for f in schema],
-            dtypes={f.name: str(f.type) for f in schema},
-            memory_bytes=table.nbytes,
-            created_at=datetime.now(),
-            source=source
+        self._metadata[data_ref] = self._build_info(
+            data_ref, table, created_at, source, ipc_path=ipc_path
         )
 
         logger.info(f"Stored DataFrame '{data_ref}': {table.num_rows} rows, {table.num_columns} cols")
+        self._enforce_memory_budget(keep=data_ref)
         return data_ref
 
     def get(self, data_ref: str) -> Optional[pa.Table]:
         """
         Retrieve an Arrow Table by reference.
 
+        Spilled tables are reloaded (memory-mapped) from their IPC file.
+
         Args:
             data_ref: Reference string from store()
 
         Returns:
             Arrow Table or None if not found
         """
-        return self._dataframes.get(data_ref)
+        table = self._dataframes.pop(data_ref, None)
+        if table is not None:
+            # Mark as most recently used
+            self._dataframes[data_ref] = table
+            return table
+
+        info = self._metadata.get(data_ref)
+        if info is None or not info.ipc_path:
+            return None
+
+        try:
+            table = self._read_ipc(info.ipc_path)
+        except Exception as e:
+            logger.error(f"Failed to reload DataFrame '{data_ref}': {e}")
+            return None
+
+        logger.info(f"Reloaded DataFrame '{data_ref}' from {info.ipc_path}")
+        info.mapped = True
+        self._dataframes[data_ref] = table
+        return table
 
     def get_pandas(self, data_ref: str) -> Optional[pd.DataFrame]:
         """
         Retrieve a DataFrame as pandas.
 
+        Repeated calls for the same ref return a cached view, so callers
+        must treat the result as read-only.
+
         Args:
             data_ref: Reference string from store()
 
         Returns:
             pandas DataFrame or None if not found
         """
-        table = self.get(data_ref)
-        if table is not None:
-            return table.to_pandas()
-        return None
+        info = self._metadata.get(data_ref)
+        cached = self._pandas_views.pop(data_ref, None)
+        if info is None:
+            return None
+        if cached is not None and cached[0] is info:
+            # Re-insert as most recently used
+            self._pandas_views[data_ref] = cached
+            return cached[1]
+
+        df = self._to_pandas(data_ref, info)
+        if df is None or not self._pandas_cache_size:
+            return df
+
+        nbytes = max(int(df.memory_usage(deep=False).sum()), info.memory_bytes)
+        self._pandas_views[data_ref] = (info, df, nbytes)
+        while len(self._pandas_views) > self._pandas_cache_size:
+            self._pandas_views.pop(next(iter(self._pandas_views)))
+        self._enforce_memory_budget(keep=data_ref)
+        return df
 
     def get_info(self, data_ref: str) -> Optional[DataFrameInfo]:
         """
@@ -162,6 +263,7 @@ class DataStore:
                 'columns': info.columns,
                 'column_names': info.column_names,
                 'memory_mb': round(info.memory_bytes / (1024 * 1024), 2),
+                'residency': self.residency(ref),
                 'source': info.source,
                 'created_at': info.created_at.isoformat()
             })
@@ -177,23 +279,147 @@ class DataStore:
         Returns:
             True if removed, False if not found
         """
-        if data_ref in self._dataframes:
-            del self._dataframes[data_ref]
-            del self._metadata[data_ref]
+        if data_ref in self._metadata:
+            self._dataframes.pop(data_ref, None)
+            self._pandas_views.pop(data_ref, None)
+            self._remove_ipc_file(self._metadata.pop(data_ref))
             logger.info(f"Dropped DataFrame '{data_ref}'")
             return True
         return False
 
     def clear(self):
         """Remove all stored DataFrames"""
-        count = len(self._dataframes)
+        count = len(self._metadata)
+        for info in self._metadata.values():
+            self._remove_ipc_file(info)
         self._dataframes.clear()
         self._metadata.clear()
+        self._pandas_views.clear()
         logger.info(f"Cleared {count} DataFrames from store")
 
+    def residency(self, data_ref: str) -> Optional[str]:
+        """
+        Report where a stored DataFrame currently lives.
+
+        Args:
+            data_ref: Reference string
+
+        Returns:
+            'memory' (heap), 'mapped' (memory-mapped IPC file),
+            'spilled' (on disk only), or None if not found
+        """
+        info = self._metadata.get(data_ref)
+        if info is None:
+            return None
+        if data_ref not in self._dataframes:
+            return 'spilled'
+        return 'mapped' if info.mapped else 'memory'
+
+    def reindex_ipc_dir(self) -> int:
+        """
+        Register IPC files left by a previous server run.
+
+        Files are indexed lazily as spilled refs; get() maps them on demand.
+
+        Returns:
+            Number of refs re-indexed
+        """
+        ipc_dir = Path(self._cache_dir) / 'ipc'
+        if not ipc_dir.is_dir():
+            return 0
+
+        count = 0
+        for path in sorted(ipc_dir.glob('*.arrow')):
+            try:
+                with pa.memory_map(str(path), 'r') as source:
+                    reader = ipc.open_file(source)
+                    schema = reader.schema
+                    rows = sum(
+                        reader.get_batch(i).num_rows
+                        for i in range(reader.num_record_batches)
+                    )
+                meta = schema.metadata or {}
+                data_ref = meta.get(IPC_REF_KEY, path.stem.encode()).decode()
+                if data_ref in self._metadata:
+                    continue
+                created = meta.get(IPC_CREATED_KEY)
+                source = meta.get(IPC_SOURCE_KEY)
+                self._metadata[data_ref] = DataFrameInfo(
+                    ref=data_ref,
+                    rows=rows,
+                    columns=len(schema),
+                    column_names=[f.name for f in schema],
+                    dtypes={f.name: str(f.type) for f in schema},
+                    memory_bytes=path.stat().st_size,
+                    created_at=(
+                        datetime.fromisoformat(created.decode()) if created
+                        else datetime.fromtimestamp(path.stat().st_mtime)
+                    ),
+                    source=source.decode() if source else None,
+                    ipc_path=str(path)
+                )
+                count += 1
+            except Exception as e:
+                logger.warning(f"Skipping unreadable IPC file {path}: {e}")
+
+        if count:
+            logger.info(f"Re-indexed {count} DataFrames from {ipc_dir}")
+        return count
+
+    def purge_spill_dir(self) -> int:
+        """
+        Delete spill files no stored ref points at.
+
+        Spilled heap tables do not survive a restart, so files left in
+        cache_dir/spill by a previous (or crashed) server run are orphans.
+
+        Returns:
+            Number of files removed
+        """
+        spill_dir = Path(self._cache_dir) / 'spill'
+        if not spill_dir.is_dir():
+            return 0
+
+        live = {info.ipc_path for info in self._metadata.values() if info.ipc_path}
+        count = 0
+        for path in spill_dir.glob('*.arrow'):
+            if str(path) in live:
+                continue
+            try:
+                path.unlink(missing_ok=True)
+                count += 1
+            except OSError as e:
+                logger.warning(f"Could not remove orphaned spill file {path}: {e}")
+
+        if count:
+            logger.info(f"Removed {count} orphaned spill files from {spill_dir}")
+        return count
+
     def total_memory_bytes(self) -> int:
-        """Get total memory used by all stored DataFrames"""
-        return sum(info.memory_bytes for info in self._metadata.values())
+        """Get total heap memory used by resident DataFrames and pandas views"""
+        tables = sum(
+            info.memory_bytes for ref, info in self._metadata.items()
+            if ref in self._dataframes and not info.mapped
+        )
+        return tables + self.pandas_cache_bytes()
+
+    def pandas_cache_bytes(self) -> int:
+        """Get estimated memory held by cached pandas views"""
+        return sum(nbytes for _, _, nbytes in self._pandas_views.values())
+
+    def mapped_bytes(self) -> int:
+        """Get total size of memory-mapped DataFrames"""
+        return sum(
+            info.memory_bytes for ref, info in self._metadata.items()
+            if ref in self._dataframes and info.mapped
+        )
+
+    def spilled_bytes(self) -> int:
+        """Get total size of DataFrames currently spilled to disk"""
+        return sum(
+            info.memory_bytes for ref, info in self._metadata.items()
+            if ref not in self._dataframes
+        )
 
     def total_memory_mb(self) -> float:
         """Get total memory in MB"""
@@ -217,3 +443,154 @@ class DataStore:
                 'limit': self._max_rows
             }
         return {'exceeded': False}
+
+    def _build_info(
+        self,
+        data_ref: str,
+        table: pa.Table,
+        created_at: datetime,
+        source: Optional[str],
+        ipc_path: Optional[str] = None
+    ) -> DataFrameInfo:
+        """Build metadata for a table"""
+        schema = table.schema
+        return DataFrameInfo(
+            ref=data_ref,
+            rows=table.num_rows,
+            columns=table.num_columns,
+            column_names=[f.name for f in schema],
+            dtypes={f.name: str(f.type) for f in schema},
+            memory_bytes=table.nbytes,
+            created_at=created_at,
+            source=source,
+            ipc_path=ipc_path,
+            mapped=ipc_path is not None
+        )
+
+    def _enforce_memory_budget(self, keep: Optional[str] = None):
+        """
+        Evict pandas views, then spill least recently used heap tables,
+        until resident memory fits the budget.
+
+        Memory-mapped tables are not counted: they are backed by page cache.
+
+        Args:
+            keep: Reference that must stay resident (the one just stored or read)
+        """
+        if not self._max_memory_bytes:
+            return
+
+        resident = self.total_memory_bytes()
+        for ref in list(self._pandas_views):
+            if resident <= self._max_memory_bytes:
+                return
+            if ref != keep:
+                resident -= self._pandas_views.pop(ref)[2]
+
+        for ref in list(self._dataframes):
+            if resident <= self._max_memory_bytes:
+                break
+            if ref == keep or self._metadata[ref].mapped:
+                continue
+            resident -= self._spill(ref)
+
+    def _to_pandas(self, data_ref: str, info: DataFrameInfo) -> Optional[pd.DataFrame]:
+        """
+        Convert a stored table to pandas.
+
+        split_blocks avoids consolidating columns into one large block.
+        self_destruct is only safe on a private copy nobody else references,
+        so it is used when converting a spilled ref straight from its file.
+        """
+        if data_ref not in self._dataframes and info.ipc_path:
+            try:
+                with pa.OSFile(info.ipc_path, 'r') as source:
+                    table = ipc.open_file(source).read_all()
+                return table.to_pandas(split_blocks=True, self_destruct=True)
+            except Exception as e:
+                logger.error(f"Failed to read spilled DataFrame '{data_ref}': {e}")
+                return None
+
+        table = self.get(data_ref)
+        if table is None:
+            return None
+        return table.to_pandas(split_blocks=True)
+
+    def _spill(self, data_ref: str) -> int:
+        """
+        Write a heap table to an Arrow IPC file and release it.
+
+        Args:
+            data_ref: Reference string
+
+        Returns:
+            Number of bytes released (0 if the spill failed)
+        """
+        info = self._metadata[data_ref]
+        if not info.ipc_path:
+            path = self._write_ipc(
+                self._dataframes[data_ref], data_ref, info.source,
+                info.created_at, subdir='spill'
+            )
+            if not path:
+                return 0
+            info.ipc_path = path
+
+        del self._dataframes[data_ref]
+        logger.info(f"Spilled DataFrame '{data_ref}' to {info.ipc_path}")
+        return info.memory_bytes
+
+    def _write_ipc(
+        self,
+        table: pa.Table,
+        data_ref: str,
+        source: Optional[str],
+        created_at: datetime,
+        subdir: str = 'ipc'
+    ) -> Optional[str]:
+        """
+        Write a table to an Arrow IPC file under the cache directory.
+
+        Returns:
+            File path, or None if the write failed
+        """
+        try:
+            target_dir = Path(self._cache_dir) / subdir
+            target_dir.mkdir(parents=True, exist_ok=True)
+            path = target_dir / f"{uuid.uuid4().hex}.arrow"
+
+            metadata = dict(table.schema.metadata or {})
+            metadata[IPC_REF_KEY] = data_ref.encode()
+            metadata[IPC_CREATED_KEY] = created_at.isoformat().encode()
+            if source:
+                metadata[IPC_SOURCE_KEY] = source.encode()
+            table = table.replace_schema_metadata(metadata)
+
+            with pa.OSFile(str(path), 'wb') as sink:
+                with ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            return str(path)
+        except Exception as e:
+            logger.error(f"Failed to write IPC file for '{data_ref}': {e}")
+            return None
+
+    def _read_ipc(self, path: str) -> pa.Table:
+        """Memory-map an Arrow IPC file as a zero-copy table"""
+        with pa.memory_map(path, 'r') as source:
+            table = ipc.open_file(source).read_all()
+        # Registry bookkeeping keys should not leak into exports
+        metadata = {
+            k: v for k, v in (table.schema.metadata or {}).items()
+            if not k.startswith(b'data_platform.')
+        }
+        return table.replace_schema_metadata(metadata or None)
+
+    def _remove_ipc_file(self, info: DataFrameInfo):
+        """Delete the IPC file backing a DataFrame, if any"""
+        if info.ipc_path:
+            try:
+                Path(info.ipc_path).unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Could not remove IPC file {info.ipc_path}: {e}")
+            info.ipc_path = None
+            info.mapped = False
@@ -0,0 +1,245 @@
+"""
+Background dbt jobs.
+
+dbt_run / dbt_test / dbt_build with `background: true` submit a job and
+return its id at once. Jobs run in a bounded pool. A job may start next to
+running ones only when their selections do not touch: neither job selects
+a node the other selects or reaches through the manifest DAG (its
+ancestors, which it reads, and its descendants, which read it). Jobs whose
+selection cannot be evaluated run alone.
+
+Each job gets its own `--target-path` and `--log-path` under
+`target/jobs/<job_id>`, so concurrent invocations do not overwrite each
+other's run_results.json, manifest or logs.
+"""
+import asyncio
+import logging
+import shutil
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+
+logger = logging.getLogger(__name__)
+
+# Commands that can run as jobs
+JOB_COMMANDS = ('run', 'test', 'build')
+
+# Resource types each command writes or tests (what its selection covers)
+JOB_RESOURCE_TYPES = {
+    'run': ['model'],
+    'test': ['test', 'unit_test'],
+    'build': ['model', 'seed', 'snapshot', 'test', 'unit_test'],
+}
+
+# Seconds a job may run before it is killed
+JOB_TIMEOUT = 3600
+
+# Finished jobs kept (older ones and their target directories are removed)
+JOB_HISTORY = 50
+
+# Log lines kept in memory per job (dbt.log in log_path has everything)
+JOB_LOG_LINES = 5000
+
+# Job statuses once finished
+JOB_FINAL_STATUSES = ('succeeded', 'failed', 'cancelled', 'timed_out', 'error')
+
+
+class DbtJob:
+    """A submitted dbt command and what it touches in the DAG"""
+
+    def __init__(
+        self,
+        job_id: str,
+        command: List[str],
+        job_dir: Path,
+        nodes: Optional[Set[str]] = None,
+        reach: Optional[Set[str]] = None
+    ):
+        self.job_id = job_id
+        self.command = command
+        self.job_dir = job_dir
+        # None = selection unknown: the job runs alone
+        self.nodes = nodes
+        self.reach = reach
+        self.status = 'queued'
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.log: deque = deque(maxlen=JOB_LOG_LINES)
+        self.error: Optional[str] = None
+        self.run_results: Optional[Dict] = None
+        self.waiting_for: List[str] = []
+
+    @property
+    def target_path(self) -> Path:
+        return self.job_dir / 'target'
+
+    @property
+    def log_path(self) -> Path:
+        return self.job_dir / 'logs'
+
+    @property
+    def done(self) -> bool:
+        return self.status in JOB_FINAL_STATUSES
+
+    def conflicts_with(self, other: 'DbtJob') -> bool:
+        """Whether the two jobs must not run at the same time"""
+        if self.nodes is None or other.nodes is None:
+            return True
+        return bool(self.nodes & other.reach or other.nodes & self.reach)
+
+    def as_dict(self, log_lines: int = 0) -> Dict:
+        end = self.finished_at or time.time()
+        result = {
+            'job_id': self.job_id,
+            'command': ' '.join(self.command),
+            'status': self.status,
+            'nodes': len(self.nodes) if self.nodes is not None else None,
+            'submitted_at': self.submitted_at,
+            'queued_seconds': round((self.started_at or end) - self.submitted_at, 1),
+            'elapsed_seconds': round(end - self.started_at, 1) if self.started_at else None,
+            'target_path': str(self.target_path),
+            'log_path': str(self.log_path)
+        }
+        if self.status == 'queued':
+            result['waiting_for'] = list(self.waiting_for)
+        if self.error:
+            result['error'] = self.error
+        if self.run_results is not None:
+            result['run_results'] = self.run_results
+        if log_lines:
+            result['log'] = list(self.log)[-log_lines:]
+        return result
+
+
+class DbtJobQueue:
+    """
+    Bounded pool of dbt jobs.
+
+    `runner(cmd, timeout=, run_id=, full_output=)` runs one dbt command and returns the
+    _run_dbt result dict; `cancel(run_id)` stops a running one and returns
+    whether it found it.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[..., Awaitable[Dict]],
+        cancel: Callable[[str], Awaitable[bool]],
+        max_concurrency: int = 2,
+        timeout: int = JOB_TIMEOUT
+    ):
+        self.runner = runner
+        self.cancel_run = cancel
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.jobs: 'OrderedDict[str, DbtJob]' = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    @property
+    def running(self) -> List[DbtJob]:
+        return [job for job in self.jobs.values() if job.status == 'running']
+
+    @property
+    def queued(self) -> List[DbtJob]:
+        return [job for job in self.jobs.values() if job.status == 'queued']
+
+    def submit(self, job: DbtJob) -> DbtJob:
+        """Queue a job and start whatever can run now"""
+        self.jobs[job.job_id] = job
+        self._prune()
+        self._schedule()
+        return job
+
+    def _schedule(self):
+        """
+        Start queued jobs in submission order while slots are free.
+
+        A job starts only if it conflicts with no running job and no job
+        queued before it, so overlapping jobs keep their submission order
+        while independent ones can overtake a blocked job.
+        """
+        running = self.running
+        earlier: List[DbtJob] = []
+        for job in self.queued:
+            blockers = [other for other in running + earlier if job.conflicts_with(other)]
+            job.waiting_for = [other.job_id for other in blockers]
+            if not blockers and len(running) < self.max_concurrency:
+                job.status = 'running'
+                job.started_at = time.time()
+                running.append(job)
+                self._tasks[job.job_id] = asyncio.create_task(self._run(job))
+            else:
+                earlier.append(job)
+
+    async def _run(self, job: DbtJob):
+        cmd = job.command + [
+            '--target-path', str(job.target_path),
+            '--log-path', str(job.log_path)
+        ]
+        try:
+            result = await self.runner(cmd, timeout=self.timeout, run_id=job.job_id, full_output=True)
+            if result.get('stdout'):
+                job.log.extend(result['stdout'].splitlines())
+            if result.get('stderr'):
+                job.log.extend(result['stderr'].splitlines())
+            if 'error' in result:
+                job.error = result['error']
+                job.status = 'timed_out' if 'timed out' in result['error'] else 'error'
+            elif result.get('cancelled'):
+                job.status = 'cancelled'
+            else:
+                job.status = 'succeeded' if result.get('success') else 'failed'
+            if result.get('run_results'):
+                # The per-node list stays in the job's run_results.json
+                job.run_results = {
+                    key: value for key, value in result['run_results'].items() if key != 'results'
+                }
+        except asyncio.CancelledError:
+            job.status = 'cancelled'
+        except Exception as e:
+            logger.error(f"dbt job {job.job_id} failed: {e}")
+            job.error = str(e)
+            job.status = 'error'
+        finally:
+            job.finished_at = time.time()
+            self._tasks.pop(job.job_id, None)
+            self._schedule()
+
+    async def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued job, or stop a running one.
+
+        Returns:
+            Whether the job was queued or running
+        """
+        job = self.jobs[job_id]
+        if job.status == 'queued':
+            job.status = 'cancelled'
+            job.finished_at = time.time()
+            self._schedule()
+            return True
+        if job.status == 'running':
+            task = self._tasks.get(job_id)
+            if not await self.cancel_run(job_id) and task is not None:
+                # dbt has not started yet
+                task.cancel()
+            if task is not None:
+                await asyncio.wait([task])
+            return True
+        return False
+
+    def _prune(self):
+        """Forget the oldest finished jobs past JOB_HISTORY, with their files"""
+        finished = [job for job in self.jobs.values() if job.done]
+        for job in finished[:max(0, len(finished) - JOB_HISTORY)]:
+            del self.jobs[job.job_id]
+            shutil.rmtree(job.job_dir, ignore_errors=True)
+
+    def stats(self) -> Dict:
+        return {
+            'running': len(self.running),
+            'queued': len(self.queued),
+            'max_concurrency': self.max_concurrency
+        }
@@ -0,0 +1,252 @@
+"""
+dbt manifest index.
+
+Reads `target/manifest.json` once into compact lookup tables: name to
+unique_id, parent and child adjacency, and unique_ids per resource type.
+Lineage lookups are then dict reads proportional to a node's degree instead
+of scans over every node in the manifest; transitive queries (ancestors,
+descendants, shortest paths, blast radius) walk the adjacency breadth-first.
+"""
+import json
+import logging
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Manifest sections that hold graph members -> their resource_type (for
+# entries that omit it; 'nodes' entries always carry one)
+GRAPH_SECTIONS = {
+    'nodes': 'model',
+    'sources': 'source',
+    'exposures': 'exposure',
+    'metrics': 'metric',
+    'semantic_models': 'semantic_model',
+    'saved_queries': 'saved_query',
+    'unit_tests': 'unit_test',
+}
+
+# Node fields kept in the index; the rest of the manifest is released
+NODE_FIELDS = (
+    'name', 'resource_type', 'package_name', 'schema', 'database', 'alias',
+    'description', 'tags', 'fqn', 'path', 'original_file_path', 'version',
+    'source_name', 'checksum', 'test_metadata'
+)
+
+# Config keys kept per node (also what `config.<key>:` selectors can match)
+CONFIG_FIELDS = (
+    'materialized', 'enabled', 'tags', 'severity', 'schema', 'access',
+    'incremental_strategy', 'unique_key', 'group'
+)
+
+
+class ManifestIndex:
+    """
+    Indexed, in-memory view of a dbt manifest.
+
+    Built by `load`; `stamp` records the file's (mtime_ns, size) so callers
+    can tell when the manifest on disk has changed.
+    """
+
+    def __init__(self, manifest: Dict, stamp: Optional[Tuple[int, int]] = None):
+        self.stamp = stamp
+        self.loaded_at = time.monotonic()
+        self.metadata = manifest.get('metadata', {})
+        self.nodes: Dict[str, Dict] = {}
+        self.by_name: Dict[str, List[str]] = {}
+        self.by_type: Dict[str, List[str]] = {}
+
+        for section in GRAPH_SECTIONS:
+            for unique_id, node in (manifest.get(section) or {}).items():
+                compact = {key: node[key] for key in NODE_FIELDS if key in node}
+                compact['config'] = {
+                    key: value for key, value in (node.get('config') or {}).items()
+                    if key in CONFIG_FIELDS
+                }
+                compact['section'] = section
+                compact.setdefault('resource_type', GRAPH_SECTIONS[section])
+                self.nodes[unique_id] = compact
+                if node.get('name'):
+                    self.by_name.setdefault(node['name'], []).append(unique_id)
+                self.by_type.setdefault(compact['resource_type'], []).append(unique_id)
+
+        # dbt writes parent_map/child_map; older or hand-built manifests
+        # only have depends_on
+        parent_map = manifest.get('parent_map')
+        if parent_map:
+            self.parents = {uid: list(parents) for uid, parents in parent_map.items()}
+        else:
+            self.parents = {}
+            for section in GRAPH_SECTIONS:
+                for unique_id, node in (manifest.get(section) or {}).items():
+                    self.parents[unique_id] = list(
+                        (node.get('depends_on') or {}).get('nodes') or []
+                    )
+
+        child_map = manifest.get('child_map')
+        if child_map:
+            self.children = {uid: list(children) for uid, children in child_map.items()}
+        else:
+            self.children = {uid: [] for uid in self.nodes}
+            for unique_id, parents in self.parents.items():
+                for parent in parents:
+                    self.children.setdefault(parent, []).append(unique_id)
+
+    @classmethod
+    def load(cls, path: Path) -> 'ManifestIndex':
+        """
+        Read and index a manifest file.
+
+        Args:
+            path: Path to manifest.json
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If it is not valid JSON
+        """
+        stamp = file_stamp(path)
+        started = time.perf_counter()
+        with open(path) as f:
+            manifest = json.load(f)
+        index = cls(manifest, stamp)
+        logger.info(
+            f"Indexed {path} ({len(index.nodes)} nodes) in {time.perf_counter() - started:.2f}s"
+        )
+        return index
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        unique_id for a node name or unique_id.
+
+        Models win over other resources sharing a name (e.g. a seed or a
+        snapshot); the latest version wins among versioned models.
+        """
+        if name in self.nodes:
+            return name
+        candidates = self.by_name.get(name)
+        if not candidates:
+            # Versioned or package-qualified references: "model.pkg.name"
+            suffix = f'.{name}'
+            candidates = [uid for uid in self.by_type.get('model', []) if uid.endswith(suffix)]
+            if not candidates:
+                return None
+        models = [uid for uid in candidates if self.nodes[uid]['resource_type'] == 'model']
+        if models:
+            return max(models, key=lambda uid: _version_key(self.nodes[uid].get('version')))
+        return candidates[0]
+
+    def upstream(self, unique_id: str, depth: Optional[int] = None) -> Dict[str, int]:
+        """Ancestors of a node -> distance (1 = direct parent), up to `depth` levels"""
+        return self.walk([unique_id], self.parents, depth)
+
+    def downstream(self, unique_id: str, depth: Optional[int] = None) -> Dict[str, int]:
+        """Descendants of a node -> distance (1 = direct child), up to `depth` levels"""
+        return self.walk([unique_id], self.children, depth)
+
+    def walk(
+        self,
+        start: Iterable[str],
+        edges: Dict[str, List[str]],
+        depth: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Breadth-first distances from `start` along `edges` (start excluded)"""
+        start = list(start)
+        seen = set(start)
+        distances: Dict[str, int] = {}
+        queue = deque((uid, 0) for uid in start)
+        while queue:
+            uid, distance = queue.popleft()
+            if depth is not None and distance >= depth:
+                continue
+            for neighbor in edges.get(uid, ()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    distances[neighbor] = distance + 1
+                    queue.append((neighbor, distance + 1))
+        return distances
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        """
+        Shortest dependency chain from `source` down to `target`.
+
+        Returns:
+            unique_ids from source to target, or None if target is not
+            downstream of source
+        """
+        previous: Dict[str, Optional[str]] = {source: None}
+        queue = deque([source])
+        while queue:
+            uid = queue.popleft()
+            if uid == target:
+                path = []
+                while uid is not None:
+                    path.append(uid)
+                    uid = previous[uid]
+                return path[::-1]
+            for child in self.children.get(uid, ()):
+                if child not in previous:
+                    previous[child] = uid
+                    queue.append(child)
+        return None
+
+    def blast_radius(self, unique_id: str) -> Dict:
+        """
+        Everything affected by a change to a node.
+
+        Returns:
+            Dict with downstream counts per resource type, the max depth,
+            and the affected exposures, models and tests by name
+        """
+        affected = self.downstream(unique_id)
+        by_type: Dict[str, List[str]] = {}
+        for uid in sorted(affected, key=lambda uid: (affected[uid], uid)):
+            resource_type = self.nodes.get(uid, {}).get('resource_type', 'unknown')
+            by_type.setdefault(resource_type, []).append(uid)
+        return {
+            'total': len(affected),
+            'max_depth': max(affected.values(), default=0),
+            'counts': {t: len(ids) for t, ids in sorted(by_type.items())},
+            'exposures': [self.nodes[uid]['name'] for uid in by_type.get('exposure', [])],
+            'models': [self.nodes[uid]['name'] for uid in by_type.get('model', [])],
+            'tests': by_type.get('test', []) + by_type.get('unit_test', [])
+        }
+
+    def names(self, resource_type: str, limit: Optional[int] = None) -> List[str]:
+        """Names of the nodes of one resource type"""
+        unique_ids = self.by_type.get(resource_type, [])
+        if limit is not None:
+            unique_ids = unique_ids[:limit]
+        return [self.nodes[uid].get('name') for uid in unique_ids]
+
+    def stats(self) -> Dict:
+        """Index size and age"""
+        return {
+            'nodes': len(self.nodes),
+            'resource_types': {t: len(ids) for t, ids in sorted(self.by_type.items())},
+            'edges': sum(len(parents) for parents in self.parents.values()),
+            'dbt_version': self.metadata.get('dbt_version'),
+            'age_seconds': round(self.age_seconds, 3)
+        }
+
+
+def file_stamp(path: Path) -> Tuple[int, int]:
+    """(mtime_ns, size) of a file; changes whenever dbt rewrites it"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _version_key(version) -> Tuple[int, float, str]:
+    """Order model versions numerically where possible (unversioned first)"""
+    if version is None:
+        return (0, 0.0, '')
+    try:
+        return (1, float(version), '')
+    except (TypeError, ValueError):
+        return (1, 0.0, str(version))
@@ -0,0 +1,274 @@
+"""
+Asynchronous dbt subprocesses.
+
+Runs the dbt CLI through asyncio.create_subprocess_exec so a long build
+does not block the MCP event loop. stdout/stderr are read as they are
+written, and dbt's `--log-format json` events are folded into progress
+counters that `dbt_status` can report (or cancel) while the command runs.
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import signal
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Subcommands whose structured events carry per-node progress
+PROGRESS_COMMANDS = ('run', 'test', 'build', 'seed', 'snapshot')
+
+# Per-node result events; their data carries index/total
+RESULT_EVENTS = ('LogModelResult', 'LogTestResult', 'LogSeedResult', 'LogSnapshotResult')
+
+# Finished invocations kept for dbt_status
+RUN_HISTORY = 20
+
+# Seconds a cancelled dbt gets to stop its queries after SIGINT
+CANCEL_GRACE_SECONDS = 10.0
+
+# Node failures kept per invocation
+MAX_FAILURES = 50
+
+# Pipe line limit; a JSON event can carry a whole compiled query
+STREAM_LIMIT = 64 * 1024 * 1024
+
+
+class DbtProgress:
+    """Progress counters built from dbt's JSON log events"""
+
+    def __init__(self):
+        self.total: Optional[int] = None
+        self.started = 0
+        self.completed = 0
+        self.statuses: Dict[str, int] = {}
+        self.running: Dict[str, float] = {}
+        self.failures: List[Dict] = []
+        self.last_message: Optional[str] = None
+
+    def feed(self, line: str) -> Optional[str]:
+        """
+        Consume one stdout line.
+
+        Returns:
+            The human-readable message to keep in stdout (the event's `msg`,
+            or the line itself when it is not a JSON event), None to drop it
+        """
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return line
+        if not isinstance(event, dict) or 'info' not in event:
+            return line
+
+        info = event.get('info') or {}
+        data = event.get('data') or {}
+        name = info.get('name')
+        node_info = data.get('node_info') or {}
+        unique_id = node_info.get('unique_id')
+
+        if name == 'ConcurrencyLine' and data.get('node_count') is not None:
+            self.total = data['node_count']
+        elif name in RESULT_EVENTS and data.get('total'):
+            self.total = data['total']
+        elif name == 'NodeStart' and unique_id:
+            self.started += 1
+            self.running[unique_id] = time.monotonic()
+        elif name == 'NodeFinished' and unique_id:
+            self.running.pop(unique_id, None)
+            self.completed += 1
+            run_result = data.get('run_result') or {}
+            status = str(run_result.get('status') or node_info.get('node_status') or 'unknown')
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status in ('error', 'fail') and len(self.failures) < MAX_FAILURES:
+                self.failures.append({
+                    'unique_id': unique_id,
+                    'status': status,
+                    'message': run_result.get('message')
+                })
+
+        message = info.get('msg')
+        if message and info.get('level') in ('info', 'warn', 'error'):
+            self.last_message = message
+        return message
+
+    def as_dict(self) -> Dict:
+        now = time.monotonic()
+        progress = {
+            'total': self.total,
+            'started': self.started,
+            'completed': self.completed,
+            'percent': round(100 * self.completed / self.total, 1) if self.total else None,
+            'statuses': dict(self.statuses),
+            'running': [
+                {'unique_id': uid, 'seconds': round(now - started, 1)}
+                for uid, started in self.running.items()
+            ],
+            'last_message': self.last_message
+        }
+        if self.failures:
+            progress['failures'] = list(self.failures)
+        return progress
+
+
+class DbtInvocation:
+    """One dbt command, running or finished"""
+
+    def __init__(self, run_id: str, command: List[str]):
+        self.run_id = run_id
+        self.command = command
+        self.progress = DbtProgress()
+        self.status = 'running'
+        self.returncode: Optional[int] = None
+        self.process = None
+        self.cancel_requested = False
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._finished = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status != 'running'
+
+    def finish(self, status: str, returncode: Optional[int] = None):
+        self.status = status
+        self.returncode = returncode
+        self.finished_at = time.time()
+        self._finished.set()
+
+    async def cancel(self, grace_seconds: float = CANCEL_GRACE_SECONDS) -> bool:
+        """
+        Stop the command: SIGINT first (dbt cancels its open queries), then
+        SIGTERM and SIGKILL for each `grace_seconds` it keeps running.
+
+        Returns:
+            Whether a running process was signalled
+        """
+        process = self.process
+        if self.done or process is None:
+            return False
+        self.cancel_requested = True
+        for stop in (lambda: process.send_signal(signal.SIGINT), process.terminate, process.kill):
+            with contextlib.suppress(ProcessLookupError):
+                stop()
+            try:
+                await asyncio.wait_for(self._finished.wait(), grace_seconds)
+                break
+            except asyncio.TimeoutError:
+                logger.warning(f"dbt {self.run_id} still running after cancel, escalating")
+        return True
+
+    def as_dict(self) -> Dict:
+        end = self.finished_at or time.time()
+        return {
+            'run_id': self.run_id,
+            'command': ' '.join(self.command),
+            'status': self.status,
+            'returncode': self.returncode,
+            'elapsed_seconds': round(end - self.started_at, 1),
+            'progress': self.progress.as_dict()
+        }
+
+
+async def run_process(
+    full_cmd: List[str],
+    invocation: DbtInvocation,
+    cwd: Optional[str],
+    env: Dict[str, str],
+    timeout: float,
+    json_events: bool = False
+) -> Tuple[int, str, str]:
+    """
+    Run a dbt command to completion without blocking the event loop.
+
+    The invocation is finished with succeeded/failed/cancelled/timed_out;
+    a caller that is itself cancelled kills the process.
+
+    Args:
+        full_cmd: Executable and arguments
+        invocation: Receives the process handle and progress events
+        cwd: Working directory
+        env: Environment
+        timeout: Seconds before the process is killed
+        json_events: Parse stdout lines as `--log-format json` events
+
+    Returns:
+        (returncode, stdout, stderr); with json_events, stdout holds the
+        events' messages
+
+    Raises:
+        asyncio.TimeoutError: If the command ran longer than `timeout`
+        FileNotFoundError: If the executable is missing
+    """
+    stdout: List[str] = []
+    stderr: List[str] = []
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *full_cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            env=env,
+            limit=STREAM_LIMIT
+        )
+    except BaseException:
+        invocation.finish('failed')
+        raise
+    invocation.process = process
+
+    async def read_stdout():
+        async for line in _read_lines(process.stdout):
+            if json_events:
+                line = invocation.progress.feed(line)
+                if line is None:
+                    continue
+            stdout.append(line)
+
+    async def read_stderr():
+        async for line in _read_lines(process.stderr):
+            stderr.append(line)
+
+    try:
+        await asyncio.wait_for(asyncio.gather(read_stdout(), read_stderr()), timeout)
+        returncode = await process.wait()
+    except BaseException as e:
+        # Timeouts and cancelled callers must not leave dbt running
+        if process.returncode is None:
+            with contextlib.suppress(ProcessLookupError):
+                process.kill()
+            await process.wait()
+        if isinstance(e, asyncio.TimeoutError):
+            status = 'timed_out'
+        elif isinstance(e, asyncio.CancelledError):
+            status = 'cancelled'
+        else:
+            status = 'failed'
+        invocation.finish(status, process.returncode)
+        raise
+
+    if invocation.cancel_requested:
+        status = 'cancelled'
+    else:
+        status = 'succeeded' if returncode == 0 else 'failed'
+    invocation.finish(status, returncode)
+    return returncode, '\n'.join(stdout), '\n'.join(stderr)
+
+
+async def _read_lines(stream: asyncio.StreamReader) -> AsyncIterator[str]:
+    """
+    Decoded lines of a pipe.
+
+    A line over the reader's limit raises ValueError in readline, which
+    has already dropped it from the buffer; it is replaced by a note so the
+    rest of the output is still read and dbt is not killed.
+    """
+    while True:
+        try:
+            raw = await stream.readline()
+        except ValueError:
+            yield '[log line over the stream limit skipped]'
+            continue
+        if not raw:
+            return
+        yield raw.decode(errors='replace').rstrip('\n')
@@ -0,0 +1,234 @@
+"""
+dbt run_results.json parsing and timing history.
+
+dbt writes `run_results.json` into its target path after run/test/build.
+These helpers reduce it to a compact structure (per-node status, execution
+time and rows affected, status counts, failures, slowest models) so tool
+results do not have to carry dbt's full log output. Each parsed run is also
+archived under `target/run_history`, one small JSON file per invocation,
+and compare_runs reports the nodes whose timings moved across those runs.
+"""
+import json
+import os
+import statistics
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Node statuses reported as failures
+FAILED_STATUSES = ('error', 'fail', 'runtime error')
+
+# Statuses whose message is noise ("OK", "SELECT 42")
+QUIET_STATUSES = ('success', 'pass')
+
+# Slowest models listed per run
+SLOWEST_MODELS = 10
+
+# Archived runs kept per project
+HISTORY_FILES = 50
+
+
+def load_run_results(target_path: Path, since: Optional[float] = None) -> Optional[Dict]:
+    """
+    Read `run_results.json` from a dbt target directory.
+
+    Args:
+        target_path: dbt target directory
+        since: Ignore a file last written before this time (a leftover
+            from an earlier invocation)
+
+    Returns:
+        The parsed file, or None if dbt did not write one
+    """
+    path = Path(target_path) / 'run_results.json'
+    if not path.exists():
+        return None
+    if since is not None and os.stat(path).st_mtime < since:
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def node_results(run_results: Dict) -> List[Dict]:
+    """
+    Per-node results in execution order.
+
+    Returns:
+        Dicts with unique_id, status, execution_time, rows_affected (when
+        the adapter reports it) and message (for nodes that did not pass)
+    """
+    nodes = []
+    for result in run_results.get('results') or []:
+        status = str(result.get('status'))
+        node = {
+            'unique_id': result.get('unique_id'),
+            'status': status,
+            'execution_time': round(result.get('execution_time') or 0.0, 3)
+        }
+        rows = (result.get('adapter_response') or {}).get('rows_affected')
+        if rows is not None:
+            node['rows_affected'] = rows
+        if status not in QUIET_STATUSES and result.get('message'):
+            node['message'] = result['message']
+        nodes.append(node)
+    return nodes
+
+
+def summarize_run_results(run_results: Dict, slowest: int = SLOWEST_MODELS) -> Dict:
+    """
+    Status counts, total elapsed time, failed nodes and slowest models of
+    one invocation.
+
+    Args:
+        run_results: Parsed run_results.json
+        slowest: Number of slowest models to list
+
+    Returns:
+        Dict with invocation_id, command, generated_at, elapsed_time, nodes,
+        counts (per status), rows_affected (total), failures and slowest
+    """
+    nodes = node_results(run_results)
+    counts: Dict[str, int] = {}
+    for node in nodes:
+        counts[node['status']] = counts.get(node['status'], 0) + 1
+    models = [node for node in nodes if (node['unique_id'] or '').startswith('model.')]
+    metadata = run_results.get('metadata') or {}
+    return {
+        'invocation_id': metadata.get('invocation_id'),
+        'command': (run_results.get('args') or {}).get('which'),
+        'generated_at': metadata.get('generated_at'),
+        'elapsed_time': run_results.get('elapsed_time'),
+        'nodes': len(nodes),
+        'counts': dict(sorted(counts.items())),
+        'rows_affected': sum(node.get('rows_affected') or 0 for node in nodes),
+        'failures': [
+            {key: node.get(key) for key in ('unique_id', 'status', 'message')}
+            for node in nodes if node['status'] in FAILED_STATUSES
+        ],
+        'slowest': [
+            {key: node[key] for key in ('unique_id', 'execution_time', 'status')}
+            for node in sorted(models, key=lambda node: -node['execution_time'])[:slowest]
+        ]
+    }
+
+
+def parse_run_results(run_results: Dict, slowest: int = SLOWEST_MODELS) -> Dict:
+    """Summary plus the per-node `results`"""
+    return {**summarize_run_results(run_results, slowest), 'results': node_results(run_results)}
+
+
+def archive_run_results(history_dir: Path, run_results: Dict) -> Optional[Path]:
+    """
+    Keep the timings of one invocation for later comparison.
+
+    Files are named by generation time and invocation id, so an invocation
+    is archived once and a directory listing sorts chronologically. Only
+    the newest HISTORY_FILES are kept.
+
+    Returns:
+        The archive file, or None if the run has no invocation id
+    """
+    summary = summarize_run_results(run_results, slowest=0)
+    invocation_id = summary['invocation_id']
+    if not invocation_id:
+        return None
+    generated_at = (summary['generated_at'] or '').replace(':', '-')
+    history_dir = Path(history_dir)
+    history_dir.mkdir(parents=True, exist_ok=True)
+    path = history_dir / f'{generated_at}_{invocation_id}.json'
+    if not path.exists():
+        record = {
+            key: summary[key]
+            for key in ('invocation_id', 'command', 'generated_at', 'elapsed_time', 'counts')
+        }
+        record['nodes'] = {
+            node['unique_id']: [node['status'], node['execution_time'], node.get('rows_affected')]
+            for node in node_results(run_results)
+        }
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(record))
+        os.replace(tmp, path)
+    for stale in sorted(history_dir.glob('*.json'))[:-HISTORY_FILES]:
+        stale.unlink(missing_ok=True)
+    return path
+
+
+def load_history(history_dir: Path, last: int) -> List[Dict]:
+    """The `last` archived runs, oldest first"""
+    history_dir = Path(history_dir)
+    if not history_dir.exists() or last <= 0:
+        return []
+    runs = []
+    for path in sorted(history_dir.glob('*.json'))[-last:]:
+        try:
+            runs.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return runs
+
+
+def compare_runs(
+    runs: List[Dict],
+    threshold_pct: float = 20.0,
+    min_seconds: float = 1.0,
+    limit: int = 20
+) -> Dict:
+    """
+    Compare the newest run's node timings with the runs before it.
+
+    A node's baseline is its median execution time across the earlier runs
+    that executed it. It counts as slower (or faster) when the newest time
+    differs from the baseline by more than `threshold_pct` percent and at
+    least `min_seconds`.
+
+    Args:
+        runs: Archived runs, oldest first
+        threshold_pct: Relative change to report
+        min_seconds: Absolute change to report
+        limit: Maximum nodes per list
+
+    Returns:
+        Dict with the compared runs, slower and faster nodes (largest
+        change first) and nodes new in the latest run
+    """
+    if not runs:
+        return {'runs': [], 'slower': [], 'faster': [], 'new': []}
+    latest, earlier = runs[-1], runs[:-1]
+    history: Dict[str, List[float]] = {}
+    for run in earlier:
+        for unique_id, (status, seconds, _) in run['nodes'].items():
+            if status not in FAILED_STATUSES and status != 'skipped':
+                history.setdefault(unique_id, []).append(seconds)
+
+    slower: List[Tuple[float, Dict]] = []
+    faster: List[Tuple[float, Dict]] = []
+    new = []
+    for unique_id, (status, seconds, _) in latest['nodes'].items():
+        if status in FAILED_STATUSES or status == 'skipped':
+            continue
+        previous = history.get(unique_id)
+        if not previous:
+            new.append(unique_id)
+            continue
+        baseline = statistics.median(previous)
+        delta = seconds - baseline
+        if abs(delta) < min_seconds or (baseline and abs(delta) / baseline * 100 < threshold_pct):
+            continue
+        entry = {
+            'unique_id': unique_id,
+            'execution_time': seconds,
+            'baseline': round(baseline, 3),
+            'change_seconds': round(delta, 3),
+            'change_pct': round(delta / baseline * 100, 1) if baseline else None,
+            'history': previous
+        }
+        (slower if delta > 0 else faster).append((abs(delta), entry))
+
+    return {
+        'runs': [
+            {key: run.get(key) for key in ('invocation_id', 'command', 'generated_at', 'elapsed_time', 'counts')}
+            for run in runs
+        ],
+        'slower': [entry for _, entry in sorted(slower, key=lambda item: -item[0])[:limit]],
+        'faster': [entry for _, entry in sorted(faster, key=lambda item: -item[0])[:limit]],
+        'new': sorted(new)[:limit]
+    }
@@ -0,0 +1,219 @@
+"""
+In-process dbt node selection.
+
+Evaluates dbt's `--select` / `--exclude` syntax against a ManifestIndex, so
+resources can be listed without starting `dbt ls`:
+
+- space-separated terms are a union, comma-joined terms an intersection
+- graph operators: `+model` (ancestors), `model+` (descendants), `2+model`
+  / `model+1` (depth-limited), `@model` (descendants and their ancestors)
+- methods: `tag:`, `path:`, `resource_type:`, `package:`, `fqn:`,
+  `source:`, `exposure:`, `metric:`, `test_type:`, `test_name:`,
+  `config.<key>:`; a bare value matches node names, fqn paths and unique_ids
+
+`*` and `?` wildcards work in every value.
+"""
+import re
+from fnmatch import fnmatchcase
+from typing import Callable, Dict, List, Optional, Set
+
+from .dbt_manifest import ManifestIndex
+
+_TERM = re.compile(r'^(?P<at>@)?(?:(?P<up_depth>\d*)(?P<up>\+))?(?P<body>.+?)(?:(?P<down>\+)(?P<down_depth>\d*))?$')
+
+
+class SelectorError(ValueError):
+    """Raised for selector syntax or methods that cannot be evaluated"""
+
+
+def select_nodes(
+    index: ManifestIndex,
+    select: Optional[str] = None,
+    exclude: Optional[str] = None,
+    resource_types: Optional[List[str]] = None,
+    methods: Optional[Dict[str, Callable[[ManifestIndex, str], Set[str]]]] = None
+) -> Set[str]:
+    """
+    Evaluate a dbt selection against the index.
+
+    Args:
+        index: Manifest index
+        select: Selector (None or empty = every node)
+        exclude: Selector whose matches are removed
+        resource_types: Keep only these resource types
+        methods: Extra `method:` handlers (value -> matching unique_ids)
+
+    Returns:
+        Selected unique_ids
+
+    Raises:
+        SelectorError: On unknown methods or malformed terms
+    """
+    selected = _evaluate(index, select, methods) if select and select.strip() else set(index.nodes)
+    if exclude and exclude.strip():
+        selected -= _evaluate(index, exclude, methods)
+    if resource_types:
+        selected = {uid for uid in selected if index.nodes[uid]['resource_type'] in resource_types}
+    return selected
+
+
+def _evaluate(
+    index: ManifestIndex,
+    selector: str,
+    methods: Optional[Dict[str, Callable[[ManifestIndex, str], Set[str]]]]
+) -> Set[str]:
+    """Union of space-separated terms, each an intersection of comma-joined parts"""
+    union: Set[str] = set()
+    for term in selector.split():
+        parts = [part for part in term.split(',') if part]
+        result = _select_term(index, parts[0], methods)
+        for part in parts[1:]:
+            result &= _select_term(index, part, methods)
+        union |= result
+    return union
+
+
+def _select_term(
+    index: ManifestIndex,
+    term: str,
+    methods: Optional[Dict[str, Callable[[ManifestIndex, str], Set[str]]]]
+) -> Set[str]:
+    """One selector term with its graph operators applied"""
+    match = _TERM.match(term)
+    if not match or not match.group('body'):
+        raise SelectorError(f"Invalid selector term: '{term}'")
+    if match.group('at') and (match.group('up') or match.group('down')):
+        raise SelectorError(f"'@' cannot be combined with '+' in '{term}'")
+
+    seeds = _match_method(index, match.group('body'), methods)
+    result = set(seeds)
+    if match.group('at'):
+        descendants = index.walk(seeds, index.children)
+        result |= set(descendants)
+        result |= set(index.walk(result, index.parents))
+        return result
+    if match.group('up'):
+        depth = int(match.group('up_depth')) if match.group('up_depth') else None
+        result |= set(index.walk(seeds, index.parents, depth))
+    if match.group('down'):
+        depth = int(match.group('down_depth')) if match.group('down_depth') else None
+        result |= set(index.walk(seeds, index.children, depth))
+    return result
+
+
+def _match_method(
+    index: ManifestIndex,
+    body: str,
+    methods: Optional[Dict[str, Callable[[ManifestIndex, str], Set[str]]]]
+) -> Set[str]:
+    """unique_ids matching one `method:value` (or bare value)"""
+    method, _, value = body.partition(':') if ':' in body else ('', '', body)
+    if method and methods and method in methods:
+        return methods[method](index, value)
+
+    nodes = index.nodes.items()
+    if not method:
+        if '/' in value or value.endswith('.sql') or value.endswith('.py'):
+            return _match_path(index, value)
+        return {uid for uid, node in nodes if _match_default(uid, node, value)}
+    if method == 'fqn':
+        return {uid for uid, node in nodes if _match_fqn(node, value)}
+    if method == 'tag':
+        return {
+            uid for uid, node in nodes
+            if any(fnmatchcase(tag, value) for tag in _tags(node))
+        }
+    if method == 'path':
+        return _match_path(index, value)
+    if method == 'resource_type':
+        return {uid for uid, node in nodes if fnmatchcase(node['resource_type'], value)}
+    if method == 'package':
+        return {uid for uid, node in nodes if fnmatchcase(node.get('package_name') or '', value)}
+    if method == 'source':
+        return {uid for uid, node in nodes if node['resource_type'] == 'source' and _match_source(node, value)}
+    if method in ('exposure', 'metric', 'semantic_model', 'saved_query'):
+        return {
+            uid for uid, node in nodes
+            if node['resource_type'] == method and fnmatchcase(node.get('name') or '', value)
+        }
+    if method == 'test_type':
+        return {
+            uid for uid, node in nodes
+            if node['resource_type'] in ('test', 'unit_test') and _test_type(node) == value
+        }
+    if method == 'test_name':
+        return {
+            uid for uid, node in nodes
+            if node['resource_type'] == 'test'
+            and fnmatchcase((node.get('test_metadata') or {}).get('name') or '', value)
+        }
+    if method.startswith('config.'):
+        key = method[len('config.'):]
+        return {
+            uid for uid, node in nodes
+            if _match_config(node['config'].get(key), value)
+        }
+    raise SelectorError(f"Unsupported selector method '{method}:'")
+
+
+def _match_default(unique_id: str, node: Dict, value: str) -> bool:
+    """Bare values: node name, fqn path, or unique_id"""
+    return (
+        fnmatchcase(node.get('name') or '', value)
+        or unique_id == value
+        or _match_fqn(node, value)
+    )
+
+
+def _match_fqn(node: Dict, value: str) -> bool:
+    """
+    dbt fqn matching: the dotted value matches a prefix of the fqn
+    (`shop` = the whole package, `shop.staging` = a folder), or names the
+    package and the node with the folders left out (`shop.stg_orders`).
+    """
+    fqn = node.get('fqn') or []
+    parts = value.split('.')
+    if not fqn or len(parts) > len(fqn):
+        return False
+    if all(fnmatchcase(segment, part) for segment, part in zip(fqn, parts)):
+        return True
+    return len(parts) == 2 and fnmatchcase(fqn[0], parts[0]) and fnmatchcase(fqn[-1], parts[1])
+
+
+def _match_path(index: ManifestIndex, value: str) -> Set[str]:
+    """Files or directories relative to the project root"""
+    prefix = value.rstrip('/') + '/'
+    return {
+        uid for uid, node in index.nodes.items()
+        if (path := node.get('original_file_path'))
+        and (path == value or path.startswith(prefix) or fnmatchcase(path, value))
+    }
+
+
+def _match_source(node: Dict, value: str) -> bool:
+    """`source:raw` (whole source) or `source:raw.orders`"""
+    source_name, _, table = value.partition('.')
+    return fnmatchcase(node.get('source_name') or '', source_name) and (
+        not table or fnmatchcase(node.get('name') or '', table)
+    )
+
+
+def _match_config(setting, value: str) -> bool:
+    if isinstance(setting, list):
+        return any(fnmatchcase(str(item), value) for item in setting)
+    if isinstance(setting, bool):
+        return str(setting).lower() == value.lower()
+    return setting is not None and fnmatchcase(str(setting), value)
+
+
+def _tags(node: Dict) -> List[str]:
+    config_tags = node['config'].get('tags') or []
+    if isinstance(config_tags, str):
+        config_tags = [config_tags]
+    return list(node.get('tags') or []) + list(config_tags)
+
+
+def _test_type(node: Dict) -> str:
+    if node['resource_type'] == 'unit_test':
+        return 'unit'
+    return 'generic' if node.get('test_metadata') else 'singular'
@@ -0,0 +1,169 @@
+"""
+State-based (changed-only) dbt runs.
+
+After a successful dbt_build that covered every modified node (no
+`select`/`exclude`, or a changed-only build), the manifest dbt just wrote is
+copied into a state directory. Only build refreshes it: `run` skips seeds,
+snapshots and tests, which would then look unmodified to the next build. A changed-only run then builds
+`state:modified+` with `--defer --state <dir>`, so unchanged upstream models
+resolve to the relations recorded in the snapshot.
+
+The modified set is also computed in process by comparing the current
+manifest index with the snapshot, so it can be previewed (dbt_changed,
+dbt_select with `state:` selectors) before anything runs. The comparison
+uses what the index keeps: file checksums, the indexed config keys and the
+relation (database / schema / alias). dbt's own comparison also looks at
+macros and vars, so it may select slightly more.
+"""
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from .dbt_manifest import ManifestIndex
+from .dbt_selectors import SelectorError, select_nodes
+
+# Commands whose successful runs refresh the state snapshot (build is the
+# only one that builds every resource type)
+STATE_COMMANDS = ('build',)
+
+# Selection of a changed-only run
+MODIFIED_SELECTOR = 'state:modified+'
+
+# Node fields that make up its relation
+RELATION_FIELDS = ('database', 'schema', 'alias')
+
+
+def modified_nodes(current: ManifestIndex, state: ManifestIndex) -> Dict[str, List[str]]:
+    """
+    Nodes that are new or changed since the state snapshot.
+
+    Returns:
+        unique_id -> reasons: ['new'], or any of 'body' (checksum),
+        'configs' and 'relation'
+    """
+    modified: Dict[str, List[str]] = {}
+    for unique_id, node in current.nodes.items():
+        previous = state.nodes.get(unique_id)
+        if previous is None:
+            modified[unique_id] = ['new']
+            continue
+        reasons = []
+        if node.get('checksum') != previous.get('checksum'):
+            reasons.append('body')
+        if node.get('config') != previous.get('config'):
+            reasons.append('configs')
+        if any(node.get(key) != previous.get(key) for key in RELATION_FIELDS):
+            reasons.append('relation')
+        if reasons:
+            modified[unique_id] = reasons
+    return modified
+
+
+def removed_nodes(current: ManifestIndex, state: ManifestIndex) -> List[str]:
+    """Nodes in the snapshot that no longer exist"""
+    return sorted(set(state.nodes) - set(current.nodes))
+
+
+def state_methods(
+    state: Optional[ManifestIndex]
+) -> Dict[str, Callable[[ManifestIndex, str], Set[str]]]:
+    """
+    `state:` selector method for select_nodes.
+
+    Supports `state:modified` (new or changed), `state:new` and
+    `state:modified.body` / `.configs` / `.relation`.
+    """
+    cache: Dict = {}
+
+    def select_state(index: ManifestIndex, value: str) -> Set[str]:
+        if state is None:
+            raise SelectorError(
+                "No state snapshot yet: run a full dbt_build first"
+            )
+        if cache.get('index') is not index:
+            cache['index'] = index
+            cache['modified'] = modified_nodes(index, state)
+        modified = cache['modified']
+        if value == 'modified':
+            return set(modified)
+        if value == 'new':
+            return {uid for uid, reasons in modified.items() if reasons == ['new']}
+        if value.startswith('modified.'):
+            reason = value[len('modified.'):]
+            if reason in ('body', 'configs', 'relation'):
+                return {uid for uid, reasons in modified.items() if reason in reasons}
+        raise SelectorError(f"Unsupported state selector 'state:{value}'")
+
+    return {'state': select_state}
+
+
+def covers_modified(cmd: List[str]) -> bool:
+    """Whether a successful run of this command built every modified node"""
+    if cmd[0] not in STATE_COMMANDS or '--exclude' in cmd:
+        return False
+    return '--select' not in cmd or cmd[cmd.index('--select') + 1] == MODIFIED_SELECTOR
+
+
+def snapshot_manifest(manifest_path: Path, state_dir: Path) -> Path:
+    """
+    Copy a manifest into the state directory (atomically, so a concurrent
+    changed-only run never reads a half-written file).
+
+    Returns:
+        The snapshot path
+    """
+    state_dir = Path(state_dir)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    path = state_dir / 'manifest.json'
+    tmp = state_dir / 'manifest.json.tmp'
+    shutil.copy2(manifest_path, tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def diff_state(
+    current: ManifestIndex,
+    state: ManifestIndex,
+    resource_types: Optional[List[str]] = None,
+    limit: int = 100
+) -> Dict:
+    """
+    What a changed-only run would build.
+
+    Args:
+        current: Index of the project as it is now
+        state: Index of the snapshot
+        resource_types: Count only these resource types (what the command builds)
+        limit: Maximum unique_ids per list
+
+    Returns:
+        Dict with modified nodes and their reasons, the downstream nodes
+        `state:modified+` adds, counts per resource type, and removed nodes
+    """
+    modified = modified_nodes(current, state)
+    selected = select_nodes(
+        current, MODIFIED_SELECTOR, resource_types=resource_types, methods=state_methods(state)
+    )
+    reasons: Dict[str, int] = {}
+    for uid in selected & set(modified):
+        for reason in modified[uid]:
+            reasons[reason] = reasons.get(reason, 0) + 1
+    counts: Dict[str, int] = {}
+    for uid in selected:
+        resource = current.nodes[uid]['resource_type']
+        counts[resource] = counts.get(resource, 0) + 1
+    changed = sorted(uid for uid in selected if uid in modified)
+    downstream = sorted(uid for uid in selected if uid not in modified)
+    removed = removed_nodes(current, state)
+    return {
+        'state_generated_at': state.metadata.get('generated_at'),
+        'selected': len(selected),
+        'total': len(current.nodes),
+        'counts': dict(sorted(counts.items())),
+        'reasons': dict(sorted(reasons.items())),
+        'modified': [{'unique_id': uid, 'reasons': modified[uid]} for uid in changed[:limit]],
+        'downstream': downstream[:limit],
+        'removed': removed[:limit],
+        'truncated': max(len(changed), len(downstream), len(removed)) > limit
+    }
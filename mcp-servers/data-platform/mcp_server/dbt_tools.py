@@ -3,17 +3,40 @@ dbt MCP Tools.
 
 Provides dbt CLI wrapper with pre-execution validation.
 """
-import subprocess
+import asyncio
 import json
 import logging
 import os
+import shutil
+import uuid
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 
 from .config import load_config
+from .dbt_jobs import JOB_RESOURCE_TYPES, DbtJob, DbtJobQueue
+from .dbt_manifest import ManifestIndex, file_stamp
+from .dbt_process import PROGRESS_COMMANDS, RUN_HISTORY, DbtInvocation, run_process
+from .dbt_results import (
+    archive_run_results, compare_runs, load_history, load_run_results, parse_run_results
+)
+from .dbt_selectors import SelectorError, select_nodes
+from .dbt_state import (
+    MODIFIED_SELECTOR, covers_modified, diff_state, snapshot_manifest, state_methods
+)
+from .dbt_worker import WORKER_COMMANDS, DbtWorkerClient, WorkerUnavailable
 
 logger = logging.getLogger(__name__)
 
+# dbt_lineage traversal directions
+LINEAGE_DIRECTIONS = ('upstream', 'downstream', 'both')
+
+# Characters of run/test/build output returned unless full_output is set
+OUTPUT_TAIL_CHARS = 5000
+
+# Commands that create or replace relations in the warehouse
+WAREHOUSE_COMMANDS = ('run', 'build', 'seed', 'snapshot')
+
 
 class DbtTools:
     """dbt CLI wrapper tools with pre-validation"""
@@ -22,6 +45,18 @@ class DbtTools:
         self.config = load_config()
         self.project_dir = self.config.get('dbt_project_dir')
         self.profiles_dir = self.config.get('dbt_profiles_dir')
+        self.manifest: Optional[ManifestIndex] = None
+        self.state_manifest: Optional[ManifestIndex] = None
+        self._manifest_lock = asyncio.Lock()
+        self.runs: 'OrderedDict[str, DbtInvocation]' = OrderedDict()
+        self.worker: Optional[DbtWorkerClient] = None
+        # Called after dbt may have changed relations (the server hooks up
+        # the PostgreSQL catalog and query caches)
+        self.on_warehouse_changed: Optional[Callable[[], None]] = None
+        self.job_queue = DbtJobQueue(
+            self._run_dbt, self._cancel_run,
+            max_concurrency=self.config.get('dbt_max_jobs') or 2
+        )
 
     def _get_dbt_command(self, cmd: List[str]) -> List[str]:
         """Build dbt command with project and profiles directories"""
@@ -33,19 +68,35 @@ class DbtTools:
         base.extend(cmd)
         return base
 
-    def _run_dbt(
+    async def _run_dbt(
         self,
         cmd: List[str],
         timeout: int = 300,
-        capture_json: bool = False
+        capture_json: bool = False,
+        run_id: Optional[str] = None,
+        full_output: bool = False
     ) -> Dict:
         """
         Run dbt command and return result.
 
+        The command runs as an asyncio subprocess registered in `self.runs`,
+        so dbt_status can report its progress or cancel it. run/test/build/
+        seed/snapshot use `--log-format json`; their events feed the progress
+        counters and stdout keeps the log messages; their run_results.json is
+        parsed into `run_results` and archived for dbt_timing_report, and
+        stdout/stderr are cut to the last OUTPUT_TAIL_CHARS characters. A
+        successful build that covered every modified node snapshots its
+        manifest as the state for changed-only runs. Once run/build/seed/
+        snapshot has run, even partly, `on_warehouse_changed` is called. With
+        `dbt_worker` enabled, parse/compile/ls go to the persistent worker
+        instead (the CLI is used if it cannot start).
+
         Args:
             cmd: dbt subcommand and arguments
             timeout: Command timeout in seconds
             capture_json: If True, parse JSON output
+            run_id: Id to register the run under (default: generated)
+            full_output: Return run/test/build stdout and stderr untruncated
 
         Returns:
             Dict with command result
@@ -56,42 +107,70 @@ class DbtTools:
                 'suggestion': 'Set DBT_PROJECT_DIR in project .env or ensure dbt_project.yml exists'
             }
 
-        full_cmd = self._get_dbt_command(cmd)
+        if self.config.get('dbt_worker') and cmd[0] in WORKER_COMMANDS:
+            result = await self._run_in_worker(cmd, timeout, capture_json)
+            if result is not None:
+                return result
+
+        json_events = cmd[0] in PROGRESS_COMMANDS
+        full_cmd = self._get_dbt_command(cmd + ['--log-format', 'json'] if json_events else cmd)
         logger.info(f"Running: {' '.join(full_cmd)}")
 
+        invocation = DbtInvocation(run_id or f"dbt_{uuid.uuid4().hex[:8]}", cmd)
+        self._track_run(invocation)
         try:
             env = os.environ.copy()
             # Disable dbt analytics/tracking
             env['DBT_SEND_ANONYMOUS_USAGE_STATS'] = 'false'
 
-            result = subprocess.run(
-                full_cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                cwd=self.project_dir,
-                env=env
-            )
+            try:
+                returncode, stdout, stderr = await run_process(
+                    full_cmd, invocation, self.project_dir, env, timeout, json_events
+                )
+            finally:
+                # Failed, cancelled and timed-out runs may still have built relations
+                if invocation.process is not None and cmd[0] in WAREHOUSE_COMMANDS:
+                    self._warehouse_changed()
 
             output = {
-                'success': result.returncode == 0,
+                'success': returncode == 0,
                 'command': ' '.join(cmd),
-                'stdout': result.stdout,
-                'stderr': result.stderr if result.returncode != 0 else None
+                'run_id': invocation.run_id,
+                'stdout': stdout,
+                'stderr': stderr if returncode != 0 else None
             }
-
-            if capture_json and result.returncode == 0:
+            if json_events:
+                output['progress'] = invocation.progress.as_dict()
+                run_results = await self._collect_run_results(cmd, invocation.started_at)
+                if run_results is not None:
+                    output['run_results'] = run_results
+                if not full_output:
+                    for key in ('stdout', 'stderr'):
+                        if output[key] and len(output[key]) > OUTPUT_TAIL_CHARS:
+                            output[f'{key}_chars'] = len(output[key])
+                            output[key] = _tail(output[key], OUTPUT_TAIL_CHARS)
+                            output[f'{key}_truncated'] = True
+            if invocation.status == 'cancelled':
+                output['success'] = False
+                output['cancelled'] = True
+            elif output['success'] and covers_modified(cmd):
+                snapshot = await self._snapshot_state(cmd, invocation.started_at)
+                if snapshot is not None:
+                    output['state_snapshot'] = str(snapshot)
+
+            if capture_json and returncode == 0:
                 try:
-                    output['data'] = json.loads(result.stdout)
+                    output['data'] = json.loads(stdout)
                 except json.JSONDecodeError:
                     pass
 
             return output
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             return {
                 'error': f'Command timed out after {timeout}s',
-                'command': ' '.join(cmd)
+                'command': ' '.join(cmd),
+                'run_id': invocation.run_id
             }
         except FileNotFoundError:
             return {
@@ -102,6 +181,214 @@ class DbtTools:
             logger.error(f"dbt command failed: {e}")
             return {'error': str(e)}
 
+    def _warehouse_changed(self):
+        if self.on_warehouse_changed is not None:
+            try:
+                self.on_warehouse_changed()
+            except Exception as e:
+                logger.warning(f"Could not invalidate warehouse caches: {e}")
+
+    def _target_path(self, cmd: List[str]) -> Path:
+        if '--target-path' in cmd:
+            return Path(cmd[cmd.index('--target-path') + 1])
+        return Path(self.project_dir) / 'target'
+
+    def _history_path(self) -> Path:
+        return Path(self.project_dir) / 'target' / 'run_history'
+
+    async def _collect_run_results(self, cmd: List[str], since: float) -> Optional[Dict]:
+        """Parse and archive the run_results.json this invocation wrote, if any"""
+        try:
+            raw = await asyncio.to_thread(load_run_results, self._target_path(cmd), since)
+            if raw is None:
+                return None
+            await asyncio.to_thread(archive_run_results, self._history_path(), raw)
+            return parse_run_results(raw)
+        except Exception as e:
+            logger.warning(f"Could not read run_results.json: {e}")
+            return None
+
+    def _state_path(self) -> Path:
+        if self.config.get('dbt_state_dir'):
+            return Path(self.config['dbt_state_dir'])
+        return Path(self.project_dir) / 'target' / 'state'
+
+    async def _snapshot_state(self, cmd: List[str], since: float) -> Optional[Path]:
+        """Keep the manifest this invocation wrote as the changed-only baseline"""
+        manifest = self._target_path(cmd) / 'manifest.json'
+        try:
+            if not manifest.exists() or os.stat(manifest).st_mtime < since:
+                return None
+            return await asyncio.to_thread(snapshot_manifest, manifest, self._state_path())
+        except Exception as e:
+            logger.warning(f"Could not snapshot dbt state: {e}")
+            return None
+
+    async def _state_index(self) -> Optional[ManifestIndex]:
+        """Indexed state snapshot (None if there is none yet), cached like the manifest"""
+        path = self._state_path() / 'manifest.json'
+        if not path.exists():
+            return None
+        stamp = file_stamp(path)
+        if self.state_manifest is None or self.state_manifest.stamp != stamp:
+            async with self._manifest_lock:
+                if self.state_manifest is None or self.state_manifest.stamp != file_stamp(path):
+                    self.state_manifest = await asyncio.to_thread(ManifestIndex.load, path)
+        return self.state_manifest
+
+    async def _changed_only_args(self, command: str) -> Tuple[List[str], Dict]:
+        """
+        Selection arguments of a changed-only run and a preview of what it builds.
+
+        Without a state snapshot the whole project runs (and, on success,
+        becomes the snapshot).
+        """
+        state = await self._state_index()
+        if state is None:
+            message = 'No state snapshot yet: ran the full project'
+            if command != 'build':
+                message += ' (only a successful dbt_build creates the snapshot)'
+            return [], {'state': None, 'message': message}
+        preview = diff_state(
+            await self._manifest_index(), state, resource_types=JOB_RESOURCE_TYPES[command], limit=20
+        )
+        args = ['--select', MODIFIED_SELECTOR, '--defer', '--state', str(self._state_path())]
+        return args, {'state': str(self._state_path()), **preview}
+
+    def _worker(self) -> DbtWorkerClient:
+        if self.worker is None:
+            self.worker = DbtWorkerClient(self.project_dir, self.profiles_dir)
+        return self.worker
+
+    async def start_worker(self):
+        """Spawn the persistent dbt worker so its manifest is warm by the first call"""
+        if self.project_dir and self.config.get('dbt_worker'):
+            await self._worker().start()
+
+    async def close(self):
+        """Stop the persistent dbt worker, if running"""
+        if self.worker is not None:
+            await self.worker.close()
+
+    async def _run_in_worker(
+        self,
+        cmd: List[str],
+        timeout: int,
+        capture_json: bool
+    ) -> Optional[Dict]:
+        """
+        Run parse/compile/ls in the persistent worker.
+
+        Returns:
+            Dict shaped like a CLI result, or None when the worker is
+            unavailable and the CLI should be used instead
+        """
+        try:
+            response = await self._worker().invoke(cmd, timeout)
+        except WorkerUnavailable as e:
+            logger.warning(f"dbt worker unavailable, using the CLI: {e}")
+            return None
+        except asyncio.TimeoutError:
+            return {
+                'error': f'Command timed out after {timeout}s',
+                'command': ' '.join(cmd)
+            }
+
+        success = bool(response.get('success'))
+        output = {
+            'success': success,
+            'command': ' '.join(cmd),
+            'stdout': response.get('stdout') or '',
+            'stderr': response.get('stderr') if not success else None,
+            'worker': True,
+            'reparsed': response.get('reparsed', False),
+            'elapsed_seconds': response.get('elapsed_seconds')
+        }
+        if capture_json and success:
+            try:
+                output['data'] = json.loads(output['stdout'])
+            except json.JSONDecodeError:
+                pass
+        return output
+
+    def _track_run(self, invocation: DbtInvocation):
+        """Register a run, dropping the oldest finished ones past RUN_HISTORY"""
+        self.runs[invocation.run_id] = invocation
+        finished = [run_id for run_id, run in self.runs.items() if run.done]
+        for run_id in finished[:max(0, len(self.runs) - RUN_HISTORY)]:
+            del self.runs[run_id]
+
+    async def _cancel_run(self, run_id: str) -> bool:
+        invocation = self.runs.get(run_id)
+        return invocation is not None and await invocation.cancel()
+
+    async def _submit_job(
+        self,
+        cmd: List[str],
+        select: Optional[str],
+        exclude: Optional[str]
+    ) -> Dict:
+        """
+        Queue a run/test/build as a background job.
+
+        The selection is resolved against the manifest so the queue can tell
+        which jobs are independent; if it cannot be, the job runs alone.
+        """
+        if not self.project_dir:
+            return {'error': 'dbt project not found'}
+        nodes = reach = None
+        if not await self._ensure_manifest(select=select):
+            try:
+                index = await self._manifest_index()
+                nodes = select_nodes(
+                    index, select, exclude, resource_types=JOB_RESOURCE_TYPES[cmd[0]],
+                    methods=state_methods(await self._state_index())
+                )
+                reach = nodes | set(index.walk(nodes, index.parents)) | set(
+                    index.walk(nodes, index.children)
+                )
+            except Exception as e:
+                logger.warning(f"Selection not evaluated, job will run alone: {e}")
+                nodes = reach = None
+
+        job_id = f"job_{uuid.uuid4().hex[:8]}"
+        job_dir = Path(self.project_dir) / 'target' / 'jobs' / job_id
+        await asyncio.to_thread(self._prepare_job_dir, job_dir)
+        job = self.job_queue.submit(DbtJob(job_id, cmd, job_dir, nodes, reach))
+        return {'background': True, **job.as_dict()}
+
+    def _prepare_job_dir(self, job_dir: Path):
+        """Create a job's target path, seeded with dbt's partial parse state"""
+        target = job_dir / 'target'
+        target.mkdir(parents=True, exist_ok=True)
+        partial_parse = Path(self.project_dir) / 'target' / 'partial_parse.msgpack'
+        if partial_parse.exists():
+            shutil.copy2(partial_parse, target / 'partial_parse.msgpack')
+
+    def _manifest_path(self) -> Path:
+        return Path(self.project_dir) / 'target' / 'manifest.json'
+
+    async def _manifest_index(self) -> ManifestIndex:
+        """
+        Indexed manifest, re-read only when the file on disk has changed.
+
+        The file's (mtime, size) is checked on every call; parsing runs in a
+        worker thread so a large manifest does not block the event loop.
+
+        Raises:
+            OSError: If the manifest cannot be read
+            ValueError: If it is not valid JSON
+        """
+        path = self._manifest_path()
+        stamp = file_stamp(path)
+        if self.manifest is not None and self.manifest.stamp == stamp:
+            return self.manifest
+        async with self._manifest_lock:
+            # Another call may have reloaded it while this one waited
+            if self.manifest is None or self.manifest.stamp != file_stamp(path):
+                self.manifest = await asyncio.to_thread(ManifestIndex.load, path)
+        return self.manifest
+
     async def dbt_parse(self) -> Dict:
         """
         Validate dbt project without executing (pre-flight check).
@@ -109,7 +396,7 @@ class DbtTools:
         Returns:
             Dict with validation result and any errors
         """
-        result = self._run_dbt(['parse'])
+        result = await self._run_dbt(['parse'])
 
         # Check if _run_dbt returned an error (e.g., project not found, timeout, dbt not installed)
         if 'error' in result:
@@ -150,7 +437,10 @@ class DbtTools:
         self,
         select: Optional[str] = None,
         exclude: Optional[str] = None,
-        full_refresh: bool = False
+        full_refresh: bool = False,
+        background: bool = False,
+        full_output: bool = False,
+        changed_only: bool = False
     ) -> Dict:
         """
         Run dbt models with pre-validation.
@@ -159,10 +449,19 @@ class DbtTools:
             select: Model selection (e.g., "model_name", "+model_name", "tag:daily")
             exclude: Models to exclude
             full_refresh: If True, rebuild incremental models
+            background: If True, queue as a job and return its job_id at once
+            full_output: Return all of dbt's output (default: the last 5000
+                characters; per-node results are in `run_results`)
+            changed_only: Only build nodes modified since the last state
+                snapshot and their descendants (`state:modified+` with
+                `--defer`); cannot be combined with select
 
         Returns:
             Dict with run result
         """
+        if changed_only and select:
+            return {'error': 'changed_only selects state:modified+ and cannot be combined with select'}
+
         # ALWAYS validate first
         parse_result = await self.dbt_parse()
         if not parse_result.get('valid'):
@@ -172,19 +471,37 @@ class DbtTools:
             }
 
         cmd = ['run']
-        if select:
+        changed = None
+        if changed_only:
+            try:
+                args, changed = await self._changed_only_args('run')
+            except Exception as e:
+                logger.error(f"dbt_run changed_only failed: {e}")
+                return {'error': str(e)}
+            cmd.extend(args)
+            if args:
+                select = MODIFIED_SELECTOR
+        elif select:
             cmd.extend(['--select', select])
         if exclude:
             cmd.extend(['--exclude', exclude])
         if full_refresh:
             cmd.append('--full-refresh')
 
-        return self._run_dbt(cmd)
+        if background:
+            result = await self._submit_job(cmd, select, exclude)
+        else:
+            result = await self._run_dbt(cmd, full_output=full_output)
+        if changed is not None:
+            result['changed_only'] = changed
+        return result
 
     async def dbt_test(
         self,
         select: Optional[str] = None,
-        exclude: Optional[str] = None
+        exclude: Optional[str] = None,
+        background: bool = False,
+        full_output: bool = False
     ) -> Dict:
         """
         Run dbt tests.
@@ -192,6 +509,9 @@ class DbtTools:
         Args:
             select: Test selection
             exclude: Tests to exclude
+            background: If True, queue as a job and return its job_id at once
+            full_output: Return all of dbt's output (default: the last 5000
+                characters; per-node results are in `run_results`)
 
         Returns:
             Dict with test results
@@ -202,13 +522,18 @@ class DbtTools:
         if exclude:
             cmd.extend(['--exclude', exclude])
 
-        return self._run_dbt(cmd)
+        if background:
+            return await self._submit_job(cmd, select, exclude)
+        return await self._run_dbt(cmd, full_output=full_output)
 
     async def dbt_build(
         self,
         select: Optional[str] = None,
         exclude: Optional[str] = None,
-        full_refresh: bool = False
+        full_refresh: bool = False,
+        background: bool = False,
+        full_output: bool = False,
+        changed_only: bool = False
     ) -> Dict:
         """
         Run dbt build (run + test) with pre-validation.
@@ -217,10 +542,19 @@ class DbtTools:
             select: Model/test selection
             exclude: Resources to exclude
             full_refresh: If True, rebuild incremental models
+            background: If True, queue as a job and return its job_id at once
+            full_output: Return all of dbt's output (default: the last 5000
+                characters; per-node results are in `run_results`)
+            changed_only: Only build nodes modified since the last state
+                snapshot and their descendants (`state:modified+` with
+                `--defer`); cannot be combined with select
 
         Returns:
             Dict with build result
         """
+        if changed_only and select:
+            return {'error': 'changed_only selects state:modified+ and cannot be combined with select'}
+
         # ALWAYS validate first
         parse_result = await self.dbt_parse()
         if not parse_result.get('valid'):
@@ -230,14 +564,30 @@ class DbtTools:
             }
 
         cmd = ['build']
-        if select:
+        changed = None
+        if changed_only:
+            try:
+                args, changed = await self._changed_only_args('build')
+            except Exception as e:
+                logger.error(f"dbt_build changed_only failed: {e}")
+                return {'error': str(e)}
+            cmd.extend(args)
+            if args:
+                select = MODIFIED_SELECTOR
+        elif select:
             cmd.extend(['--select', select])
         if exclude:
             cmd.extend(['--exclude', exclude])
         if full_refresh:
             cmd.append('--full-refresh')
 
-        return self._run_dbt(cmd)
+        if background:
+            result = await self._submit_job(cmd, select, exclude)
+        else:
+            result = await self._run_dbt(cmd, full_output=full_output)
+        if changed is not None:
+            result['changed_only'] = changed
+        return result
 
     async def dbt_compile(
         self,
@@ -256,7 +606,7 @@ class DbtTools:
         if select:
             cmd.extend(['--select', select])
 
-        return self._run_dbt(cmd)
+        return await self._run_dbt(cmd)
 
     async def dbt_ls(
         self,
@@ -281,7 +631,7 @@ class DbtTools:
         if resource_type:
             cmd.extend(['--resource-type', resource_type])
 
-        result = self._run_dbt(cmd)
+        result = await self._run_dbt(cmd)
 
         if result.get('success') and result.get('stdout'):
             lines = [l.strip() for l in result['stdout'].split('\n') if l.strip()]
@@ -297,7 +647,7 @@ class DbtTools:
         Returns:
             Dict with generation result
         """
-        result = self._run_dbt(['docs', 'generate'])
+        result = await self._run_dbt(['docs', 'generate'])
 
         if result.get('success') and self.project_dir:
             # Check for generated catalog
@@ -308,24 +658,185 @@ class DbtTools:
 
         return result
 
-    async def dbt_lineage(self, model: str) -> Dict:
+    async def dbt_status(
+        self,
+        run_id: Optional[str] = None,
+        cancel: bool = False
+    ) -> Dict:
         """
-        Get model dependencies and lineage.
+        Progress of dbt commands started by this server, or cancel one.
 
         Args:
-            model: Model name to analyze
+            run_id: Run to show (None = all recent runs, newest first)
+            cancel: If True, stop the run (SIGINT, then terminate/kill)
+
+        Returns:
+            Dict with the run's status, elapsed time and progress counters
+            (total, completed, statuses, running nodes, failures)
+        """
+        if run_id is None:
+            if cancel:
+                return {'error': 'run_id is required to cancel a run'}
+            runs = [run.as_dict() for run in reversed(self.runs.values())]
+            status = {
+                'runs': runs,
+                'running': sum(1 for run in self.runs.values() if not run.done)
+            }
+            if self.worker is not None:
+                status['worker'] = self.worker.stats()
+            return status
+
+        invocation = self.runs.get(run_id)
+        if invocation is None:
+            return {
+                'error': f'Unknown run_id: {run_id}',
+                'available_runs': list(self.runs)
+            }
+        if not cancel:
+            return invocation.as_dict()
+
+        try:
+            cancelled = await invocation.cancel()
+        except Exception as e:
+            logger.error(f"dbt_status cancel failed: {e}")
+            return {'error': str(e)}
+        result = invocation.as_dict()
+        result['cancelled'] = cancelled
+        if not cancelled:
+            result['message'] = f'Run already {invocation.status}'
+        return result
+
+    async def dbt_jobs(
+        self,
+        job_id: Optional[str] = None,
+        cancel: bool = False,
+        log_lines: int = 20
+    ) -> Dict:
+        """
+        Background dbt jobs: list them, show one, or cancel one.
+
+        Args:
+            job_id: Job to show or cancel (None = all jobs, newest first)
+            cancel: If True, drop a queued job or stop a running one
+            log_lines: Trailing log lines to include for a single job
+
+        Returns:
+            Dict with the job's status, timings, waiting_for (queued jobs),
+            live progress (running jobs), log tail and run_results summary
+        """
+        jobs = self.job_queue.jobs
+        if job_id is None:
+            if cancel:
+                return {'error': 'job_id is required to cancel a job'}
+            return {
+                'jobs': [job.as_dict() for job in reversed(jobs.values())],
+                **self.job_queue.stats()
+            }
+
+        job = jobs.get(job_id)
+        if job is None:
+            return {
+                'error': f'Unknown job_id: {job_id}',
+                'available_jobs': list(jobs)
+            }
+        if cancel:
+            try:
+                cancelled = await self.job_queue.cancel(job_id)
+            except Exception as e:
+                logger.error(f"dbt_jobs cancel failed: {e}")
+                return {'error': str(e)}
+            result = job.as_dict(log_lines)
+            result['cancelled'] = cancelled
+            return result
+
+        result = job.as_dict(log_lines)
+        if job.status == 'running' and job_id in self.runs:
+            result['progress'] = self.runs[job_id].progress.as_dict()
+        return result
+
+    async def dbt_timing_report(
+        self,
+        last: int = 5,
+        model: Optional[str] = None,
+        threshold_pct: float = 20.0,
+        min_seconds: float = 1.0,
+        limit: int = 20
+    ) -> Dict:
+        """
+        Compare node timings across the last runs to find models that got slower.
+
+        Runs are archived from run_results.json after every run/test/build
+        (including ones started outside this server, picked up from target/).
+        The newest run is compared with the median of the runs before it.
+
+        Args:
+            last: Number of recent runs to compare (at least 2)
+            model: Also return this model's timing in each run
+            threshold_pct: Minimum relative change to report
+            min_seconds: Minimum absolute change to report
+            limit: Maximum nodes per list
 
         Returns:
-            Dict with upstream and downstream dependencies
+            Dict with the compared runs, slower / faster nodes (baseline,
+            change in seconds and percent, earlier timings) and new nodes
         """
         if not self.project_dir:
             return {'error': 'dbt project not found'}
+        if last < 2:
+            return {'error': 'last must be at least 2'}
 
-        manifest_path = Path(self.project_dir) / 'target' / 'manifest.json'
+        history = self._history_path()
+        try:
+            latest = await asyncio.to_thread(load_run_results, Path(self.project_dir) / 'target')
+            if latest is not None:
+                await asyncio.to_thread(archive_run_results, history, latest)
+            runs = await asyncio.to_thread(load_history, history, last)
+        except Exception as e:
+            logger.error(f"dbt_timing_report failed: {e}")
+            return {'error': str(e)}
+
+        if len(runs) < 2:
+            return {
+                'runs': len(runs),
+                'message': 'Need at least 2 recorded runs to compare',
+                'suggestion': 'Run dbt_run or dbt_build again, then retry'
+            }
+
+        report = compare_runs(runs, threshold_pct, min_seconds, limit)
+        if model:
+            names = {uid for run in runs for uid in run['nodes']}
+            matches = sorted(
+                uid for uid in names
+                if uid == model or (uid.startswith('model.') and uid.endswith(f'.{model}'))
+            )
+            if not matches:
+                report['model'] = {'error': f'Model not found in recorded runs: {model}'}
+            else:
+                unique_id = matches[0]
+                report['model'] = {
+                    'unique_id': unique_id,
+                    'timings': [
+                        {
+                            'generated_at': run.get('generated_at'),
+                            'status': run['nodes'][unique_id][0],
+                            'execution_time': run['nodes'][unique_id][1],
+                            'rows_affected': run['nodes'][unique_id][2]
+                        }
+                        for run in runs if unique_id in run['nodes']
+                    ]
+                }
+        return report
+
+    async def _ensure_manifest(self, select: Optional[str] = None) -> Optional[Dict]:
+        """Compile the project when no manifest exists yet; returns an error dict on failure"""
+        if not self.project_dir:
+            return {'error': 'dbt project not found'}
+
+        manifest_path = self._manifest_path()
 
         # Generate manifest if not exists
         if not manifest_path.exists():
-            compile_result = await self.dbt_compile(select=model)
+            compile_result = await self.dbt_compile(select=select)
             if not compile_result.get('success'):
                 return {
                     'error': 'Failed to compile manifest',
@@ -337,51 +848,252 @@ class DbtTools:
                 'error': 'Manifest not found',
                 'suggestion': 'Run dbt compile first'
             }
+        return None
 
-        try:
-            with open(manifest_path) as f:
-                manifest = json.load(f)
+    def _not_found(self, index: ManifestIndex, model: str) -> Dict:
+        return {
+            'error': f'Model not found: {model}',
+            'available_models': index.names('model', limit=20)
+        }
 
-            # Find the model node
-            model_key = None
-            for key in manifest.get('nodes', {}):
-                if key.endswith(f'.{model}') or manifest['nodes'][key].get('name') == model:
-                    model_key = key
-                    break
+    async def dbt_lineage(
+        self,
+        model: str,
+        depth: int = 1,
+        direction: str = 'both'
+    ) -> Dict:
+        """
+        Get model dependencies and lineage.
 
-            if not model_key:
-                return {
-                    'error': f'Model not found: {model}',
-                    'available_models': [
-                        n.get('name') for n in manifest.get('nodes', {}).values()
-                        if n.get('resource_type') == 'model'
-                    ][:20]
-                }
+        Args:
+            model: Model name to analyze
+            depth: Levels to follow (1 = direct parents/children, 0 = all)
+            direction: 'upstream', 'downstream' or 'both'
 
-            node = manifest['nodes'][model_key]
+        Returns:
+            Dict with upstream and downstream dependencies (nearest first);
+            for depth != 1 also upstream_by_depth / downstream_by_depth
+        """
+        if direction not in LINEAGE_DIRECTIONS:
+            return {
+                'error': f"Unknown direction '{direction}'. Use one of: {', '.join(LINEAGE_DIRECTIONS)}"
+            }
+        error = await self._ensure_manifest(select=model)
+        if error:
+            return error
 
-            # Get upstream (depends_on)
-            upstream = node.get('depends_on', {}).get('nodes', [])
+        try:
+            index = await self._manifest_index()
 
-            # Get downstream (find nodes that depend on this one)
-            downstream = []
-            for key, other_node in manifest.get('nodes', {}).items():
-                deps = other_node.get('depends_on', {}).get('nodes', [])
-                if model_key in deps:
-                    downstream.append(key)
+            model_key = index.resolve(model)
+            if not model_key:
+                return self._not_found(index, model)
 
-            return {
+            node = index.nodes[model_key]
+            result = {
                 'model': model,
                 'unique_id': model_key,
-                'materialization': node.get('config', {}).get('materialized'),
+                'materialization': node['config'].get('materialized'),
                 'schema': node.get('schema'),
                 'database': node.get('database'),
-                'upstream': upstream,
-                'downstream': downstream,
                 'description': node.get('description'),
                 'tags': node.get('tags', [])
             }
+            limit = depth or None
+            for name, walk in (('upstream', index.upstream), ('downstream', index.downstream)):
+                if direction not in (name, 'both'):
+                    continue
+                if depth == 1:
+                    edges = index.parents if name == 'upstream' else index.children
+                    result[name] = edges.get(model_key, [])
+                    continue
+                distances = walk(model_key, limit)
+                ordered = sorted(distances, key=lambda uid: (distances[uid], uid))
+                result[name] = ordered
+                by_depth: Dict[str, List[str]] = {}
+                for uid in ordered:
+                    by_depth.setdefault(str(distances[uid]), []).append(uid)
+                result[f'{name}_by_depth'] = by_depth
+            return result
 
         except Exception as e:
             logger.error(f"dbt_lineage failed: {e}")
             return {'error': str(e)}
+
+    async def dbt_path(self, from_model: str, to_model: str) -> Dict:
+        """
+        Shortest dependency chain between two nodes.
+
+        Looks downstream from `from_model` first, then the other way round.
+
+        Args:
+            from_model: Starting node name or unique_id
+            to_model: Target node name or unique_id
+
+        Returns:
+            Dict with the path (unique_ids), its length and direction, or
+            connected: False
+        """
+        error = await self._ensure_manifest()
+        if error:
+            return error
+
+        try:
+            index = await self._manifest_index()
+            source = index.resolve(from_model)
+            target = index.resolve(to_model)
+            for name, key in ((from_model, source), (to_model, target)):
+                if not key:
+                    return self._not_found(index, name)
+
+            path = index.shortest_path(source, target)
+            direction = 'downstream'
+            if path is None:
+                path = index.shortest_path(target, source)
+                direction = 'upstream'
+                if path is not None:
+                    path = path[::-1]
+            if path is None:
+                return {'from': source, 'to': target, 'connected': False}
+            return {
+                'from': source,
+                'to': target,
+                'connected': True,
+                'direction': direction,
+                'length': len(path) - 1,
+                'path': path
+            }
+        except Exception as e:
+            logger.error(f"dbt_path failed: {e}")
+            return {'error': str(e)}
+
+    async def dbt_impact(self, model: str) -> Dict:
+        """
+        Blast radius of changing a node: everything downstream of it.
+
+        Args:
+            model: Model (or any node) name or unique_id
+
+        Returns:
+            Dict with downstream counts per resource type, max depth, and
+            the affected exposures, models and tests
+        """
+        error = await self._ensure_manifest(select=model)
+        if error:
+            return error
+
+        try:
+            index = await self._manifest_index()
+            model_key = index.resolve(model)
+            if not model_key:
+                return self._not_found(index, model)
+            return {'model': model, 'unique_id': model_key, **index.blast_radius(model_key)}
+        except Exception as e:
+            logger.error(f"dbt_impact failed: {e}")
+            return {'error': str(e)}
+
+    async def dbt_select(
+        self,
+        select: Optional[str] = None,
+        exclude: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        limit: int = 500
+    ) -> Dict:
+        """
+        Evaluate a dbt selector against the cached manifest (no `dbt ls`).
+
+        Supports union (space), intersection (comma), `+`/`N+` graph
+        operators, `@`, and the tag/path/resource_type/package/fqn/source/
+        exposure/test_type/test_name/config.<key> methods, plus `state:`
+        (modified, new, modified.body/configs/relation) against the state
+        snapshot.
+
+        Args:
+            select: Selector, e.g. "+fct_orders+", "tag:daily,resource_type:model"
+            exclude: Selector to remove from the result
+            resource_type: Keep only this resource type
+            limit: Maximum unique_ids to return
+
+        Returns:
+            Dict with selected unique_ids, count and counts per resource type
+        """
+        error = await self._ensure_manifest()
+        if error:
+            return error
+
+        try:
+            index = await self._manifest_index()
+            selected = select_nodes(
+                index, select, exclude,
+                resource_types=[resource_type] if resource_type else None,
+                methods=state_methods(await self._state_index())
+            )
+        except SelectorError as e:
+            return {'error': str(e)}
+        except Exception as e:
+            logger.error(f"dbt_select failed: {e}")
+            return {'error': str(e)}
+
+        counts: Dict[str, int] = {}
+        for uid in selected:
+            resource = index.nodes[uid]['resource_type']
+            counts[resource] = counts.get(resource, 0) + 1
+        ordered = sorted(selected)
+        return {
+            'select': select,
+            'exclude': exclude,
+            'count': len(ordered),
+            'counts': dict(sorted(counts.items())),
+            'unique_ids': ordered[:limit],
+            'truncated': len(ordered) > limit
+        }
+
+    async def dbt_changed(self, parse: bool = True, limit: int = 100) -> Dict:
+        """
+        Preview a changed-only run: nodes modified since the state snapshot.
+
+        Compares node checksums, configs and relations of the current
+        manifest with the snapshot taken after the last full or changed-only
+        dbt_build, without running dbt against the warehouse.
+
+        Args:
+            parse: Re-parse the project first so recent edits are seen
+            limit: Maximum unique_ids per list
+
+        Returns:
+            Dict with modified nodes and why, the downstream nodes a
+            changed-only build adds, counts per resource type and removed
+            nodes
+        """
+        if not self.project_dir:
+            return {'error': 'dbt project not found'}
+        if parse:
+            parse_result = await self.dbt_parse()
+            if not parse_result.get('valid'):
+                return {'error': 'Parse failed', **parse_result}
+        error = await self._ensure_manifest()
+        if error:
+            return error
+
+        try:
+            index = await self._manifest_index()
+            state = await self._state_index()
+            if state is None:
+                return {
+                    'state': None,
+                    'message': 'No state snapshot yet',
+                    'suggestion': 'Run a full dbt_build; later builds can use changed_only: true'
+                }
+            return {'state': str(self._state_path()), **diff_state(index, state, limit=limit)}
+        except Exception as e:
+            logger.error(f"dbt_changed failed: {e}")
+            return {'error': str(e)}
+
+
+def _tail(text: str, limit: int) -> str:
+    """Last `limit` characters of text, starting at a line boundary"""
+    tail = text[-limit:]
+    newline = tail.find('\n')
+    if 0 <= newline < len(tail) - 1:
+        tail = tail[newline + 1:]
+    return f'... [{len(text) - len(tail)} characters truncated]\n{tail}'
@@ -0,0 +1,333 @@
+"""
+Persistent dbt worker.
+
+Keeps one Python process with dbt imported and the project's manifest
+parsed, and serves parse/compile/ls through dbt's programmatic `dbtRunner`
+over a local pipe (JSON lines on the worker's stdin/stdout). A warm worker
+skips the interpreter start, dbt import and project parse that every `dbt`
+CLI call pays, so `dbt_ls` and a single-model `dbt_compile` return in well
+under a second. The manifest is re-parsed when a project file changes.
+
+DbtWorkerClient is the server side; the worker itself runs this file as a
+script: `python dbt_worker.py --project-dir DIR [--profiles-dir DIR]`.
+Only the standard library is imported at module level so the script starts
+without the server's dependencies.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Commands served by the worker; everything else runs through the CLI
+WORKER_COMMANDS = ('parse', 'compile', 'ls', 'list')
+
+# Files whose changes invalidate the warm manifest
+PROJECT_SUFFIXES = ('.sql', '.yml', '.yaml', '.py', '.csv', '.md', '.jinja', '.jinja2')
+
+# Directories dbt writes to or installs into
+SKIP_DIRS = {'target', 'dbt_packages', 'dbt_modules', 'logs', 'node_modules'}
+
+# Seconds to wait for the worker's import and first parse
+STARTUP_TIMEOUT = 120.0
+
+# Pipe line limit; ls/compile responses are single JSON lines
+STREAM_LIMIT = 64 * 1024 * 1024
+
+
+class WorkerUnavailable(RuntimeError):
+    """The worker could not start or exited; callers fall back to the CLI"""
+
+
+def project_fingerprint(project_dir: str, profiles_dir: Optional[str] = None) -> int:
+    """
+    Hash of the (path, mtime, size) of every project source file.
+
+    Changes when a model, YAML file, macro or seed is added, edited or
+    removed, or when profiles.yml changes.
+    """
+    entries = []
+    for root, dirs, files in os.walk(project_dir):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith('.')]
+        for name in files:
+            if name.endswith(PROJECT_SUFFIXES):
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                entries.append((path, stat.st_mtime_ns, stat.st_size))
+    if profiles_dir:
+        profiles = os.path.join(profiles_dir, 'profiles.yml')
+        if os.path.exists(profiles):
+            stat = os.stat(profiles)
+            entries.append((profiles, stat.st_mtime_ns, stat.st_size))
+    return hash(tuple(sorted(entries)))
+
+
+class DbtWorker:
+    """Worker side: runs dbt commands in process against a warm manifest"""
+
+    def __init__(self, project_dir: str, profiles_dir: Optional[str] = None, runner_cls=None):
+        """
+        Args:
+            project_dir: dbt project directory
+            profiles_dir: Directory holding profiles.yml
+            runner_cls: dbtRunner implementation (default: dbt.cli.main.dbtRunner)
+
+        Raises:
+            ImportError: If dbt-core (>= 1.5) is not installed
+        """
+        if runner_cls is None:
+            from dbt.cli.main import dbtRunner
+            runner_cls = dbtRunner
+        self.runner_cls = runner_cls
+        self.project_dir = project_dir
+        self.profiles_dir = profiles_dir
+        self.manifest = None
+        self.fingerprint: Optional[int] = None
+        self.messages: List = []
+
+    def _flags(self) -> List[str]:
+        flags = ['--project-dir', self.project_dir]
+        if self.profiles_dir:
+            flags.extend(['--profiles-dir', self.profiles_dir])
+        return flags
+
+    def _collect(self, event):
+        """dbtRunner callback: keep the messages the CLI would print"""
+        info = event.info
+        if info.level in ('info', 'warn', 'error') and info.msg:
+            self.messages.append((info.level, info.msg))
+
+    def _invoke(self, args: List[str], manifest=None):
+        self.messages = []
+        runner = self.runner_cls(manifest=manifest, callbacks=[self._collect])
+        return runner.invoke(args + self._flags())
+
+    def _parse(self):
+        # Fingerprint first: an edit made during the parse triggers another
+        fingerprint = project_fingerprint(self.project_dir, self.profiles_dir)
+        result = self._invoke(['parse'])
+        if result.success:
+            self.manifest = result.result
+            self.fingerprint = fingerprint
+        else:
+            self.manifest = None
+        return result
+
+    def handle(self, args: List[str]) -> Dict:
+        """
+        Run one command.
+
+        Returns:
+            Dict with success, stdout (the log messages, or the resource
+            list for ls), stderr on failure, whether the manifest was
+            re-parsed, and elapsed_seconds
+        """
+        started = time.perf_counter()
+        command = args[0] if args else ''
+        if command not in WORKER_COMMANDS:
+            return {'success': False, 'stdout': '', 'stderr': f"Unsupported worker command: '{command}'"}
+
+        reparsed = False
+        if (
+            command == 'parse'
+            or self.manifest is None
+            or project_fingerprint(self.project_dir, self.profiles_dir) != self.fingerprint
+        ):
+            result = self._parse()
+            reparsed = True
+            if command != 'parse' and result.success:
+                result = self._invoke(args, self.manifest)
+        else:
+            result = self._invoke(args, self.manifest)
+
+        if command in ('ls', 'list') and result.success and isinstance(result.result, list):
+            stdout = '\n'.join(str(line) for line in result.result)
+        else:
+            stdout = '\n'.join(message for _, message in self.messages)
+        errors = [message for level, message in self.messages if level == 'error']
+        if result.exception is not None:
+            errors.append(f'{type(result.exception).__name__}: {result.exception}')
+        return {
+            'success': bool(result.success),
+            'stdout': stdout,
+            'stderr': None if result.success else '\n'.join(errors),
+            'reparsed': reparsed,
+            'elapsed_seconds': round(time.perf_counter() - started, 3)
+        }
+
+
+class DbtWorkerClient:
+    """Server side: starts the worker and sends it commands one at a time"""
+
+    def __init__(
+        self,
+        project_dir: str,
+        profiles_dir: Optional[str] = None,
+        startup_timeout: float = STARTUP_TIMEOUT
+    ):
+        self.project_dir = project_dir
+        self.profiles_dir = profiles_dir
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.info: Dict = {}
+        self.disabled_reason: Optional[str] = None
+        self.requests = 0
+        self._ready = False
+        self._lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+
+    async def start(self):
+        """Spawn the worker; it imports dbt and parses the project in the background"""
+        if self.process is not None and self.process.returncode is None:
+            return
+        cmd = [sys.executable, str(Path(__file__).resolve()), '--project-dir', self.project_dir]
+        if self.profiles_dir:
+            cmd.extend(['--profiles-dir', self.profiles_dir])
+        env = os.environ.copy()
+        env['DBT_SEND_ANONYMOUS_USAGE_STATS'] = 'false'
+        self._ready = False
+        self.process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=self.project_dir,
+            env=env,
+            limit=STREAM_LIMIT
+        )
+        logger.info(f"Started dbt worker (pid {self.process.pid})")
+
+    async def _wait_ready(self):
+        if self._ready:
+            return
+        try:
+            line = await asyncio.wait_for(self.process.stdout.readline(), self.startup_timeout)
+            message = json.loads(line) if line else {'error': 'dbt worker exited during startup'}
+        except (asyncio.TimeoutError, ValueError) as e:
+            message = {'error': f'dbt worker did not start: {str(e) or "timed out"}'}
+        if not message.get('ready'):
+            # Do not pay the startup cost again on every call
+            self.disabled_reason = message.get('error') or 'dbt worker failed to start'
+            await self.close()
+            raise WorkerUnavailable(self.disabled_reason)
+        self.info = message
+        self._ready = True
+        logger.info(f"dbt worker ready (dbt {message.get('dbt_version')})")
+
+    async def invoke(self, args: List[str], timeout: float) -> Dict:
+        """
+        Run a command in the worker.
+
+        Raises:
+            WorkerUnavailable: If the worker cannot start or exits mid-command
+            asyncio.TimeoutError: If the command ran longer than `timeout`
+                (the worker is restarted on the next call)
+        """
+        if self.disabled_reason:
+            raise WorkerUnavailable(self.disabled_reason)
+        async with self._lock:
+            if self.process is None or self.process.returncode is not None:
+                await self.start()
+            await self._wait_ready()
+            request = {'id': next(self._ids), 'args': args}
+            try:
+                self.process.stdin.write((json.dumps(request) + '\n').encode())
+                await self.process.stdin.drain()
+                line = await asyncio.wait_for(self.process.stdout.readline(), timeout)
+                if not line:
+                    raise WorkerUnavailable('dbt worker exited')
+                response = json.loads(line)
+            except asyncio.TimeoutError:
+                # The worker is still busy with this command; replace it
+                await self.close()
+                raise
+            except (OSError, ValueError) as e:
+                await self.close()
+                raise WorkerUnavailable(f'dbt worker failed: {e}') from e
+            except WorkerUnavailable:
+                await self.close()
+                raise
+            self.requests += 1
+            return response
+
+    async def close(self):
+        """Stop the worker (it also exits on its own when the pipe closes)"""
+        process, self.process = self.process, None
+        self._ready = False
+        if process is None or process.returncode is not None:
+            return
+        process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), 5)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+    def stats(self) -> Dict:
+        return {
+            'running': self.process is not None and self.process.returncode is None,
+            'ready': self._ready,
+            'dbt_version': self.info.get('dbt_version'),
+            'requests': self.requests,
+            'disabled_reason': self.disabled_reason
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Worker entry point: one JSON request per stdin line, one response per stdout line"""
+    parser = argparse.ArgumentParser(description='Persistent dbt worker')
+    parser.add_argument('--project-dir', required=True)
+    parser.add_argument('--profiles-dir')
+    args = parser.parse_args(argv)
+
+    # Responses own the original stdout; anything dbt prints goes to stderr
+    channel = os.fdopen(os.dup(1), 'w')
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    def send(message: Dict):
+        channel.write(json.dumps(message, default=str) + '\n')
+        channel.flush()
+
+    try:
+        worker = DbtWorker(args.project_dir, args.profiles_dir)
+    except ImportError as e:
+        send({'ready': False, 'error': f'dbt-core >= 1.5 (dbtRunner) is required: {e}'})
+        return 1
+    try:
+        from dbt.version import __version__ as dbt_version
+    except ImportError:
+        dbt_version = None
+
+    # Warm the manifest before accepting requests
+    warm = worker.handle(['parse'])
+    send({
+        'ready': True,
+        'dbt_version': dbt_version,
+        'parsed': warm['success'],
+        'elapsed_seconds': warm['elapsed_seconds']
+    })
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request: Dict = {}
+        try:
+            request = json.loads(line)
+            response = worker.handle(request['args'])
+        except Exception as e:
+            response = {'success': False, 'stdout': '', 'stderr': f'{type(e).__name__}: {e}'}
+        response['id'] = request.get('id') if isinstance(request, dict) else None
+        send(response)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,19 +3,114 @@ pandas MCP Tools.
 
 Provides DataFrame operations with Arrow IPC data_ref persistence.
 """
+import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 import json
 import logging
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 
 from .data_store import DataStore
 from .config import load_config
+from .arrow_aggregation import IncrementalGroupBy
+from .arrow_geometry import (
+    Geometries,
+    areas,
+    bounds,
+    centroids,
+    geometry_columns,
+    read_geometries,
+    summarize
+)
+from .arrow_expressions import (
+    parse_condition,
+    condition_columns,
+    ExpressionNotSupported,
+    ARROW_FALLBACK_ERRORS
+)
 
 logger = logging.getLogger(__name__)
 
+# pandas aggregation name -> (Arrow hash aggregate, options)
+ARROW_AGGREGATIONS = {
+    'sum': ('sum', None),
+    'mean': ('mean', None),
+    'min': ('min', None),
+    'max': ('max', None),
+    'count': ('count', None),
+    'nunique': ('count_distinct', None),
+    'std': ('stddev', pc.VarianceOptions(ddof=1)),
+    'var': ('variance', pc.VarianceOptions(ddof=1)),
+}
+
+# File suffix -> pyarrow.dataset format
+DATASET_FORMATS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.csv': 'csv',
+    '.arrow': 'ipc',
+    '.feather': 'ipc',
+    '.ipc': 'ipc',
+}
+
+# Lon/lat SRIDs, where planar areas come out in square degrees
+GEOGRAPHIC_SRIDS = {4326, 4269, 4258, 4283}
+
+# pandas merge how -> Arrow join_type. right and outer stay on pandas:
+# pd.merge orders them by right rows and by sorted keys respectively
+ARROW_JOIN_TYPES = {
+    'inner': 'inner',
+    'left': 'left outer',
+}
+
+
+class _IngestStats:
+    """Throughput and peak Arrow memory tracking for streaming reads"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.baseline = pa.total_allocated_bytes()
+        self.peak = 0
+        self.rows_scanned = 0
+        self.rows_kept = 0
+        self.row_groups_total = None
+        self.row_groups_read = None
+        self.files_total = None
+        self.files_read = None
+        self.stopped_early = False
+
+    def scanned(self, rows: int):
+        self.rows_scanned += rows
+        self.peak = max(self.peak, pa.total_allocated_bytes() - self.baseline)
+
+    def kept(self, rows: int) -> int:
+        self.rows_kept += rows
+        self.peak = max(self.peak, pa.total_allocated_bytes() - self.baseline)
+        return self.rows_kept
+
+    def as_dict(self) -> Dict:
+        elapsed = time.perf_counter() - self.started
+        result = {
+            'rows_scanned': self.rows_scanned,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_sec': round(self.rows_scanned / elapsed) if elapsed > 0 else None,
+            'peak_memory_mb': round(self.peak / (1024 * 1024), 2),
+            'stopped_early': self.stopped_early
+        }
+        if self.files_total is not None:
+            result['files_total'] = self.files_total
+            result['files_read'] = self.files_read
+        if self.row_groups_total is not None:
+            result['row_groups_total'] = self.row_groups_total
+            result['row_groups_read'] = self.row_groups_read
+        return result
+
 
 class PandasTools:
     """pandas data manipulation tools with data_ref persistence"""
@@ -25,103 +120,432 @@ class PandasTools:
         config = load_config()
         self.max_rows = config.get('max_rows', 100_000)
         self.store.set_max_rows(self.max_rows)
+        self.max_memory_mb = config.get('max_memory_mb', 0)
+        self.store.set_memory_budget(self.max_memory_mb)
+        if config.get('cache_dir'):
+            self.store.set_cache_dir(config['cache_dir'])
+        self.store.purge_spill_dir()
+        self.store.set_pandas_cache_size(config.get('pandas_cache_size', 8))
+        if config.get('storage_mode') == 'ipc':
+            self.store.set_storage_mode('ipc')
+            self.store.reindex_ipc_dir()
 
     def _check_and_store(
         self,
-        df: pd.DataFrame,
+        df: Union[pd.DataFrame, pa.Table],
         name: Optional[str] = None,
-        source: Optional[str] = None
+        source: Optional[str] = None,
+        engine: Optional[str] = None
     ) -> Dict:
-        """Check row limit and store DataFrame if within limits"""
-        check = self.store.check_row_limit(len(df))
+        """Check row limit and store DataFrame (or Arrow Table) if within limits"""
+        if isinstance(df, pa.Table):
+            rows = df.num_rows
+            columns = df.column_names
+            dtypes = {f.name: str(f.type) for f in df.schema}
+        else:
+            rows = len(df)
+            columns = list(df.columns)
+            dtypes = {col: str(dtype) for col, dtype in df.dtypes.items()}
+
+        check = self.store.check_row_limit(rows)
         if check['exceeded']:
+            preview = (
+                df.slice(0, 100).to_pylist() if isinstance(df, pa.Table)
+                else df.head(100).to_dict(orient='records')
+            )
             return {
                 'error': 'row_limit_exceeded',
                 **check,
-                'preview': df.head(100).to_dict(orient='records')
+                'preview': preview
             }
 
         data_ref = self.store.store(df, name=name, source=source)
-        return {
+        result = {
             'data_ref': data_ref,
-            'rows': len(df),
-            'columns': list(df.columns),
-            'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()}
+            'rows': rows,
+            'columns': columns,
+            'dtypes': dtypes
         }
+        if engine:
+            result['engine'] = engine
+        return result
 
     async def read_csv(
         self,
         file_path: str,
         name: Optional[str] = None,
         chunk_size: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        condition: Optional[str] = None,
         **kwargs
     ) -> Dict:
         """
-        Load CSV file into DataFrame.
+        Load CSV file into a single DataFrame by streaming record batches.
+
+        The file is read with pyarrow.csv.open_csv: only the requested
+        columns are parsed and `condition` is applied to each batch as it
+        arrives, so the full file is never materialized. Reading stops early
+        once the row limit is exceeded. pandas is used instead when kwargs
+        have no Arrow equivalent or Arrow cannot parse the file.
 
         Args:
             file_path: Path to CSV file
             name: Optional name for data_ref
-            chunk_size: If provided, process in chunks
+            chunk_size: Approximate rows per streamed batch
+            columns: Optional list of columns to load
+            condition: Optional pandas-style row filter applied while reading
             **kwargs: Additional pandas read_csv arguments
 
         Returns:
-            Dict with data_ref or error info
+            Dict with data_ref (or error info), engine, and ingest stats
+            (rows_scanned, elapsed_seconds, rows_per_sec, peak_memory_mb)
         """
         path = Path(file_path)
         if not path.exists():
             return {'error': f'File not found: {file_path}'}
 
         try:
-            if chunk_size:
-                # Chunked processing - return iterator info
-                chunks = []
-                for i, chunk in enumerate(pd.read_csv(path, chunksize=chunk_size, **kwargs)):
-                    chunk_ref = self.store.store(chunk, name=f"{name or 'chunk'}_{i}", source=file_path)
-                    chunks.append({'ref': chunk_ref, 'rows': len(chunk)})
-                return {
-                    'chunked': True,
-                    'chunks': chunks,
-                    'total_chunks': len(chunks)
-                }
-
-            df = pd.read_csv(path, **kwargs)
-            return self._check_and_store(df, name=name, source=file_path)
+            options = self._arrow_csv_options(path, chunk_size, columns, condition, kwargs)
+            engine = 'arrow'
+            try:
+                if options is None:
+                    raise ExpressionNotSupported(f"pandas-only read_csv arguments: {sorted(kwargs)}")
+                table, stats = self._stream_csv_arrow(path, columns, condition, options)
+            except ARROW_FALLBACK_ERRORS as e:
+                logger.debug(f"read_csv falling back to pandas: {e}")
+                engine = 'pandas'
+                table, stats = self._stream_csv_pandas(path, chunk_size, columns, condition, kwargs)
+
+            return self._store_ingest(table, stats, name=name, source=file_path, engine=engine)
 
         except Exception as e:
             logger.error(f"read_csv failed: {e}")
             return {'error': str(e)}
 
+    def _store_ingest(
+        self,
+        table: pa.Table,
+        stats: Dict,
+        name: Optional[str],
+        source: str,
+        engine: str
+    ) -> Dict:
+        """Store a streamed read, or report the row limit if reading stopped early"""
+        if stats.pop('stopped_early'):
+            check = self.store.check_row_limit(table.num_rows)
+            return {
+                'error': 'row_limit_exceeded',
+                **check,
+                'message': f"{check['message']} (stopped reading early)",
+                'engine': engine,
+                **stats,
+                'preview': table.slice(0, 100).to_pylist()
+            }
+
+        result = self._check_and_store(table, name=name, source=source, engine=engine)
+        result.update(stats)
+        return result
+
+    def _arrow_csv_options(
+        self,
+        path: Path,
+        chunk_size: Optional[int],
+        columns: Optional[List[str]],
+        condition: Optional[str],
+        kwargs: Dict
+    ) -> Optional[Dict]:
+        """
+        Map read_csv arguments onto pyarrow.csv options.
+
+        Returns:
+            Dict of read/parse/convert options, or None if kwargs contain
+            pandas arguments without an Arrow equivalent
+        """
+        kwargs = dict(kwargs)
+        read_options = {}
+        parse_options = {}
+        convert_options = {}
+
+        delimiter = kwargs.pop('sep', None) or kwargs.pop('delimiter', None)
+        if delimiter is not None:
+            if len(delimiter) != 1:
+                return None
+            parse_options['delimiter'] = delimiter
+        if 'encoding' in kwargs:
+            read_options['encoding'] = kwargs.pop('encoding')
+        if isinstance(kwargs.get('skiprows'), int):
+            read_options['skip_rows'] = kwargs.pop('skiprows')
+        if 'names' in kwargs:
+            read_options['column_names'] = list(kwargs.pop('names'))
+        if 'usecols' in kwargs:
+            usecols = list(kwargs.pop('usecols'))
+            if not all(isinstance(c, str) for c in usecols):
+                return None
+            columns = columns or usecols
+        if kwargs:
+            return None
+
+        if columns:
+            needed = list(columns)
+            if condition:
+                needed += sorted(condition_columns(condition) - set(columns))
+            convert_options['include_columns'] = needed
+
+        if chunk_size:
+            # open_csv batches by bytes; estimate them from the leading rows
+            with open(path, 'rb') as f:
+                sample = f.read(64 * 1024)
+            row_bytes = max(1, len(sample) // max(1, sample.count(b'\n')))
+            read_options['block_size'] = max(1 << 16, chunk_size * row_bytes)
+
+        return {
+            'read_options': pa_csv.ReadOptions(**read_options),
+            'parse_options': pa_csv.ParseOptions(**parse_options),
+            'convert_options': pa_csv.ConvertOptions(**convert_options)
+        }
+
+    def _stream_csv_arrow(
+        self,
+        path: Path,
+        columns: Optional[List[str]],
+        condition: Optional[str],
+        options: Dict
+    ) -> Tuple[pa.Table, Dict]:
+        """Stream a CSV through pyarrow.csv.open_csv, filtering each batch"""
+        predicate = parse_condition(condition) if condition else None
+        stats = _IngestStats()
+        batches = []
+
+        with pa_csv.open_csv(str(path), **options) as reader:
+            schema = reader.schema
+            if columns:
+                schema = pa.schema([schema.field(c) for c in columns])
+            for batch in reader:
+                stats.scanned(batch.num_rows)
+                chunk = pa.Table.from_batches([batch])
+                if predicate is not None:
+                    chunk = chunk.filter(predicate)
+                if columns:
+                    chunk = chunk.select(columns)
+                batches.extend(chunk.to_batches())
+                if self.store.check_row_limit(stats.kept(chunk.num_rows))['exceeded']:
+                    stats.stopped_early = True
+                    break
+
+        return pa.Table.from_batches(batches, schema=schema), stats.as_dict()
+
+    def _stream_csv_pandas(
+        self,
+        path: Path,
+        chunk_size: Optional[int],
+        columns: Optional[List[str]],
+        condition: Optional[str],
+        kwargs: Dict
+    ) -> Tuple[pa.Table, Dict]:
+        """Read a CSV with pandas chunks, combining them into one Arrow table"""
+        stats = _IngestStats()
+        tables = []
+
+        reader = pd.read_csv(path, chunksize=chunk_size or 100_000, **kwargs)
+        with reader:
+            for chunk in reader:
+                stats.scanned(len(chunk))
+                if condition:
+                    chunk = chunk.query(condition)
+                if columns:
+                    chunk = chunk[columns]
+                tables.append(pa.Table.from_pandas(chunk, preserve_index=False))
+                if self.store.check_row_limit(stats.kept(len(chunk)))['exceeded']:
+                    stats.stopped_early = True
+                    break
+
+        table = pa.concat_tables(tables, promote_options='permissive') if tables else pa.table({})
+        return table, stats.as_dict()
+
     async def read_parquet(
         self,
         file_path: str,
         name: Optional[str] = None,
-        columns: Optional[List[str]] = None
+        columns: Optional[List[str]] = None,
+        filters: Optional[Union[str, List]] = None
     ) -> Dict:
         """
         Load Parquet file into DataFrame.
 
+        Reads through pyarrow.dataset: filters are pushed down so row groups
+        whose statistics cannot match are skipped, and the Arrow table is
+        stored directly without a pandas round-trip.
+
         Args:
             file_path: Path to Parquet file
             name: Optional name for data_ref
             columns: Optional list of columns to load
+            filters: Optional row filter, either DNF tuples
+                ([("col", "=", v)] or [[...], [...]]) or a pandas-style
+                expression string ("day == '2024-01-01' and amount > 0")
 
         Returns:
-            Dict with data_ref or error info
+            Dict with data_ref (or error info) and scan stats
+            (row_groups_total, row_groups_read, rows_scanned, ...)
         """
         path = Path(file_path)
         if not path.exists():
             return {'error': f'File not found: {file_path}'}
 
         try:
-            table = pq.read_table(path, columns=columns)
-            df = table.to_pandas()
-            return self._check_and_store(df, name=name, source=file_path)
+            dataset = ds.dataset(str(path), format='parquet')
+            predicate = self._filters_to_expression(filters)
+            table, stats = self._scan_dataset(dataset, columns, predicate)
+            return self._store_ingest(table, stats, name=name, source=file_path, engine='arrow')
 
         except Exception as e:
             logger.error(f"read_parquet failed: {e}")
             return {'error': str(e)}
 
+    def _filters_to_expression(
+        self,
+        filters: Optional[Union[str, List]]
+    ) -> Optional[pc.Expression]:
+        """Convert DNF filter tuples or an expression string to an Arrow expression"""
+        if not filters:
+            return None
+        if isinstance(filters, str):
+            return parse_condition(filters)
+        # JSON-RPC delivers tuples as lists
+        if isinstance(filters[0][0], (list, tuple)):
+            filters = [[tuple(term) for term in conjunction] for conjunction in filters]
+        else:
+            filters = [tuple(term) for term in filters]
+        return pq.filters_to_expression(filters)
+
+    def _scan_dataset(
+        self,
+        dataset: ds.Dataset,
+        columns: Optional[List[str]],
+        predicate: Optional[pc.Expression]
+    ) -> Tuple[pa.Table, Dict]:
+        """
+        Stream a dataset scan into one table, stopping at the row limit.
+
+        Partitions that cannot match the predicate are pruned, and Parquet
+        fragments are split by row group so groups whose min/max statistics
+        rule out the predicate are never read. The scanner reads the
+        remaining fragments in parallel.
+        """
+        stats = _IngestStats()
+        if isinstance(dataset, ds.FileSystemDataset):
+            stats.files_total = len(dataset.files)
+            stats.files_read = stats.files_total
+
+        if predicate is not None:
+            fragments = []
+            files = set()
+            stats.row_groups_total = 0
+            rows_to_read = 0
+            for fragment in dataset.get_fragments(filter=predicate):
+                files.add(fragment.path)
+                if isinstance(fragment, ds.ParquetFileFragment):
+                    stats.row_groups_total += fragment.num_row_groups
+                    row_groups = fragment.split_by_row_group(predicate, schema=dataset.schema)
+                    rows_to_read += sum(rg.row_groups[0].num_rows for rg in row_groups)
+                    fragments.extend(row_groups)
+                else:
+                    fragments.append(fragment)
+            stats.row_groups_read = len(fragments)
+            if stats.files_total is not None:
+                stats.files_read = len(files)
+            dataset = ds.FileSystemDataset(
+                fragments, dataset.schema, dataset.format, dataset.filesystem
+            )
+
+        scanner = dataset.scanner(columns=columns, filter=predicate, use_threads=True)
+        schema = scanner.projected_schema
+        batches = []
+        for batch in scanner.to_batches():
+            batches.append(batch)
+            if self.store.check_row_limit(stats.kept(batch.num_rows))['exceeded']:
+                stats.stopped_early = True
+                break
+
+        # Batches arrive already filtered; count rows in the row groups read
+        if predicate is not None and not stats.stopped_early and rows_to_read:
+            stats.rows_scanned = rows_to_read
+        else:
+            stats.rows_scanned = stats.rows_kept
+        return pa.Table.from_batches(batches, schema=schema), stats.as_dict()
+
+    async def read_dataset(
+        self,
+        path: Union[str, List[str]],
+        name: Optional[str] = None,
+        format: str = 'parquet',
+        partitioning: Optional[Union[str, List[str]]] = 'hive',
+        columns: Optional[List[str]] = None,
+        filters: Optional[Union[str, List]] = None
+    ) -> Dict:
+        """
+        Load a multi-file or partitioned dataset into one DataFrame.
+
+        Partition directories that cannot match `filters` are skipped
+        without being opened, Parquet row groups are pruned by statistics,
+        and the remaining fragments are read in parallel.
+
+        Args:
+            path: Dataset directory, or a list of files
+            name: Optional name for data_ref
+            format: File format ('parquet', 'csv', 'feather'/'ipc')
+            partitioning: 'hive' for key=value directories, a list of field
+                names for plain directory partitioning, or None
+            columns: Optional list of columns to load (partition keys allowed)
+            filters: Optional row filter (DNF tuples or expression string)
+
+        Returns:
+            Dict with data_ref (or error info) and scan stats
+            (files_total, files_read, row_groups_read, ...)
+        """
+        missing = self._missing_path(path)
+        if missing:
+            return missing
+
+        try:
+            dataset = self._open_dataset(path, format, partitioning)
+            predicate = self._filters_to_expression(filters)
+            table, stats = self._scan_dataset(dataset, columns, predicate)
+            return self._store_ingest(
+                table, stats, name=name, source=f"dataset: {path}", engine='arrow'
+            )
+
+        except Exception as e:
+            logger.error(f"read_dataset failed: {e}")
+            return {'error': str(e)}
+
+    def _open_dataset(
+        self,
+        path: Union[str, List[str]],
+        format: Optional[str] = None,
+        partitioning: Optional[Union[str, List[str]]] = 'hive'
+    ) -> ds.Dataset:
+        """
+        Open a file, directory, or file list as a pyarrow dataset.
+
+        The format is inferred from the file suffix when not given;
+        directories default to Parquet.
+        """
+        if format is None:
+            first = Path(path if isinstance(path, str) else path[0])
+            format = DATASET_FORMATS.get(first.suffix.lower(), 'parquet')
+        if isinstance(partitioning, list):
+            partitioning = ds.DirectoryPartitioning.discover(field_names=partitioning)
+        return ds.dataset(path, format=format, partitioning=partitioning)
+
+    def _missing_path(self, path: Union[str, List[str]]) -> Optional[Dict]:
+        """Return a not-found error for the first path that does not exist"""
+        paths = [path] if isinstance(path, str) else list(path)
+        missing = [p for p in paths if not Path(p).exists()]
+        if missing:
+            return {'error': f'File not found: {missing[0]}'}
+        return None
+
     async def read_json(
         self,
         file_path: str,
@@ -221,6 +645,75 @@ class PandasTools:
             logger.error(f"to_parquet failed: {e}")
             return {'error': str(e)}
 
+    async def write_dataset(
+        self,
+        data_ref: str,
+        base_dir: str,
+        format: str = 'parquet',
+        partition_cols: Optional[List[str]] = None,
+        max_rows_per_file: Optional[int] = None,
+        compression: str = 'snappy',
+        existing_data_behavior: str = 'error'
+    ) -> Dict:
+        """
+        Export DataFrame as a (partitioned) multi-file dataset.
+
+        Files are written in parallel by pyarrow.dataset.write_dataset,
+        using hive-style key=value directories for partition columns.
+
+        Args:
+            data_ref: Reference to stored DataFrame
+            base_dir: Output directory
+            format: File format ('parquet', 'csv', 'feather'/'ipc')
+            partition_cols: Columns to partition by
+            max_rows_per_file: Split output files at this many rows
+            compression: Parquet compression codec
+            existing_data_behavior: 'error', 'overwrite_or_ignore', or
+                'delete_matching'
+
+        Returns:
+            Dict with success status and files written
+        """
+        table = self.store.get(data_ref)
+        if table is None:
+            return {'error': f'DataFrame not found: {data_ref}'}
+
+        try:
+            written = []
+            options = {}
+            if format == 'parquet':
+                options['file_options'] = ds.ParquetFileFormat().make_write_options(
+                    compression=compression
+                )
+            if max_rows_per_file:
+                options['max_rows_per_file'] = max_rows_per_file
+                options['max_rows_per_group'] = min(max_rows_per_file, 1 << 20)
+
+            ds.write_dataset(
+                table,
+                base_dir,
+                format=format,
+                partitioning=partition_cols or None,
+                partitioning_flavor='hive' if partition_cols else None,
+                existing_data_behavior=existing_data_behavior,
+                file_visitor=lambda f: written.append(f.path),
+                use_threads=True,
+                **options
+            )
+
+            return {
+                'success': True,
+                'base_dir': base_dir,
+                'rows': table.num_rows,
+                'files_written': len(written),
+                'partitions': len({str(Path(f).parent) for f in written}),
+                'size_bytes': sum(Path(f).stat().st_size for f in written),
+                'files': written[:100]
+            }
+        except Exception as e:
+            logger.error(f"write_dataset failed: {e}")
+            return {'error': str(e)}
+
     async def describe(self, data_ref: str) -> Dict:
         """
         Get statistical summary of DataFrame.
@@ -310,32 +803,57 @@ class PandasTools:
 
     async def filter(
         self,
-        data_ref: str,
-        condition: str,
-        name: Optional[str] = None
+        data_ref: Optional[str] = None,
+        condition: str = '',
+        name: Optional[str] = None,
+        path: Optional[Union[str, List[str]]] = None,
+        format: Optional[str] = None
     ) -> Dict:
         """
         Filter DataFrame rows by condition.
 
+        With `path` instead of `data_ref`, runs out-of-core: the file or
+        dataset is scanned in batches with the condition pushed down, and
+        only the matching rows are stored.
+
         Args:
             data_ref: Reference to stored DataFrame
             condition: pandas query string (e.g., "age > 30 and city == 'NYC'")
             name: Optional name for result data_ref
+            path: CSV/Parquet file, dataset directory, or file list to scan
+            format: Dataset format for `path` (inferred from suffix if omitted)
 
         Returns:
-            Dict with new data_ref for filtered result
+            Dict with new data_ref for filtered result and the engine used
         """
-        df = self.store.get_pandas(data_ref)
-        if df is None:
+        if path is not None:
+            return self._scan_to_ref(
+                path, format,
+                columns=None,
+                condition=condition,
+                name=name or f"{self._path_label(path)}_filtered",
+                source=f"filter({path}, '{condition}')"
+            )
+
+        table = self.store.get(data_ref)
+        if table is None:
             return {'error': f'DataFrame not found: {data_ref}'}
 
         try:
-            filtered = df.query(condition).reset_index(drop=True)
+            engine = 'arrow'
+            try:
+                filtered = table.filter(parse_condition(condition))
+            except ARROW_FALLBACK_ERRORS as e:
+                logger.debug(f"filter falling back to pandas: {e}")
+                engine = 'pandas'
+                filtered = self.store.get_pandas(data_ref).query(condition).reset_index(drop=True)
+
             result_name = name or f"{data_ref}_filtered"
             return self._check_and_store(
                 filtered,
                 name=result_name,
-                source=f"filter({data_ref}, '{condition}')"
+                source=f"filter({data_ref}, '{condition}')",
+                engine=engine
             )
         except Exception as e:
             logger.error(f"filter failed: {e}")
@@ -343,40 +861,59 @@ class PandasTools:
 
     async def select(
         self,
-        data_ref: str,
-        columns: List[str],
-        name: Optional[str] = None
+        data_ref: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        name: Optional[str] = None,
+        path: Optional[Union[str, List[str]]] = None,
+        format: Optional[str] = None
     ) -> Dict:
         """
         Select specific columns from DataFrame.
 
+        With `path` instead of `data_ref`, runs out-of-core: only the
+        selected columns are read from the file or dataset.
+
         Args:
             data_ref: Reference to stored DataFrame
             columns: List of column names to select
             name: Optional name for result data_ref
+            path: CSV/Parquet file, dataset directory, or file list to scan
+            format: Dataset format for `path` (inferred from suffix if omitted)
 
         Returns:
             Dict with new data_ref for selected columns
         """
-        df = self.store.get_pandas(data_ref)
-        if df is None:
+        columns = columns or []
+        if path is not None:
+            return self._scan_to_ref(
+                path, format,
+                columns=columns,
+                condition=None,
+                name=name or f"{self._path_label(path)}_select",
+                source=f"select({path}, {columns})"
+            )
+
+        table = self.store.get(data_ref)
+        if table is None:
             return {'error': f'DataFrame not found: {data_ref}'}
 
         try:
             # Validate columns exist
-            missing = [c for c in columns if c not in df.columns]
+            missing = [c for c in columns if c not in table.column_names]
             if missing:
                 return {
                     'error': f'Columns not found: {missing}',
-                    'available_columns': list(df.columns)
+                    'available_columns': table.column_names
                 }
 
-            selected = df[columns]
+            # Column projection is zero-copy on Arrow
+            selected = table.select(columns)
             result_name = name or f"{data_ref}_select"
             return self._check_and_store(
                 selected,
                 name=result_name,
-                source=f"select({data_ref}, {columns})"
+                source=f"select({data_ref}, {columns})",
+                engine='arrow'
             )
         except Exception as e:
             logger.error(f"select failed: {e}")
@@ -384,38 +921,66 @@ class PandasTools:
 
     async def groupby(
         self,
-        data_ref: str,
-        by: Union[str, List[str]],
-        agg: Dict[str, Union[str, List[str]]],
-        name: Optional[str] = None
+        data_ref: Optional[str] = None,
+        by: Union[str, List[str], None] = None,
+        agg: Optional[Dict[str, Union[str, List[str]]]] = None,
+        name: Optional[str] = None,
+        path: Optional[Union[str, List[str]]] = None,
+        format: Optional[str] = None,
+        condition: Optional[str] = None
     ) -> Dict:
         """
         Group DataFrame and aggregate.
 
+        With `path` instead of `data_ref`, runs out-of-core: the file or
+        dataset is scanned in batches and folded into per-group partial
+        aggregates, so only the grouped result has to fit under max_rows.
+
         Args:
             data_ref: Reference to stored DataFrame
             by: Column(s) to group by
             agg: Aggregation dict (e.g., {"sales": "sum", "count": "mean"})
             name: Optional name for result data_ref
+            path: CSV/Parquet file, dataset directory, or file list to scan
+            format: Dataset format for `path` (inferred from suffix if omitted)
+            condition: Optional pandas query string; rows are filtered before
+                grouping (pushed into the scan with `path`)
 
         Returns:
-            Dict with new data_ref for aggregated result
+            Dict with new data_ref for aggregated result and the engine used
         """
-        df = self.store.get_pandas(data_ref)
-        if df is None:
+        if by is None or not agg:
+            return {'error': 'groupby requires by and agg'}
+        if path is not None:
+            return self._aggregate_path(path, format, by, agg, condition, name)
+
+        table = self.store.get(data_ref)
+        if table is None:
             return {'error': f'DataFrame not found: {data_ref}'}
 
         try:
-            grouped = df.groupby(by).agg(agg).reset_index()
-            # Flatten column names if multi-level
-            if isinstance(grouped.columns, pd.MultiIndex):
-                grouped.columns = ['_'.join(col).strip('_') for col in grouped.columns]
+            engine = 'arrow'
+            try:
+                if condition:
+                    table = table.filter(parse_condition(condition))
+                grouped = self._arrow_groupby(table, by, agg)
+            except ARROW_FALLBACK_ERRORS as e:
+                logger.debug(f"groupby falling back to pandas: {e}")
+                engine = 'pandas'
+                df = self.store.get_pandas(data_ref)
+                if condition:
+                    df = df.query(condition)
+                grouped = df.groupby(by).agg(agg).reset_index()
+                # Flatten column names if multi-level
+                if isinstance(grouped.columns, pd.MultiIndex):
+                    grouped.columns = ['_'.join(col).strip('_') for col in grouped.columns]
 
             result_name = name or f"{data_ref}_grouped"
             return self._check_and_store(
                 grouped,
                 name=result_name,
-                source=f"groupby({data_ref}, by={by})"
+                source=f"groupby({data_ref}, by={by}" + (f", '{condition}')" if condition else ")"),
+                engine=engine
             )
         except Exception as e:
             logger.error(f"groupby failed: {e}")
@@ -444,32 +1009,411 @@ class PandasTools:
             name: Optional name for result data_ref
 
         Returns:
-            Dict with new data_ref for joined result
+            Dict with new data_ref for joined result and the engine used
         """
-        left_df = self.store.get_pandas(left_ref)
-        right_df = self.store.get_pandas(right_ref)
+        left_table = self.store.get(left_ref)
+        right_table = self.store.get(right_ref)
 
-        if left_df is None:
+        if left_table is None:
             return {'error': f'DataFrame not found: {left_ref}'}
-        if right_df is None:
+        if right_table is None:
             return {'error': f'DataFrame not found: {right_ref}'}
 
         try:
-            joined = pd.merge(
-                left_df, right_df,
-                on=on, left_on=left_on, right_on=right_on,
-                how=how
-            )
+            engine = 'arrow'
+            try:
+                joined = self._arrow_join(
+                    left_table, right_table, on, left_on, right_on, how
+                )
+            except ARROW_FALLBACK_ERRORS as e:
+                logger.debug(f"join falling back to pandas: {e}")
+                engine = 'pandas'
+                joined = pd.merge(
+                    self.store.get_pandas(left_ref), self.store.get_pandas(right_ref),
+                    on=on, left_on=left_on, right_on=right_on,
+                    how=how
+                )
+
             result_name = name or f"{left_ref}_{right_ref}_joined"
             return self._check_and_store(
                 joined,
                 name=result_name,
-                source=f"join({left_ref}, {right_ref}, how={how})"
+                source=f"join({left_ref}, {right_ref}, how={how})",
+                engine=engine
             )
         except Exception as e:
             logger.error(f"join failed: {e}")
             return {'error': str(e)}
 
+    def _path_label(self, path: Union[str, List[str]]) -> str:
+        """Default result name stem for an out-of-core source"""
+        return Path(path if isinstance(path, str) else path[0]).stem
+
+    def _scan_to_ref(
+        self,
+        path: Union[str, List[str]],
+        format: Optional[str],
+        columns: Optional[List[str]],
+        condition: Optional[str],
+        name: str,
+        source: str
+    ) -> Dict:
+        """Scan a file or dataset with projection/predicate pushdown into one ref"""
+        missing = self._missing_path(path)
+        if missing:
+            return missing
+
+        try:
+            dataset = self._open_dataset(path, format)
+            if columns:
+                unknown = [c for c in columns if c not in dataset.schema.names]
+                if unknown:
+                    return {
+                        'error': f'Columns not found: {unknown}',
+                        'available_columns': dataset.schema.names
+                    }
+            try:
+                predicate = parse_condition(condition) if condition else None
+            except ExpressionNotSupported as e:
+                return {'error': f'Out-of-core filter needs an Arrow-compatible condition: {e}'}
+
+            table, stats = self._scan_dataset(dataset, columns, predicate)
+            return self._store_ingest(
+                table, stats, name=name, source=source, engine='arrow'
+            )
+        except Exception as e:
+            logger.error(f"out-of-core scan failed: {e}")
+            return {'error': str(e)}
+
+    def _aggregate_path(
+        self,
+        path: Union[str, List[str]],
+        format: Optional[str],
+        by: Union[str, List[str]],
+        agg: Dict[str, Union[str, List[str]]],
+        condition: Optional[str],
+        name: Optional[str]
+    ) -> Dict:
+        """Group-by over a file or dataset, folding batches incrementally"""
+        missing = self._missing_path(path)
+        if missing:
+            return missing
+
+        try:
+            try:
+                aggregator = IncrementalGroupBy(by, agg)
+                predicate = parse_condition(condition) if condition else None
+            except ExpressionNotSupported as e:
+                return {'error': str(e)}
+
+            dataset = self._open_dataset(path, format)
+            unknown = [c for c in aggregator.columns if c not in dataset.schema.names]
+            if unknown:
+                return {
+                    'error': f'Columns not found: {unknown}',
+                    'available_columns': dataset.schema.names
+                }
+
+            stats = _IngestStats()
+            scanner = dataset.scanner(
+                columns=aggregator.columns, filter=predicate, use_threads=True
+            )
+            for batch in scanner.to_batches():
+                aggregator.update(batch)
+                stats.scanned(batch.num_rows)
+                if self.store.check_row_limit(aggregator.num_groups)['exceeded']:
+                    stats.stopped_early = True
+                    break
+
+            grouped = aggregator.result()
+            stats.kept(grouped.num_rows)
+            return self._store_ingest(
+                grouped,
+                stats.as_dict(),
+                name=name or f"{self._path_label(path)}_grouped",
+                source=f"groupby({path}, by={by})",
+                engine='arrow'
+            )
+        except Exception as e:
+            logger.error(f"out-of-core groupby failed: {e}")
+            return {'error': str(e)}
+
+    def _arrow_groupby(
+        self,
+        table: pa.Table,
+        by: Union[str, List[str]],
+        agg: Dict[str, Union[str, List[str]]]
+    ) -> pa.Table:
+        """
+        Group and aggregate with Table.group_by, matching pandas output.
+
+        Keys are sorted and null keys dropped (pandas sort=True, dropna=True).
+        Plain string aggregations keep the column name; once any column has a
+        list of functions, names become `column_func` like the flattened
+        pandas MultiIndex.
+
+        Raises:
+            ExpressionNotSupported: For aggregations with no Arrow equivalent
+        """
+        keys = [by] if isinstance(by, str) else list(by)
+        # pandas builds a MultiIndex as soon as any column has a list of funcs
+        flatten = any(not isinstance(funcs, str) for funcs in agg.values())
+        aggregations = []
+        output_names = []
+        for column, funcs in agg.items():
+            for func in ([funcs] if isinstance(funcs, str) else funcs):
+                if func not in ARROW_AGGREGATIONS:
+                    raise ExpressionNotSupported(f"Unsupported aggregation: {func}")
+                arrow_func, options = ARROW_AGGREGATIONS[func]
+                aggregations.append(
+                    (column, arrow_func, options) if options else (column, arrow_func)
+                )
+                output_names.append(
+                    (f"{column}_{arrow_func}", f"{column}_{func}" if flatten else column)
+                )
+
+        for key in keys:
+            table = table.filter(pc.is_valid(table[key]))
+
+        grouped = table.group_by(keys).aggregate(aggregations)
+        grouped = grouped.select(keys + [arrow_name for arrow_name, _ in output_names])
+        grouped = grouped.rename_columns(keys + [name for _, name in output_names])
+        return grouped.sort_by([(key, 'ascending') for key in keys])
+
+    def _arrow_join(
+        self,
+        left: pa.Table,
+        right: pa.Table,
+        on: Optional[Union[str, List[str]]],
+        left_on: Optional[Union[str, List[str]]],
+        right_on: Optional[Union[str, List[str]]],
+        how: str
+    ) -> pa.Table:
+        """
+        Join with Table.join, matching pd.merge column naming.
+
+        Rows follow the left table, matches within a left row follow the
+        right table.
+
+        Raises:
+            ExpressionNotSupported: For join types with no Arrow equivalent
+        """
+        join_type = ARROW_JOIN_TYPES.get(how)
+        if join_type is None:
+            raise ExpressionNotSupported(f"Unsupported join type: {how}")
+
+        if on is None and left_on is not None and left_on == right_on:
+            on = left_on
+        if on is not None:
+            keys = [on] if isinstance(on, str) else list(on)
+            right_keys, coalesce = None, True
+        elif left_on is not None and right_on is not None:
+            keys = [left_on] if isinstance(left_on, str) else list(left_on)
+            right_keys = [right_on] if isinstance(right_on, str) else list(right_on)
+            coalesce = False
+        else:
+            raise ExpressionNotSupported("Join keys must be given via on or left_on/right_on")
+
+        # pd.merge column order: left columns, then right columns minus shared keys
+        shared = set(left.column_names) & set(right.column_names) - (set(keys) if coalesce else set())
+        expected = [f"{c}_x" if c in shared else c for c in left.column_names]
+        expected += [
+            f"{c}_y" if c in shared else c for c in right.column_names
+            if not (coalesce and c in keys)
+        ]
+
+        left_order, right_order = '__left_row__', '__right_row__'
+        left = left.append_column(left_order, pa.array(range(left.num_rows), pa.int64()))
+        right = right.append_column(right_order, pa.array(range(right.num_rows), pa.int64()))
+        joined = left.join(
+            right,
+            keys=keys,
+            right_keys=right_keys,
+            join_type=join_type,
+            left_suffix='_x',
+            right_suffix='_y',
+            coalesce_keys=coalesce
+        )
+        joined = joined.sort_by([(left_order, 'ascending'), (right_order, 'ascending')])
+        return joined.select(expected)
+
+    def _read_geometry(self, table: pa.Table, column: Optional[str]) -> Tuple[str, Geometries]:
+        """
+        Resolve and decode a geometry column.
+
+        Raises:
+            ValueError: If the column is missing or no geometry column is tagged
+        """
+        if column is None:
+            tagged = geometry_columns(table)
+            if not tagged:
+                raise ValueError(
+                    "No geometry column found; pass column= (WKB binary or hex EWKB text)"
+                )
+            column = tagged[0]
+        elif column not in table.column_names:
+            raise ValueError(f"Column not found: {column}")
+        field = table.schema.field(column)
+        return column, read_geometries(table.column(column), field)
+
+    def _geometry_srid(self, geoms: Geometries) -> Optional[int]:
+        """The column's SRID when all geometries agree"""
+        srids = np.unique(geoms.srids[geoms.types > 0])
+        return int(srids[0]) if len(srids) == 1 and srids[0] else None
+
+    async def geo_bbox(
+        self,
+        data_ref: str,
+        column: Optional[str] = None,
+        per_row: bool = False,
+        name: Optional[str] = None
+    ) -> Dict:
+        """
+        Bounding box of a stored geometry column.
+
+        Args:
+            data_ref: Reference to stored DataFrame
+            column: Geometry column (default: first geometry-tagged column)
+            per_row: Also store xmin/ymin/xmax/ymax columns per row
+            name: Optional name for the per_row result data_ref
+
+        Returns:
+            Dict with the overall bbox, geometry counts and SRID
+        """
+        table = self.store.get(data_ref)
+        if table is None:
+            return {'error': f'DataFrame not found: {data_ref}'}
+
+        try:
+            column, geoms = self._read_geometry(table, column)
+            boxes = bounds(geoms)
+            present = ~np.isnan(boxes[:, 0])
+            result = {
+                'data_ref': data_ref,
+                'column': column,
+                'geometries': int(present.sum()),
+                'empty_or_null': int(len(geoms) - present.sum()),
+                'srid': self._geometry_srid(geoms),
+                'bbox': None
+            }
+            if present.any():
+                result['bbox'] = {
+                    'xmin': float(boxes[present, 0].min()),
+                    'ymin': float(boxes[present, 1].min()),
+                    'xmax': float(boxes[present, 2].max()),
+                    'ymax': float(boxes[present, 3].max())
+                }
+            if per_row:
+                for i, key in enumerate(('xmin', 'ymin', 'xmax', 'ymax')):
+                    table = table.append_column(key, pa.array(boxes[:, i], from_pandas=True))
+                stored = self._check_and_store(
+                    table,
+                    name=name or f"{data_ref}_bbox",
+                    source=f"geo_bbox({data_ref}, {column})",
+                    engine='arrow'
+                )
+                if 'error' in stored:
+                    return stored
+                result['result_ref'] = stored['data_ref']
+            return result
+        except Exception as e:
+            logger.error(f"geo_bbox failed: {e}")
+            return {'error': str(e)}
+
+    async def geo_centroid(
+        self,
+        data_ref: str,
+        column: Optional[str] = None,
+        name: Optional[str] = None
+    ) -> Dict:
+        """
+        Add centroid_x / centroid_y columns for a stored geometry column.
+
+        Centroids follow ST_Centroid: area-weighted for polygons,
+        length-weighted for lines, the mean for points. Computed in the
+        column's own (planar) coordinates.
+
+        Args:
+            data_ref: Reference to stored DataFrame
+            column: Geometry column (default: first geometry-tagged column)
+            name: Optional name for result data_ref
+
+        Returns:
+            Dict with new data_ref including the centroid columns
+        """
+        table = self.store.get(data_ref)
+        if table is None:
+            return {'error': f'DataFrame not found: {data_ref}'}
+
+        try:
+            column, geoms = self._read_geometry(table, column)
+            points = centroids(geoms)
+            table = table.append_column('centroid_x', pa.array(points[:, 0], from_pandas=True))
+            table = table.append_column('centroid_y', pa.array(points[:, 1], from_pandas=True))
+            result = self._check_and_store(
+                table,
+                name=name or f"{data_ref}_centroid",
+                source=f"geo_centroid({data_ref}, {column})",
+                engine='arrow'
+            )
+            if 'error' not in result:
+                result['column'] = column
+                result['srid'] = self._geometry_srid(geoms)
+            return result
+        except Exception as e:
+            logger.error(f"geo_centroid failed: {e}")
+            return {'error': str(e)}
+
+    async def geo_area(
+        self,
+        data_ref: str,
+        column: Optional[str] = None,
+        name: Optional[str] = None
+    ) -> Dict:
+        """
+        Add a planar area column for a stored geometry column.
+
+        Areas are in squared coordinate units (holes subtracted); for
+        lon/lat data (SRID 4326) that is square degrees, so transform to a
+        projected CRS in SQL first when real areas are needed.
+
+        Args:
+            data_ref: Reference to stored DataFrame
+            column: Geometry column (default: first geometry-tagged column)
+            name: Optional name for result data_ref
+
+        Returns:
+            Dict with new data_ref including the area column and
+            min/max/mean/total area
+        """
+        table = self.store.get(data_ref)
+        if table is None:
+            return {'error': f'DataFrame not found: {data_ref}'}
+
+        try:
+            column, geoms = self._read_geometry(table, column)
+            values = areas(geoms)
+            table = table.append_column('area', pa.array(values, from_pandas=True))
+            result = self._check_and_store(
+                table,
+                name=name or f"{data_ref}_area",
+                source=f"geo_area({data_ref}, {column})",
+                engine='arrow'
+            )
+            if 'error' in result:
+                return result
+            srid = self._geometry_srid(geoms)
+            result.update({'column': column, 'srid': srid, 'area': summarize(values)})
+            if srid in GEOGRAPHIC_SRIDS:
+                result['warning'] = (
+                    f"SRID {srid} is geographic; areas are in square degrees. "
+                    "Use ST_Transform in SQL for metric areas."
+                )
+            return result
+        except Exception as e:
+            logger.error(f"geo_area failed: {e}")
+            return {'error': str(e)}
+
     async def list_data(self) -> Dict:
         """
         List all stored DataFrames.
@@ -481,6 +1425,10 @@ class PandasTools:
         return {
             'count': len(refs),
             'total_memory_mb': self.store.total_memory_mb(),
+            'mapped_mb': round(self.store.mapped_bytes() / (1024 * 1024), 2),
+            'pandas_cache_mb': round(self.store.pandas_cache_bytes() / (1024 * 1024), 2),
+            'spilled_mb': round(self.store.spilled_bytes() / (1024 * 1024), 2),
+            'max_memory_mb': self.max_memory_mb or None,
             'max_rows_limit': self.max_rows,
             'dataframes': refs
         }
@@ -0,0 +1,207 @@
+"""
+EXPLAIN plan summarization.
+
+Reduces the JSON output of `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)` to the
+parts that explain a slow query: where the time went, which tables were
+read sequentially, where the planner's row estimates were wrong, and how
+much was served from shared buffers.
+"""
+import json
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# Defaults for what counts as worth reporting
+SEQ_SCAN_MIN_ROWS = 10_000
+MISESTIMATE_FACTOR = 10.0
+MISESTIMATE_MIN_ROWS = 100
+
+
+def summarize_plan(
+    explain: Union[str, List, Dict],
+    top_n: int = 5,
+    seq_scan_min_rows: int = SEQ_SCAN_MIN_ROWS,
+    misestimate_factor: float = MISESTIMATE_FACTOR
+) -> Dict:
+    """
+    Summarize an EXPLAIN (FORMAT JSON) result.
+
+    Works with or without ANALYZE: without it, node "time" is the
+    planner's cost and actual-row checks are skipped.
+
+    Args:
+        explain: EXPLAIN output (JSON text, or the decoded list/dict)
+        top_n: Number of costliest nodes to report
+        seq_scan_min_rows: Report sequential scans reading at least this many rows
+        misestimate_factor: Report nodes whose actual rows differ from the
+            estimate by at least this factor
+
+    Returns:
+        Dict with planning/execution time, top_nodes, seq_scans,
+        misestimates, buffers and hints
+    """
+    if isinstance(explain, str):
+        explain = json.loads(explain)
+    if isinstance(explain, list):
+        explain = explain[0]
+    root = explain['Plan']
+    analyzed = 'Actual Total Time' in root
+
+    nodes = []
+    seq_scans = []
+    misestimates = []
+    sort_spills = []
+    for node, depth in _walk(root):
+        self_value = _self_value(node, analyzed)
+        nodes.append((self_value, depth, node))
+
+        if not analyzed:
+            if node['Node Type'] == 'Seq Scan' and node.get('Plan Rows', 0) >= seq_scan_min_rows:
+                seq_scans.append(_seq_scan(node, analyzed))
+            continue
+
+        loops = node.get('Actual Loops', 1) or 1
+        if node['Node Type'] == 'Seq Scan':
+            scanned = (node.get('Actual Rows', 0) + node.get('Rows Removed by Filter', 0)) * loops
+            if scanned >= seq_scan_min_rows:
+                seq_scans.append(_seq_scan(node, analyzed))
+
+        estimated = node.get('Plan Rows', 0)
+        actual = node.get('Actual Rows', 0)
+        if max(estimated, actual) >= MISESTIMATE_MIN_ROWS:
+            factor = max(estimated, actual) / max(min(estimated, actual), 1)
+            if factor >= misestimate_factor:
+                misestimates.append({
+                    **_describe(node),
+                    'estimated_rows': estimated,
+                    'actual_rows': actual,
+                    'loops': loops,
+                    'factor': round(factor, 1),
+                    'direction': 'under' if actual > estimated else 'over'
+                })
+
+        if node.get('Sort Space Type') == 'Disk':
+            sort_spills.append({**_describe(node), 'sort_method': node.get('Sort Method'),
+                                'space_kb': node.get('Sort Space Used')})
+
+    total = sum(value for value, _, _ in nodes) or 1.0
+    ranked = sorted(nodes, key=lambda item: item[0], reverse=True)[:top_n]
+    unit = 'self_ms' if analyzed else 'self_cost'
+    top_nodes = [
+        {
+            **_describe(node),
+            'depth': depth,
+            unit: round(value, 3),
+            'percent': round(100 * value / total, 1),
+            'rows': node.get('Actual Rows' if analyzed else 'Plan Rows'),
+            **({'loops': node.get('Actual Loops')} if analyzed else {})
+        }
+        for value, depth, node in ranked
+    ]
+    seq_scans.sort(key=lambda scan: scan.get('rows_scanned', scan.get('estimated_rows', 0)), reverse=True)
+    misestimates.sort(key=lambda item: item['factor'], reverse=True)
+
+    summary = {
+        'analyzed': analyzed,
+        'planning_ms': explain.get('Planning Time'),
+        'execution_ms': explain.get('Execution Time'),
+        'total_cost': root.get('Total Cost'),
+        'top_nodes': top_nodes,
+        'seq_scans': seq_scans,
+        'misestimates': misestimates,
+        'buffers': _buffers(root),
+    }
+    if sort_spills:
+        summary['sort_spills'] = sort_spills
+    summary['hints'] = _hints(summary)
+    return summary
+
+
+def _walk(node: Dict, depth: int = 0) -> Iterator[Tuple[Dict, int]]:
+    """Pre-order traversal of a plan tree"""
+    yield node, depth
+    for child in node.get('Plans', []):
+        yield from _walk(child, depth + 1)
+
+
+def _self_value(node: Dict, analyzed: bool) -> float:
+    """Exclusive time (ms, all loops) or exclusive cost of a node"""
+    children = node.get('Plans', [])
+    if analyzed:
+        own = node.get('Actual Total Time', 0.0) * (node.get('Actual Loops', 1) or 1)
+        below = sum(
+            c.get('Actual Total Time', 0.0) * (c.get('Actual Loops', 1) or 1)
+            for c in children
+        )
+    else:
+        own = node.get('Total Cost', 0.0)
+        below = sum(c.get('Total Cost', 0.0) for c in children)
+    return max(own - below, 0.0)
+
+
+def _describe(node: Dict) -> Dict:
+    """Node identity: type plus the relation/index it touches"""
+    described = {'node_type': node['Node Type']}
+    if node.get('Relation Name'):
+        described['relation'] = node['Relation Name']
+        if node.get('Alias') and node['Alias'] != node['Relation Name']:
+            described['alias'] = node['Alias']
+    if node.get('Index Name'):
+        described['index'] = node['Index Name']
+    return described
+
+
+def _seq_scan(node: Dict, analyzed: bool) -> Dict:
+    """Sequential scan details; filtered scans are index candidates"""
+    scan = _describe(node)
+    if analyzed:
+        loops = node.get('Actual Loops', 1) or 1
+        removed = node.get('Rows Removed by Filter', 0) * loops
+        returned = node.get('Actual Rows', 0) * loops
+        scan.update({'rows_scanned': returned + removed, 'rows_returned': returned})
+    else:
+        scan['estimated_rows'] = node.get('Plan Rows')
+    if node.get('Filter'):
+        scan['filter'] = node['Filter']
+    if node.get('Parallel Aware'):
+        scan['parallel'] = True
+    return scan
+
+
+def _buffers(root: Dict) -> Optional[Dict]:
+    """Shared buffer hits vs reads for the whole plan (root counts are inclusive)"""
+    if 'Shared Hit Blocks' not in root:
+        return None
+    hit = root.get('Shared Hit Blocks', 0)
+    read = root.get('Shared Read Blocks', 0)
+    return {
+        'shared_hit': hit,
+        'shared_read': read,
+        'hit_ratio': round(hit / (hit + read), 4) if hit + read else None,
+        'temp_read': root.get('Temp Read Blocks', 0),
+        'temp_written': root.get('Temp Written Blocks', 0)
+    }
+
+
+def _hints(summary: Dict) -> List[str]:
+    """Short, actionable notes derived from the summary"""
+    hints = []
+    for scan in summary['seq_scans'][:3]:
+        if scan.get('filter') and scan.get('rows_scanned', 0) > 10 * max(scan.get('rows_returned', 0), 1):
+            hints.append(
+                f"Seq Scan on {scan.get('relation')} reads {scan['rows_scanned']:,} rows to return "
+                f"{scan['rows_returned']:,}; an index on the filter columns may help ({scan['filter']})"
+            )
+    for item in summary['misestimates'][:3]:
+        target = item.get('relation') or item['node_type']
+        hints.append(
+            f"{item['node_type']} on {target} expected {item['estimated_rows']:,} rows but got "
+            f"{item['actual_rows']:,} ({item['factor']}x); run ANALYZE or add extended statistics"
+        )
+    for spill in summary.get('sort_spills', [])[:1]:
+        hints.append(f"Sort spilled to disk ({spill['sort_method']}); raise work_mem or sort fewer rows")
+    buffers = summary['buffers']
+    if buffers and buffers['hit_ratio'] is not None and buffers['hit_ratio'] < 0.9 and buffers['shared_read'] > 1000:
+        hints.append(
+            f"Only {buffers['hit_ratio']:.0%} of pages came from shared buffers; "
+            "the query is I/O bound on a cold cache or an oversized scan"
+        )
+    return hints
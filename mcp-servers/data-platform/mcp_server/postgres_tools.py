@@ -5,11 +5,20 @@ Provides database operations with connection pooling and PostGIS support.
 """
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Any, Set, Tuple
 import json
 
+import pyarrow as pa
+
 from .data_store import DataStore
 from .config import load_config
+from .pg_binary import CopyDecoder, UnsupportedCopyType
+from .query_cache import QueryCache, is_read_only, modified_tables
+from .catalog_cache import SCHEMAS_QUERY, CatalogSnapshot
+from .pg_plan import MISESTIMATE_FACTOR, SEQ_SCAN_MIN_ROWS, summarize_plan
+from .arrow_geometry import GEOMETRY_TYPES, WKB, register_geometry_codecs, tag_geometry
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +36,43 @@ try:
 except ImportError:
     PANDAS_AVAILABLE = False
 
+# pg_query fetch strategies
+QUERY_MODES = ('fetch', 'copy', 'stream')
+
+# pg_query geometry column encodings
+GEOMETRY_FORMATS = ('wkb', 'geoarrow')
+
+# pg_write_table strategies
+WRITE_MODES = ('append', 'replace', 'upsert')
+
+# st_geometry_type / st_srid / st_extent strategies
+SPATIAL_MODES = ('exact', 'fast', 'sample')
+
+# Rows read when TABLESAMPLE is unavailable (views) or samples nothing
+SPATIAL_SAMPLE_ROWS = 10_000
+
+# geometry_columns type -> ST_GeometryType() name
+GEOMETRY_TYPE_NAMES = {
+    'POINT': 'ST_Point',
+    'LINESTRING': 'ST_LineString',
+    'POLYGON': 'ST_Polygon',
+    'MULTIPOINT': 'ST_MultiPoint',
+    'MULTILINESTRING': 'ST_MultiLineString',
+    'MULTIPOLYGON': 'ST_MultiPolygon',
+    'GEOMETRYCOLLECTION': 'ST_GeometryCollection',
+    'CIRCULARSTRING': 'ST_CircularString',
+    'COMPOUNDCURVE': 'ST_CompoundCurve',
+    'CURVEPOLYGON': 'ST_CurvePolygon',
+    'MULTICURVE': 'ST_MultiCurve',
+    'MULTISURFACE': 'ST_MultiSurface',
+    'POLYHEDRALSURFACE': 'ST_PolyhedralSurface',
+    'TRIANGLE': 'ST_Triangle',
+    'TIN': 'ST_Tin',
+}
+
+# pg_execute command tags after which the catalog cache is stale
+CATALOG_COMMANDS = ('CREATE', 'ALTER', 'DROP', 'COMMENT', 'GRANT', 'REVOKE', 'DO', 'CALL')
+
 
 class PostgresTools:
     """PostgreSQL/PostGIS database tools"""
@@ -36,6 +82,15 @@ class PostgresTools:
         self.config = load_config()
         self.pool: Optional[Any] = None
         self.max_rows = self.config.get('max_rows', 100_000)
+        self.fetch_size = self.config.get('pg_fetch_size', 10_000)
+        self.stream_max_mb = self.config.get('pg_stream_max_mb', 0)
+        self._pool_lock = asyncio.Lock()
+        self._waiting = 0
+        self.query_cache = QueryCache(ttl_seconds=self.config.get('pg_query_cache_ttl', 0.0))
+        self.invalidate_on_write = self.config.get('pg_query_cache_invalidate', True)
+        self.catalog_ttl = self.config.get('pg_catalog_ttl', 300.0)
+        self.catalog: Optional[CatalogSnapshot] = None
+        self._catalog_lock = asyncio.Lock()
 
     async def _get_pool(self):
         """Get or create connection pool"""
@@ -43,15 +98,103 @@ class PostgresTools:
             raise RuntimeError("asyncpg not installed - run: pip install asyncpg")
 
         if self.pool is None:
-            postgres_url = self.config.get('postgres_url')
-            if not postgres_url:
-                raise RuntimeError(
-                    "PostgreSQL not configured. Set POSTGRES_URL in "
-                    "~/.config/claude/postgres.env"
-                )
-            self.pool = await asyncpg.create_pool(postgres_url, min_size=1, max_size=5)
+            # Concurrent first calls must not each create a pool
+            async with self._pool_lock:
+                if self.pool is None:
+                    postgres_url = self.config.get('postgres_url')
+                    if not postgres_url:
+                        raise RuntimeError(
+                            "PostgreSQL not configured. Set POSTGRES_URL in "
+                            "~/.config/claude/postgres.env"
+                        )
+                    self.pool = await asyncpg.create_pool(
+                        postgres_url,
+                        min_size=self.config.get('pg_pool_min_size', 1),
+                        max_size=self.config.get('pg_pool_max_size', 5),
+                        max_inactive_connection_lifetime=self.config.get(
+                            'pg_pool_max_inactive_seconds', 300.0
+                        ),
+                        statement_cache_size=self.config.get('pg_statement_cache_size', 100),
+                        server_settings=self._server_settings() or None,
+                        init=self._init_connection
+                    )
         return self.pool
 
+    def _server_settings(self) -> Dict[str, str]:
+        """
+        search_path and statement_timeout as connection startup parameters.
+
+        Startup parameters become the session defaults, so they survive the
+        RESET ALL asyncpg runs when a connection goes back to the pool
+        (settings made with SET inside `init` would not).
+        """
+        settings = {}
+        if self.config.get('pg_search_path'):
+            settings['search_path'] = self.config['pg_search_path']
+        if self.config.get('pg_statement_timeout_ms'):
+            settings['statement_timeout'] = str(self.config['pg_statement_timeout_ms'])
+        return settings
+
+    async def _init_connection(self, conn: Any):
+        """Decode PostGIS geometry as WKB on every new connection"""
+        await register_geometry_codecs(conn)
+
+    @asynccontextmanager
+    async def _acquire(self):
+        """Acquire a pooled connection, counting callers waiting for one"""
+        pool = await self._get_pool()
+        self._waiting += 1
+        waiting = True
+        try:
+            async with pool.acquire() as conn:
+                self._waiting -= 1
+                waiting = False
+                yield conn
+        finally:
+            if waiting:
+                self._waiting -= 1
+
+    def pool_stats(self) -> Optional[Dict]:
+        """Current pool usage, or None before the pool exists"""
+        if self.pool is None:
+            return None
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        return {
+            'size': size,
+            'in_use': size - idle,
+            'idle': idle,
+            'waiting': self._waiting,
+            'min_size': self.pool.get_min_size(),
+            'max_size': self.pool.get_max_size()
+        }
+
+    async def warmup(self) -> Dict:
+        """
+        Create the pool eagerly and health-check a connection.
+
+        Called from server initialization when DATA_PLATFORM_PG_POOL_WARMUP
+        is set, so the first user query does not pay connection setup.
+
+        Returns:
+            Dict with warmed status, elapsed time, and pool stats
+        """
+        if not ASYNCPG_AVAILABLE or not self.config.get('postgres_url'):
+            return {'warmed': False, 'reason': 'PostgreSQL not configured'}
+
+        started = time.perf_counter()
+        try:
+            async with self._acquire() as conn:
+                await conn.fetchval('SELECT 1')
+            return {
+                'warmed': True,
+                'elapsed_seconds': round(time.perf_counter() - started, 3),
+                'pool': self.pool_stats()
+            }
+        except Exception as e:
+            logger.warning(f"PostgreSQL pool warmup failed: {e}")
+            return {'warmed': False, 'error': str(e)}
+
     async def pg_connect(self) -> Dict:
         """
         Test PostgreSQL connection and return status.
@@ -75,8 +218,7 @@ class PostgresTools:
             }
 
         try:
-            pool = await self._get_pool()
-            async with pool.acquire() as conn:
+            async with self._acquire() as conn:
                 version = await conn.fetchval('SELECT version()')
                 db_name = await conn.fetchval('SELECT current_database()')
                 user = await conn.fetchval('SELECT current_user')
@@ -88,14 +230,16 @@ class PostgresTools:
                 except Exception:
                     pass
 
-                return {
-                    'connected': True,
-                    'database': db_name,
-                    'user': user,
-                    'version': version.split(',')[0] if version else 'Unknown',
-                    'postgis_version': postgis_version,
-                    'postgis_available': postgis_version is not None
-                }
+            return {
+                'connected': True,
+                'database': db_name,
+                'user': user,
+                'version': version.split(',')[0] if version else 'Unknown',
+                'postgis_version': postgis_version,
+                'postgis_available': postgis_version is not None,
+                'pool': self.pool_stats(),
+                'query_cache': self.query_cache.stats()
+            }
 
         except Exception as e:
             logger.error(f"pg_connect failed: {e}")
@@ -108,7 +252,12 @@ class PostgresTools:
         self,
         query: str,
         params: Optional[List] = None,
-        name: Optional[str] = None
+        name: Optional[str] = None,
+        mode: str = 'fetch',
+        fetch_size: Optional[int] = None,
+        max_mb: Optional[float] = None,
+        use_cache: bool = True,
+        geometry_format: str = 'wkb'
     ) -> Dict:
         """
         Execute SELECT query and return results as data_ref.
@@ -117,16 +266,160 @@ class PostgresTools:
             query: SQL SELECT query
             params: Query parameters (positional, use $1, $2, etc.)
             name: Optional name for result data_ref
+            mode: 'fetch' (row-by-row via asyncpg records), 'copy'
+                (binary COPY decoded straight into Arrow; for large
+                results), or 'stream' (server-side cursor, stops at the
+                row limit or byte budget and stores a truncated result).
+                'copy' falls back to 'fetch' when a column type has no
+                binary decoder.
+            fetch_size: Rows per cursor fetch in 'stream' mode
+            max_mb: Byte budget for 'stream' mode (0 = no budget)
+            use_cache: Answer a repeat of a recent query (same normalized
+                SQL and params) from its existing data_ref; statements
+                that write or call volatile functions always run
+            geometry_format: PostGIS columns as 'wkb' (Arrow binary tagged
+                geoarrow.wkb) or 'geoarrow' (x/y coordinate lists; one
+                geometry type per column; not cached)
 
         Returns:
             Dict with data_ref for results or error
         """
         if not PANDAS_AVAILABLE:
             return {'error': 'pandas not available'}
+        if mode not in QUERY_MODES:
+            return {'error': f"Unknown mode '{mode}'. Use one of: {', '.join(QUERY_MODES)}"}
+        if geometry_format not in GEOMETRY_FORMATS:
+            return {
+                'error': f"Unknown geometry_format '{geometry_format}'. "
+                         f"Use one of: {', '.join(GEOMETRY_FORMATS)}"
+            }
+
+        use_cache = (
+            use_cache and self.query_cache.enabled and geometry_format == 'wkb'
+            and is_read_only(query)
+        )
+        if use_cache:
+            entry = self.query_cache.get(query, params, self.store)
+            if entry is not None:
+                return self._cached_result(entry, query, name)
+
+        result = await self._run_query(
+            query, params, name, mode, fetch_size, max_mb, geometry_format
+        )
+        if use_cache and result.get('data_ref') and not result.get('truncated'):
+            self.query_cache.put(query, params, result, self.store)
+        return result
+
+    async def pg_query_batch(
+        self,
+        queries: List[Any],
+        max_concurrency: Optional[int] = None,
+        mode: str = 'fetch'
+    ) -> Dict:
+        """
+        Run independent SELECT queries concurrently, one data_ref each.
+
+        Queries share the connection pool through asyncio.gather, with at
+        most `max_concurrency` in flight, so N queries cost roughly the
+        latency of the slowest instead of the sum. Each one goes through
+        pg_query (including its result cache); a failing query does not
+        stop the others.
+
+        Args:
+            queries: SQL strings or dicts with query, params, name, mode
+            max_concurrency: Queries in flight at once (default and
+                maximum: the pool's max size)
+            mode: Default pg_query mode for items that do not set one
+
+        Returns:
+            Dict with per-query results (data_ref, rows, elapsed_seconds or
+            error) in input order, plus batch timing
+        """
+        if not queries:
+            return {'error': 'queries must be a non-empty list'}
+        items = []
+        for index, item in enumerate(queries):
+            if isinstance(item, str):
+                item = {'query': item}
+            if not isinstance(item, dict) or not item.get('query'):
+                return {'error': f'Query {index} must be a SQL string or an object with "query"'}
+            unknown = set(item) - {
+                'query', 'params', 'name', 'mode', 'fetch_size', 'max_mb', 'use_cache', 'geometry_format'
+            }
+            if unknown:
+                return {'error': f'Query {index} has unknown keys: {sorted(unknown)}'}
+            items.append({'mode': mode, **item})
+
+        pool_size = self.config.get('pg_pool_max_size', 5)
+        limit = max(1, min(max_concurrency or pool_size, pool_size))
+        semaphore = asyncio.Semaphore(limit)
+
+        async def run(index: int, item: Dict) -> Dict:
+            async with semaphore:
+                started = time.perf_counter()
+                result = await self.pg_query(**item)
+                elapsed = time.perf_counter() - started
+            return {'index': index, **result, 'elapsed_seconds': round(elapsed, 4)}
 
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(run(index, item) for index, item in enumerate(items)),
+            return_exceptions=True
+        )
+        elapsed = time.perf_counter() - started
+
+        results = [
+            {'index': index, 'error': str(result)} if isinstance(result, BaseException) else result
+            for index, result in enumerate(results)
+        ]
+        failed = sum(1 for result in results if 'error' in result)
+        return {
+            'count': len(results),
+            'succeeded': len(results) - failed,
+            'failed': failed,
+            'max_concurrency': limit,
+            'elapsed_seconds': round(elapsed, 4),
+            'query_seconds_total': round(sum(r.get('elapsed_seconds', 0) for r in results), 4),
+            'results': results
+        }
+
+    def _cached_result(self, entry: Any, query: str, name: Optional[str]) -> Dict:
+        """Serve a cache hit, aliasing the stored table under a new name if asked"""
+        result = dict(entry.result)
+        if name and name != entry.data_ref:
+            # Arrow tables are immutable, so the alias shares the cached buffers
+            result['data_ref'] = self.store.store(
+                self.store.get(entry.data_ref), name=name, source=f"pg_query: {query[:100]}..."
+            )
+        result['cached'] = True
+        result['cache_age_seconds'] = round(time.monotonic() - entry.created, 3)
+        return result
+
+    async def _run_query(
+        self,
+        query: str,
+        params: Optional[List],
+        name: Optional[str],
+        mode: str,
+        fetch_size: Optional[int],
+        max_mb: Optional[float],
+        geometry_format: str = 'wkb'
+    ) -> Dict:
+        """Execute a pg_query against the database (no cache)"""
         try:
-            pool = await self._get_pool()
-            async with pool.acquire() as conn:
+            async with self._acquire() as conn:
+                fallback_reason = None
+                if mode == 'stream':
+                    return await self._query_stream(
+                        conn, query, params, name, fetch_size, max_mb, geometry_format
+                    )
+                if mode == 'copy':
+                    try:
+                        return await self._query_copy(conn, query, params, name, geometry_format)
+                    except UnsupportedCopyType as e:
+                        logger.debug(f"pg_query falling back to fetch: {e}")
+                        fallback_reason = str(e)
+
                 if params:
                     rows = await conn.fetch(query, *params)
                 else:
@@ -139,30 +432,282 @@ class PostgresTools:
                         'message': 'Query returned no results'
                     }
 
-                # Convert to DataFrame
-                df = pd.DataFrame([dict(r) for r in rows])
+                geometry = _geometry_names(rows)
+                if geometry:
+                    # Keep WKB as Arrow binary instead of pandas object columns
+                    data = tag_geometry(
+                        pa.Table.from_batches([_records_to_batch(rows)]), geometry, geometry_format
+                    )
+                else:
+                    # Convert to DataFrame
+                    data = pd.DataFrame([dict(r) for r in rows])
 
                 # Check row limit
-                check = self.store.check_row_limit(len(df))
+                check = self.store.check_row_limit(len(data))
                 if check['exceeded']:
+                    preview = data.slice(0, 100).to_pylist() if geometry else data.head(100).to_dict(orient='records')
                     return {
                         'error': 'row_limit_exceeded',
                         **check,
-                        'preview': df.head(100).to_dict(orient='records')
+                        'preview': preview
                     }
 
                 # Store result
-                data_ref = self.store.store(df, name=name, source=f"pg_query: {query[:100]}...")
-                return {
+                data_ref = self.store.store(data, name=name, source=f"pg_query: {query[:100]}...")
+                result = {
                     'data_ref': data_ref,
-                    'rows': len(df),
-                    'columns': list(df.columns)
+                    'rows': len(data),
+                    'columns': data.column_names if geometry else list(data.columns),
+                    'mode': 'fetch'
                 }
+                if geometry:
+                    result['geometry_columns'] = geometry
+                if fallback_reason:
+                    result['fallback_reason'] = fallback_reason
+                return result
 
         except Exception as e:
             logger.error(f"pg_query failed: {e}")
             return {'error': str(e)}
 
+    async def _query_copy(
+        self,
+        conn: Any,
+        query: str,
+        params: Optional[List],
+        name: Optional[str],
+        geometry_format: str = 'wkb'
+    ) -> Dict:
+        """
+        Run a query through binary COPY and store the decoded Arrow table.
+
+        The query is wrapped in LIMIT max_rows + 1 so an oversized result is
+        cut off by the server instead of being transferred in full. Chunks
+        are decoded into record batches as they arrive, so the raw stream
+        is never held in full.
+
+        Raises:
+            UnsupportedCopyType: If a result column has no binary decoder
+        """
+        columns = await self._result_columns(conn, query)
+        decoder = CopyDecoder(columns)
+
+        body = query.strip().rstrip(';')
+        limited = f"SELECT * FROM ({body}) AS _q LIMIT {self.max_rows + 1}"
+
+        async def sink(chunk: bytes):
+            decoder.feed(chunk)
+
+        await conn.copy_from_query(limited, *(params or []), output=sink, format='binary')
+        table = decoder.finish()
+        geometry = [column for column, type_name in columns if type_name in GEOMETRY_TYPES]
+
+        if table.num_rows == 0:
+            return {
+                'data_ref': None,
+                'rows': 0,
+                'message': 'Query returned no results',
+                'mode': 'copy'
+            }
+
+        check = self.store.check_row_limit(table.num_rows)
+        if check['exceeded']:
+            return {
+                'error': 'row_limit_exceeded',
+                **check,
+                'message': f"{check['message']} (result cut off at {self.max_rows + 1} rows)",
+                'mode': 'copy',
+                'preview': table.slice(0, 100).to_pylist()
+            }
+
+        if geometry:
+            table = tag_geometry(table, geometry, geometry_format)
+        data_ref = self.store.store(table, name=name, source=f"pg_query: {query[:100]}...")
+        result = {
+            'data_ref': data_ref,
+            'rows': table.num_rows,
+            'columns': table.column_names,
+            'mode': 'copy',
+            'bytes_received': decoder.bytes_received
+        }
+        if geometry:
+            result['geometry_columns'] = geometry
+        return result
+
+    async def _query_stream(
+        self,
+        conn: Any,
+        query: str,
+        params: Optional[List],
+        name: Optional[str],
+        fetch_size: Optional[int],
+        max_mb: Optional[float],
+        geometry_format: str = 'wkb'
+    ) -> Dict:
+        """
+        Stream a query through a server-side cursor into Arrow batches.
+
+        Rows are fetched `fetch_size` at a time and converted to a record
+        batch as they arrive, so at most one fetch of Python records is
+        alive. Reading stops once the row limit or byte budget is reached,
+        and the rows read so far are stored with `truncated: True`.
+        """
+        fetch_size = fetch_size or self.fetch_size
+        max_mb = self.stream_max_mb if max_mb is None else max_mb
+        max_bytes = int(max_mb * 1024 * 1024) if max_mb else None
+
+        batches = []
+        geometry: List[str] = []
+        rows = 0
+        size = 0
+        truncated_by = None
+
+        # Cursors only live inside a transaction
+        async with conn.transaction():
+            cursor = await conn.cursor(query, *(params or []))
+            while True:
+                remaining = self.max_rows - rows
+                if remaining <= 0:
+                    if await cursor.fetchrow() is not None:
+                        truncated_by = 'max_rows'
+                    break
+
+                records = await cursor.fetch(min(fetch_size, remaining))
+                if not records:
+                    break
+                batch = _records_to_batch(records)
+                geometry += [c for c in _geometry_names(records) if c not in geometry]
+
+                if max_bytes and size + batch.nbytes > max_bytes:
+                    # Keep the share of this batch that fits the budget
+                    fits = int(batch.num_rows * (max_bytes - size) / batch.nbytes)
+                    if fits:
+                        batches.append(batch.slice(0, fits))
+                        rows += fits
+                        size += batches[-1].nbytes
+                    truncated_by = 'max_bytes'
+                    break
+
+                batches.append(batch)
+                rows += batch.num_rows
+                size += batch.nbytes
+
+        if not rows:
+            return {
+                'data_ref': None,
+                'rows': 0,
+                'message': 'Query returned no results',
+                'mode': 'stream',
+                'truncated': truncated_by is not None
+            }
+
+        table = pa.concat_tables(
+            [pa.Table.from_batches([batch]) for batch in batches],
+            promote_options='permissive'
+        )
+        if geometry:
+            table = tag_geometry(table, geometry, geometry_format)
+        data_ref = self.store.store(table, name=name, source=f"pg_query: {query[:100]}...")
+        result = {
+            'data_ref': data_ref,
+            'rows': table.num_rows,
+            'columns': table.column_names,
+            'mode': 'stream',
+            'truncated': truncated_by is not None,
+            'memory_mb': round(table.nbytes / (1024 * 1024), 2)
+        }
+        if geometry:
+            result['geometry_columns'] = geometry
+        if truncated_by:
+            result['truncated_by'] = truncated_by
+            result['message'] = (
+                f"Stopped at {table.num_rows:,} rows ({truncated_by} reached); "
+                "add a WHERE/LIMIT or aggregate in SQL for the full result"
+            )
+        return result
+
+    async def _result_columns(self, conn: Any, query: str) -> List[Tuple[str, str]]:
+        """Describe a query's result columns as (name, type name) without running it"""
+        statement = await conn.prepare(query)
+        columns = []
+        for attribute in statement.get_attributes():
+            # Enums travel as their text label
+            type_name = 'text' if attribute.type.kind == 'e' else attribute.type.name
+            columns.append((attribute.name, type_name))
+        return columns
+
+    async def pg_explain(
+        self,
+        query: str,
+        params: Optional[List] = None,
+        analyze: bool = True,
+        rollback: bool = True,
+        top_n: int = 5,
+        seq_scan_min_rows: int = SEQ_SCAN_MIN_ROWS,
+        misestimate_factor: float = MISESTIMATE_FACTOR,
+        include_plan: bool = False
+    ) -> Dict:
+        """
+        Profile a query with EXPLAIN and summarize the plan.
+
+        Runs EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON). ANALYZE executes the
+        statement, so by default it runs inside a transaction that is rolled
+        back: DML can be profiled without changing data.
+
+        Args:
+            query: SQL statement to profile
+            params: Query parameters
+            analyze: Execute the statement for actual times and rows
+                (False = planner estimates only)
+            rollback: Run inside a rolled-back transaction
+            top_n: Number of costliest plan nodes to report
+            seq_scan_min_rows: Report sequential scans reading at least this many rows
+            misestimate_factor: Report row estimates off by at least this factor
+            include_plan: Also return the raw JSON plan
+
+        Returns:
+            Dict with planning/execution time, top_nodes, seq_scans,
+            misestimates, buffers (hit ratio) and hints
+        """
+        writes = modified_tables(query)
+        if analyze and not rollback and writes != set():
+            logger.warning("pg_explain running ANALYZE on a writing statement without rollback")
+
+        options = 'ANALYZE, BUFFERS, FORMAT JSON' if analyze else 'FORMAT JSON'
+        explain_sql = f"EXPLAIN ({options}) {query.strip().rstrip(';')}"
+        try:
+            async with self._acquire() as conn:
+                if rollback:
+                    transaction = conn.transaction()
+                    await transaction.start()
+                    try:
+                        plan = await conn.fetchval(explain_sql, *(params or []))
+                    finally:
+                        await transaction.rollback()
+                else:
+                    plan = await conn.fetchval(explain_sql, *(params or []))
+
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            summary = summarize_plan(
+                plan,
+                top_n=top_n,
+                seq_scan_min_rows=seq_scan_min_rows,
+                misestimate_factor=misestimate_factor
+            )
+            result = {
+                'query': query[:200],
+                **summary,
+                'rolled_back': rollback
+            }
+            if include_plan:
+                result['plan'] = plan
+            return result
+
+        except Exception as e:
+            logger.error(f"pg_explain failed: {e}")
+            return {'error': str(e)}
+
     async def pg_execute(
         self,
         query: str,
@@ -179,16 +724,18 @@ class PostgresTools:
             Dict with affected rows count
         """
         try:
-            pool = await self._get_pool()
-            async with pool.acquire() as conn:
+            async with self._acquire() as conn:
                 if params:
                     result = await conn.execute(query, *params)
                 else:
                     result = await conn.execute(query)
 
-                # Parse result (e.g., "INSERT 0 1" or "UPDATE 5")
+                # Parse result (e.g., "INSERT 0 1", "UPDATE 5" or "CREATE TABLE")
                 parts = result.split()
-                affected = int(parts[-1]) if parts else 0
+                affected = int(parts[-1]) if parts and parts[-1].isdigit() else 0
+                self._invalidate_cache(modified_tables(query))
+                if parts and parts[0] in CATALOG_COMMANDS:
+                    self.catalog = None
 
                 return {
                     'success': True,
@@ -200,6 +747,161 @@ class PostgresTools:
             logger.error(f"pg_execute failed: {e}")
             return {'error': str(e)}
 
+    def invalidate_caches(self):
+        """
+        Mark the catalog stale and drop cached pg_query results.
+
+        For writes made outside this server's own tools, such as dbt runs
+        that create and replace relations.
+        """
+        self.catalog = None
+        self._invalidate_cache(None)
+
+    def _invalidate_cache(self, tables: Optional[Set[str]]):
+        """Drop cached pg_query results that read tables a write touched"""
+        if not self.invalidate_on_write:
+            return
+        if tables is None or tables:
+            removed = self.query_cache.invalidate(tables)
+            if removed:
+                logger.debug(f"Invalidated {removed} cached pg_query result(s)")
+
+    async def pg_write_table(
+        self,
+        data_ref: str,
+        table: str,
+        schema: str = 'public',
+        mode: str = 'append',
+        key_columns: Optional[List[str]] = None,
+        create: bool = True
+    ) -> Dict:
+        """
+        Bulk load a stored DataFrame into a table via binary COPY.
+
+        Rows are streamed batch-by-batch into asyncpg's
+        copy_records_to_table, all inside one transaction.
+
+        Args:
+            data_ref: Reference to stored DataFrame
+            table: Target table name
+            schema: Target schema (default: public)
+            mode: 'append' (add rows), 'replace' (truncate, then load; the
+                table's indexes, constraints, grants and dependent views
+                are kept), or
+                'upsert' (load into a staging table, then INSERT ...
+                ON CONFLICT (key_columns) DO UPDATE)
+            key_columns: Conflict key for upsert (becomes the primary key
+                when the table is created)
+            create: Create the table from the Arrow schema if it is missing
+
+        Returns:
+            Dict with rows written, whether the table was created, and throughput
+        """
+        if mode not in WRITE_MODES:
+            return {'error': f"Unknown mode '{mode}'. Use one of: {', '.join(WRITE_MODES)}"}
+        if mode == 'upsert' and not key_columns:
+            return {'error': 'upsert mode requires key_columns'}
+
+        data = self.store.get(data_ref)
+        if data is None:
+            return {'error': f'DataFrame not found: {data_ref}'}
+        missing = [c for c in key_columns or [] if c not in data.column_names]
+        if missing:
+            return {'error': f'Key columns not found: {missing}'}
+
+        target = f"{quote_ident(schema)}.{quote_ident(table)}"
+        started = time.perf_counter()
+        try:
+            async with self._acquire() as conn:
+                async with conn.transaction():
+                    exists = await conn.fetchval('SELECT to_regclass($1) IS NOT NULL', target)
+                    if not exists and not create:
+                        raise RuntimeError(
+                            f'Table not found: {schema}.{table} (pass create=true to create it)'
+                        )
+                    if mode == 'replace' and exists:
+                        await conn.execute(f'TRUNCATE TABLE {target}')
+
+                    created = False
+                    if not exists:
+                        await conn.execute(create_table_sql(target, data.schema, key_columns))
+                        created = True
+
+                    columns = data.column_names
+                    if mode == 'upsert':
+                        await conn.execute(
+                            f'CREATE TEMP TABLE _pg_write_stage '
+                            f'(LIKE {target} INCLUDING DEFAULTS) ON COMMIT DROP'
+                        )
+                        await conn.copy_records_to_table(
+                            '_pg_write_stage', records=_arrow_records(data), columns=columns
+                        )
+                        await conn.execute(upsert_sql(target, '_pg_write_stage', columns, key_columns))
+                    else:
+                        await conn.copy_records_to_table(
+                            table, schema_name=schema, records=_arrow_records(data), columns=columns
+                        )
+
+            self._invalidate_cache({table, table.lower()})
+            if created:
+                self.catalog = None
+            elapsed = time.perf_counter() - started
+            return {
+                'success': True,
+                'table': f'{schema}.{table}',
+                'mode': mode,
+                'rows': data.num_rows,
+                'created': created,
+                'elapsed_seconds': round(elapsed, 3),
+                'rows_per_sec': round(data.num_rows / elapsed) if elapsed > 0 else None
+            }
+
+        except Exception as e:
+            logger.error(f"pg_write_table failed: {e}")
+            return {'error': str(e)}
+
+    async def _catalog(self, schema: Optional[str] = None) -> CatalogSnapshot:
+        """
+        Catalog snapshot for the introspection tools.
+
+        The whole catalog is bulk-loaded and reused for
+        DATA_PLATFORM_PG_CATALOG_TTL seconds. With a TTL of 0, every call
+        loads a fresh snapshot of just `schema`.
+        """
+        if self.catalog_ttl <= 0:
+            async with self._acquire() as conn:
+                return await CatalogSnapshot.load(conn, schema)
+
+        # One loader at a time; concurrent callers share its snapshot
+        async with self._catalog_lock:
+            if self.catalog is None or self.catalog.age_seconds > self.catalog_ttl:
+                async with self._acquire() as conn:
+                    self.catalog = await CatalogSnapshot.load(conn)
+        return self.catalog
+
+    async def pg_refresh_catalog(self) -> Dict:
+        """
+        Reload the catalog cache now.
+
+        Returns:
+            Dict with schema/table/column counts and load time
+        """
+        started = time.perf_counter()
+        try:
+            async with self._acquire() as conn:
+                catalog = await CatalogSnapshot.load(conn)
+            if self.catalog_ttl > 0:
+                self.catalog = catalog
+            return {
+                'refreshed': True,
+                **catalog.stats(),
+                'elapsed_seconds': round(time.perf_counter() - started, 3),
+                'ttl_seconds': self.catalog_ttl
+            }
+        except Exception as e:
+            logger.error(f"pg_refresh_catalog failed: {e}")
+            return {'error': str(e)}
+
     async def pg_tables(self, schema: str = 'public') -> Dict:
         """
         List all tables in schema.
@@ -210,34 +912,14 @@ class PostgresTools:
         Returns:
             Dict with list of tables
         """
-        query = """
-            SELECT
-                table_name,
-                table_type,
-                (SELECT count(*) FROM information_schema.columns c
-                 WHERE c.table_schema = t.table_schema
-                 AND c.table_name = t.table_name) as column_count
-            FROM information_schema.tables t
-            WHERE table_schema = $1
-            ORDER BY table_name
-        """
         try:
-            pool = await self._get_pool()
-            async with pool.acquire() as conn:
-                rows = await conn.fetch(query, schema)
-                tables = [
-                    {
-                        'name': r['table_name'],
-                        'type': r['table_type'],
-                        'columns': r['column_count']
-                    }
-                    for r in rows
-                ]
-                return {
-                    'schema': schema,
-                    'count': len(tables),
-                    'tables': tables
-                }
+            catalog = await self._catalog(schema)
+            tables = catalog.tables.get(schema, [])
+            return {
+                'schema': schema,
+                'count': len(tables),
+                'tables': tables
+            }
         except Exception as e:
             logger.error(f"pg_tables failed: {e}")
             return {'error': str(e)}
@@ -253,40 +935,14 @@ class PostgresTools:
         Returns:
             Dict with column details
         """
-        query = """
-            SELECT
-                column_name,
-                data_type,
-                udt_name,
-                is_nullable,
-                column_default,
-                character_maximum_length,
-                numeric_precision
-            FROM information_schema.columns
-            WHERE table_schema = $1 AND table_name = $2
-            ORDER BY ordinal_position
-        """
         try:
-            pool = await self._get_pool()
-            async with pool.acquire() as conn:
-                rows = await conn.fetch(query, schema, table)
-                columns = [
-                    {
-                        'name': r['column_name'],
-                        'type': r['data_type'],
-                        'udt': r['udt_name'],
-                        'nullable': r['is_nullable'] == 'YES',
-                        'default': r['column_default'],
-                        'max_length': r['character_maximum_length'],
-                        'precision': r['numeric_precision']
-                    }
-                    for r in rows
-                ]
-                return {
-                    'table': f'{schema}.{table}',
-                    'column_count': len(columns),
-                    'columns': columns
-                }
+            catalog = await self._catalog(schema)
+            columns = catalog.table_columns(schema, table)
+            return {
+                'table': f'{schema}.{table}',
+                'column_count': len(columns),
+                'columns': columns
+            }
         except Exception as e:
             logger.error(f"pg_columns failed: {e}")
             return {'error': str(e)}
@@ -298,25 +954,50 @@ class PostgresTools:
         Returns:
             Dict with list of schemas
         """
-        query = """
-            SELECT schema_name
-            FROM information_schema.schemata
-            WHERE schema_name NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
-            ORDER BY schema_name
-        """
         try:
-            pool = await self._get_pool()
-            async with pool.acquire() as conn:
-                rows = await conn.fetch(query)
-                schemas = [r['schema_name'] for r in rows]
-                return {
-                    'count': len(schemas),
-                    'schemas': schemas
-                }
+            if self.catalog_ttl > 0:
+                schemas = (await self._catalog()).schemas
+            else:
+                async with self._acquire() as conn:
+                    schemas = [r['schema_name'] for r in await conn.fetch(SCHEMAS_QUERY)]
+            return {
+                'count': len(schemas),
+                'schemas': schemas
+            }
         except Exception as e:
             logger.error(f"pg_schemas failed: {e}")
             return {'error': str(e)}
 
+    async def pg_search_columns(
+        self,
+        query: str,
+        schema: Optional[str] = None,
+        limit: int = 25
+    ) -> Dict:
+        """
+        Fuzzy search for columns by name across the whole database.
+
+        Args:
+            query: Column name or fragment; "table.column" narrows by table
+            schema: Restrict to one schema (default: all)
+            limit: Maximum matches (default: 25)
+
+        Returns:
+            Dict with ranked matches (schema, table, column, type, score, match)
+        """
+        try:
+            catalog = await self._catalog(schema)
+            matches = catalog.search_columns(query, schema=schema, limit=limit)
+            return {
+                'query': query,
+                'count': len(matches),
+                'matches': matches,
+                'catalog_age_seconds': round(catalog.age_seconds, 3)
+            }
+        except Exception as e:
+            logger.error(f"pg_search_columns failed: {e}")
+            return {'error': str(e)}
+
     async def st_tables(self, schema: str = 'public') -> Dict:
         """
         List PostGIS-enabled tables.
@@ -327,46 +1008,85 @@ class PostgresTools:
         Returns:
             Dict with list of tables with geometry columns
         """
-        query = """
-            SELECT
-                f_table_name as table_name,
-                f_geometry_column as geometry_column,
-                type as geometry_type,
-                srid,
-                coord_dimension
-            FROM geometry_columns
-            WHERE f_table_schema = $1
-            ORDER BY f_table_name
-        """
         try:
-            pool = await self._get_pool()
-            async with pool.acquire() as conn:
-                rows = await conn.fetch(query, schema)
-                tables = [
-                    {
-                        'table': r['table_name'],
-                        'geometry_column': r['geometry_column'],
-                        'geometry_type': r['geometry_type'],
-                        'srid': r['srid'],
-                        'dimensions': r['coord_dimension']
-                    }
-                    for r in rows
-                ]
-                return {
-                    'schema': schema,
-                    'count': len(tables),
-                    'postgis_tables': tables
-                }
+            catalog = await self._catalog(schema)
         except Exception as e:
-            if 'geometry_columns' in str(e):
+            logger.error(f"st_tables failed: {e}")
+            return {'error': str(e)}
+
+        if catalog.geometry is None:
+            if 'geometry_columns' in (catalog.geometry_error or ''):
                 return {
                     'error': 'PostGIS not installed or extension not enabled',
                     'suggestion': 'Run: CREATE EXTENSION IF NOT EXISTS postgis;'
                 }
-            logger.error(f"st_tables failed: {e}")
-            return {'error': str(e)}
+            logger.error(f"st_tables failed: {catalog.geometry_error}")
+            return {'error': catalog.geometry_error}
+
+        tables = catalog.geometry.get(schema, [])
+        return {
+            'schema': schema,
+            'count': len(tables),
+            'postgis_tables': tables
+        }
+
+    async def _geometry_metadata(self, table: str, column: str, schema: str) -> Optional[Dict]:
+        """A column's geometry_columns entry (typmod type and SRID) from the catalog cache"""
+        catalog = await self._catalog(schema)
+        for entry in (catalog.geometry or {}).get(schema, []):
+            if entry['table'] == table and entry['geometry_column'] == column:
+                return entry
+        return None
+
+    async def _sample_rows(
+        self,
+        conn: Any,
+        select: str,
+        table: str,
+        column: str,
+        schema: str,
+        sample_percent: float
+    ) -> Tuple[List[Any], Dict]:
+        """
+        Evaluate `select` over a sample of a table's non-null geometries.
 
-    async def st_geometry_type(self, table: str, column: str, schema: str = 'public') -> Dict:
+        Uses TABLESAMPLE SYSTEM (page-level, so it reads ~sample_percent of
+        the table). Views cannot be sampled and small tables may sample no
+        pages; both fall back to the first SPATIAL_SAMPLE_ROWS rows.
+
+        Args:
+            select: Select list; `{geom}` is replaced by the quoted column
+
+        Returns:
+            (rows, description of the sample taken)
+        """
+        target = f"{quote_ident(schema)}.{quote_ident(table)}"
+        geom = quote_ident(column)
+        select = select.format(geom=geom)
+        try:
+            rows = await conn.fetch(
+                f"SELECT {select} FROM {target} TABLESAMPLE SYSTEM ($1) WHERE {geom} IS NOT NULL",
+                float(sample_percent)
+            )
+            if any(value is not None for row in rows for value in row.values()):
+                return rows, {'method': 'tablesample', 'percent': sample_percent}
+        except Exception as e:
+            logger.debug(f"TABLESAMPLE unavailable for {target}: {e}")
+
+        rows = await conn.fetch(
+            f"SELECT {select} FROM (SELECT {geom} FROM {target} "
+            f"WHERE {geom} IS NOT NULL LIMIT {SPATIAL_SAMPLE_ROWS}) AS _s"
+        )
+        return rows, {'method': 'limit', 'rows': SPATIAL_SAMPLE_ROWS}
+
+    async def st_geometry_type(
+        self,
+        table: str,
+        column: str,
+        schema: str = 'public',
+        mode: str = 'exact',
+        sample_percent: float = 1.0
+    ) -> Dict:
         """
         Get geometry type of a column.
 
@@ -374,10 +1094,18 @@ class PostgresTools:
             table: Table name
             column: Geometry column name
             schema: Schema name
+            mode: 'exact' (scan the table), 'fast' (typmod from
+                geometry_columns, sampling only for unconstrained columns),
+                or 'sample' (TABLESAMPLE only)
+            sample_percent: Share of table pages read when sampling
 
         Returns:
-            Dict with geometry type information
+            Dict with geometry type information, plus `exact` and `method`
+            (scan, metadata, or sample)
         """
+        if mode not in SPATIAL_MODES:
+            return {'error': f"Unknown mode '{mode}'. Use one of: {', '.join(SPATIAL_MODES)}"}
+
         query = f"""
             SELECT DISTINCT ST_GeometryType({column}) as geom_type
             FROM {schema}.{table}
@@ -385,20 +1113,43 @@ class PostgresTools:
             LIMIT 10
         """
         try:
-            pool = await self._get_pool()
-            async with pool.acquire() as conn:
-                rows = await conn.fetch(query)
-                types = [r['geom_type'] for r in rows]
+            result = {'table': f'{schema}.{table}', 'column': column}
+            if mode == 'fast':
+                metadata = await self._geometry_metadata(table, column, schema)
+                type_name = geometry_type_name(metadata['geometry_type']) if metadata else None
+                if type_name:
+                    return {**result, 'geometry_types': [type_name], 'exact': True, 'method': 'metadata'}
+
+            async with self._acquire() as conn:
+                if mode == 'exact':
+                    rows = await conn.fetch(query)
+                    types = [r['geom_type'] for r in rows]
+                    return {**result, 'geometry_types': types, 'exact': True, 'method': 'scan'}
+
+                rows, sample = await self._sample_rows(
+                    conn, 'DISTINCT ST_GeometryType({geom}) AS geom_type',
+                    table, column, schema, sample_percent
+                )
+                types = sorted(r['geom_type'] for r in rows if r['geom_type'] is not None)
                 return {
-                    'table': f'{schema}.{table}',
-                    'column': column,
-                    'geometry_types': types
+                    **result,
+                    'geometry_types': types,
+                    'exact': False,
+                    'method': 'sample',
+                    'sample': sample
                 }
         except Exception as e:
             logger.error(f"st_geometry_type failed: {e}")
             return {'error': str(e)}
 
-    async def st_srid(self, table: str, column: str, schema: str = 'public') -> Dict:
+    async def st_srid(
+        self,
+        table: str,
+        column: str,
+        schema: str = 'public',
+        mode: str = 'exact',
+        sample_percent: float = 1.0
+    ) -> Dict:
         """
         Get SRID of geometry column.
 
@@ -406,10 +1157,16 @@ class PostgresTools:
             table: Table name
             column: Geometry column name
             schema: Schema name
+            mode: 'exact' (scan the table), 'fast' (typmod SRID from
+                geometry_columns, sampling only when it is 0), or 'sample'
+            sample_percent: Share of table pages read when sampling
 
         Returns:
-            Dict with SRID information
+            Dict with SRID information, plus `exact` and `method`
         """
+        if mode not in SPATIAL_MODES:
+            return {'error': f"Unknown mode '{mode}'. Use one of: {', '.join(SPATIAL_MODES)}"}
+
         query = f"""
             SELECT DISTINCT ST_SRID({column}) as srid
             FROM {schema}.{table}
@@ -417,10 +1174,28 @@ class PostgresTools:
             LIMIT 1
         """
         try:
-            pool = await self._get_pool()
-            async with pool.acquire() as conn:
-                row = await conn.fetchrow(query)
-                srid = row['srid'] if row else None
+            metadata = None
+            if mode == 'fast':
+                metadata = await self._geometry_metadata(table, column, schema)
+
+            async with self._acquire() as conn:
+                if metadata and metadata['srid']:
+                    srid = metadata['srid']
+                    estimate = {'exact': True, 'method': 'metadata'}
+                elif mode == 'exact':
+                    row = await conn.fetchrow(query)
+                    srid = row['srid'] if row else None
+                    estimate = {'exact': True, 'method': 'scan'}
+                else:
+                    rows, sample = await self._sample_rows(
+                        conn, 'DISTINCT ST_SRID({geom}) AS srid',
+                        table, column, schema, sample_percent
+                    )
+                    srids = sorted(r['srid'] for r in rows if r['srid'] is not None)
+                    srid = srids[0] if srids else None
+                    estimate = {'exact': False, 'method': 'sample', 'sample': sample}
+                    if len(srids) > 1:
+                        estimate['srids'] = srids
 
                 # Get SRID description
                 srid_info = None
@@ -441,13 +1216,21 @@ class PostgresTools:
                     'table': f'{schema}.{table}',
                     'column': column,
                     'srid': srid,
-                    'info': srid_info
+                    'info': srid_info,
+                    **estimate
                 }
         except Exception as e:
             logger.error(f"st_srid failed: {e}")
             return {'error': str(e)}
 
-    async def st_extent(self, table: str, column: str, schema: str = 'public') -> Dict:
+    async def st_extent(
+        self,
+        table: str,
+        column: str,
+        schema: str = 'public',
+        mode: str = 'exact',
+        sample_percent: float = 1.0
+    ) -> Dict:
         """
         Get bounding box of all geometries.
 
@@ -455,10 +1238,18 @@ class PostgresTools:
             table: Table name
             column: Geometry column name
             schema: Schema name
+            mode: 'exact' (ST_Extent over the table), 'fast'
+                (ST_EstimatedExtent from planner statistics, sampling when
+                the table has not been analyzed), or 'sample'
+            sample_percent: Share of table pages read when sampling
 
         Returns:
-            Dict with bounding box coordinates
+            Dict with bounding box coordinates, plus `exact` and `method`
+            (scan, statistics, or sample)
         """
+        if mode not in SPATIAL_MODES:
+            return {'error': f"Unknown mode '{mode}'. Use one of: {', '.join(SPATIAL_MODES)}"}
+
         query = f"""
             SELECT
                 ST_XMin(extent) as xmin,
@@ -471,9 +1262,24 @@ class PostgresTools:
             ) sub
         """
         try:
-            pool = await self._get_pool()
-            async with pool.acquire() as conn:
-                row = await conn.fetchrow(query)
+            async with self._acquire() as conn:
+                row = None
+                estimate = {'exact': True, 'method': 'scan'}
+                if mode == 'fast':
+                    row = await self._estimated_extent(conn, table, column, schema)
+                    estimate = {'exact': False, 'method': 'statistics'}
+                if mode == 'exact':
+                    row = await conn.fetchrow(query)
+                elif row is None or row['xmin'] is None:
+                    rows, sample = await self._sample_rows(
+                        conn,
+                        'ST_XMin(ST_Extent({geom})) AS xmin, ST_YMin(ST_Extent({geom})) AS ymin, '
+                        'ST_XMax(ST_Extent({geom})) AS xmax, ST_YMax(ST_Extent({geom})) AS ymax',
+                        table, column, schema, sample_percent
+                    )
+                    row = rows[0] if rows else None
+                    estimate = {'exact': False, 'method': 'sample', 'sample': sample}
+
                 if row and row['xmin'] is not None:
                     return {
                         'table': f'{schema}.{table}',
@@ -483,18 +1289,35 @@ class PostgresTools:
                             'ymin': float(row['ymin']),
                             'xmax': float(row['xmax']),
                             'ymax': float(row['ymax'])
-                        }
+                        },
+                        **estimate
                     }
                 return {
                     'table': f'{schema}.{table}',
                     'column': column,
                     'bbox': None,
-                    'message': 'No geometries found or all NULL'
+                    'message': 'No geometries found or all NULL',
+                    **estimate
                 }
         except Exception as e:
             logger.error(f"st_extent failed: {e}")
             return {'error': str(e)}
 
+    async def _estimated_extent(self, conn: Any, table: str, column: str, schema: str) -> Optional[Any]:
+        """ST_EstimatedExtent from planner statistics, or None if the table has none"""
+        try:
+            return await conn.fetchrow(
+                """
+                SELECT ST_XMin(e) as xmin, ST_YMin(e) as ymin, ST_XMax(e) as xmax, ST_YMax(e) as ymax
+                FROM (SELECT ST_EstimatedExtent($1, $2, $3) as e) sub
+                """,
+                schema, table, column
+            )
+        except Exception as e:
+            # Older PostGIS raises instead of returning NULL for unanalyzed tables
+            logger.debug(f"ST_EstimatedExtent unavailable for {schema}.{table}: {e}")
+            return None
+
     async def close(self):
         """Close connection pool"""
         if self.pool:
@@ -502,6 +1325,135 @@ class PostgresTools:
             self.pool = None
 
 
+def quote_ident(name: str) -> str:
+    """Quote a PostgreSQL identifier"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def geometry_type_name(type_name: str) -> Optional[str]:
+    """
+    ST_GeometryType() name for a geometry_columns type.
+
+    Returns None for unconstrained columns (GEOMETRY), whose rows may mix types.
+    """
+    name = type_name.upper()
+    if name.endswith('M') and name[:-1] in GEOMETRY_TYPE_NAMES:
+        name = name[:-1]
+    return GEOMETRY_TYPE_NAMES.get(name)
+
+
+def arrow_to_pg_type(arrow_type: pa.DataType) -> str:
+    """
+    Map an Arrow type to the PostgreSQL column type used for CREATE TABLE.
+
+    Nested types (lists, structs, maps) are stored as jsonb.
+    """
+    types = pa.types
+    if types.is_dictionary(arrow_type):
+        return arrow_to_pg_type(arrow_type.value_type)
+    if types.is_boolean(arrow_type):
+        return 'boolean'
+    if types.is_int8(arrow_type) or types.is_int16(arrow_type) or types.is_uint8(arrow_type):
+        return 'smallint'
+    if types.is_int32(arrow_type) or types.is_uint16(arrow_type):
+        return 'integer'
+    if types.is_int64(arrow_type) or types.is_uint32(arrow_type):
+        return 'bigint'
+    if types.is_uint64(arrow_type):
+        return 'numeric(20, 0)'
+    if types.is_float16(arrow_type) or types.is_float32(arrow_type):
+        return 'real'
+    if types.is_float64(arrow_type):
+        return 'double precision'
+    if types.is_decimal(arrow_type):
+        return f'numeric({arrow_type.precision}, {arrow_type.scale})'
+    if types.is_string(arrow_type) or types.is_large_string(arrow_type):
+        return 'text'
+    if types.is_binary(arrow_type) or types.is_large_binary(arrow_type) or types.is_fixed_size_binary(arrow_type):
+        return 'bytea'
+    if types.is_date(arrow_type):
+        return 'date'
+    if types.is_timestamp(arrow_type):
+        return 'timestamptz' if arrow_type.tz else 'timestamp'
+    if types.is_time(arrow_type):
+        return 'time'
+    if types.is_duration(arrow_type):
+        return 'interval'
+    if types.is_nested(arrow_type):
+        return 'jsonb'
+    return 'text'
+
+
+def create_table_sql(
+    target: str,
+    schema: pa.Schema,
+    key_columns: Optional[List[str]] = None
+) -> str:
+    """Build CREATE TABLE for an Arrow schema (target must be quoted)"""
+    columns = [
+        f"{quote_ident(field.name)} {arrow_to_pg_type(field.type)}"
+        + ('' if field.nullable or key_columns and field.name in key_columns else ' NOT NULL')
+        for field in schema
+    ]
+    if key_columns:
+        columns.append(f"PRIMARY KEY ({', '.join(quote_ident(c) for c in key_columns)})")
+    return f"CREATE TABLE {target} ({', '.join(columns)})"
+
+
+def upsert_sql(target: str, stage: str, columns: List[str], key_columns: List[str]) -> str:
+    """Build INSERT ... ON CONFLICT DO UPDATE from a staging table"""
+    column_list = ', '.join(quote_ident(c) for c in columns)
+    keys = ', '.join(quote_ident(c) for c in key_columns)
+    updates = [c for c in columns if c not in key_columns]
+    if updates:
+        action = 'DO UPDATE SET ' + ', '.join(
+            f"{quote_ident(c)} = EXCLUDED.{quote_ident(c)}" for c in updates
+        )
+    else:
+        action = 'DO NOTHING'
+    return (
+        f"INSERT INTO {target} ({column_list}) "
+        f"SELECT {column_list} FROM {stage} "
+        f"ON CONFLICT ({keys}) {action}"
+    )
+
+
+def _arrow_records(table: pa.Table, batch_rows: int = 50_000):
+    """Yield row tuples one record batch at a time for copy_records_to_table"""
+    json_columns = [
+        i for i, field in enumerate(table.schema)
+        if pa.types.is_nested(field.type)
+    ]
+    for batch in table.to_batches(max_chunksize=batch_rows):
+        columns = [column.to_pylist() for column in batch.columns]
+        for i in json_columns:
+            columns[i] = [None if v is None else json.dumps(v, default=str) for v in columns[i]]
+        yield from zip(*columns)
+
+
+def _geometry_names(records: List[Any]) -> List[str]:
+    """Columns holding WKB values decoded by the geometry codec"""
+    names = list(records[0].keys())
+    return [
+        name for name in names
+        if any(isinstance(record[name], WKB) for record in records)
+    ]
+
+
+def _records_to_batch(records: List[Any]) -> pa.RecordBatch:
+    """Convert one fetch of asyncpg records into an Arrow record batch"""
+    names = list(records[0].keys())
+    arrays = []
+    for name in names:
+        values = [record[name] for record in records]
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+            # UUIDs, ranges, geometries etc. have no Arrow type; keep their text
+            arrays.append(pa.array([None if v is None else str(v) for v in values]))
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
 def check_connection() -> None:
     """
     Check PostgreSQL connection for SessionStart hook.
@@ -0,0 +1,236 @@
+"""
+pg_query result cache.
+
+Maps normalized SQL plus parameters to the data_ref that already holds the
+result, so a repeated query is answered without a round trip. Entries
+expire after a TTL, are dropped when their data_ref is dropped or
+overwritten, and can be invalidated by DML against a table they read.
+"""
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# String literals, quoted identifiers and dollar-quoted bodies are kept
+# verbatim; runs of comments and whitespace collapse to a single space
+_SQL_TOKENS = re.compile(
+    r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|\$([A-Za-z_]\w*|)\$.*?\$\2\$)"""
+    r"""|((?:--[^\n]*|/\*.*?\*/|\s)+)""",
+    re.DOTALL
+)
+
+_IDENTIFIER = r'((?:"(?:[^"]|"")+"|[A-Za-z_][\w$]*)(?:\s*\.\s*(?:"(?:[^"]|"")+"|[A-Za-z_][\w$]*))*)'
+
+# Tables a query reads
+_READ_TABLES = re.compile(r'\b(?:FROM|JOIN)\s+(?:ONLY\s+)?' + _IDENTIFIER, re.IGNORECASE)
+
+# Tables a statement modifies
+_WRITE_TABLES = re.compile(
+    r'\b(?:INSERT\s+INTO|UPDATE(?:\s+ONLY)?|DELETE\s+FROM(?:\s+ONLY)?|MERGE\s+INTO'
+    r'|TRUNCATE(?:\s+TABLE)?(?:\s+ONLY)?|(?:ALTER|DROP)\s+TABLE(?:\s+IF\s+EXISTS)?'
+    r'|COPY)\s+' + _IDENTIFIER,
+    re.IGNORECASE
+)
+
+_READ_ONLY_COMMANDS = ('SELECT', 'WITH', 'SHOW', 'EXPLAIN', 'VALUES', 'TABLE')
+
+# String literals and quoted identifiers, blanked before keyword checks
+_QUOTED = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|\$([A-Za-z_]\w*|)\$.*?\$\1\$""", re.DOTALL)
+
+# Keywords that make a statement write (also inside CTEs and subqueries),
+# lock rows, or execute what it explains
+_WRITE_KEYWORDS = re.compile(
+    r'\b(?:insert|update|delete|merge|truncate|create|drop|alter|grant|revoke'
+    r'|copy|call|into|analyze|share)\b|;'
+)
+
+# Functions whose result differs between calls or that have side effects
+_VOLATILE_FUNCTIONS = re.compile(
+    r'\b(?:nextval|setval|currval|lastval|random|random_normal|gen_random_uuid'
+    r'|uuid_generate_v\d\w*|now|clock_timestamp|statement_timestamp'
+    r'|transaction_timestamp|timeofday|txid_current\w*|pg_current_xact_id\w*'
+    r'|set_config|pg_sleep\w*|pg_notify|pg_advisory\w*|pg_try_advisory\w*'
+    r'|pg_cancel_backend|pg_terminate_backend|dblink\w*|lo_\w+)\s*\('
+    r'|\b(?:current_timestamp|current_date|current_time|localtime|localtimestamp)\b'
+)
+
+
+def normalize_sql(query: str) -> str:
+    """
+    Canonicalize SQL text for cache lookups.
+
+    Comments are removed, whitespace runs collapse to one space, unquoted
+    text is lowercased (PostgreSQL folds unquoted identifiers and keywords
+    anyway), and a trailing semicolon is dropped. Literals and quoted
+    identifiers are left untouched.
+    """
+    pieces = []
+    position = 0
+    for match in _SQL_TOKENS.finditer(query):
+        pieces.append(query[position:match.start()].lower())
+        pieces.append(match.group(1) if match.group(1) is not None else ' ')
+        position = match.end()
+    pieces.append(query[position:].lower())
+    return ''.join(pieces).strip().rstrip(';').strip()
+
+
+def _table_name(identifier: str) -> str:
+    """Bare table name: last dotted component, unquoted or lowercased"""
+    last = re.split(r'\s*\.\s*(?=(?:[^"]*"[^"]*")*[^"]*$)', identifier)[-1]
+    if last.startswith('"'):
+        return last[1:-1].replace('""', '"')
+    return last.lower()
+
+
+def referenced_tables(query: str) -> Set[str]:
+    """Bare names of the tables a query reads (FROM / JOIN)"""
+    return {_table_name(m.group(1)) for m in _READ_TABLES.finditer(normalize_sql(query))}
+
+
+def modified_tables(statement: str) -> Optional[Set[str]]:
+    """
+    Bare names of the tables a statement writes.
+
+    Returns:
+        Set of table names, an empty set for read-only statements, or None
+        when the statement may write but its targets cannot be determined
+        (functions, DO blocks, CALL, ...)
+    """
+    normalized = normalize_sql(statement)
+    tables = {_table_name(m.group(1)) for m in _WRITE_TABLES.finditer(normalized)}
+    if tables:
+        return tables
+    first_word = normalized.split(' ', 1)[0].upper() if normalized else ''
+    if first_word in _READ_ONLY_COMMANDS:
+        return set()
+    return None
+
+
+def is_read_only(query: str) -> bool:
+    """
+    Whether a query can be answered from the cache.
+
+    True only for a single read-only statement with no write keyword
+    anywhere (data-modifying CTEs, SELECT INTO, FOR UPDATE / SHARE,
+    EXPLAIN ANALYZE) and no volatile functions (nextval, random, now, ...).
+    Anything else may change data or return something new on every call.
+    """
+    if modified_tables(query) != set():
+        return False
+    unquoted = _QUOTED.sub("''", normalize_sql(query))
+    return not (_WRITE_KEYWORDS.search(unquoted) or _VOLATILE_FUNCTIONS.search(unquoted))
+
+
+@dataclass
+class CacheEntry:
+    """A cached pg_query result"""
+    data_ref: str
+    info: Any
+    result: Dict
+    tables: Set[str]
+    created: float
+
+
+class QueryCache:
+    """
+    TTL cache of pg_query results keyed by normalized SQL and params.
+
+    Off unless a positive TTL is given: writes made outside this process
+    are not seen until an entry expires.
+
+    An entry is only served while its data_ref still holds the exact table
+    it was created with (checked by DataFrameInfo identity), so drop_data
+    or an overwrite silently retires it.
+    """
+
+    def __init__(self, ttl_seconds: float = 0.0, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, str], CacheEntry] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def key(query: str, params: Optional[List]) -> Tuple[str, str]:
+        """Cache key for a query and its parameters"""
+        return normalize_sql(query), json.dumps(list(params or []), default=str)
+
+    def get(self, query: str, params: Optional[List], store: Any) -> Optional[CacheEntry]:
+        """
+        Look up a live entry, counting the hit or miss.
+
+        Args:
+            query: SQL text
+            params: Query parameters
+            store: DataStore used to confirm the data_ref is unchanged
+        """
+        key = self.key(query, params)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expired = time.monotonic() - entry.created > self.ttl_seconds
+            if expired or store.get_info(entry.data_ref) is not entry.info:
+                del self._entries[key]
+                entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        # LRU order: most recently used last
+        self._entries[key] = self._entries.pop(key)
+        return entry
+
+    def put(self, query: str, params: Optional[List], result: Dict, store: Any):
+        """Remember a stored pg_query result"""
+        data_ref = result.get('data_ref')
+        if not self.enabled or not data_ref:
+            return
+        key = self.key(query, params)
+        self._entries.pop(key, None)
+        self._entries[key] = CacheEntry(
+            data_ref=data_ref,
+            info=store.get_info(data_ref),
+            result=dict(result),
+            tables=referenced_tables(query),
+            created=time.monotonic()
+        )
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def invalidate(self, tables: Optional[Set[str]] = None) -> int:
+        """
+        Drop entries that read any of `tables` (all entries if None).
+
+        Returns:
+            Number of entries removed
+        """
+        if tables is None:
+            stale = list(self._entries)
+        else:
+            stale = [key for key, entry in self._entries.items() if entry.tables & tables]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and size"""
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'invalidations': self.invalidations,
+            'ttl_seconds': self.ttl_seconds
+        }
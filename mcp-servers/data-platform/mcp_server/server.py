@@ -42,6 +42,18 @@ class DataPlatformMCPServer:
             self.pandas_tools = PandasTools()
             self.postgres_tools = PostgresTools()
             self.dbt_tools = DbtTools()
+            # dbt creates and replaces relations in the same database
+            self.dbt_tools.on_warehouse_changed = self.postgres_tools.invalidate_caches
+
+            # Optionally open the pool now so the first query skips connection setup
+            if self.config.get('postgres_available') and self.config.get('pg_pool_warmup'):
+                warmup = await self.postgres_tools.warmup()
+                if warmup.get('warmed'):
+                    logger.info(f"PostgreSQL pool warmed in {warmup['elapsed_seconds']}s")
+
+            # Start the dbt worker now; it parses the project while the client connects
+            if self.config.get('dbt_available') and self.config.get('dbt_worker'):
+                await self.dbt_tools.start_worker()
 
             # Log available capabilities
             caps = []
@@ -81,7 +93,16 @@ class DataPlatformMCPServer:
                             },
                             "chunk_size": {
                                 "type": "integer",
-                                "description": "Process in chunks of this size"
+                                "description": "Approximate rows per streamed batch"
+                            },
+                            "columns": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Optional list of columns to load"
+                            },
+                            "condition": {
+                                "type": "string",
+                                "description": "Optional row filter applied while reading (pandas query syntax)"
                             }
                         },
                         "required": ["file_path"]
@@ -105,11 +126,66 @@ class DataPlatformMCPServer:
                                 "type": "array",
                                 "items": {"type": "string"},
                                 "description": "Optional list of columns to load"
+                            },
+                            "filters": {
+                                "description": "Row filter pushed down to row groups: DNF list ([[\"col\", \"=\", value], ...]) or expression string (\"day == '2024-01-01'\")",
+                                "oneOf": [
+                                    {"type": "string"},
+                                    {"type": "array"}
+                                ]
                             }
                         },
                         "required": ["file_path"]
                     }
                 ),
+                Tool(
+                    name="read_dataset",
+                    description="Load a partitioned or multi-file dataset (directory or file list) into DataFrame, pruning partitions and row groups by filter",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "path": {
+                                "description": "Dataset directory, or list of file paths",
+                                "oneOf": [
+                                    {"type": "string"},
+                                    {"type": "array", "items": {"type": "string"}}
+                                ]
+                            },
+                            "name": {
+                                "type": "string",
+                                "description": "Optional name for data_ref"
+                            },
+                            "format": {
+                                "type": "string",
+                                "enum": ["parquet", "csv", "feather", "ipc"],
+                                "default": "parquet",
+                                "description": "File format"
+                            },
+                            "partitioning": {
+                                "description": "'hive' for key=value directories, list of field names for plain directories, or null for none",
+                                "oneOf": [
+                                    {"type": "string"},
+                                    {"type": "array", "items": {"type": "string"}},
+                                    {"type": "null"}
+                                ],
+                                "default": "hive"
+                            },
+                            "columns": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Optional list of columns to load (partition keys allowed)"
+                            },
+                            "filters": {
+                                "description": "Row filter pushed down to partitions and row groups: DNF list or expression string",
+                                "oneOf": [
+                                    {"type": "string"},
+                                    {"type": "array"}
+                                ]
+                            }
+                        },
+                        "required": ["path"]
+                    }
+                ),
                 Tool(
                     name="read_json",
                     description="Load JSON/JSONL file into DataFrame",
@@ -179,6 +255,50 @@ class DataPlatformMCPServer:
                         "required": ["data_ref", "file_path"]
                     }
                 ),
+                Tool(
+                    name="write_dataset",
+                    description="Export DataFrame as a hive-partitioned, multi-file dataset",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "data_ref": {
+                                "type": "string",
+                                "description": "Reference to stored DataFrame"
+                            },
+                            "base_dir": {
+                                "type": "string",
+                                "description": "Output directory"
+                            },
+                            "format": {
+                                "type": "string",
+                                "enum": ["parquet", "csv", "feather", "ipc"],
+                                "default": "parquet",
+                                "description": "File format"
+                            },
+                            "partition_cols": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Columns to partition by (key=value directories)"
+                            },
+                            "max_rows_per_file": {
+                                "type": "integer",
+                                "description": "Split output files at this many rows"
+                            },
+                            "compression": {
+                                "type": "string",
+                                "default": "snappy",
+                                "description": "Compression codec (parquet only)"
+                            },
+                            "existing_data_behavior": {
+                                "type": "string",
+                                "enum": ["error", "overwrite_or_ignore", "delete_matching"],
+                                "default": "error",
+                                "description": "What to do if base_dir already has data"
+                            }
+                        },
+                        "required": ["data_ref", "base_dir"]
+                    }
+                ),
                 Tool(
                     name="describe",
                     description="Get statistical summary of DataFrame",
@@ -233,7 +353,7 @@ class DataPlatformMCPServer:
                 ),
                 Tool(
                     name="filter",
-                    description="Filter DataFrame rows by condition",
+                    description="Filter DataFrame rows by condition (or scan a file/dataset out-of-core via path)",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -248,14 +368,26 @@ class DataPlatformMCPServer:
                             "name": {
                                 "type": "string",
                                 "description": "Optional name for result data_ref"
+                            },
+                            "path": {
+                                "description": "Out-of-core source instead of data_ref: CSV/Parquet file, dataset directory, or file list (scanned in batches)",
+                                "oneOf": [
+                                    {"type": "string"},
+                                    {"type": "array", "items": {"type": "string"}}
+                                ]
+                            },
+                            "format": {
+                                "type": "string",
+                                "enum": ["parquet", "csv", "feather", "ipc"],
+                                "description": "Format for path (inferred from file suffix if omitted)"
                             }
                         },
-                        "required": ["data_ref", "condition"]
+                        "required": ["condition"]
                     }
                 ),
                 Tool(
                     name="select",
-                    description="Select specific columns from DataFrame",
+                    description="Select specific columns from DataFrame (or read only those columns from a file/dataset via path)",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -271,14 +403,26 @@ class DataPlatformMCPServer:
                             "name": {
                                 "type": "string",
                                 "description": "Optional name for result data_ref"
+                            },
+                            "path": {
+                                "description": "Out-of-core source instead of data_ref: CSV/Parquet file, dataset directory, or file list (scanned in batches)",
+                                "oneOf": [
+                                    {"type": "string"},
+                                    {"type": "array", "items": {"type": "string"}}
+                                ]
+                            },
+                            "format": {
+                                "type": "string",
+                                "enum": ["parquet", "csv", "feather", "ipc"],
+                                "description": "Format for path (inferred from file suffix if omitted)"
                             }
                         },
-                        "required": ["data_ref", "columns"]
+                        "required": ["columns"]
                     }
                 ),
                 Tool(
                     name="groupby",
-                    description="Group DataFrame and aggregate",
+                    description="Group DataFrame and aggregate (or aggregate a file/dataset larger than max_rows incrementally via path)",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -300,9 +444,25 @@ class DataPlatformMCPServer:
                             "name": {
                                 "type": "string",
                                 "description": "Optional name for result data_ref"
+                            },
+                            "condition": {
+                                "type": "string",
+                                "description": "Optional pandas query string; rows are filtered before grouping"
+                            },
+                            "path": {
+                                "description": "Out-of-core source instead of data_ref: CSV/Parquet file, dataset directory, or file list (scanned in batches)",
+                                "oneOf": [
+                                    {"type": "string"},
+                                    {"type": "array", "items": {"type": "string"}}
+                                ]
+                            },
+                            "format": {
+                                "type": "string",
+                                "enum": ["parquet", "csv", "feather", "ipc"],
+                                "description": "Format for path (inferred from file suffix if omitted)"
                             }
                         },
-                        "required": ["data_ref", "by", "agg"]
+                        "required": ["by", "agg"]
                     }
                 ),
                 Tool(
@@ -379,7 +539,7 @@ class DataPlatformMCPServer:
                 # PostgreSQL tools
                 Tool(
                     name="pg_connect",
-                    description="Test PostgreSQL connection and return status",
+                    description="Test PostgreSQL connection and return status (including connection pool stats)",
                     inputSchema={
                         "type": "object",
                         "properties": {}
@@ -403,6 +563,113 @@ class DataPlatformMCPServer:
                             "name": {
                                 "type": "string",
                                 "description": "Optional name for result data_ref"
+                            },
+                            "mode": {
+                                "type": "string",
+                                "enum": ["fetch", "copy", "stream"],
+                                "default": "fetch",
+                                "description": "Result transfer: 'fetch' (row records), 'copy' (binary COPY decoded straight into Arrow; use for large results), or 'stream' (server-side cursor; stops at the row limit or byte budget and stores a truncated result)"
+                            },
+                            "fetch_size": {
+                                "type": "integer",
+                                "description": "Rows per cursor fetch in stream mode (default DATA_PLATFORM_PG_FETCH_SIZE)"
+                            },
+                            "max_mb": {
+                                "type": "number",
+                                "description": "Byte budget in MB for stream mode (default DATA_PLATFORM_PG_STREAM_MAX_MB, 0 = none)"
+                            },
+                            "use_cache": {
+                                "type": "boolean",
+                                "default": True,
+                                "description": "Serve a repeat of a recent identical query (same normalized SQL and params) from its existing data_ref"
+                            },
+                            "geometry_format": {
+                                "type": "string",
+                                "enum": ["wkb", "geoarrow"],
+                                "default": "wkb",
+                                "description": "PostGIS columns as 'wkb' (Arrow binary tagged geoarrow.wkb) or 'geoarrow' (x/y coordinate lists; needs one geometry type per column)"
+                            }
+                        },
+                        "required": ["query"]
+                    }
+                ),
+                Tool(
+                    name="pg_query_batch",
+                    description="Run independent SELECT queries concurrently over the pool; each result becomes its own data_ref, with per-query timing",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "queries": {
+                                "type": "array",
+                                "items": {
+                                    "type": ["string", "object"],
+                                    "properties": {
+                                        "query": {"type": "string"},
+                                        "params": {"type": "array", "items": {}},
+                                        "name": {"type": "string"},
+                                        "mode": {"type": "string", "enum": ["fetch", "copy", "stream"]}
+                                    }
+                                },
+                                "description": "SQL strings, or objects with query, params, name and mode"
+                            },
+                            "max_concurrency": {
+                                "type": "integer",
+                                "description": "Queries in flight at once (default and maximum: DATA_PLATFORM_PG_POOL_MAX_SIZE)"
+                            },
+                            "mode": {
+                                "type": "string",
+                                "enum": ["fetch", "copy", "stream"],
+                                "default": "fetch",
+                                "description": "Default mode for queries that do not set one"
+                            }
+                        },
+                        "required": ["queries"]
+                    }
+                ),
+                Tool(
+                    name="pg_explain",
+                    description="Profile a query with EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON): costliest nodes, large seq scans, row misestimates, buffer hit ratio and tuning hints. Runs in a rolled-back transaction by default, so DML is safe to profile",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "query": {
+                                "type": "string",
+                                "description": "SQL statement to profile"
+                            },
+                            "params": {
+                                "type": "array",
+                                "items": {},
+                                "description": "Query parameters"
+                            },
+                            "analyze": {
+                                "type": "boolean",
+                                "default": True,
+                                "description": "Execute for actual times/rows (false = planner estimates only)"
+                            },
+                            "rollback": {
+                                "type": "boolean",
+                                "default": True,
+                                "description": "Run inside a transaction that is rolled back"
+                            },
+                            "top_n": {
+                                "type": "integer",
+                                "default": 5,
+                                "description": "Number of costliest plan nodes to report"
+                            },
+                            "seq_scan_min_rows": {
+                                "type": "integer",
+                                "default": 10000,
+                                "description": "Report sequential scans reading at least this many rows"
+                            },
+                            "misestimate_factor": {
+                                "type": "number",
+                                "default": 10,
+                                "description": "Report row estimates off by at least this factor"
+                            },
+                            "include_plan": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Also return the raw JSON plan"
                             }
                         },
                         "required": ["query"]
@@ -427,6 +694,45 @@ class DataPlatformMCPServer:
                         "required": ["query"]
                     }
                 ),
+                Tool(
+                    name="pg_write_table",
+                    description="Bulk load a stored DataFrame into a PostgreSQL table via binary COPY (append, replace, or upsert)",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "data_ref": {
+                                "type": "string",
+                                "description": "Reference to stored DataFrame"
+                            },
+                            "table": {
+                                "type": "string",
+                                "description": "Target table name"
+                            },
+                            "schema": {
+                                "type": "string",
+                                "default": "public",
+                                "description": "Target schema name"
+                            },
+                            "mode": {
+                                "type": "string",
+                                "enum": ["append", "replace", "upsert"],
+                                "default": "append",
+                                "description": "append rows, replace (truncate, then load) the table, or upsert on key_columns"
+                            },
+                            "key_columns": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Conflict key for upsert (primary key when the table is created)"
+                            },
+                            "create": {
+                                "type": "boolean",
+                                "default": True,
+                                "description": "Create the table from the DataFrame schema if it does not exist"
+                            }
+                        },
+                        "required": ["data_ref", "table"]
+                    }
+                ),
                 Tool(
                     name="pg_tables",
                     description="List all tables in schema",
@@ -468,6 +774,37 @@ class DataPlatformMCPServer:
                         "properties": {}
                     }
                 ),
+                Tool(
+                    name="pg_search_columns",
+                    description="Fuzzy search column names across all tables (served from the catalog cache)",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "query": {
+                                "type": "string",
+                                "description": "Column name or fragment; 'table.column' narrows by table"
+                            },
+                            "schema": {
+                                "type": "string",
+                                "description": "Restrict to one schema (default: all)"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "default": 25,
+                                "description": "Maximum matches"
+                            }
+                        },
+                        "required": ["query"]
+                    }
+                ),
+                Tool(
+                    name="pg_refresh_catalog",
+                    description="Reload the cached table/column/schema catalog (after DDL made outside this server)",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {}
+                    }
+                ),
                 # PostGIS tools
                 Tool(
                     name="st_tables",
@@ -501,6 +838,17 @@ class DataPlatformMCPServer:
                                 "type": "string",
                                 "default": "public",
                                 "description": "Schema name"
+                            },
+                            "mode": {
+                                "type": "string",
+                                "enum": ["exact", "fast", "sample"],
+                                "default": "exact",
+                                "description": "'exact' scans the table; 'fast' reads the typmod from geometry_columns and samples only unconstrained columns; 'sample' uses TABLESAMPLE. Results report exact (true/false) and method"
+                            },
+                            "sample_percent": {
+                                "type": "number",
+                                "default": 1.0,
+                                "description": "Percent of table pages read when sampling"
                             }
                         },
                         "required": ["table", "column"]
@@ -524,6 +872,17 @@ class DataPlatformMCPServer:
                                 "type": "string",
                                 "default": "public",
                                 "description": "Schema name"
+                            },
+                            "mode": {
+                                "type": "string",
+                                "enum": ["exact", "fast", "sample"],
+                                "default": "exact",
+                                "description": "'exact' scans the table; 'fast' reads the typmod SRID from geometry_columns and samples only when it is 0; 'sample' uses TABLESAMPLE. Results report exact (true/false) and method"
+                            },
+                            "sample_percent": {
+                                "type": "number",
+                                "default": 1.0,
+                                "description": "Percent of table pages read when sampling"
                             }
                         },
                         "required": ["table", "column"]
@@ -547,11 +906,94 @@ class DataPlatformMCPServer:
                                 "type": "string",
                                 "default": "public",
                                 "description": "Schema name"
+                            },
+                            "mode": {
+                                "type": "string",
+                                "enum": ["exact", "fast", "sample"],
+                                "default": "exact",
+                                "description": "'exact' runs ST_Extent over the table; 'fast' reads ST_EstimatedExtent from planner statistics and samples unanalyzed tables; 'sample' uses TABLESAMPLE. Results report exact (true/false) and method"
+                            },
+                            "sample_percent": {
+                                "type": "number",
+                                "default": 1.0,
+                                "description": "Percent of table pages read when sampling"
                             }
                         },
                         "required": ["table", "column"]
                     }
                 ),
+                # In-memory spatial tools
+                Tool(
+                    name="geo_bbox",
+                    description="Bounding box of a stored geometry column, computed in memory (no database round trip)",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "data_ref": {
+                                "type": "string",
+                                "description": "Reference to stored DataFrame"
+                            },
+                            "column": {
+                                "type": "string",
+                                "description": "Geometry column (default: first geometry-tagged column from pg_query)"
+                            },
+                            "per_row": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Also store xmin/ymin/xmax/ymax columns per row"
+                            },
+                            "name": {
+                                "type": "string",
+                                "description": "Name for the per_row result data_ref"
+                            }
+                        },
+                        "required": ["data_ref"]
+                    }
+                ),
+                Tool(
+                    name="geo_centroid",
+                    description="Add centroid_x/centroid_y columns for a stored geometry column (vectorized, planar)",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "data_ref": {
+                                "type": "string",
+                                "description": "Reference to stored DataFrame"
+                            },
+                            "column": {
+                                "type": "string",
+                                "description": "Geometry column (default: first geometry-tagged column from pg_query)"
+                            },
+                            "name": {
+                                "type": "string",
+                                "description": "Optional name for result data_ref"
+                            }
+                        },
+                        "required": ["data_ref"]
+                    }
+                ),
+                Tool(
+                    name="geo_area",
+                    description="Add a planar area column for a stored geometry column, with min/max/mean/total",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "data_ref": {
+                                "type": "string",
+                                "description": "Reference to stored DataFrame"
+                            },
+                            "column": {
+                                "type": "string",
+                                "description": "Geometry column (default: first geometry-tagged column from pg_query)"
+                            },
+                            "name": {
+                                "type": "string",
+                                "description": "Optional name for result data_ref"
+                            }
+                        },
+                        "required": ["data_ref"]
+                    }
+                ),
                 # dbt tools
                 Tool(
                     name="dbt_parse",
@@ -579,6 +1021,21 @@ class DataPlatformMCPServer:
                                 "type": "boolean",
                                 "default": False,
                                 "description": "Rebuild incremental models"
+                            },
+                            "background": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Queue as a background job and return its job_id immediately (see dbt_jobs)"
+                            },
+                            "full_output": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Return all of dbt's log output (default: last 5000 characters; per-node results are in run_results)"
+                            },
+                            "changed_only": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Only build nodes modified since the last state snapshot and their descendants (state:modified+ with --defer); preview with dbt_changed"
                             }
                         }
                     }
@@ -596,6 +1053,16 @@ class DataPlatformMCPServer:
                             "exclude": {
                                 "type": "string",
                                 "description": "Tests to exclude"
+                            },
+                            "background": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Queue as a background job and return its job_id immediately (see dbt_jobs)"
+                            },
+                            "full_output": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Return all of dbt's log output (default: last 5000 characters; per-node results are in run_results)"
                             }
                         }
                     }
@@ -618,6 +1085,21 @@ class DataPlatformMCPServer:
                                 "type": "boolean",
                                 "default": False,
                                 "description": "Rebuild incremental models"
+                            },
+                            "background": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Queue as a background job and return its job_id immediately (see dbt_jobs)"
+                            },
+                            "full_output": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Return all of dbt's log output (default: last 5000 characters; per-node results are in run_results)"
+                            },
+                            "changed_only": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Only build nodes modified since the last state snapshot and their descendants (state:modified+ with --defer); preview with dbt_changed"
                             }
                         }
                     }
@@ -667,9 +1149,126 @@ class DataPlatformMCPServer:
                         "properties": {}
                     }
                 ),
+                Tool(
+                    name="dbt_status",
+                    description="Progress of running and recent dbt commands (nodes completed, running, failed); can cancel a run",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "run_id": {
+                                "type": "string",
+                                "description": "Run to show or cancel (run_id from a dbt_run/dbt_build/dbt_test result); omit to list recent runs"
+                            },
+                            "cancel": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Stop the run (dbt cancels its open queries)"
+                            }
+                        }
+                    }
+                ),
+                Tool(
+                    name="dbt_jobs",
+                    description="Background dbt jobs: list them, show one (log tail, run_results summary, live progress) or cancel one",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "job_id": {
+                                "type": "string",
+                                "description": "Job to show or cancel; omit to list all jobs"
+                            },
+                            "cancel": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Drop a queued job or stop a running one"
+                            },
+                            "log_lines": {
+                                "type": "integer",
+                                "default": 20,
+                                "description": "Trailing log lines to include"
+                            }
+                        }
+                    }
+                ),
+                Tool(
+                    name="dbt_timing_report",
+                    description="Compare model timings across the last dbt runs (from run_results.json) to spot models that got slower",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "last": {
+                                "type": "integer",
+                                "default": 5,
+                                "description": "Number of recent runs to compare (newest vs median of the rest)"
+                            },
+                            "model": {
+                                "type": "string",
+                                "description": "Also show this model's timing in each run"
+                            },
+                            "threshold_pct": {
+                                "type": "number",
+                                "default": 20,
+                                "description": "Minimum relative change to report"
+                            },
+                            "min_seconds": {
+                                "type": "number",
+                                "default": 1.0,
+                                "description": "Minimum absolute change in seconds to report"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "default": 20,
+                                "description": "Maximum models per list"
+                            }
+                        }
+                    }
+                ),
                 Tool(
                     name="dbt_lineage",
                     description="Get model dependencies and lineage",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "model": {
+                                "type": "string",
+                                "description": "Model name to analyze"
+                            },
+                            "depth": {
+                                "type": "integer",
+                                "default": 1,
+                                "description": "Levels to follow (1 = direct parents/children, 0 = full lineage)"
+                            },
+                            "direction": {
+                                "type": "string",
+                                "enum": ["upstream", "downstream", "both"],
+                                "default": "both",
+                                "description": "Which side of the graph to walk"
+                            }
+                        },
+                        "required": ["model"]
+                    }
+                ),
+                Tool(
+                    name="dbt_path",
+                    description="Shortest dependency path between two models (from the cached manifest)",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "from_model": {
+                                "type": "string",
+                                "description": "Starting model/node name or unique_id"
+                            },
+                            "to_model": {
+                                "type": "string",
+                                "description": "Target model/node name or unique_id"
+                            }
+                        },
+                        "required": ["from_model", "to_model"]
+                    }
+                ),
+                Tool(
+                    name="dbt_impact",
+                    description="Blast radius of changing a model: downstream models, tests and exposures",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -680,6 +1279,51 @@ class DataPlatformMCPServer:
                         },
                         "required": ["model"]
                     }
+                ),
+                Tool(
+                    name="dbt_select",
+                    description="Evaluate dbt selector syntax (+model+, tag:, path:, @, unions/intersections) against the manifest without running dbt ls",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "select": {
+                                "type": "string",
+                                "description": "Selector (e.g., '+fct_orders+', 'tag:daily,resource_type:model', 'state:modified+'); omit for all nodes"
+                            },
+                            "exclude": {
+                                "type": "string",
+                                "description": "Selector to exclude"
+                            },
+                            "resource_type": {
+                                "type": "string",
+                                "description": "Keep only this resource type (model, test, seed, snapshot, source, exposure)"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "default": 500,
+                                "description": "Maximum unique_ids to return"
+                            }
+                        }
+                    }
+                ),
+                Tool(
+                    name="dbt_changed",
+                    description="Preview a changed_only run: nodes modified since the last state snapshot (by checksum, config, relation) and their descendants",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "parse": {
+                                "type": "boolean",
+                                "default": True,
+                                "description": "Re-parse the project first so recent edits are seen"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "default": 100,
+                                "description": "Maximum unique_ids per list"
+                            }
+                        }
+                    }
                 )
             ]
             return tools
@@ -694,12 +1338,16 @@ class DataPlatformMCPServer:
                     result = await self.pandas_tools.read_csv(**arguments)
                 elif name == "read_parquet":
                     result = await self.pandas_tools.read_parquet(**arguments)
+                elif name == "read_dataset":
+                    result = await self.pandas_tools.read_dataset(**arguments)
                 elif name == "read_json":
                     result = await self.pandas_tools.read_json(**arguments)
                 elif name == "to_csv":
                     result = await self.pandas_tools.to_csv(**arguments)
                 elif name == "to_parquet":
                     result = await self.pandas_tools.to_parquet(**arguments)
+                elif name == "write_dataset":
+                    result = await self.pandas_tools.write_dataset(**arguments)
                 elif name == "describe":
                     result = await self.pandas_tools.describe(**arguments)
                 elif name == "head":
@@ -723,14 +1371,24 @@ class DataPlatformMCPServer:
                     result = await self.postgres_tools.pg_connect()
                 elif name == "pg_query":
                     result = await self.postgres_tools.pg_query(**arguments)
+                elif name == "pg_query_batch":
+                    result = await self.postgres_tools.pg_query_batch(**arguments)
+                elif name == "pg_explain":
+                    result = await self.postgres_tools.pg_explain(**arguments)
                 elif name == "pg_execute":
                     result = await self.postgres_tools.pg_execute(**arguments)
+                elif name == "pg_write_table":
+                    result = await self.postgres_tools.pg_write_table(**arguments)
                 elif name == "pg_tables":
                     result = await self.postgres_tools.pg_tables(**arguments)
                 elif name == "pg_columns":
                     result = await self.postgres_tools.pg_columns(**arguments)
                 elif name == "pg_schemas":
                     result = await self.postgres_tools.pg_schemas()
+                elif name == "pg_search_columns":
+                    result = await self.postgres_tools.pg_search_columns(**arguments)
+                elif name == "pg_refresh_catalog":
+                    result = await self.postgres_tools.pg_refresh_catalog()
                 # PostGIS tools
                 elif name == "st_tables":
                     result = await self.postgres_tools.st_tables(**arguments)
@@ -740,6 +1398,13 @@ class DataPlatformMCPServer:
                     result = await self.postgres_tools.st_srid(**arguments)
                 elif name == "st_extent":
                     result = await self.postgres_tools.st_extent(**arguments)
+                # In-memory spatial tools
+                elif name == "geo_bbox":
+                    result = await self.pandas_tools.geo_bbox(**arguments)
+                elif name == "geo_centroid":
+                    result = await self.pandas_tools.geo_centroid(**arguments)
+                elif name == "geo_area":
+                    result = await self.pandas_tools.geo_area(**arguments)
                 # dbt tools
                 elif name == "dbt_parse":
                     result = await self.dbt_tools.dbt_parse()
@@ -755,8 +1420,22 @@ class DataPlatformMCPServer:
                     result = await self.dbt_tools.dbt_ls(**arguments)
                 elif name == "dbt_docs_generate":
                     result = await self.dbt_tools.dbt_docs_generate()
+                elif name == "dbt_status":
+                    result = await self.dbt_tools.dbt_status(**arguments)
+                elif name == "dbt_jobs":
+                    result = await self.dbt_tools.dbt_jobs(**arguments)
+                elif name == "dbt_timing_report":
+                    result = await self.dbt_tools.dbt_timing_report(**arguments)
                 elif name == "dbt_lineage":
                     result = await self.dbt_tools.dbt_lineage(**arguments)
+                elif name == "dbt_path":
+                    result = await self.dbt_tools.dbt_path(**arguments)
+                elif name == "dbt_impact":
+                    result = await self.dbt_tools.dbt_impact(**arguments)
+                elif name == "dbt_select":
+                    result = await self.dbt_tools.dbt_select(**arguments)
+                elif name == "dbt_changed":
+                    result = await self.dbt_tools.dbt_changed(**arguments)
                 else:
                     raise ValueError(f"Unknown tool: {name}")
 
@@ -777,12 +1456,15 @@ class DataPlatformMCPServer:
         await self.initialize()
         self.setup_tools()
 
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                self.server.create_initialization_options()
-            )
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    self.server.create_initialization_options()
+                )
+        finally:
+            await self.dbt_tools.close()
 
 
 async def main():
@@ -0,0 +1,90 @@
+"""
+Unit tests for incremental (out-of-core) Arrow aggregation.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+@pytest.fixture
+def frame():
+    """Grouped data with null keys, NaN values, and a large mean"""
+    rng = np.random.default_rng(42)
+    n = 5000
+    df = pd.DataFrame({
+        'k': rng.integers(0, 20, n),
+        'tag': rng.choice(['a', 'b', None], n),
+        'v': rng.normal(1e6, 3.0, n),
+        'w': rng.integers(0, 15, n).astype(float)
+    })
+    df.loc[::7, 'v'] = np.nan
+    return df
+
+
+def run_incremental(df, by, agg, batch_rows=333, compact_rows=200):
+    from mcp_server.arrow_aggregation import IncrementalGroupBy
+
+    aggregator = IncrementalGroupBy(by, agg, compact_rows=compact_rows)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for batch in table.to_batches(max_chunksize=batch_rows):
+        aggregator.update(batch)
+    return aggregator.result().to_pandas()
+
+
+def expected(df, by, agg):
+    grouped = df.groupby(by).agg(agg).reset_index()
+    if isinstance(grouped.columns, pd.MultiIndex):
+        grouped.columns = ['_'.join(col).strip('_') for col in grouped.columns]
+    return grouped
+
+
+@pytest.mark.parametrize('agg', [
+    {'v': 'sum'},
+    {'v': 'mean', 'w': 'max'},
+    {'v': ['mean', 'std', 'var', 'min', 'count']},
+    {'w': 'nunique'},
+    {'v': 'std', 'w': ['nunique', 'sum']},
+])
+def test_matches_pandas(frame, agg):
+    """Test batch-by-batch results equal a single pandas groupby"""
+    by = ['k', 'tag']
+    result = run_incremental(frame, by, agg)
+    target = expected(frame, by, agg)
+
+    assert list(result.columns) == list(target.columns)
+    for column in target.columns:
+        if column in by:
+            assert list(result[column]) == list(target[column])
+        else:
+            np.testing.assert_allclose(
+                result[column].astype(float), target[column].astype(float), rtol=1e-9
+            )
+
+
+def test_single_batch_equals_many(frame):
+    """Test compaction does not change the answer"""
+    agg = {'v': ['mean', 'std']}
+    one = run_incremental(frame, 'k', agg, batch_rows=len(frame))
+    many = run_incremental(frame, 'k', agg, batch_rows=50, compact_rows=10)
+
+    pd.testing.assert_frame_equal(one, many, rtol=1e-9)
+
+
+def test_num_groups_tracks_cardinality(frame):
+    """Test the group count is available before the scan finishes"""
+    from mcp_server.arrow_aggregation import IncrementalGroupBy
+
+    aggregator = IncrementalGroupBy('k', {'v': 'sum'})
+    aggregator.update(pa.Table.from_pandas(frame, preserve_index=False))
+
+    assert aggregator.num_groups == 20
+
+
+def test_unsupported_aggregation():
+    """Test aggregations without a mergeable form are rejected"""
+    from mcp_server.arrow_aggregation import IncrementalGroupBy
+    from mcp_server.arrow_expressions import ExpressionNotSupported
+
+    with pytest.raises(ExpressionNotSupported):
+        IncrementalGroupBy('k', {'v': 'median'})
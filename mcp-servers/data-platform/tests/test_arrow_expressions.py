@@ -0,0 +1,57 @@
+"""
+Unit tests for pandas query to Arrow expression translation.
+"""
+import pytest
+import pandas as pd
+import pyarrow as pa
+
+
+@pytest.fixture
+def table():
+    """Arrow table with nulls and NaN to exercise pandas null semantics"""
+    return pa.table({
+        'a': [1, None, 3, 4],
+        'city': ['NYC', 'LA', None, 'NYC'],
+        'f': [1.0, float('nan'), None, 2.0]
+    })
+
+
+@pytest.mark.parametrize('condition', [
+    'a > 2',
+    'a != 3',
+    'not (a > 2)',
+    "city == 'NYC'",
+    "city != 'NYC'",
+    "city in ['NYC', 'LA']",
+    "city not in ['NYC']",
+    'a / 2 > 1',
+    '1 < a < 4',
+    '(a > 1) | (f < 0)',
+    "a >= 1 and city == 'NYC'",
+    '~(a == 1)',
+    'a + f > 3',
+    'f != f',
+])
+def test_matches_pandas_query(table, condition):
+    """Test Arrow filtering returns the same rows as DataFrame.query"""
+    from mcp_server.arrow_expressions import parse_condition
+
+    arrow_rows = table.filter(parse_condition(condition)).num_rows
+    pandas_rows = len(table.to_pandas().query(condition))
+
+    assert arrow_rows == pandas_rows
+
+
+@pytest.mark.parametrize('condition', [
+    'city.str.startswith("N")',
+    '`my col` > 1',
+    'a > @threshold',
+    'a in other_column',
+    'a ** 2 > 4',
+])
+def test_unsupported_conditions(condition):
+    """Test syntax without an Arrow equivalent raises ExpressionNotSupported"""
+    from mcp_server.arrow_expressions import parse_condition, ExpressionNotSupported
+
+    with pytest.raises(ExpressionNotSupported):
+        parse_condition(condition)
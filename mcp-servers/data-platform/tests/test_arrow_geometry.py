@@ -0,0 +1,188 @@
+"""
+Unit tests for Arrow-native geometry decoding and measures.
+"""
+import json
+import struct
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+
+SQUARE = [(0, 0), (4, 0), (4, 4), (0, 4), (0, 0)]
+HOLE = [(1, 1), (1, 2), (2, 2), (2, 1), (1, 1)]
+SMALL = [(10, 10), (12, 10), (12, 12), (10, 12), (10, 10)]
+
+
+def header(code: int, srid=None, endian='<') -> bytes:
+    """WKB byte order + type code, with an EWKB SRID when given"""
+    if srid:
+        return struct.pack(endian + 'BII', endian == '<', code | 0x20000000, srid)
+    return struct.pack(endian + 'BI', endian == '<', code)
+
+
+def point(x, y, srid=None, endian='<') -> bytes:
+    return header(1, srid, endian) + struct.pack(endian + '2d', x, y)
+
+
+def coords(points, endian='<') -> bytes:
+    return struct.pack(endian + 'I', len(points)) + b''.join(
+        struct.pack(endian + '2d', *p) for p in points
+    )
+
+
+def linestring(points, srid=None, endian='<') -> bytes:
+    return header(2, srid, endian) + coords(points, endian)
+
+
+def polygon(rings, srid=None, endian='<') -> bytes:
+    return header(3, srid, endian) + struct.pack(endian + 'I', len(rings)) + b''.join(
+        coords(ring, endian) for ring in rings
+    )
+
+
+def multi(code, parts, srid=None) -> bytes:
+    return header(code, srid) + struct.pack('<I', len(parts)) + b''.join(parts)
+
+
+def test_parse_points_vectorized():
+    """Test a column of EWKB points takes the NumPy path and keeps SRIDs"""
+    from mcp_server.arrow_geometry import bounds, centroids, parse_wkb
+
+    geoms = parse_wkb(pa.array([point(1, 2, 4326), None, point(3, 4, 4326)]))
+
+    assert geoms.types.tolist() == [1, 0, 1]
+    assert geoms.srids.tolist() == [4326, 0, 4326]
+    assert geoms.geometry_offsets.tolist() == [0, 1, 1, 2]
+    assert np.allclose(centroids(geoms), [[1, 2], [np.nan, np.nan], [3, 4]], equal_nan=True)
+    assert bounds(geoms)[2].tolist() == [3, 4, 3, 4]
+
+
+def test_parse_mixed_geometries():
+    """Test bounds, areas and centroids across geometry types"""
+    from mcp_server.arrow_geometry import areas, bounds, centroids, parse_wkb
+
+    geoms = parse_wkb(pa.array([
+        polygon([SQUARE, HOLE], srid=3857),
+        None,
+        linestring([(0, 0), (2, 0), (2, 2)]),
+        point(5, 5),
+        multi(6, [polygon([SQUARE]), polygon([SMALL])]),
+    ]))
+
+    assert geoms.types.tolist() == [3, 0, 2, 1, 6]
+    assert np.allclose(areas(geoms), [15, np.nan, 0, 0, 20], equal_nan=True)
+    assert bounds(geoms)[4].tolist() == [0, 0, 12, 12]
+    centers = centroids(geoms)
+    # Hole-weighted: (16 * 2 - 1 * 1.5) / 15
+    assert np.allclose(centers[0], [30.5 / 15, 30.5 / 15])
+    # Length-weighted segment midpoints
+    assert np.allclose(centers[2], [1.5, 0.5])
+    assert np.allclose(centers[4], [3.8, 3.8])
+
+
+def test_parse_big_endian_and_iso_z():
+    """Test big-endian WKB and ISO Z coordinates (Z dropped)"""
+    from mcp_server.arrow_geometry import areas, bounds, parse_wkb
+
+    point_z = struct.pack('<BI3d', 1, 1001, 7, 8, 99)
+    geoms = parse_wkb(pa.array([polygon([SQUARE], endian='>'), point_z]))
+
+    assert areas(geoms)[0] == 16
+    assert bounds(geoms)[1].tolist() == [7, 8, 7, 8]
+
+
+def test_parse_unsupported_and_empty():
+    """Test curved types become nulls and empty points have no coordinates"""
+    from mcp_server.arrow_geometry import bounds, parse_wkb
+
+    circular = struct.pack('<BII', 1, 8, 0)
+    empty = struct.pack('<BI2d', 1, 1, float('nan'), float('nan'))
+    geoms = parse_wkb(pa.array([circular, empty, point(1, 1)]))
+
+    assert geoms.types.tolist() == [0, 1, 1]
+    assert np.isnan(bounds(geoms)[:2]).all()
+    assert bounds(geoms)[2].tolist() == [1, 1, 1, 1]
+
+
+def test_tag_geometry_hex_text():
+    """Test hex EWKB text is decoded to binary and tagged with its CRS"""
+    from mcp_server.arrow_geometry import geometry_columns, tag_geometry
+
+    table = pa.table({'id': [1, 2], 'geom': [point(1, 2, 3857).hex(), None]})
+
+    tagged = tag_geometry(table, ['geom'])
+
+    field = tagged.schema.field('geom')
+    assert field.type == pa.binary()
+    assert field.metadata[b'ARROW:extension:name'] == b'geoarrow.wkb'
+    assert json.loads(field.metadata[b'ARROW:extension:metadata']) == {'crs': 'EPSG:3857'}
+    assert geometry_columns(tagged) == ['geom']
+
+
+@pytest.mark.parametrize('values', [
+    [point(1, 2), None, point(3, 4)],
+    [linestring([(0, 0), (2, 0), (2, 2)]), None],
+    [polygon([SQUARE, HOLE]), None, polygon([SMALL])],
+    [multi(4, [point(0, 0), point(2, 2)]), None],
+    [multi(5, [linestring([(0, 0), (2, 0)]), linestring([(0, 0), (0, 4)])])],
+    [multi(6, [polygon([SQUARE, HOLE]), polygon([SMALL])]), None, multi(6, [polygon([SMALL])])],
+])
+def test_geoarrow_round_trip(values):
+    """Test GeoArrow arrays decode to the same measures as their WKB"""
+    from mcp_server.arrow_geometry import (
+        areas, bounds, centroids, parse_wkb, read_geometries, to_geoarrow
+    )
+
+    geoms = parse_wkb(pa.array(values, pa.binary()))
+    array, field = to_geoarrow(geoms, 'geom', srid=4326)
+    native = read_geometries(array, field)
+
+    assert field.metadata[b'ARROW:extension:name'].startswith(b'geoarrow.')
+    assert array.null_count == values.count(None)
+    assert set(native.srids[native.types > 0].tolist()) == {4326}
+    for measure in (bounds, areas, centroids):
+        assert np.allclose(measure(geoms), measure(native), equal_nan=True)
+
+
+def test_geoarrow_rejects_mixed_types():
+    """Test GeoArrow conversion needs a single geometry type"""
+    from mcp_server.arrow_geometry import parse_wkb, to_geoarrow
+
+    geoms = parse_wkb(pa.array([point(0, 0), polygon([SQUARE])]))
+
+    with pytest.raises(ValueError, match='single non-collection geometry type'):
+        to_geoarrow(geoms, 'geom')
+
+
+@pytest.mark.asyncio
+async def test_register_geometry_codecs():
+    """Test PostGIS types get a hex WKB text codec and WKT params pass through"""
+    from unittest.mock import AsyncMock
+    from mcp_server.arrow_geometry import WKB, register_geometry_codecs
+
+    conn = AsyncMock()
+    conn.fetch = AsyncMock(return_value=[{'typname': 'geometry', 'nspname': 'public'}])
+
+    registered = await register_geometry_codecs(conn)
+
+    assert registered == ['geometry']
+    kwargs = conn.set_type_codec.call_args.kwargs
+    assert kwargs['schema'] == 'public' and kwargs['format'] == 'text'
+    decoded = kwargs['decoder'](point(1, 2).hex())
+    assert isinstance(decoded, WKB) and decoded == point(1, 2)
+    assert kwargs['encoder'](b'\x01') == '01'
+    assert kwargs['encoder']('POINT(1 2)') == 'POINT(1 2)'
+
+
+@pytest.mark.asyncio
+async def test_register_geometry_codecs_without_postgis():
+    """Test lookup failures leave the connection unchanged"""
+    from unittest.mock import AsyncMock
+    from mcp_server.arrow_geometry import register_geometry_codecs
+
+    conn = AsyncMock()
+    conn.fetch = AsyncMock(side_effect=Exception('permission denied'))
+
+    assert await register_geometry_codecs(conn) == []
+    conn.set_type_codec.assert_not_called()
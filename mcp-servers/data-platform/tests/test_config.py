@@ -237,3 +237,142 @@ def test_find_project_directory_none_when_no_markers(tmp_path, monkeypatch):
     result = config._find_project_directory()
 
     assert result is None
+
+
+def test_memory_budget_config(tmp_path, monkeypatch):
+    """Test memory budget and cache directory configuration"""
+    from mcp_server.config import DataPlatformConfig
+
+    project_dir = tmp_path / 'project'
+    project_dir.mkdir()
+
+    project_config = project_dir / '.env'
+    project_config.write_text(
+        "DATA_PLATFORM_MAX_MEMORY_MB=512\n"
+        f"DATA_PLATFORM_CACHE_DIR={tmp_path / 'cache'}\n"
+    )
+
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.chdir(project_dir)
+    # Registered so the values loaded from .env are cleaned up afterwards
+    monkeypatch.setenv('DATA_PLATFORM_MAX_MEMORY_MB', '0')
+    monkeypatch.setenv('DATA_PLATFORM_CACHE_DIR', '')
+
+    config = DataPlatformConfig()
+    result = config.load()
+
+    assert result['max_memory_mb'] == 512
+    assert result['cache_dir'] == str(tmp_path / 'cache')
+
+
+def test_storage_mode_config(tmp_path, monkeypatch):
+    """Test IPC storage mode configuration"""
+    from mcp_server.config import DataPlatformConfig
+
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('DATA_PLATFORM_STORAGE', 'IPC')
+
+    config = DataPlatformConfig()
+    result = config.load()
+
+    assert result['storage_mode'] == 'ipc'
+
+
+def test_pg_stream_config(tmp_path, monkeypatch):
+    """Test streaming query fetch size and byte budget configuration"""
+    from mcp_server.config import DataPlatformConfig
+
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('DATA_PLATFORM_PG_FETCH_SIZE', '2500')
+    monkeypatch.setenv('DATA_PLATFORM_PG_STREAM_MAX_MB', '64')
+
+    config = DataPlatformConfig()
+    result = config.load()
+
+    assert result['pg_fetch_size'] == 2500
+    assert result['pg_stream_max_mb'] == 64
+
+
+def test_pg_pool_config(tmp_path, monkeypatch):
+    """Test connection pool configuration"""
+    from mcp_server.config import DataPlatformConfig
+
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('DATA_PLATFORM_PG_POOL_MAX_SIZE', '20')
+    monkeypatch.setenv('DATA_PLATFORM_PG_POOL_MAX_INACTIVE_SECONDS', '60')
+    monkeypatch.setenv('DATA_PLATFORM_PG_STATEMENT_CACHE_SIZE', '0')
+    monkeypatch.setenv('DATA_PLATFORM_PG_SEARCH_PATH', 'analytics,public')
+    monkeypatch.setenv('DATA_PLATFORM_PG_STATEMENT_TIMEOUT_MS', '30000')
+    monkeypatch.setenv('DATA_PLATFORM_PG_POOL_WARMUP', 'true')
+
+    config = DataPlatformConfig()
+    result = config.load()
+
+    assert result['pg_pool_min_size'] == 1
+    assert result['pg_pool_max_size'] == 20
+    assert result['pg_pool_max_inactive_seconds'] == 60.0
+    assert result['pg_statement_cache_size'] == 0
+    assert result['pg_search_path'] == 'analytics,public'
+    assert result['pg_statement_timeout_ms'] == 30000
+    assert result['pg_pool_warmup'] is True
+
+
+def test_pg_query_cache_config(tmp_path, monkeypatch):
+    """Test pg_query result cache configuration"""
+    from mcp_server.config import DataPlatformConfig
+
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('DATA_PLATFORM_PG_QUERY_CACHE_TTL', raising=False)
+    monkeypatch.setenv('DATA_PLATFORM_PG_QUERY_CACHE_INVALIDATE', 'false')
+
+    config = DataPlatformConfig()
+    result = config.load()
+
+    assert result['pg_query_cache_ttl'] == 0.0
+    assert result['pg_query_cache_invalidate'] is False
+
+    monkeypatch.setenv('DATA_PLATFORM_PG_QUERY_CACHE_TTL', '60')
+    assert config.load()['pg_query_cache_ttl'] == 60.0
+
+
+def test_pg_catalog_ttl_config(tmp_path, monkeypatch):
+    """Test catalog cache TTL configuration"""
+    from mcp_server.config import DataPlatformConfig
+
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('DATA_PLATFORM_PG_CATALOG_TTL', '60')
+
+    config = DataPlatformConfig()
+    result = config.load()
+
+    assert result['pg_catalog_ttl'] == 60.0
+
+
+def test_dbt_worker_config(tmp_path, monkeypatch):
+    """Test the persistent dbt worker is opt-in, the job pool size and the state directory"""
+    from mcp_server.config import DataPlatformConfig
+
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('DATA_PLATFORM_DBT_WORKER', raising=False)
+    monkeypatch.delenv('DATA_PLATFORM_DBT_STATE_DIR', raising=False)
+
+    config = DataPlatformConfig()
+    assert config.load()['dbt_worker'] is False
+
+    assert config.load()['dbt_max_jobs'] == 2
+
+    monkeypatch.setenv('DATA_PLATFORM_DBT_WORKER', 'true')
+    monkeypatch.setenv('DATA_PLATFORM_DBT_MAX_JOBS', '4')
+    result = config.load()
+    assert result['dbt_worker'] is True
+    assert result['dbt_max_jobs'] == 4
+    assert result['dbt_state_dir'] is None
+
+    monkeypatch.setenv('DATA_PLATFORM_DBT_STATE_DIR', str(tmp_path / 'state'))
+    assert config.load()['dbt_state_dir'] == str(tmp_path / 'state')
@@ -4,6 +4,7 @@ Unit tests for Arrow IPC DataFrame registry.
 import pytest
 import pandas as pd
 import pyarrow as pa
+from pathlib import Path
 
 
 def test_store_pandas_dataframe():
@@ -238,3 +239,245 @@ def test_metadata_dtypes():
     assert 'int_col' in info.dtypes
     assert 'float_col' in info.dtypes
     assert 'str_col' in info.dtypes
+
+
+def test_memory_budget_spills_lru(tmp_path, monkeypatch):
+    """Test least recently used tables are spilled when over budget"""
+    from mcp_server.data_store import DataStore
+
+    store = DataStore()
+    store._dataframes = {}
+    store._metadata = {}
+    monkeypatch.setattr(store, '_cache_dir', str(tmp_path))
+
+    store.store(pd.DataFrame({'a': range(1000)}), name='old')
+    store.store(pd.DataFrame({'a': range(1000)}), name='recent')
+    per_table = store.get_info('old').memory_bytes
+
+    # Touch 'old' so 'recent' becomes the LRU entry
+    store.get('old')
+    monkeypatch.setattr(store, '_max_memory_bytes', per_table * 2)
+    store.store(pd.DataFrame({'a': range(1000)}), name='newest')
+
+    assert store.residency('recent') == 'spilled'
+    assert store.residency('old') == 'memory'
+    assert store.residency('newest') == 'memory'
+    assert store.total_memory_bytes() <= per_table * 2
+    assert Path(store.get_info('recent').ipc_path).exists()
+
+
+def test_spilled_table_reloads_on_get(tmp_path, monkeypatch):
+    """Test get() transparently reloads a spilled table"""
+    from mcp_server.data_store import DataStore
+
+    store = DataStore()
+    store._dataframes = {}
+    store._metadata = {}
+    monkeypatch.setattr(store, '_cache_dir', str(tmp_path))
+    monkeypatch.setattr(store, '_max_memory_bytes', 1)
+
+    store.store(pd.DataFrame({'a': [1, 2, 3]}), name='first')
+    store.store(pd.DataFrame({'b': [4, 5]}), name='second')
+    assert store.residency('first') == 'spilled'
+
+    table = store.get('first')
+
+    assert table.column('a').to_pylist() == [1, 2, 3]
+    # Reloaded tables are memory-mapped and do not count against the heap budget
+    assert store.residency('first') == 'mapped'
+    assert store.residency('second') == 'memory'
+
+
+def test_list_refs_reports_residency(tmp_path, monkeypatch):
+    """Test list_refs shows whether each ref is resident or spilled"""
+    from mcp_server.data_store import DataStore
+
+    store = DataStore()
+    store._dataframes = {}
+    store._metadata = {}
+    monkeypatch.setattr(store, '_cache_dir', str(tmp_path))
+    monkeypatch.setattr(store, '_max_memory_bytes', 1)
+
+    store.store(pd.DataFrame({'a': [1]}), name='cold')
+    store.store(pd.DataFrame({'a': [2]}), name='hot')
+
+    residency = {r['ref']: r['residency'] for r in store.list_refs()}
+    assert residency == {'cold': 'spilled', 'hot': 'memory'}
+    assert store.spilled_bytes() > 0
+
+
+def test_drop_removes_spill_file(tmp_path, monkeypatch):
+    """Test dropping a spilled DataFrame deletes its IPC file"""
+    from mcp_server.data_store import DataStore
+
+    store = DataStore()
+    store._dataframes = {}
+    store._metadata = {}
+    monkeypatch.setattr(store, '_cache_dir', str(tmp_path))
+    monkeypatch.setattr(store, '_max_memory_bytes', 1)
+
+    store.store(pd.DataFrame({'a': [1]}), name='spilled')
+    store.store(pd.DataFrame({'a': [2]}), name='resident')
+    spill_path = Path(store.get_info('spilled').ipc_path)
+
+    assert store.drop('spilled') is True
+    assert not spill_path.exists()
+    assert store.get('spilled') is None
+
+
+def test_purge_spill_dir_removes_orphans(tmp_path, monkeypatch):
+    """Test spill files left by an earlier run are deleted, live ones kept"""
+    from mcp_server.data_store import DataStore
+
+    store = DataStore()
+    store._dataframes = {}
+    store._metadata = {}
+    monkeypatch.setattr(store, '_cache_dir', str(tmp_path))
+    monkeypatch.setattr(store, '_max_memory_bytes', 1)
+
+    (tmp_path / 'spill').mkdir()
+    orphan = tmp_path / 'spill' / 'previous_run.arrow'
+    orphan.write_bytes(b'stale')
+    store.store(pd.DataFrame({'a': [1]}), name='spilled')
+    store.store(pd.DataFrame({'a': [2]}), name='resident')
+    live = Path(store.get_info('spilled').ipc_path)
+
+    assert store.purge_spill_dir() == 1
+    assert not orphan.exists()
+    assert live.exists()
+    assert store.get('spilled').column('a').to_pylist() == [1]
+
+
+def test_ipc_storage_mode_maps_tables(tmp_path, monkeypatch):
+    """Test ipc storage mode writes tables once and keeps them memory-mapped"""
+    from mcp_server.data_store import DataStore
+
+    store = DataStore()
+    store._dataframes = {}
+    store._metadata = {}
+    monkeypatch.setattr(store, '_cache_dir', str(tmp_path))
+    monkeypatch.setattr(store, '_storage_mode', 'ipc')
+
+    store.store(pd.DataFrame({'a': [1, 2, 3]}), name='mapped_df', source='test')
+
+    info = store.get_info('mapped_df')
+    assert Path(info.ipc_path).parent == tmp_path / 'ipc'
+    assert store.residency('mapped_df') == 'mapped'
+    assert store.total_memory_bytes() == 0
+    assert store.get_pandas('mapped_df')['a'].tolist() == [1, 2, 3]
+    assert b'data_platform.ref' not in (store.get('mapped_df').schema.metadata or {})
+
+
+def test_reindex_ipc_dir(tmp_path, monkeypatch):
+    """Test IPC-backed refs survive a restart via reindex_ipc_dir"""
+    from mcp_server.data_store import DataStore
+
+    store = DataStore()
+    store._dataframes = {}
+    store._metadata = {}
+    monkeypatch.setattr(store, '_cache_dir', str(tmp_path))
+    monkeypatch.setattr(store, '_storage_mode', 'ipc')
+
+    store.store(pd.DataFrame({'a': [1, 2, 3]}), name='persisted', source='orig.csv')
+    store.store(pd.DataFrame({'b': [4]}), name='dropped')
+    store.drop('dropped')
+
+    # Simulate a fresh process
+    store._dataframes = {}
+    store._metadata = {}
+
+    assert store.reindex_ipc_dir() == 1
+    info = store.get_info('persisted')
+    assert info.rows == 3
+    assert info.source == 'orig.csv'
+    assert store.residency('persisted') == 'spilled'
+    assert store.get('persisted').column('a').to_pylist() == [1, 2, 3]
+    assert store.get('dropped') is None
+
+
+def test_set_storage_mode_rejects_unknown():
+    """Test invalid storage modes are rejected"""
+    from mcp_server.data_store import DataStore
+
+    with pytest.raises(ValueError):
+        DataStore.set_storage_mode('s3')
+
+
+def test_get_pandas_returns_cached_view():
+    """Test repeated get_pandas calls reuse one conversion"""
+    from mcp_server.data_store import DataStore
+
+    store = DataStore()
+    store._dataframes = {}
+    store._metadata = {}
+    store._pandas_views = {}
+
+    store.store(pd.DataFrame({'a': [1, 2, 3]}), name='cached')
+
+    first = store.get_pandas('cached')
+    second = store.get_pandas('cached')
+
+    assert first is second
+    assert store.pandas_cache_bytes() > 0
+    assert store.total_memory_bytes() >= store.pandas_cache_bytes()
+
+
+def test_pandas_view_invalidated_on_overwrite_and_drop():
+    """Test cached views are dropped when their ref changes"""
+    from mcp_server.data_store import DataStore
+
+    store = DataStore()
+    store._dataframes = {}
+    store._metadata = {}
+    store._pandas_views = {}
+
+    store.store(pd.DataFrame({'a': [1]}), name='mutable')
+    assert store.get_pandas('mutable')['a'].tolist() == [1]
+
+    store.store(pd.DataFrame({'a': [2]}), name='mutable')
+    assert store.get_pandas('mutable')['a'].tolist() == [2]
+
+    store.drop('mutable')
+    assert store.get_pandas('mutable') is None
+    assert store.pandas_cache_bytes() == 0
+
+
+def test_pandas_cache_is_bounded(monkeypatch):
+    """Test least recently used views are evicted beyond the cache size"""
+    from mcp_server.data_store import DataStore
+
+    store = DataStore()
+    store._dataframes = {}
+    store._metadata = {}
+    store._pandas_views = {}
+    monkeypatch.setattr(store, '_pandas_cache_size', 2)
+
+    for ref in ('v1', 'v2', 'v3'):
+        store.store(pd.DataFrame({'a': [1]}), name=ref)
+        store.get_pandas(ref)
+
+    assert list(store._pandas_views) == ['v2', 'v3']
+
+
+def test_pandas_views_evicted_before_spilling(tmp_path, monkeypatch):
+    """Test the memory budget drops cached views before spilling tables"""
+    from mcp_server.data_store import DataStore
+
+    store = DataStore()
+    store._dataframes = {}
+    store._metadata = {}
+    store._pandas_views = {}
+    monkeypatch.setattr(store, '_cache_dir', str(tmp_path))
+
+    store.store(pd.DataFrame({'a': range(1000)}), name='t1')
+    store.store(pd.DataFrame({'a': range(1000)}), name='t2')
+    store.get_pandas('t1')
+
+    # Room for both tables plus a single view
+    monkeypatch.setattr(store, '_max_memory_bytes', store.total_memory_bytes())
+    store.get_pandas('t2')
+
+    assert 't1' not in store._pandas_views
+    assert 't2' in store._pandas_views
+    assert store.residency('t1') == 'memory'
+    assert store.residency('t2') == 'memory'
@@ -0,0 +1,179 @@
+"""
+Unit tests for the background dbt job queue.
+"""
+import asyncio
+
+import pytest
+
+
+RUN_RESULTS = {
+    'metadata': {'generated_at': '2026-01-01T00:00:00Z', 'invocation_id': 'inv-1'},
+    'elapsed_time': 4.2,
+    'results': [
+        {'unique_id': 'model.shop.stg_orders', 'status': 'success', 'message': 'SELECT 10'},
+        {'unique_id': 'model.shop.fct_orders', 'status': 'error', 'message': 'relation does not exist'},
+        {'unique_id': 'test.shop.not_null', 'status': 'skipped', 'message': None},
+    ]
+}
+
+
+class FakeRunner:
+    """Stands in for _run_dbt; each run waits until its gate is opened"""
+
+    def __init__(self):
+        self.gates = {}
+        self.started = []
+        self.cancelled = []
+
+    def gate(self, run_id):
+        return self.gates.setdefault(run_id, asyncio.Event())
+
+    async def __call__(self, cmd, timeout, run_id, full_output=False):
+        from mcp_server.dbt_results import parse_run_results
+
+        self.started.append(run_id)
+        await self.gate(run_id).wait()
+        if run_id in self.cancelled:
+            return {'success': False, 'cancelled': True, 'stdout': ''}
+        assert full_output and '--target-path' in cmd
+        return {
+            'success': True,
+            'stdout': f'{run_id} line 1\n{run_id} line 2',
+            'run_results': parse_run_results(RUN_RESULTS)
+        }
+
+    async def cancel(self, run_id):
+        self.cancelled.append(run_id)
+        self.gate(run_id).set()
+        return True
+
+
+async def settle():
+    """Let started jobs run"""
+    for _ in range(10):
+        await asyncio.sleep(0.01)
+
+
+def make_job(tmp_path, job_id, nodes, reach=None):
+    from mcp_server.dbt_jobs import DbtJob
+
+    nodes = set(nodes) if nodes is not None else None
+    reach = set(reach or ()) | nodes if nodes is not None else None
+    return DbtJob(job_id, ['build'], tmp_path / job_id, nodes, reach)
+
+
+def test_conflicts_follow_the_dag(tmp_path):
+    """Test jobs conflict when one selects what the other reaches"""
+    a = make_job(tmp_path, 'a', ['stg_orders'], reach=['fct_orders'])
+    b = make_job(tmp_path, 'b', ['fct_orders'], reach=['stg_orders'])
+    c = make_job(tmp_path, 'c', ['stg_customers'])
+    unknown = make_job(tmp_path, 'd', None)
+
+    assert a.conflicts_with(b) and b.conflicts_with(a)
+    assert not a.conflicts_with(c)
+    assert unknown.conflicts_with(c)
+
+
+@pytest.mark.asyncio
+async def test_queue_runs_independent_jobs_concurrently(tmp_path):
+    """Test independent jobs overtake a job blocked by an overlapping one"""
+    from mcp_server.dbt_jobs import DbtJobQueue
+
+    runner = FakeRunner()
+    queue = DbtJobQueue(runner, runner.cancel, max_concurrency=2)
+
+    queue.submit(make_job(tmp_path, 'a', ['stg_orders'], reach=['fct_orders']))
+    blocked = queue.submit(make_job(tmp_path, 'b', ['fct_orders'], reach=['stg_orders']))
+    queue.submit(make_job(tmp_path, 'c', ['stg_customers']))
+    await settle()
+
+    assert runner.started == ['a', 'c']
+    assert blocked.as_dict()['waiting_for'] == ['a']
+
+    runner.gate('a').set()
+    await settle()
+    assert runner.started == ['a', 'c', 'b']
+
+    runner.gate('b').set()
+    runner.gate('c').set()
+    await settle()
+
+    job = queue.jobs['a'].as_dict(log_lines=1)
+    assert job['status'] == 'succeeded'
+    assert job['log'] == ['a line 2']
+    assert job['run_results']['counts'] == {'error': 1, 'skipped': 1, 'success': 1}
+    assert job['run_results']['failures'][0]['unique_id'] == 'model.shop.fct_orders'
+    assert queue.stats() == {'running': 0, 'queued': 0, 'max_concurrency': 2}
+
+
+@pytest.mark.asyncio
+async def test_queue_bounds_concurrency(tmp_path):
+    """Test the pool size caps running jobs and unknown selections run alone"""
+    from mcp_server.dbt_jobs import DbtJobQueue
+
+    runner = FakeRunner()
+    queue = DbtJobQueue(runner, runner.cancel, max_concurrency=1)
+
+    queue.submit(make_job(tmp_path, 'a', ['x']))
+    queue.submit(make_job(tmp_path, 'b', ['y']))
+    await settle()
+    assert runner.started == ['a']
+
+    runner.gate('a').set()
+    await settle()
+    assert runner.started == ['a', 'b']
+
+    queue.max_concurrency = 2
+    queue.submit(make_job(tmp_path, 'c', None))
+    queue.submit(make_job(tmp_path, 'd', ['z']))
+    await settle()
+    # c waits for b; d waits for c, which was queued first
+    assert runner.started == ['a', 'b']
+    assert queue.jobs['d'].waiting_for == ['c']
+
+    runner.gate('b').set()
+    await settle()
+    assert runner.started == ['a', 'b', 'c']
+    runner.gate('c').set()
+    runner.gate('d').set()
+    await settle()
+    assert [job.status for job in queue.jobs.values()] == ['succeeded'] * 4
+
+
+@pytest.mark.asyncio
+async def test_queue_cancel(tmp_path):
+    """Test cancelling queued and running jobs"""
+    from mcp_server.dbt_jobs import DbtJobQueue
+
+    runner = FakeRunner()
+    queue = DbtJobQueue(runner, runner.cancel, max_concurrency=1)
+    queue.submit(make_job(tmp_path, 'a', ['x']))
+    queue.submit(make_job(tmp_path, 'b', ['y']))
+    await settle()
+
+    assert await queue.cancel('b') is True
+    assert queue.jobs['b'].status == 'cancelled'
+    assert await queue.cancel('a') is True
+    assert queue.jobs['a'].status == 'cancelled'
+    assert runner.cancelled == ['a']
+    assert await queue.cancel('a') is False
+    assert runner.started == ['a']
+
+
+def test_prune_removes_old_job_dirs(tmp_path, monkeypatch):
+    """Test finished jobs past the history limit are dropped with their files"""
+    from mcp_server import dbt_jobs
+    from mcp_server.dbt_jobs import DbtJobQueue
+
+    monkeypatch.setattr(dbt_jobs, 'JOB_HISTORY', 1)
+    queue = DbtJobQueue(None, None)
+    for job_id in ('a', 'b'):
+        job = make_job(tmp_path, job_id, ['x'])
+        job.target_path.mkdir(parents=True)
+        job.status = 'succeeded'
+        queue.jobs[job_id] = job
+
+    queue._prune()
+
+    assert list(queue.jobs) == ['b']
+    assert not (tmp_path / 'a').exists()
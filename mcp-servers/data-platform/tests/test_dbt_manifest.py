@@ -0,0 +1,210 @@
+"""
+Unit tests for the dbt manifest index.
+"""
+import json
+
+
+def node(name, resource_type='model', depends_on=(), package='shop', **fields):
+    """Manifest entry for a node in the `shop` project (staging/ or marts/)"""
+    folder = 'staging' if name.startswith('stg_') else 'marts'
+    return {
+        'name': name,
+        'resource_type': resource_type,
+        'package_name': package,
+        'depends_on': {'nodes': list(depends_on)},
+        'config': {'materialized': 'view', 'enabled': True, 'on_schema_change': 'ignore'},
+        'tags': [],
+        'fqn': [package, folder, name],
+        'path': f'{folder}/{name}.sql',
+        'original_file_path': f'models/{folder}/{name}.sql',
+        'raw_code': 'select 1',
+        **fields
+    }
+
+
+def make_manifest(with_maps=False):
+    """
+    Small shop project:
+
+        source.raw.orders -> stg_orders -> fct_orders -> revenue_dashboard (exposure)
+        seed.countries ----------------/       \\-> not_null test
+        stg_customers -> dim_customers -----/
+    """
+    manifest = {
+        'metadata': {'dbt_version': '1.8.0'},
+        'nodes': {
+            'seed.shop.countries': node('countries', 'seed'),
+            'model.shop.stg_orders': node(
+                'stg_orders', depends_on=['source.shop.raw.orders'], tags=['staging']
+            ),
+            'model.shop.stg_customers': node('stg_customers', tags=['staging']),
+            'model.shop.dim_customers': node(
+                'dim_customers', depends_on=['model.shop.stg_customers'], tags=['daily'],
+                schema='marts', database='analytics', description='Customer dimension'
+            ),
+            'model.shop.fct_orders': node(
+                'fct_orders',
+                depends_on=[
+                    'model.shop.stg_orders', 'seed.shop.countries', 'model.shop.dim_customers'
+                ],
+                tags=['daily']
+            ),
+            'test.shop.not_null_fct_orders_id.abc': node(
+                'not_null_fct_orders_id', 'test', depends_on=['model.shop.fct_orders']
+            ),
+        },
+        'sources': {
+            'source.shop.raw.orders': {
+                'name': 'orders', 'source_name': 'raw', 'resource_type': 'source',
+                'package_name': 'shop', 'fqn': ['shop', 'raw', 'orders'], 'config': {}
+            }
+        },
+        'exposures': {
+            'exposure.shop.revenue_dashboard': {
+                'name': 'revenue_dashboard', 'resource_type': 'exposure',
+                'package_name': 'shop', 'depends_on': {'nodes': ['model.shop.fct_orders']}
+            }
+        }
+    }
+    if with_maps:
+        parents = {}
+        for section in ('nodes', 'sources', 'exposures'):
+            for uid, entry in manifest[section].items():
+                parents[uid] = list(entry.get('depends_on', {}).get('nodes', []))
+        children = {uid: [] for uid in parents}
+        for uid, ups in parents.items():
+            for up in ups:
+                children[up].append(uid)
+        manifest['parent_map'] = parents
+        manifest['child_map'] = children
+    return manifest
+
+
+def write_manifest(project_dir, manifest):
+    """Write target/manifest.json under a dbt project directory"""
+    target = project_dir / 'target'
+    target.mkdir(parents=True, exist_ok=True)
+    path = target / 'manifest.json'
+    path.write_text(json.dumps(manifest))
+    return path
+
+
+def test_index_adjacency_from_depends_on():
+    """Test parents/children are built from depends_on when maps are absent"""
+    from mcp_server.dbt_manifest import ManifestIndex
+
+    index = ManifestIndex(make_manifest())
+
+    assert index.parents['model.shop.dim_customers'] == ['model.shop.stg_customers']
+    assert sorted(index.children['model.shop.fct_orders']) == [
+        'exposure.shop.revenue_dashboard', 'test.shop.not_null_fct_orders_id.abc'
+    ]
+    assert index.children['source.shop.raw.orders'] == ['model.shop.stg_orders']
+    assert index.by_type['exposure'] == ['exposure.shop.revenue_dashboard']
+
+
+def test_index_prefers_parent_and_child_maps():
+    """Test dbt's parent_map/child_map are used as-is"""
+    from mcp_server.dbt_manifest import ManifestIndex
+
+    manifest = make_manifest(with_maps=True)
+    manifest['child_map']['model.shop.stg_orders'] = ['model.shop.fct_orders']
+
+    index = ManifestIndex(manifest)
+
+    assert index.children['model.shop.stg_orders'] == ['model.shop.fct_orders']
+    assert index.stats()['edges'] == 7
+
+
+def test_index_keeps_compact_nodes():
+    """Test only the indexed fields of each node are retained"""
+    from mcp_server.dbt_manifest import ManifestIndex
+
+    index = ManifestIndex(make_manifest())
+    compact = index.nodes['model.shop.dim_customers']
+
+    assert 'raw_code' not in compact
+    assert compact['config'] == {'materialized': 'view', 'enabled': True}
+    assert compact['schema'] == 'marts'
+    assert compact['section'] == 'nodes'
+
+
+def test_resolve_names():
+    """Test name, unique_id and versioned-model resolution"""
+    from mcp_server.dbt_manifest import ManifestIndex
+
+    manifest = make_manifest()
+    # A snapshot sharing a model's name, and two versions of a model
+    manifest['nodes']['snapshot.shop.dim_customers'] = node('dim_customers', 'snapshot')
+    manifest['nodes']['model.shop.orders.v2'] = node('orders', version=2)
+    manifest['nodes']['model.shop.orders.v10'] = node('orders', version=10)
+
+    index = ManifestIndex(manifest)
+
+    assert index.resolve('dim_customers') == 'model.shop.dim_customers'
+    assert index.resolve('model.shop.fct_orders') == 'model.shop.fct_orders'
+    assert index.resolve('orders') == 'model.shop.orders.v10'
+    assert index.resolve('orders.v2') == 'model.shop.orders.v2'
+    assert index.resolve('missing') is None
+
+
+def test_load_records_file_stamp(tmp_path):
+    """Test load stamps the index with the file's mtime and size"""
+    from mcp_server.dbt_manifest import ManifestIndex, file_stamp
+
+    path = write_manifest(tmp_path, make_manifest())
+
+    index = ManifestIndex.load(path)
+
+    assert index.stamp == file_stamp(path)
+    assert index.stats()['nodes'] == 8
+    assert index.stats()['dbt_version'] == '1.8.0'
+
+
+def test_upstream_and_downstream_depths():
+    """Test traversal distances and depth limits"""
+    from mcp_server.dbt_manifest import ManifestIndex
+
+    index = ManifestIndex(make_manifest())
+
+    assert index.upstream('model.shop.fct_orders') == {
+        'model.shop.stg_orders': 1,
+        'seed.shop.countries': 1,
+        'model.shop.dim_customers': 1,
+        'source.shop.raw.orders': 2,
+        'model.shop.stg_customers': 2,
+    }
+    assert set(index.upstream('model.shop.fct_orders', depth=1)) == {
+        'model.shop.stg_orders', 'seed.shop.countries', 'model.shop.dim_customers'
+    }
+    assert index.downstream('model.shop.stg_customers')['exposure.shop.revenue_dashboard'] == 3
+
+
+def test_shortest_path():
+    """Test the shortest downstream chain between two nodes"""
+    from mcp_server.dbt_manifest import ManifestIndex
+
+    index = ManifestIndex(make_manifest())
+
+    assert index.shortest_path('source.shop.raw.orders', 'exposure.shop.revenue_dashboard') == [
+        'source.shop.raw.orders',
+        'model.shop.stg_orders',
+        'model.shop.fct_orders',
+        'exposure.shop.revenue_dashboard',
+    ]
+    assert index.shortest_path('model.shop.fct_orders', 'model.shop.stg_orders') is None
+
+
+def test_blast_radius():
+    """Test downstream impact counts exposures and tests"""
+    from mcp_server.dbt_manifest import ManifestIndex
+
+    index = ManifestIndex(make_manifest())
+
+    impact = index.blast_radius('model.shop.stg_customers')
+
+    assert impact['counts'] == {'exposure': 1, 'model': 2, 'test': 1}
+    assert impact['models'] == ['dim_customers', 'fct_orders']
+    assert impact['exposures'] == ['revenue_dashboard']
+    assert impact['tests'] == ['test.shop.not_null_fct_orders_id.abc']
+    assert impact['max_depth'] == 3
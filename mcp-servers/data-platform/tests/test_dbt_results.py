@@ -0,0 +1,122 @@
+"""
+Unit tests for run_results.json parsing and timing history.
+"""
+import json
+import os
+import time
+
+
+def make_run(invocation_id, generated_at, timings, statuses=None):
+    """run_results.json content with the given {unique_id: seconds}"""
+    statuses = statuses or {}
+    return {
+        'metadata': {'invocation_id': invocation_id, 'generated_at': generated_at},
+        'args': {'which': 'build'},
+        'elapsed_time': sum(timings.values()),
+        'results': [
+            {
+                'unique_id': unique_id,
+                'status': statuses.get(unique_id, 'success'),
+                'execution_time': seconds,
+                'message': 'SELECT 5',
+                'adapter_response': {'rows_affected': 5}
+            }
+            for unique_id, seconds in timings.items()
+        ]
+    }
+
+
+def test_summarize_run_results():
+    """Test counts, failures, rows and slowest models"""
+    from mcp_server.dbt_results import node_results, summarize_run_results
+
+    raw = make_run(
+        'inv-1', '2026-01-01T00:00:00Z',
+        {'model.shop.stg_orders': 1.5, 'model.shop.fct_orders': 8.25, 'test.shop.not_null': 0.1},
+        statuses={'test.shop.not_null': 'fail'}
+    )
+    raw['results'][2]['message'] = 'Got 3 results'
+
+    nodes = node_results(raw)
+    summary = summarize_run_results(raw, slowest=1)
+
+    assert nodes[0] == {
+        'unique_id': 'model.shop.stg_orders', 'status': 'success', 'execution_time': 1.5, 'rows_affected': 5
+    }
+    assert nodes[2]['message'] == 'Got 3 results'
+    assert summary['command'] == 'build'
+    assert summary['counts'] == {'fail': 1, 'success': 2}
+    assert summary['rows_affected'] == 15
+    assert summary['failures'] == [
+        {'unique_id': 'test.shop.not_null', 'status': 'fail', 'message': 'Got 3 results'}
+    ]
+    assert summary['slowest'] == [
+        {'unique_id': 'model.shop.fct_orders', 'execution_time': 8.25, 'status': 'success'}
+    ]
+
+
+def test_load_run_results_ignores_stale_file(tmp_path):
+    """Test a run_results.json older than the invocation is not reported"""
+    from mcp_server.dbt_results import load_run_results
+
+    assert load_run_results(tmp_path) is None
+    (tmp_path / 'run_results.json').write_text(json.dumps(make_run('inv-1', 'now', {})))
+    stamp = time.time() - 60
+    os.utime(tmp_path / 'run_results.json', (stamp, stamp))
+
+    assert load_run_results(tmp_path, since=time.time()) is None
+    assert load_run_results(tmp_path)['metadata']['invocation_id'] == 'inv-1'
+
+
+def test_archive_keeps_each_invocation_once(tmp_path, monkeypatch):
+    """Test archiving is idempotent per invocation and prunes old runs"""
+    from mcp_server import dbt_results
+    from mcp_server.dbt_results import archive_run_results, load_history
+
+    monkeypatch.setattr(dbt_results, 'HISTORY_FILES', 2)
+    for day in (1, 2, 2, 3):
+        run = make_run(f'inv-{day}', f'2026-01-0{day}T00:00:00Z', {'model.shop.stg_orders': float(day)})
+        archive_run_results(tmp_path, run)
+
+    runs = load_history(tmp_path, last=5)
+
+    assert [run['invocation_id'] for run in runs] == ['inv-2', 'inv-3']
+    assert runs[-1]['nodes'] == {'model.shop.stg_orders': ['success', 3.0, 5]}
+    assert load_history(tmp_path, last=1)[0]['invocation_id'] == 'inv-3'
+    assert archive_run_results(tmp_path, {'metadata': {}}) is None
+
+
+def test_compare_runs(tmp_path):
+    """Test the newest run is compared with the median of earlier runs"""
+    from mcp_server.dbt_results import archive_run_results, compare_runs, load_history
+
+    timings = [
+        {'model.shop.stg_orders': 2.0, 'model.shop.fct_orders': 10.0, 'model.shop.dim_customers': 1.0},
+        {'model.shop.stg_orders': 2.2, 'model.shop.fct_orders': 12.0, 'model.shop.dim_customers': 1.1},
+        {'model.shop.stg_orders': 2.1, 'model.shop.fct_orders': 30.0, 'model.shop.dim_customers': 5.0},
+        {
+            'model.shop.stg_orders': 2.3, 'model.shop.fct_orders': 4.0,
+            'model.shop.dim_customers': 9.0, 'model.shop.fct_returns': 3.0
+        },
+    ]
+    for day, run in enumerate(timings, start=1):
+        archive_run_results(tmp_path, make_run(
+            f'inv-{day}', f'2026-01-0{day}T00:00:00Z', run,
+            statuses={'model.shop.dim_customers': 'error'} if day == 3 else None
+        ))
+
+    report = compare_runs(load_history(tmp_path, last=4))
+
+    assert [run['invocation_id'] for run in report['runs']] == ['inv-1', 'inv-2', 'inv-3', 'inv-4']
+    assert report['slower'] == [{
+        'unique_id': 'model.shop.dim_customers',
+        'execution_time': 9.0,
+        'baseline': 1.05,
+        'change_seconds': 7.95,
+        'change_pct': 757.1,
+        'history': [1.0, 1.1]
+    }]
+    assert [entry['unique_id'] for entry in report['faster']] == ['model.shop.fct_orders']
+    assert report['faster'][0]['baseline'] == 12.0
+    assert report['new'] == ['model.shop.fct_returns']
+    assert compare_runs([]) == {'runs': [], 'slower': [], 'faster': [], 'new': []}
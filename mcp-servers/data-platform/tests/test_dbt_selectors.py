@@ -0,0 +1,95 @@
+"""
+Unit tests for in-process dbt selector evaluation.
+"""
+import pytest
+
+from tests.test_dbt_manifest import make_manifest
+
+
+@pytest.fixture
+def index():
+    from mcp_server.dbt_manifest import ManifestIndex
+    return ManifestIndex(make_manifest())
+
+
+def select(index, selector, **kwargs):
+    from mcp_server.dbt_selectors import select_nodes
+    return sorted(select_nodes(index, selector, **kwargs))
+
+
+def test_graph_operators(index):
+    """Test +model, model+, N+model and @model"""
+    assert select(index, '+dim_customers') == [
+        'model.shop.dim_customers', 'model.shop.stg_customers'
+    ]
+    assert select(index, 'fct_orders+') == [
+        'exposure.shop.revenue_dashboard',
+        'model.shop.fct_orders',
+        'test.shop.not_null_fct_orders_id.abc',
+    ]
+    assert select(index, '1+fct_orders') == [
+        'model.shop.dim_customers', 'model.shop.fct_orders',
+        'model.shop.stg_orders', 'seed.shop.countries',
+    ]
+    # Descendants of stg_orders plus all their ancestors
+    assert 'model.shop.stg_customers' in select(index, '@stg_orders')
+
+
+def test_union_intersection_and_exclude(index):
+    """Test space = union, comma = intersection, and exclude"""
+    assert select(index, 'tag:daily,resource_type:model') == [
+        'model.shop.dim_customers', 'model.shop.fct_orders'
+    ]
+    assert select(index, 'stg_orders stg_customers') == [
+        'model.shop.stg_customers', 'model.shop.stg_orders'
+    ]
+    assert select(index, '+fct_orders', exclude='resource_type:source resource_type:seed') == [
+        'model.shop.dim_customers', 'model.shop.fct_orders',
+        'model.shop.stg_customers', 'model.shop.stg_orders',
+    ]
+
+
+def test_methods(index):
+    """Test path, fqn, package, source, config and test methods"""
+    assert select(index, 'path:models/staging') == [
+        'model.shop.stg_customers', 'model.shop.stg_orders'
+    ]
+    assert select(index, 'models/staging/stg_orders.sql') == ['model.shop.stg_orders']
+    assert select(index, 'shop.staging') == select(index, 'fqn:shop.staging.*')
+    assert select(index, 'shop.fct_orders') == ['model.shop.fct_orders']
+    assert select(index, 'source:raw') == ['source.shop.raw.orders']
+    assert select(index, 'config.materialized:view', resource_types=['seed']) == [
+        'seed.shop.countries'
+    ]
+    assert select(index, 'test_type:singular') == ['test.shop.not_null_fct_orders_id.abc']
+    assert select(index, 'exposure:revenue_*') == ['exposure.shop.revenue_dashboard']
+    assert len(select(index, 'package:shop')) == len(index.nodes)
+
+
+def test_wildcards_and_empty_selection(index):
+    """Test glob values and that no selector means every node"""
+    assert select(index, 'stg_*') == ['model.shop.stg_customers', 'model.shop.stg_orders']
+    assert len(select(index, None)) == len(index.nodes)
+    assert select(index, 'no_such_model') == []
+
+
+def test_custom_methods(index):
+    """Test extra method handlers are consulted first"""
+    methods = {'state': lambda idx, value: {'model.shop.stg_orders'}}
+
+    from mcp_server.dbt_selectors import select_nodes
+
+    assert select_nodes(index, 'state:modified+', methods=methods) == {
+        'model.shop.stg_orders', 'model.shop.fct_orders',
+        'test.shop.not_null_fct_orders_id.abc', 'exposure.shop.revenue_dashboard',
+    }
+
+
+def test_invalid_selectors(index):
+    """Test unknown methods and bad operator combinations are rejected"""
+    from mcp_server.dbt_selectors import SelectorError
+
+    with pytest.raises(SelectorError, match="Unsupported selector method 'bogus:'"):
+        select(index, 'bogus:x')
+    with pytest.raises(SelectorError, match="'@' cannot be combined"):
+        select(index, '@fct_orders+')
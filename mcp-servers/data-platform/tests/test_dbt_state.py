@@ -0,0 +1,117 @@
+"""
+Unit tests for state-based (changed-only) dbt selection.
+"""
+import json
+
+import pytest
+
+from tests.test_dbt_manifest import make_manifest
+
+
+def changed_manifest():
+    """The shop manifest with stg_customers edited, a config change, and a new model"""
+    manifest = make_manifest(with_maps=True)
+    nodes = manifest['nodes']
+    nodes['model.shop.stg_customers']['checksum'] = {'name': 'sha256', 'checksum': 'new'}
+    nodes['seed.shop.countries']['config']['materialized'] = 'table'
+    nodes['model.shop.stg_payments'] = dict(nodes['model.shop.stg_orders'], name='stg_payments')
+    manifest['parent_map']['model.shop.stg_payments'] = []
+    manifest['child_map']['model.shop.stg_payments'] = []
+    removed = 'test.shop.not_null_fct_orders_id.abc'
+    del nodes[removed]
+    del manifest['parent_map'][removed]
+    manifest['child_map'].pop(removed)
+    manifest['child_map']['model.shop.fct_orders'].remove(removed)
+    return manifest
+
+
+@pytest.fixture
+def indexes():
+    from mcp_server.dbt_manifest import ManifestIndex
+
+    state = make_manifest(with_maps=True)
+    for node in state['nodes'].values():
+        node['checksum'] = {'name': 'sha256', 'checksum': 'old'}
+    current = changed_manifest()
+    for node in current['nodes'].values():
+        node.setdefault('checksum', {'name': 'sha256', 'checksum': 'old'})
+    return ManifestIndex(current), ManifestIndex(state)
+
+
+def test_modified_nodes(indexes):
+    """Test new nodes and checksum / config changes are detected"""
+    from mcp_server.dbt_state import modified_nodes, removed_nodes
+
+    current, state = indexes
+
+    assert modified_nodes(current, state) == {
+        'model.shop.stg_customers': ['body'],
+        'seed.shop.countries': ['configs'],
+        'model.shop.stg_payments': ['new'],
+    }
+    assert removed_nodes(current, state) == ['test.shop.not_null_fct_orders_id.abc']
+
+
+def test_state_selector_method(indexes):
+    """Test state: selectors plug into select_nodes with graph operators"""
+    from mcp_server.dbt_selectors import SelectorError, select_nodes
+    from mcp_server.dbt_state import state_methods
+
+    current, state = indexes
+    methods = state_methods(state)
+
+    assert select_nodes(current, 'state:new', methods=methods) == {'model.shop.stg_payments'}
+    assert select_nodes(current, 'state:modified.body+', methods=methods) == {
+        'model.shop.stg_customers', 'model.shop.dim_customers', 'model.shop.fct_orders',
+        'exposure.shop.revenue_dashboard'
+    }
+    assert select_nodes(
+        current, 'state:modified+', resource_types=['model'], methods=methods
+    ) == {
+        'model.shop.stg_customers', 'model.shop.dim_customers', 'model.shop.fct_orders',
+        'model.shop.stg_payments'
+    }
+    with pytest.raises(SelectorError, match='Unsupported state selector'):
+        select_nodes(current, 'state:unmodified', methods=methods)
+    with pytest.raises(SelectorError, match='No state snapshot'):
+        select_nodes(current, 'state:modified', methods=state_methods(None))
+
+
+def test_diff_state(indexes):
+    """Test the preview separates modified nodes from the descendants they pull in"""
+    from mcp_server.dbt_state import diff_state
+
+    current, state = indexes
+    diff = diff_state(current, state, resource_types=['model', 'seed'], limit=2)
+
+    assert diff['selected'] == 5
+    assert diff['counts'] == {'model': 4, 'seed': 1}
+    assert diff['reasons'] == {'body': 1, 'configs': 1, 'new': 1}
+    assert diff['modified'] == [
+        {'unique_id': 'model.shop.stg_customers', 'reasons': ['body']},
+        {'unique_id': 'model.shop.stg_payments', 'reasons': ['new']},
+    ]
+    assert diff['downstream'] == ['model.shop.dim_customers', 'model.shop.fct_orders']
+    assert diff['truncated'] is True
+
+
+def test_covers_modified_and_snapshot(tmp_path):
+    """Test which commands refresh the snapshot, and the snapshot copy"""
+    from mcp_server.dbt_state import covers_modified, snapshot_manifest
+
+    assert covers_modified(['build'])
+    assert covers_modified(['build', '--select', 'state:modified+', '--defer', '--state', 'x'])
+    # run skips seeds, snapshots and tests, so it never refreshes the state
+    assert not covers_modified(['run'])
+    assert not covers_modified(['run', '--select', 'state:modified+', '--defer', '--state', 'x'])
+    assert not covers_modified(['build', '--select', 'stg_orders'])
+    assert not covers_modified(['build', '--exclude', 'stg_orders'])
+    assert not covers_modified(['test'])
+
+    manifest = tmp_path / 'manifest.json'
+    manifest.write_text(json.dumps({'metadata': {}}))
+    path = snapshot_manifest(manifest, tmp_path / 'state')
+
+    assert path == tmp_path / 'state' / 'manifest.json'
+    assert json.loads(path.read_text()) == {'metadata': {}}
+    assert sorted(p.name for p in (tmp_path / 'state').iterdir()) == ['manifest.json']
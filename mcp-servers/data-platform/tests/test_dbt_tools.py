@@ -1,14 +1,75 @@
 """
 Unit tests for dbt MCP tools.
 """
+import asyncio
 import pytest
+from contextlib import contextmanager
 from unittest.mock import Mock, patch, MagicMock
-import subprocess
 import json
 import tempfile
 import os
 
 
+class FakeProcess:
+    """asyncio subprocess stand-in; with hang=True it runs until signalled"""
+
+    def __init__(self, stdout='', stderr='', returncode=0, hang=False):
+        self.stdout = asyncio.StreamReader()
+        self.stderr = asyncio.StreamReader()
+        self.stdout.feed_data(stdout.encode())
+        self.stderr.feed_data(stderr.encode())
+        self.returncode = None
+        self.signals = []
+        self._exit_code = returncode
+        self._exited = asyncio.Event()
+        if not hang:
+            self._exit(returncode)
+
+    def _exit(self, code):
+        if not self._exited.is_set():
+            self._exit_code = code
+            self.stdout.feed_eof()
+            self.stderr.feed_eof()
+            self._exited.set()
+
+    async def wait(self):
+        await self._exited.wait()
+        self.returncode = self._exit_code
+        return self.returncode
+
+    def send_signal(self, sig):
+        self.signals.append(sig)
+        self._exit(-sig)
+
+    def terminate(self):
+        self.send_signal(15)
+
+    def kill(self):
+        self.send_signal(9)
+
+
+@contextmanager
+def fake_dbt(*results):
+    """
+    Patch asyncio subprocesses. Each dbt call takes the next result (an
+    object with stdout/stderr/returncode, a FakeProcess, or an exception
+    to raise); the last one repeats. Yields the commands run.
+    """
+    calls = []
+
+    async def create(*args, **kwargs):
+        calls.append(list(args))
+        result = results[min(len(calls), len(results)) - 1]
+        if isinstance(result, BaseException):
+            raise result
+        if isinstance(result, FakeProcess):
+            return result
+        return FakeProcess(result.stdout, result.stderr, result.returncode)
+
+    with patch('asyncio.create_subprocess_exec', new=create):
+        yield calls
+
+
 @pytest.fixture
 def mock_config(tmp_path):
     """Mock configuration with dbt project"""
@@ -42,7 +103,7 @@ async def test_dbt_parse_success(dbt_tools):
     mock_result.stdout = 'Parsed successfully'
     mock_result.stderr = ''
 
-    with patch('subprocess.run', return_value=mock_result):
+    with fake_dbt(mock_result):
         result = await dbt_tools.dbt_parse()
 
     assert result['valid'] is True
@@ -56,7 +117,7 @@ async def test_dbt_parse_failure(dbt_tools):
     mock_result.stdout = ''
     mock_result.stderr = 'Compilation error: deprecated syntax'
 
-    with patch('subprocess.run', return_value=mock_result):
+    with fake_dbt(mock_result):
         result = await dbt_tools.dbt_parse()
 
     assert result['valid'] is False
@@ -77,7 +138,7 @@ async def test_dbt_run_with_prevalidation(dbt_tools):
     mock_run.stdout = 'Completed successfully'
     mock_run.stderr = ''
 
-    with patch('subprocess.run', side_effect=[mock_parse, mock_run]):
+    with fake_dbt(mock_parse, mock_run):
         result = await dbt_tools.dbt_run()
 
     assert result['success'] is True
@@ -91,7 +152,7 @@ async def test_dbt_run_fails_validation(dbt_tools):
     mock_parse.stdout = ''
     mock_parse.stderr = 'Parse error'
 
-    with patch('subprocess.run', return_value=mock_parse):
+    with fake_dbt(mock_parse):
         result = await dbt_tools.dbt_run()
 
     assert 'error' in result
@@ -111,15 +172,7 @@ async def test_dbt_run_with_selection(dbt_tools):
     mock_run.stdout = 'Completed'
     mock_run.stderr = ''
 
-    calls = []
-
-    def track_calls(*args, **kwargs):
-        calls.append(args[0] if args else kwargs.get('args', []))
-        if len(calls) == 1:
-            return mock_parse
-        return mock_run
-
-    with patch('subprocess.run', side_effect=track_calls):
+    with fake_dbt(mock_parse, mock_run) as calls:
         result = await dbt_tools.dbt_run(select='dim_customers')
 
     # Verify --select was passed
@@ -134,7 +187,7 @@ async def test_dbt_test(dbt_tools):
     mock_result.stdout = 'All tests passed'
     mock_result.stderr = ''
 
-    with patch('subprocess.run', return_value=mock_result):
+    with fake_dbt(mock_result):
         result = await dbt_tools.dbt_test()
 
     assert result['success'] is True
@@ -153,7 +206,7 @@ async def test_dbt_build(dbt_tools):
     mock_build.stdout = 'Build complete'
     mock_build.stderr = ''
 
-    with patch('subprocess.run', side_effect=[mock_parse, mock_build]):
+    with fake_dbt(mock_parse, mock_build):
         result = await dbt_tools.dbt_build()
 
     assert result['success'] is True
@@ -167,7 +220,7 @@ async def test_dbt_compile(dbt_tools):
     mock_result.stdout = 'Compiled'
     mock_result.stderr = ''
 
-    with patch('subprocess.run', return_value=mock_result):
+    with fake_dbt(mock_result):
         result = await dbt_tools.dbt_compile()
 
     assert result['success'] is True
@@ -181,7 +234,7 @@ async def test_dbt_ls(dbt_tools):
     mock_result.stdout = 'dim_customers\ndim_products\nfct_orders\n'
     mock_result.stderr = ''
 
-    with patch('subprocess.run', return_value=mock_result):
+    with fake_dbt(mock_result):
         result = await dbt_tools.dbt_ls()
 
     assert result['success'] is True
@@ -205,7 +258,7 @@ async def test_dbt_docs_generate(dbt_tools, tmp_path):
 
     dbt_tools.project_dir = str(tmp_path / 'dbt_project')
 
-    with patch('subprocess.run', return_value=mock_result):
+    with fake_dbt(mock_result):
         result = await dbt_tools.dbt_docs_generate()
 
     assert result['success'] is True
@@ -301,18 +354,444 @@ async def test_dbt_no_project():
 @pytest.mark.asyncio
 async def test_dbt_timeout(dbt_tools):
     """Test dbt command timeout handling"""
-    with patch('subprocess.run', side_effect=subprocess.TimeoutExpired('dbt', 300)):
-        result = await dbt_tools.dbt_parse()
+    with fake_dbt(FakeProcess(hang=True)):
+        result = await dbt_tools._run_dbt(['parse'], timeout=0.05)
 
     assert 'error' in result
     assert 'timed out' in result['error'].lower()
+    assert dbt_tools.runs[result['run_id']].status == 'timed_out'
 
 
 @pytest.mark.asyncio
 async def test_dbt_not_installed(dbt_tools):
     """Test handling when dbt is not installed"""
-    with patch('subprocess.run', side_effect=FileNotFoundError()):
+    with fake_dbt(FileNotFoundError()):
         result = await dbt_tools.dbt_parse()
 
     assert 'error' in result
     assert 'not found' in result['error'].lower()
+
+
+@pytest.mark.asyncio
+async def test_dbt_lineage_reuses_cached_index(dbt_tools, tmp_path):
+    """Test the manifest is parsed once and re-read only after it changes"""
+    from mcp_server.dbt_manifest import ManifestIndex
+    from tests.test_dbt_manifest import make_manifest, write_manifest
+
+    project = tmp_path / 'dbt_project'
+    path = write_manifest(project, make_manifest())
+    dbt_tools.project_dir = str(project)
+
+    with patch.object(ManifestIndex, 'load', wraps=ManifestIndex.load) as load:
+        first = await dbt_tools.dbt_lineage('fct_orders')
+        second = await dbt_tools.dbt_lineage('dim_customers')
+        assert load.call_count == 1
+
+        manifest = make_manifest()
+        manifest['nodes']['model.shop.fct_orders']['depends_on']['nodes'] = []
+        path.write_text(json.dumps(manifest) + ' ' * 10)
+        third = await dbt_tools.dbt_lineage('fct_orders')
+        assert load.call_count == 2
+
+    assert len(first['upstream']) == 3
+    assert second['downstream'] == ['model.shop.fct_orders']
+    assert second['materialization'] == 'view'
+    assert third['upstream'] == []
+
+
+@pytest.fixture
+def shop_project(dbt_tools, tmp_path):
+    """Point dbt_tools at a project with the shop manifest"""
+    from tests.test_dbt_manifest import make_manifest, write_manifest
+
+    project = tmp_path / 'dbt_project'
+    write_manifest(project, make_manifest(with_maps=True))
+    dbt_tools.project_dir = str(project)
+    return dbt_tools
+
+
+@pytest.mark.asyncio
+async def test_dbt_lineage_depth(shop_project):
+    """Test transitive upstream lineage grouped by depth"""
+    result = await shop_project.dbt_lineage('fct_orders', depth=0, direction='upstream')
+
+    assert 'downstream' not in result
+    assert result['upstream_by_depth'] == {
+        '1': ['model.shop.dim_customers', 'model.shop.stg_orders', 'seed.shop.countries'],
+        '2': ['model.shop.stg_customers', 'source.shop.raw.orders'],
+    }
+
+    result = await shop_project.dbt_lineage('fct_orders', direction='sideways')
+    assert "Unknown direction 'sideways'" in result['error']
+
+
+@pytest.mark.asyncio
+async def test_dbt_path(shop_project):
+    """Test shortest paths in either direction"""
+    result = await shop_project.dbt_path('stg_customers', 'revenue_dashboard')
+
+    assert result['direction'] == 'downstream'
+    assert result['length'] == 3
+
+    result = await shop_project.dbt_path('fct_orders', 'stg_orders')
+    assert result['direction'] == 'upstream'
+    assert result['path'] == ['model.shop.fct_orders', 'model.shop.stg_orders']
+
+    result = await shop_project.dbt_path('stg_orders', 'stg_customers')
+    assert result['connected'] is False
+
+
+@pytest.mark.asyncio
+async def test_dbt_impact(shop_project):
+    """Test blast radius reports exposures and tests"""
+    result = await shop_project.dbt_impact('stg_orders')
+
+    assert result['unique_id'] == 'model.shop.stg_orders'
+    assert result['counts'] == {'exposure': 1, 'model': 1, 'test': 1}
+    assert result['exposures'] == ['revenue_dashboard']
+
+
+@pytest.mark.asyncio
+async def test_dbt_select_in_process(shop_project):
+    """Test selectors are evaluated without running dbt"""
+    with fake_dbt() as calls:
+        result = await shop_project.dbt_select('+fct_orders', resource_type='model', limit=2)
+
+    assert calls == []
+    assert result['count'] == 4
+    assert result['counts'] == {'model': 4}
+    assert result['unique_ids'] == ['model.shop.dim_customers', 'model.shop.fct_orders']
+    assert result['truncated'] is True
+
+    result = await shop_project.dbt_select('result:error')
+    assert "Unsupported selector method 'result:'" in result['error']
+    result = await shop_project.dbt_select('state:modified')
+    assert 'No state snapshot yet' in result['error']
+
+
+def dbt_event(name, msg='', level='info', **data):
+    """One `--log-format json` line"""
+    return json.dumps({'info': {'name': name, 'msg': msg, 'level': level}, 'data': data}) + '\n'
+
+
+def node_events(unique_id, status):
+    node_info = {'unique_id': unique_id}
+    return (
+        dbt_event('NodeStart', f'Began running node {unique_id}', 'debug', node_info=node_info)
+        + dbt_event(
+            'NodeFinished', f'Finished running node {unique_id}', 'debug',
+            node_info=node_info,
+            run_result={'status': status, 'message': 'relation does not exist' if status == 'error' else None}
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_dbt_build_json_progress(dbt_tools):
+    """Test JSON log events become progress counters and readable stdout"""
+    mock_parse = MagicMock(returncode=0, stdout='OK', stderr='')
+    build_output = (
+        dbt_event('ConcurrencyLine', 'Concurrency: 4 threads', node_count=2)
+        + node_events('model.shop.stg_orders', 'success')
+        + node_events('model.shop.fct_orders', 'error')
+        + dbt_event('EndOfRunSummary', 'Completed with 1 error')
+        + 'not a json line\n'
+    )
+    mock_build = MagicMock(returncode=1, stdout=build_output, stderr='')
+
+    with fake_dbt(mock_parse, mock_build) as calls:
+        result = await dbt_tools.dbt_build()
+
+    assert calls[1][-2:] == ['--log-format', 'json']
+    assert '--log-format' not in calls[0]
+    assert result['success'] is False
+    assert result['command'] == 'build'
+    progress = result['progress']
+    assert progress['total'] == 2
+    assert progress['completed'] == 2
+    assert progress['statuses'] == {'success': 1, 'error': 1}
+    assert progress['failures'] == [{
+        'unique_id': 'model.shop.fct_orders', 'status': 'error', 'message': 'relation does not exist'
+    }]
+    assert progress['last_message'] == 'Completed with 1 error'
+    assert result['stdout'].splitlines()[0] == 'Concurrency: 4 threads'
+    assert result['stdout'].splitlines()[-1] == 'not a json line'
+
+
+@pytest.mark.asyncio
+async def test_dbt_status_and_cancel(dbt_tools):
+    """Test a running build reports progress and stops on cancel"""
+    running = FakeProcess(
+        dbt_event('ConcurrencyLine', node_count=3)
+        + dbt_event('NodeStart', node_info={'unique_id': 'model.shop.fct_orders'}),
+        hang=True
+    )
+
+    with fake_dbt(running):
+        task = asyncio.create_task(dbt_tools.dbt_test())
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        listing = await dbt_tools.dbt_status()
+        assert listing['running'] == 1
+        run = listing['runs'][0]
+        assert run['status'] == 'running'
+        assert run['progress']['total'] == 3
+        assert run['progress']['running'][0]['unique_id'] == 'model.shop.fct_orders'
+
+        cancelled = await dbt_tools.dbt_status(run['run_id'], cancel=True)
+        result = await task
+
+    assert cancelled['cancelled'] is True
+    assert cancelled['status'] == 'cancelled'
+    assert running.signals == [2]
+    assert result['cancelled'] is True
+    assert result['success'] is False
+
+    again = await dbt_tools.dbt_status(run['run_id'], cancel=True)
+    assert again['cancelled'] is False
+    assert 'Unknown run_id' in (await dbt_tools.dbt_status('dbt_missing'))['error']
+
+
+@pytest.mark.asyncio
+async def test_dbt_ls_uses_worker(dbt_tools):
+    """Test parse/compile/ls go to the worker when enabled, and fall back to the CLI"""
+    from unittest.mock import AsyncMock
+    from mcp_server.dbt_worker import DbtWorkerClient, WorkerUnavailable
+
+    dbt_tools.config['dbt_worker'] = True
+    response = {'success': True, 'stdout': 'stg_orders\nfct_orders', 'reparsed': False, 'elapsed_seconds': 0.04}
+
+    with patch.object(DbtWorkerClient, 'invoke', AsyncMock(return_value=response)) as invoke, \
+            fake_dbt() as calls:
+        result = await dbt_tools.dbt_ls(select='+fct_orders')
+
+    assert calls == []
+    assert invoke.call_args.args[0] == ['ls', '--output', 'name', '--select', '+fct_orders']
+    assert result['worker'] is True
+    assert result['resources'] == ['stg_orders', 'fct_orders']
+
+    cli = MagicMock(returncode=0, stdout='stg_orders\n', stderr='')
+    with patch.object(DbtWorkerClient, 'invoke', AsyncMock(side_effect=WorkerUnavailable('no dbt'))), \
+            fake_dbt(cli) as calls:
+        result = await dbt_tools.dbt_ls()
+
+    assert len(calls) == 1
+    assert 'worker' not in result
+    assert result['resources'] == ['stg_orders']
+
+
+@pytest.mark.asyncio
+async def test_dbt_build_background_jobs(shop_project):
+    """Test background builds run concurrently unless their selections overlap in the DAG"""
+    from pathlib import Path
+    from tests.test_dbt_jobs import FakeRunner, settle
+
+    runner = FakeRunner()
+    shop_project.job_queue.runner = runner
+    target = Path(shop_project.project_dir) / 'target'
+    (target / 'partial_parse.msgpack').write_bytes(b'state')
+    parse_ok = MagicMock(returncode=0, stdout='OK', stderr='')
+
+    with fake_dbt(parse_ok):
+        orders = await shop_project.dbt_build(select='stg_orders', background=True)
+        customers = await shop_project.dbt_build(select='stg_customers', background=True)
+        facts = await shop_project.dbt_build(select='fct_orders', background=True)
+    await settle()
+
+    assert orders['background'] is True
+    assert orders['nodes'] == 1
+    assert runner.started == [orders['job_id'], customers['job_id']]
+    job_dir = target / 'jobs' / orders['job_id']
+    assert (job_dir / 'target' / 'partial_parse.msgpack').read_bytes() == b'state'
+
+    listing = await shop_project.dbt_jobs()
+    assert listing['running'] == 2
+    assert listing['queued'] == 1
+    queued = await shop_project.dbt_jobs(facts['job_id'])
+    assert queued['waiting_for'] == [orders['job_id'], customers['job_id']]
+
+    runner.gate(orders['job_id']).set()
+    runner.gate(customers['job_id']).set()
+    await settle()
+    assert runner.started[-1] == facts['job_id']
+
+    runner.gate(facts['job_id']).set()
+    await settle()
+    done = await shop_project.dbt_jobs(orders['job_id'], log_lines=5)
+    assert done['status'] == 'succeeded'
+    assert done['run_results']['nodes'] == 3
+    assert len(done['log']) == 2
+    assert 'Unknown job_id' in (await shop_project.dbt_jobs('job_missing'))['error']
+
+
+@pytest.mark.asyncio
+async def test_dbt_run_parses_run_results(dbt_tools):
+    """Test run_results.json is parsed and long output is cut to its tail"""
+    import time
+    from pathlib import Path
+    from tests.test_dbt_results import make_run
+
+    target = Path(dbt_tools.project_dir) / 'target'
+    target.mkdir()
+    results = target / 'run_results.json'
+    results.write_text(json.dumps(make_run(
+        'inv-1', '2026-01-01T00:00:00Z',
+        {'model.shop.stg_orders': 1.0, 'model.shop.fct_orders': 2.0},
+        statuses={'model.shop.fct_orders': 'error'}
+    )))
+    stamp = time.time() + 60
+    os.utime(results, (stamp, stamp))
+    mock_parse = MagicMock(returncode=0, stdout='OK', stderr='')
+    mock_run = MagicMock(returncode=1, stdout=''.join(f'line {i}\n' for i in range(2000)), stderr='')
+
+    with fake_dbt(mock_parse, mock_run, mock_parse, mock_run):
+        result = await dbt_tools.dbt_run()
+        full = await dbt_tools.dbt_run(full_output=True)
+
+    assert result['stdout_truncated'] is True
+    assert result['stdout_chars'] == len(mock_run.stdout.strip())
+    assert result['stdout'].startswith('... [')
+    assert result['stdout'].endswith('line 1999')
+    assert len(result['stdout']) < 5100
+    assert 'stdout_truncated' not in full
+    assert full['stdout'].startswith('line 0')
+
+    run_results = result['run_results']
+    assert run_results['invocation_id'] == 'inv-1'
+    assert run_results['counts'] == {'error': 1, 'success': 1}
+    assert run_results['failures'][0]['unique_id'] == 'model.shop.fct_orders'
+    assert [node['unique_id'] for node in run_results['results']] == [
+        'model.shop.stg_orders', 'model.shop.fct_orders'
+    ]
+    assert len(list((target / 'run_history').glob('*.json'))) == 1
+
+
+@pytest.mark.asyncio
+async def test_dbt_timing_report(dbt_tools):
+    """Test the timing report compares archived runs and the latest run_results.json"""
+    from pathlib import Path
+    from mcp_server.dbt_results import archive_run_results
+    from tests.test_dbt_results import make_run
+
+    target = Path(dbt_tools.project_dir) / 'target'
+    assert (await dbt_tools.dbt_timing_report())['runs'] == 0
+    assert 'at least 2' in (await dbt_tools.dbt_timing_report(last=1))['error']
+
+    for day, seconds in ((1, 10.0), (2, 11.0)):
+        archive_run_results(target / 'run_history', make_run(
+            f'inv-{day}', f'2026-01-0{day}T00:00:00Z', {'model.shop.fct_orders': seconds}
+        ))
+    (target / 'run_results.json').write_text(json.dumps(make_run(
+        'inv-3', '2026-01-03T00:00:00Z', {'model.shop.fct_orders': 25.0}
+    )))
+
+    report = await dbt_tools.dbt_timing_report(model='fct_orders')
+
+    assert len(report['runs']) == 3
+    assert report['slower'][0]['unique_id'] == 'model.shop.fct_orders'
+    assert report['slower'][0]['baseline'] == 10.5
+    assert report['model']['unique_id'] == 'model.shop.fct_orders'
+    assert [timing['execution_time'] for timing in report['model']['timings']] == [10.0, 11.0, 25.0]
+    missing = await dbt_tools.dbt_timing_report(model='missing')
+    assert 'not found' in missing['model']['error']
+
+
+@pytest.mark.asyncio
+async def test_dbt_build_changed_only(shop_project):
+    """Test a full build snapshots state and a changed-only build selects state:modified+"""
+    import time
+    from pathlib import Path
+    from tests.test_dbt_manifest import write_manifest
+    from tests.test_dbt_state import changed_manifest
+
+    ok = MagicMock(returncode=0, stdout='OK', stderr='')
+    manifest = Path(shop_project.project_dir) / 'target' / 'manifest.json'
+    state = Path(shop_project.project_dir) / 'target' / 'state'
+
+    assert 'No state snapshot' in (await shop_project.dbt_changed(parse=False))['message']
+    assert 'cannot be combined' in (await shop_project.dbt_build(select='x', changed_only=True))['error']
+    with fake_dbt() as calls:
+        rejected = await shop_project.dbt_run(select='stg_orders', changed_only=True)
+    assert 'cannot be combined' in rejected['error']
+    assert calls == []
+
+    stamp = time.time() + 60
+    os.utime(manifest, (stamp, stamp))
+    with fake_dbt(ok):
+        plain = await shop_project.dbt_run()
+    # run skips seeds, snapshots and tests, so only build takes the snapshot
+    assert 'state_snapshot' not in plain
+    assert not state.exists()
+
+    with fake_dbt(ok) as calls:
+        first = await shop_project.dbt_build(changed_only=True)
+
+    assert calls[1][calls[1].index('build'):] == ['build', '--log-format', 'json']
+    assert first['changed_only']['state'] is None
+    assert first['state_snapshot'] == str(state / 'manifest.json')
+
+    write_manifest(Path(shop_project.project_dir), changed_manifest())
+    preview = await shop_project.dbt_changed(parse=False)
+    assert preview['state'] == str(state)
+    assert [node['unique_id'] for node in preview['modified']] == [
+        'model.shop.stg_customers', 'model.shop.stg_payments', 'seed.shop.countries'
+    ]
+    assert 'model.shop.fct_orders' in preview['downstream']
+    assert preview['removed'] == ['test.shop.not_null_fct_orders_id.abc']
+
+    with fake_dbt(ok) as calls:
+        second = await shop_project.dbt_run(changed_only=True)
+
+    assert calls[1][calls[1].index('run'):] == [
+        'run', '--select', 'state:modified+', '--defer', '--state', str(state),
+        '--log-format', 'json'
+    ]
+    assert second['changed_only']['counts'] == {'model': 4}
+    assert 'state_snapshot' not in second
+
+    selected = await shop_project.dbt_select('state:modified', resource_type='model')
+    assert selected['unique_ids'] == ['model.shop.stg_customers', 'model.shop.stg_payments']
+
+
+@pytest.mark.asyncio
+async def test_dbt_build_invalidates_warehouse_caches(dbt_tools):
+    """Test run/build notify the server that relations may have changed"""
+    changed = Mock()
+    dbt_tools.on_warehouse_changed = changed
+    ok = MagicMock(returncode=0, stdout='OK', stderr='')
+    failed = MagicMock(returncode=1, stdout='', stderr='Database Error')
+
+    with fake_dbt(ok):
+        await dbt_tools.dbt_parse()
+        await dbt_tools.dbt_test()
+    assert changed.call_count == 0
+
+    with fake_dbt(ok, ok, ok, failed):
+        await dbt_tools.dbt_build()
+        await dbt_tools.dbt_run()
+    assert changed.call_count == 2
+
+    with fake_dbt(FileNotFoundError()):
+        await dbt_tools.dbt_build()
+    assert changed.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_dbt_build_survives_oversized_log_line(dbt_tools):
+    """Test a JSON event longer than the pipe's line limit does not kill the build"""
+    mock_parse = MagicMock(returncode=0, stdout='OK', stderr='')
+    huge = dbt_event('SQLQuery', 'select ' + 'x, ' * 40_000, 'debug')
+    build = FakeProcess(
+        dbt_event('ConcurrencyLine', node_count=1)
+        + huge
+        + node_events('model.shop.stg_orders', 'success')
+    )
+
+    with fake_dbt(mock_parse, build):
+        result = await dbt_tools.dbt_build()
+
+    assert len(huge) > 64 * 1024
+    assert result['success'] is True
+    assert result['progress']['completed'] == 1
+    assert '[log line over the stream limit skipped]' in result['stdout']
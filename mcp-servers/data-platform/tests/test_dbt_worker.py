@@ -0,0 +1,157 @@
+"""
+Unit tests for the persistent dbt worker.
+"""
+import os
+import textwrap
+import time
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeRunner:
+    """dbtRunner stand-in recording each invocation"""
+
+    calls = []
+
+    def __init__(self, manifest=None, callbacks=None):
+        self.manifest = manifest
+        self.callbacks = callbacks or []
+
+    def _emit(self, level, msg):
+        for callback in self.callbacks:
+            callback(SimpleNamespace(info=SimpleNamespace(level=level, msg=msg)))
+
+    def invoke(self, args):
+        FakeRunner.calls.append((args[0], self.manifest))
+        self._emit('debug', 'Acquiring new connection')
+        if args[0] == 'parse':
+            self._emit('info', 'Performance info: target/perf_info.json')
+            return SimpleNamespace(success=True, result={'manifest': len(FakeRunner.calls)}, exception=None)
+        if args[0] == 'ls':
+            return SimpleNamespace(success=True, result=['shop.stg_orders', 'shop.fct_orders'], exception=None)
+        self._emit('error', "Model 'missing' not found")
+        return SimpleNamespace(success=False, result=None, exception=RuntimeError('compile failed'))
+
+
+# Importable dbt package for the worker subprocess
+FAKE_DBT = {
+    'dbt/__init__.py': '',
+    'dbt/version.py': "__version__ = '1.8.0'\n",
+    'dbt/cli/__init__.py': '',
+    'dbt/cli/main.py': '''
+        from types import SimpleNamespace
+
+
+        class dbtRunner:
+            def __init__(self, manifest=None, callbacks=None):
+                self.manifest = manifest
+                self.callbacks = callbacks or []
+
+            def invoke(self, args):
+                print('dbt prints to stdout')
+                if args[0] == 'parse':
+                    return SimpleNamespace(success=True, result='warm', exception=None)
+                if args[0] == 'ls':
+                    return SimpleNamespace(success=True, result=[f'manifest={self.manifest}'], exception=None)
+                for callback in self.callbacks:
+                    callback(SimpleNamespace(info=SimpleNamespace(level='info', msg='select 1 as id')))
+                return SimpleNamespace(success=True, result=None, exception=None)
+    ''',
+}
+
+
+@pytest.fixture
+def project(tmp_path):
+    project_dir = tmp_path / 'project'
+    (project_dir / 'models').mkdir(parents=True)
+    (project_dir / 'dbt_project.yml').write_text('name: shop\n')
+    (project_dir / 'models' / 'stg_orders.sql').write_text('select 1')
+    return project_dir
+
+
+@pytest.fixture
+def worker(project):
+    from mcp_server.dbt_worker import DbtWorker
+
+    FakeRunner.calls = []
+    return DbtWorker(str(project), runner_cls=FakeRunner)
+
+
+def test_worker_reuses_warm_manifest(worker):
+    """Test commands after the first parse run against the cached manifest"""
+    parsed = worker.handle(['parse'])
+    listed = worker.handle(['ls', '--output', 'name'])
+
+    assert parsed['success'] is True
+    assert parsed['stdout'] == 'Performance info: target/perf_info.json'
+    assert listed['reparsed'] is False
+    assert listed['stdout'] == 'shop.stg_orders\nshop.fct_orders'
+    assert FakeRunner.calls == [('parse', None), ('ls', {'manifest': 1})]
+
+
+def test_worker_reparses_after_project_change(worker, project):
+    """Test editing a model invalidates the warm manifest"""
+    worker.handle(['ls'])
+    model = project / 'models' / 'stg_orders.sql'
+    model.write_text('select 2 as id')
+    stamp = time.time() + 5
+    os.utime(model, (stamp, stamp))
+
+    result = worker.handle(['ls'])
+
+    assert result['reparsed'] is True
+    assert [command for command, _ in FakeRunner.calls] == ['parse', 'ls', 'parse', 'ls']
+    assert worker.handle(['ls'])['reparsed'] is False
+
+
+def test_worker_reports_failures(worker):
+    """Test failed commands carry error messages and unsupported commands are refused"""
+    result = worker.handle(['compile', '--select', 'missing'])
+
+    assert result['success'] is False
+    assert result['stderr'] == "Model 'missing' not found\nRuntimeError: compile failed"
+    assert "Unsupported worker command: 'run'" in worker.handle(['run'])['stderr']
+
+
+@pytest.mark.asyncio
+async def test_worker_client_over_pipe(project, tmp_path, monkeypatch):
+    """Test the client starts the worker script and talks JSON lines to it"""
+    from mcp_server.dbt_worker import DbtWorkerClient
+
+    fake = tmp_path / 'fake_dbt'
+    for name, source in FAKE_DBT.items():
+        path = fake / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(source))
+    monkeypatch.setenv('PYTHONPATH', str(fake))
+
+    client = DbtWorkerClient(str(project), startup_timeout=30)
+    try:
+        listed = await client.invoke(['ls'], timeout=30)
+        compiled = await client.invoke(['compile', '--select', 'stg_orders'], timeout=30)
+        stats = client.stats()
+    finally:
+        await client.close()
+
+    assert listed['stdout'] == 'manifest=warm'
+    assert listed['reparsed'] is False
+    assert compiled['stdout'] == 'select 1 as id'
+    assert stats['dbt_version'] == '1.8.0'
+    assert stats['requests'] == 2
+    assert client.process is None
+
+
+@pytest.mark.asyncio
+async def test_worker_client_without_dbt(project, tmp_path, monkeypatch):
+    """Test a worker that cannot import dbt is disabled after one attempt"""
+    from mcp_server.dbt_worker import DbtWorkerClient, WorkerUnavailable
+
+    monkeypatch.setenv('PYTHONPATH', str(tmp_path / 'empty'))
+    client = DbtWorkerClient(str(project), startup_timeout=30)
+
+    with pytest.raises(WorkerUnavailable, match='dbtRunner'):
+        await client.invoke(['ls'], timeout=30)
+    with pytest.raises(WorkerUnavailable):
+        await client.invoke(['ls'], timeout=30)
+    assert client.process is None
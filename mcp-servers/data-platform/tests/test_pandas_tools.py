@@ -71,6 +71,68 @@ async def test_read_csv(pandas_tools, temp_csv):
     assert 'name' in result['columns']
 
 
+@pytest.mark.asyncio
+async def test_read_csv_streaming_pushdown(pandas_tools, temp_csv):
+    """Test CSV streaming applies column projection and row predicate"""
+    result = await pandas_tools.read_csv(
+        temp_csv,
+        name='csv_pushdown',
+        columns=['name'],
+        condition='value > 25'
+    )
+
+    assert result['engine'] == 'arrow'
+    assert result['columns'] == ['name']
+    assert result['rows'] == 3
+    assert result['rows_scanned'] == 5
+    assert 'rows_per_sec' in result
+    assert 'peak_memory_mb' in result
+
+
+@pytest.mark.asyncio
+async def test_read_csv_chunked_single_ref(pandas_tools, tmp_path, monkeypatch):
+    """Test chunked CSV reads are combined into one data_ref"""
+    from mcp_server.data_store import DataStore
+
+    csv_path = tmp_path / 'big.csv'
+    pd.DataFrame({'id': range(5000), 'value': range(5000)}).to_csv(csv_path, index=False)
+    store = DataStore.get_instance()
+    monkeypatch.setattr(store, '_max_rows', 100_000)
+
+    result = await pandas_tools.read_csv(str(csv_path), name='chunked', chunk_size=500)
+
+    assert result['data_ref'] == 'chunked'
+    assert result['rows'] == 5000
+    assert store.get('chunked').num_rows == 5000
+    assert [r['ref'] for r in store.list_refs()] == ['chunked']
+
+
+@pytest.mark.asyncio
+async def test_read_csv_stops_at_row_limit(pandas_tools, tmp_path, monkeypatch):
+    """Test streaming stops once the row limit is exceeded"""
+    from mcp_server.data_store import DataStore
+
+    csv_path = tmp_path / 'limit.csv'
+    pd.DataFrame({'id': range(50_000)}).to_csv(csv_path, index=False)
+    monkeypatch.setattr(DataStore.get_instance(), '_max_rows', 1000)
+
+    result = await pandas_tools.read_csv(str(csv_path), chunk_size=100)
+
+    assert result['error'] == 'row_limit_exceeded'
+    assert result['rows_scanned'] < 50_000
+    assert len(result['preview']) == 100
+
+
+@pytest.mark.asyncio
+async def test_read_csv_pandas_kwargs_fallback(pandas_tools, temp_csv):
+    """Test pandas-only arguments route the read through pandas"""
+    result = await pandas_tools.read_csv(temp_csv, name='csv_fallback', dtype={'id': 'float64'})
+
+    assert result['engine'] == 'pandas'
+    assert result['rows'] == 5
+    assert result['dtypes']['id'] == 'double'
+
+
 @pytest.mark.asyncio
 async def test_read_csv_nonexistent(pandas_tools):
     """Test reading nonexistent CSV file"""
@@ -89,6 +151,140 @@ async def test_read_parquet(pandas_tools, temp_parquet):
     assert result['rows'] == 3
 
 
+@pytest.fixture
+def temp_daily_parquet(tmp_path):
+    """Create a Parquet file with one row group per day"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet_path = tmp_path / 'daily.parquet'
+    table = pa.table({
+        'day': [f'2024-01-{i // 100 + 1:02d}' for i in range(1000)],
+        'amount': list(range(1000))
+    })
+    pq.write_table(table, parquet_path, row_group_size=100)
+    return str(parquet_path)
+
+
+@pytest.mark.asyncio
+async def test_read_parquet_expression_filter(pandas_tools, temp_daily_parquet):
+    """Test expression filters prune row groups by statistics"""
+    result = await pandas_tools.read_parquet(
+        temp_daily_parquet,
+        name='one_day',
+        columns=['amount'],
+        filters="day == '2024-01-03'"
+    )
+
+    assert result['rows'] == 100
+    assert result['columns'] == ['amount']
+    assert result['row_groups_total'] == 10
+    assert result['row_groups_read'] == 1
+
+
+@pytest.mark.asyncio
+async def test_read_parquet_dnf_filters(pandas_tools, temp_daily_parquet):
+    """Test DNF filters (as delivered over JSON) are supported"""
+    result = await pandas_tools.read_parquet(
+        temp_daily_parquet,
+        name='dnf',
+        filters=[[['amount', '<', 5]], [['amount', '>=', 995]]]
+    )
+
+    assert result['rows'] == 10
+    assert result['row_groups_read'] == 2
+
+
+@pytest.mark.asyncio
+async def test_read_parquet_filter_under_row_limit(pandas_tools, temp_daily_parquet, monkeypatch):
+    """Test a filtered read fits under max_rows when the whole file would not"""
+    from mcp_server.data_store import DataStore
+
+    monkeypatch.setattr(DataStore.get_instance(), '_max_rows', 500)
+
+    unfiltered = await pandas_tools.read_parquet(temp_daily_parquet)
+    filtered = await pandas_tools.read_parquet(
+        temp_daily_parquet, filters=[('day', '=', '2024-01-05')]
+    )
+
+    assert unfiltered['error'] == 'row_limit_exceeded'
+    assert filtered['rows'] == 100
+
+
+@pytest.mark.asyncio
+async def test_write_dataset_round_trip(pandas_tools, temp_daily_parquet, tmp_path, monkeypatch):
+    """Test writing a hive-partitioned dataset and reading it back"""
+    from mcp_server.data_store import DataStore
+
+    monkeypatch.setattr(DataStore.get_instance(), '_max_rows', 100_000)
+    await pandas_tools.read_parquet(temp_daily_parquet, name='daily')
+    base_dir = str(tmp_path / 'daily_ds')
+
+    written = await pandas_tools.write_dataset(
+        'daily', base_dir, partition_cols=['day'], max_rows_per_file=40
+    )
+
+    assert written['success'] is True
+    assert written['rows'] == 1000
+    assert written['partitions'] == 10
+    # 100 rows per day split at 40 rows per file
+    assert written['files_written'] == 30
+    assert (tmp_path / 'daily_ds' / 'day=2024-01-01').is_dir()
+
+    result = await pandas_tools.read_dataset(base_dir, name='daily_back')
+
+    assert result['rows'] == 1000
+    assert set(result['columns']) == {'day', 'amount'}
+    assert result['files_read'] == 30
+
+
+@pytest.mark.asyncio
+async def test_read_dataset_prunes_partitions(pandas_tools, temp_daily_parquet, tmp_path, monkeypatch):
+    """Test partition filters skip non-matching directories"""
+    from mcp_server.data_store import DataStore
+
+    monkeypatch.setattr(DataStore.get_instance(), '_max_rows', 100_000)
+    await pandas_tools.read_parquet(temp_daily_parquet, name='daily')
+    base_dir = str(tmp_path / 'daily_ds')
+    await pandas_tools.write_dataset('daily', base_dir, partition_cols=['day'])
+
+    result = await pandas_tools.read_dataset(
+        base_dir,
+        columns=['amount'],
+        filters="day == '2024-01-03' and amount >= 250"
+    )
+
+    assert result['rows'] == 50
+    assert result['columns'] == ['amount']
+    assert result['files_total'] == 10
+    assert result['files_read'] == 1
+
+
+@pytest.mark.asyncio
+async def test_write_dataset_existing_data(pandas_tools, temp_csv, tmp_path):
+    """Test writing into a non-empty directory requires an explicit behavior"""
+    await pandas_tools.read_csv(temp_csv, name='small')
+    base_dir = str(tmp_path / 'small_ds')
+
+    first = await pandas_tools.write_dataset('small', base_dir)
+    again = await pandas_tools.write_dataset('small', base_dir)
+    replaced = await pandas_tools.write_dataset(
+        'small', base_dir, existing_data_behavior='delete_matching'
+    )
+
+    assert first['success'] is True
+    assert 'error' in again
+    assert replaced['success'] is True
+
+
+@pytest.mark.asyncio
+async def test_read_dataset_not_found(pandas_tools):
+    """Test reading a missing dataset path"""
+    result = await pandas_tools.read_dataset('/nonexistent/dataset')
+
+    assert 'error' in result
+
+
 @pytest.mark.asyncio
 async def test_read_json(pandas_tools, temp_json):
     """Test reading JSON file"""
@@ -168,6 +364,18 @@ async def test_filter(pandas_tools, temp_csv):
 
     assert 'data_ref' in result
     assert result['rows'] == 3  # 30.5, 40.0, 50.5
+    assert result['engine'] == 'arrow'
+
+
+@pytest.mark.asyncio
+async def test_filter_falls_back_to_pandas(pandas_tools, temp_csv):
+    """Test filter uses pandas for expressions Arrow cannot handle"""
+    await pandas_tools.read_csv(temp_csv, name='filter_fallback')
+
+    result = await pandas_tools.filter('filter_fallback', 'name.str.startswith("A")')
+
+    assert result['engine'] == 'pandas'
+    assert result['rows'] == 1
 
 
 @pytest.mark.asyncio
@@ -189,6 +397,7 @@ async def test_select(pandas_tools, temp_csv):
 
     assert 'data_ref' in result
     assert result['columns'] == ['id', 'name']
+    assert result['engine'] == 'arrow'
 
 
 @pytest.mark.asyncio
@@ -223,6 +432,161 @@ async def test_groupby(pandas_tools, tmp_path):
 
     assert 'data_ref' in result
     assert result['rows'] == 2  # Two groups: A, B
+    assert result['engine'] == 'arrow'
+
+
+@pytest.mark.asyncio
+async def test_groupby_matches_pandas_naming(pandas_tools):
+    """Test Arrow groupby output matches flattened pandas columns"""
+    from mcp_server.data_store import DataStore
+
+    df = pd.DataFrame({
+        'category': ['B', 'A', 'B', None],
+        'value': [10, 20, 30, 40],
+        'score': [1.0, 2.0, 4.0, 8.0]
+    })
+    DataStore.get_instance().store(df, name='naming_test')
+
+    result = await pandas_tools.groupby(
+        'naming_test',
+        by='category',
+        agg={'value': ['sum', 'mean'], 'score': 'std'}
+    )
+    expected = df.groupby('category').agg({'value': ['sum', 'mean'], 'score': 'std'}).reset_index()
+    expected.columns = ['_'.join(col).strip('_') for col in expected.columns]
+    stored = DataStore.get_instance().get_pandas(result['data_ref'])
+
+    assert result['engine'] == 'arrow'
+    assert result['columns'] == list(expected.columns)
+    assert stored['category'].tolist() == ['A', 'B']
+    assert stored['value_sum'].tolist() == expected['value_sum'].tolist()
+    assert stored['score_std'].tolist() == pytest.approx(expected['score_std'].tolist(), nan_ok=True)
+
+
+@pytest.mark.asyncio
+async def test_groupby_unsupported_agg_falls_back(pandas_tools, temp_csv):
+    """Test groupby uses pandas for aggregations Arrow lacks"""
+    await pandas_tools.read_csv(temp_csv, name='median_test')
+
+    result = await pandas_tools.groupby('median_test', by='name', agg={'value': 'median'})
+
+    assert result['engine'] == 'pandas'
+    assert result['rows'] == 5
+
+
+@pytest.mark.asyncio
+async def test_groupby_data_ref_with_condition(pandas_tools):
+    """Test condition filters a stored DataFrame before grouping, on both engines"""
+    from mcp_server.data_store import DataStore
+
+    df = pd.DataFrame({
+        'category': ['A', 'A', 'B', 'B', 'C'],
+        'value': [10, 20, 30, 40, 50]
+    })
+    DataStore.get_instance().store(df, name='cond_test')
+
+    arrow = await pandas_tools.groupby(
+        'cond_test', by='category', agg={'value': 'sum'}, condition='value > 15 and category != "C"',
+        name='cond_sum'
+    )
+    fallback = await pandas_tools.groupby(
+        'cond_test', by='category', agg={'value': 'median'}, condition='value > 15 and category != "C"',
+        name='cond_median'
+    )
+
+    assert arrow['engine'] == 'arrow'
+    assert fallback['engine'] == 'pandas'
+    store = DataStore.get_instance()
+    assert store.get_pandas(arrow['data_ref']).set_index('category')['value'].to_dict() == {'A': 20, 'B': 70}
+    assert store.get_pandas(fallback['data_ref']).set_index('category')['value'].to_dict() == {'A': 20, 'B': 35}
+
+
+@pytest.fixture
+def temp_large_csv(tmp_path):
+    """CSV with more rows than the test row limit"""
+    csv_path = tmp_path / 'large.csv'
+    pd.DataFrame({
+        'region': [['north', 'south', 'east'][i % 3] for i in range(3000)],
+        'amount': [float(i) for i in range(3000)]
+    }).to_csv(csv_path, index=False)
+    return str(csv_path)
+
+
+@pytest.mark.asyncio
+async def test_groupby_out_of_core(pandas_tools, temp_large_csv, monkeypatch):
+    """Test groupby over a file larger than max_rows stores only the result"""
+    from mcp_server.data_store import DataStore
+
+    monkeypatch.setattr(DataStore.get_instance(), '_max_rows', 1000)
+
+    loaded = await pandas_tools.read_csv(temp_large_csv)
+    result = await pandas_tools.groupby(
+        path=temp_large_csv, by='region', agg={'amount': ['sum', 'mean']}
+    )
+
+    assert loaded['error'] == 'row_limit_exceeded'
+    assert result['data_ref'] == 'large_grouped'
+    assert result['rows'] == 3
+    assert result['rows_scanned'] == 3000
+    df = pandas_tools.store.get_pandas('large_grouped')
+    expected = pd.read_csv(temp_large_csv).groupby('region')['amount'].sum()
+    assert df.set_index('region')['amount_sum'].to_dict() == expected.to_dict()
+
+
+@pytest.mark.asyncio
+async def test_groupby_out_of_core_with_condition(pandas_tools, temp_large_csv):
+    """Test the scan condition is applied before aggregating"""
+    result = await pandas_tools.groupby(
+        path=temp_large_csv, by='region', agg={'amount': 'count'},
+        condition="region != 'east' and amount < 300", name='counts'
+    )
+
+    df = pandas_tools.store.get_pandas('counts')
+    assert result['rows'] == 2
+    assert df['amount'].tolist() == [100, 100]
+
+
+@pytest.mark.asyncio
+async def test_groupby_out_of_core_too_many_groups(pandas_tools, temp_large_csv, monkeypatch):
+    """Test high-cardinality keys stop the scan at the row limit"""
+    from mcp_server.data_store import DataStore
+
+    monkeypatch.setattr(DataStore.get_instance(), '_max_rows', 1000)
+
+    result = await pandas_tools.groupby(
+        path=temp_large_csv, by='amount', agg={'region': 'count'}
+    )
+
+    assert result['error'] == 'row_limit_exceeded'
+
+
+@pytest.mark.asyncio
+async def test_filter_and_select_out_of_core(pandas_tools, temp_large_csv, monkeypatch):
+    """Test filter/select on a path keep only the reduced result"""
+    from mcp_server.data_store import DataStore
+
+    monkeypatch.setattr(DataStore.get_instance(), '_max_rows', 1000)
+
+    filtered = await pandas_tools.filter(path=temp_large_csv, condition='amount >= 2900')
+    selected = await pandas_tools.select(path=temp_large_csv, columns=['region'])
+
+    assert filtered['data_ref'] == 'large_filtered'
+    assert filtered['rows'] == 100
+    assert selected['error'] == 'row_limit_exceeded'
+
+
+@pytest.mark.asyncio
+async def test_out_of_core_errors(pandas_tools, temp_large_csv):
+    """Test out-of-core validation errors"""
+    missing = await pandas_tools.filter(path='/nonexistent.csv', condition='a > 1')
+    bad_column = await pandas_tools.select(path=temp_large_csv, columns=['nope'])
+    bad_agg = await pandas_tools.groupby(
+        path=temp_large_csv, by='region', agg={'amount': 'median'}
+    )
+
+    assert 'error' in missing
+    assert 'available_columns' in bad_column
+    assert 'median' in bad_agg['error']
 
 
 @pytest.mark.asyncio
@@ -249,6 +613,31 @@ async def test_join(pandas_tools, tmp_path):
 
     assert 'data_ref' in result
     assert result['rows'] == 2  # Only id 1 and 2 match
+    assert result['engine'] == 'arrow'
+    assert result['columns'] == ['id', 'name', 'value']
+
+
+@pytest.mark.asyncio
+async def test_join_row_order_matches_merge(pandas_tools):
+    """Test every join type returns rows in pd.merge order"""
+    from mcp_server.data_store import DataStore
+
+    left = pd.DataFrame({'id': [3, 1, 2, 1], 'a': list('abcd')})
+    right = pd.DataFrame({'id': [1, 4, 1, 3, 5], 'b': list('vwxyz')})
+    store = DataStore.get_instance()
+    store.store(left, name='order_left')
+    store.store(right, name='order_right')
+
+    engines = {'left': 'arrow', 'right': 'pandas', 'outer': 'pandas'}
+    for how, engine in engines.items():
+        result = await pandas_tools.join(
+            'order_left', 'order_right', on='id', how=how, name=f'joined_{how}'
+        )
+        assert result['engine'] == engine
+        expected = pd.merge(left, right, on='id', how=how)
+        joined = store.get_pandas(f'joined_{how}')
+        assert joined['a'].tolist() == expected['a'].tolist()
+        assert joined['b'].tolist() == expected['b'].tolist()
 
 
 @pytest.mark.asyncio
@@ -299,3 +688,78 @@ async def test_operations_on_nonexistent(pandas_tools):
 
     result = await pandas_tools.filter('nonexistent', 'x > 0')
     assert 'error' in result
+
+
+@pytest.fixture
+def geometry_ref(pandas_tools, monkeypatch):
+    """Store a table with a tagged WKB geometry column"""
+    import pyarrow as pa
+    from mcp_server.arrow_geometry import tag_geometry
+    from tests.test_arrow_geometry import HOLE, SQUARE, point, polygon
+
+    monkeypatch.setattr(pandas_tools.store, '_max_rows', 100_000)
+    table = pa.table({
+        'id': [1, 2, 3],
+        'geom': pa.array(
+            [polygon([SQUARE, HOLE], srid=3857), None, point(10, 20, srid=3857)], pa.binary()
+        )
+    })
+    return pandas_tools.store.store(tag_geometry(table, ['geom']), name='parcels')
+
+
+@pytest.mark.asyncio
+async def test_geo_bbox(pandas_tools, geometry_ref):
+    """Test the overall and per-row bounding boxes of a geometry column"""
+    result = await pandas_tools.geo_bbox(geometry_ref, per_row=True)
+
+    assert result['column'] == 'geom'
+    assert result['bbox'] == {'xmin': 0.0, 'ymin': 0.0, 'xmax': 10.0, 'ymax': 20.0}
+    assert result['geometries'] == 2
+    assert result['empty_or_null'] == 1
+    assert result['srid'] == 3857
+    boxes = pandas_tools.store.get(result['result_ref'])
+    assert boxes.column('xmax').to_pylist() == [4.0, None, 10.0]
+
+
+@pytest.mark.asyncio
+async def test_geo_centroid_and_area(pandas_tools, geometry_ref):
+    """Test centroid and area columns are appended to a new ref"""
+    centroid = await pandas_tools.geo_centroid(geometry_ref, name='centers')
+    area = await pandas_tools.geo_area(geometry_ref)
+
+    centers = pandas_tools.store.get('centers')
+    assert centroid['columns'] == ['id', 'geom', 'centroid_x', 'centroid_y']
+    assert centers.column('centroid_x').to_pylist()[2] == 10.0
+    assert centers.column('centroid_y').to_pylist()[1] is None
+    assert area['area'] == {'min': 0.0, 'max': 15.0, 'mean': 7.5, 'total': 15.0}
+    assert pandas_tools.store.get(area['data_ref']).column('area').to_pylist() == [15.0, None, 0.0]
+    assert 'warning' not in area
+
+
+@pytest.mark.asyncio
+async def test_geo_area_geographic_warning(pandas_tools, monkeypatch):
+    """Test lon/lat data is flagged as square degrees"""
+    import pyarrow as pa
+    from tests.test_arrow_geometry import SQUARE, polygon
+
+    monkeypatch.setattr(pandas_tools.store, '_max_rows', 100_000)
+    ref = pandas_tools.store.store(
+        pa.table({'wkb': pa.array([polygon([SQUARE], srid=4326)], pa.binary())}), name='lonlat'
+    )
+
+    result = await pandas_tools.geo_area(ref, column='wkb')
+
+    assert result['srid'] == 4326
+    assert 'square degrees' in result['warning']
+
+
+@pytest.mark.asyncio
+async def test_geo_tools_need_geometry_column(pandas_tools, temp_csv):
+    """Test a clear error when no geometry column is tagged or named"""
+    loaded = await pandas_tools.read_csv(temp_csv, name='plain')
+
+    result = await pandas_tools.geo_bbox(loaded['data_ref'])
+    assert 'No geometry column found' in result['error']
+
+    result = await pandas_tools.geo_centroid(loaded['data_ref'], column='missing')
+    assert result['error'] == 'Column not found: missing'
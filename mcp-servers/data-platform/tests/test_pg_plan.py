@@ -0,0 +1,146 @@
+"""
+Unit tests for EXPLAIN plan summarization.
+"""
+import json
+
+
+def analyzed_plan():
+    """Hash join of a filtered seq scan against an under-estimated index scan"""
+    return [{
+        'Plan': {
+            'Node Type': 'Hash Join',
+            'Total Cost': 5000.0,
+            'Plan Rows': 50,
+            'Actual Total Time': 120.0,
+            'Actual Rows': 40000,
+            'Actual Loops': 1,
+            'Shared Hit Blocks': 900,
+            'Shared Read Blocks': 9100,
+            'Temp Read Blocks': 0,
+            'Temp Written Blocks': 0,
+            'Plans': [
+                {
+                    'Node Type': 'Seq Scan',
+                    'Parent Relationship': 'Outer',
+                    'Relation Name': 'orders',
+                    'Alias': 'o',
+                    'Total Cost': 4000.0,
+                    'Plan Rows': 1000,
+                    'Actual Total Time': 90.0,
+                    'Actual Rows': 1000,
+                    'Actual Loops': 1,
+                    'Filter': "(status = 'open'::text)",
+                    'Rows Removed by Filter': 499000
+                },
+                {
+                    'Node Type': 'Hash',
+                    'Parent Relationship': 'Inner',
+                    'Total Cost': 500.0,
+                    'Plan Rows': 10,
+                    'Actual Total Time': 20.0,
+                    'Actual Rows': 5000,
+                    'Actual Loops': 1,
+                    'Plans': [{
+                        'Node Type': 'Index Scan',
+                        'Parent Relationship': 'Outer',
+                        'Relation Name': 'customers',
+                        'Index Name': 'customers_pkey',
+                        'Total Cost': 450.0,
+                        'Plan Rows': 10,
+                        'Actual Total Time': 0.75,
+                        'Actual Rows': 250,
+                        'Actual Loops': 20
+                    }]
+                }
+            ]
+        },
+        'Planning Time': 0.4,
+        'Execution Time': 121.0
+    }]
+
+
+def test_summarize_analyzed_plan():
+    """Test self time ranking, seq scans, misestimates and buffers"""
+    from mcp_server.pg_plan import summarize_plan
+
+    summary = summarize_plan(json.dumps(analyzed_plan()), top_n=4)
+
+    assert summary['analyzed'] is True
+    assert summary['execution_ms'] == 121.0
+    assert [n['node_type'] for n in summary['top_nodes']] == [
+        'Seq Scan', 'Index Scan', 'Hash Join', 'Hash'
+    ]
+    assert summary['top_nodes'][0]['self_ms'] == 90.0
+    assert summary['top_nodes'][0]['alias'] == 'o'
+
+    # Index scan: 0.75ms x 20 loops; Hash: 20ms minus that
+    assert summary['top_nodes'][1]['self_ms'] == 15.0
+    assert summary['top_nodes'][3]['self_ms'] == 5.0
+
+    assert summary['seq_scans'] == [{
+        'node_type': 'Seq Scan',
+        'relation': 'orders',
+        'alias': 'o',
+        'rows_scanned': 500000,
+        'rows_returned': 1000,
+        'filter': "(status = 'open'::text)"
+    }]
+
+    factors = {m['node_type']: (m['factor'], m['direction']) for m in summary['misestimates']}
+    assert factors['Hash Join'] == (800.0, 'under')
+    assert factors['Hash'] == (500.0, 'under')
+    assert factors['Index Scan'] == (25.0, 'under')
+
+    assert summary['buffers']['hit_ratio'] == 0.09
+    assert any('index on the filter columns' in hint for hint in summary['hints'])
+    assert any('shared buffers' in hint for hint in summary['hints'])
+
+
+def test_summarize_estimate_only_plan():
+    """Test plans without ANALYZE rank by cost and skip actual-row checks"""
+    from mcp_server.pg_plan import summarize_plan
+
+    plan = {
+        'Plan': {
+            'Node Type': 'Aggregate',
+            'Total Cost': 25000.0,
+            'Plan Rows': 1,
+            'Plans': [{
+                'Node Type': 'Seq Scan',
+                'Relation Name': 'events',
+                'Total Cost': 20000.0,
+                'Plan Rows': 1_000_000
+            }]
+        }
+    }
+    summary = summarize_plan([plan])
+
+    assert summary['analyzed'] is False
+    assert summary['top_nodes'][0] == {
+        'node_type': 'Seq Scan', 'relation': 'events', 'depth': 1,
+        'self_cost': 20000.0, 'percent': 80.0, 'rows': 1_000_000
+    }
+    assert summary['seq_scans'][0]['estimated_rows'] == 1_000_000
+    assert summary['misestimates'] == []
+    assert summary['buffers'] is None
+
+
+def test_sort_spill_hint():
+    """Test on-disk sorts are reported"""
+    from mcp_server.pg_plan import summarize_plan
+
+    plan = {'Plan': {
+        'Node Type': 'Sort',
+        'Total Cost': 10.0,
+        'Plan Rows': 100,
+        'Actual Total Time': 5.0,
+        'Actual Rows': 100,
+        'Actual Loops': 1,
+        'Sort Method': 'external merge',
+        'Sort Space Type': 'Disk',
+        'Sort Space Used': 20480
+    }}
+    summary = summarize_plan(plan)
+
+    assert summary['sort_spills'][0]['space_kb'] == 20480
+    assert any('work_mem' in hint for hint in summary['hints'])
@@ -0,0 +1,140 @@
+"""
+Unit tests for the pg_query result cache.
+"""
+import pyarrow as pa
+
+
+def test_normalize_sql():
+    """Test comments, whitespace and case are normalized but literals are kept"""
+    from mcp_server.query_cache import normalize_sql
+
+    assert normalize_sql("SELECT  *\n FROM t -- note\n WHERE a = 1;") == "select * from t where a = 1"
+    assert normalize_sql("SELECT /* hint */ 1") == "select 1"
+    assert normalize_sql("SELECT 'A  -- b'") == "select 'A  -- b'"
+    assert normalize_sql('SELECT "Col  Name" FROM T') == 'select "Col  Name" from t'
+    assert normalize_sql("SELECT $fn$ KEEP  Me $fn$") == "select $fn$ KEEP  Me $fn$"
+    assert normalize_sql("SELECT * FROM t WHERE a = $1") == "select * from t where a = $1"
+
+def test_referenced_tables():
+    """Test FROM/JOIN targets are reduced to bare table names"""
+    from mcp_server.query_cache import referenced_tables
+
+    tables = referenced_tables(
+        'SELECT * FROM public.Orders o JOIN "Customers" c ON o.cid = c.id '
+        'LEFT JOIN analytics . events e USING (id)'
+    )
+    assert tables == {'orders', 'Customers', 'events'}
+
+
+def test_modified_tables():
+    """Test write targets are found, reads return empty, opaque statements None"""
+    from mcp_server.query_cache import modified_tables
+
+    assert modified_tables('INSERT INTO sales.orders VALUES (1)') == {'orders'}
+    assert modified_tables('update users set a = 1') == {'users'}
+    assert modified_tables('DELETE FROM ONLY logs') == {'logs'}
+    assert modified_tables('TRUNCATE TABLE a, b') == {'a'}
+    assert modified_tables('DROP TABLE IF EXISTS tmp') == {'tmp'}
+    assert modified_tables('SELECT 1') == set()
+    assert modified_tables('CALL refresh_all()') is None
+
+
+def test_is_read_only():
+    """Test only provably read-only, deterministic statements are cacheable"""
+    from mcp_server.query_cache import is_read_only
+
+    assert is_read_only('SELECT id FROM users WHERE id < $1')
+    assert is_read_only("SELECT * FROM events WHERE kind = 'delete' AND note = 'now()'")
+    assert is_read_only('WITH recent AS (SELECT * FROM orders) SELECT count(*) FROM recent')
+    assert not is_read_only('INSERT INTO t(x) VALUES (1) RETURNING id')
+    assert not is_read_only("SELECT nextval('s')")
+    assert not is_read_only('WITH d AS (DELETE FROM t RETURNING *) SELECT * FROM d')
+    assert not is_read_only('SELECT * INTO copy_t FROM t')
+    assert not is_read_only('SELECT * FROM t FOR UPDATE')
+    assert not is_read_only('SELECT random(), NOW()')
+    assert not is_read_only('SELECT current_timestamp')
+    assert not is_read_only('EXPLAIN ANALYZE SELECT 1')
+    assert not is_read_only('SELECT 1; DROP TABLE t')
+    assert not is_read_only('CALL refresh_all()')
+
+
+class _Store:
+    """Minimal stand-in exposing DataStore.get_info"""
+
+    def __init__(self):
+        self.infos = {}
+
+    def get_info(self, data_ref):
+        return self.infos.get(data_ref)
+
+
+def test_query_cache_hit_miss_and_ttl(monkeypatch):
+    """Test lookups count hits/misses and entries expire after the TTL"""
+    from mcp_server import query_cache
+    from mcp_server.query_cache import QueryCache
+
+    clock = [100.0]
+    monkeypatch.setattr(query_cache.time, 'monotonic', lambda: clock[0])
+    store = _Store()
+    store.infos['r1'] = object()
+    cache = QueryCache(ttl_seconds=10)
+
+    assert cache.get('SELECT 1 FROM t', [1], store) is None
+    cache.put('SELECT 1 FROM t', [1], {'data_ref': 'r1', 'rows': 1}, store)
+    assert cache.get('SELECT  1 FROM t;', [1], store).data_ref == 'r1'
+    assert cache.get('SELECT 1 FROM t', [2], store) is None
+
+    clock[0] += 11
+    assert cache.get('SELECT 1 FROM t', [1], store) is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 3
+    assert cache.stats()['entries'] == 0
+
+
+def test_query_cache_overwritten_ref():
+    """Test an entry is retired when its data_ref now holds a different table"""
+    from mcp_server.query_cache import QueryCache
+
+    store = _Store()
+    store.infos['r1'] = object()
+    cache = QueryCache(ttl_seconds=60)
+    cache.put('SELECT * FROM t', None, {'data_ref': 'r1'}, store)
+
+    store.infos['r1'] = object()
+    assert cache.get('SELECT * FROM t', None, store) is None
+
+
+def test_query_cache_invalidate_and_capacity():
+    """Test table-scoped and full invalidation plus LRU capacity"""
+    from mcp_server.query_cache import QueryCache
+
+    store = _Store()
+    for ref in ('a', 'b', 'c'):
+        store.infos[ref] = object()
+    cache = QueryCache(ttl_seconds=60, max_entries=2)
+    cache.put('SELECT * FROM users', None, {'data_ref': 'a'}, store)
+    cache.put('SELECT * FROM orders', None, {'data_ref': 'b'}, store)
+
+    assert cache.invalidate({'users'}) == 1
+    assert cache.get('SELECT * FROM orders', None, store) is not None
+
+    cache.put('SELECT * FROM items', None, {'data_ref': 'c'}, store)
+    cache.put('SELECT * FROM users', None, {'data_ref': 'a'}, store)
+    assert cache.stats()['entries'] == 2
+    assert cache.get('SELECT * FROM orders', None, store) is None
+
+    assert cache.invalidate() == 2
+    assert cache.stats()['invalidations'] == 3
+
+
+def test_query_cache_disabled():
+    """Test a zero TTL disables caching"""
+    from mcp_server.query_cache import QueryCache
+
+    store = _Store()
+    store.infos['a'] = pa.table({'x': [1]})
+    cache = QueryCache(ttl_seconds=0)
+    cache.put('SELECT 1', None, {'data_ref': 'a'}, store)
+
+    assert cache.enabled is False
+    assert cache.stats()['entries'] == 0